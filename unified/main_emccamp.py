@@ -11,6 +11,7 @@ from src.processors import devolucao as devolucao_proc
 from src.processors import emccamp as emccamp_proc
 from src.processors import max as max_proc
 from src.scripts import extrair_basemax, extrair_doublecheck_acordo, extrair_judicial
+from src.utils.artifacts import configure_artifact_store
 from src.utils.totvs_client import baixar_baixas_emccamp, baixar_emccamp
 from src.utils.output_formatter import OutputFormatter, format_extraction_output
 from time import time
@@ -26,6 +27,8 @@ class Pipeline:
     def _get_config(self) -> LoadedConfig:
         if self._config is None:
             self._config = self.loader.load()
+            # Bases tratadas passam de uma etapa para outra em memória
+            configure_artifact_store(self._config)
         return self._config
 
     # ---- Extraction layer -------------------------------------------------
@@ -88,9 +91,11 @@ class Pipeline:
     # ---- Treatment / processing -------------------------------------------
 
     def treat_emccamp(self) -> emccamp_proc.ProcessorStats:
+        self._get_config()
         return emccamp_proc.run(self.loader)
 
     def treat_max(self) -> max_proc.MaxStats:
+        self._get_config()
         return max_proc.run(self.loader)
 
     def treat_all(self) -> Dict[str, object]:
@@ -100,14 +105,18 @@ class Pipeline:
         }
 
     def batimento(self):
+        self._get_config()
         return batimento_proc.run(self.loader)
 
     def baixa(self) -> None:
+        self._get_config()
         baixa_proc.run(self.loader)
 
     def devolucao(self):
         """Executa processamento de devolução MAX - EMCCAMP."""
+        self._get_config()
         return devolucao_proc.run(self.loader)
 
     def enriquecimento(self, dataset: str | None = None):
+        self._get_config()
         return enrichment_proc.run(dataset, self.loader)
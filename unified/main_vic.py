@@ -35,6 +35,7 @@ from src.processors.shared.tratamento_max import MaxProcessor
 from src.processors.shared.batimento import BatimentoProcessor
 from src.processors.shared.baixa import BaixaProcessor
 from src.processors.shared.devolucao import DevolucaoProcessor
+from src.utils.artifacts import artifact_store, configure_artifact_store
 from src.utils.logger import get_logger
 from src.utils.validator import ValidadorConsistencia
 
@@ -133,6 +134,9 @@ class PipelineOrchestrator:
 
         self.paths_config = self.config_loader.get_nested_value(self.config, 'paths', {})
 
+        # Bases tratadas passam de uma etapa para outra em memória
+        configure_artifact_store(self.config)
+
         # Inicializar processadores
         self.max_processor = MaxProcessor(self.config, self.logger)
         self.vic_processor = VicProcessor(self.config, self.logger)
@@ -474,6 +478,9 @@ class PipelineOrchestrator:
                     "Pulando etapas dependentes - arquivos VIC/MAX não disponíveis"
                 )
                 
+            # Conclui a gravação dos ZIPs que ficaram em segundo plano
+            artifact_store().flush()
+
             # Comparação com sistema atual (se solicitado)
             if comparar_com_atual:
                 self.logger.info("\n[EXTRA] Comparando com sistema atual...")
@@ -12,7 +12,6 @@ from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
-import pyodbc
 
 # Setup path
 ROOT = Path(__file__).resolve().parents[1]
@@ -21,6 +20,8 @@ sys.path.insert(0, str(ROOT))
 from dotenv import load_dotenv
 load_dotenv(ROOT / ".env")
 
+from src.utils.sql_runner import QueryJob, dedup_by_digits, run_concurrently
+
 
 # Query AUTOJUR - Banco Candiotto/Autojur - EMCCAMP
 SQL_AUTOJUR_EMCCAMP = """
@@ -49,29 +50,20 @@ WHERE
 """
 
 
-def executar_consulta(server: str, database: str, username: str, password: str, query: str, descricao: str) -> pd.DataFrame:
-    """Executa consulta SQL e retorna DataFrame."""
-    print(f"[EXEC] {descricao}...")
-    
-    try:
-        conn_str = (
-            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-            f"SERVER={server};"
-            f"DATABASE={database};"
-            f"UID={username};"
-            f"PWD={password};"
-            f"TrustServerCertificate=yes;"
-        )
-        conn = pyodbc.connect(conn_str, timeout=30)
-        df = pd.read_sql(query, conn, dtype=str)
-        conn.close()
-        
-        print(f"[OK] {descricao}: {len(df):,} registros")
-        return df
-        
-    except Exception as e:
-        print(f"[ERRO] {descricao}: {e}")
-        return pd.DataFrame(columns=["CPF_CNPJ", "ORIGEM"])
+def executar_consultas(jobs: list[QueryJob]) -> dict[str, pd.DataFrame]:
+    """Executa as consultas ao mesmo tempo (uma thread por banco) e retorna DataFrames por descrição."""
+    for job in jobs:
+        print(f"[EXEC] {job.name}...")
+    
+    resultados = {}
+    for outcome in run_concurrently(jobs):
+        if outcome.ok:
+            print(f"[OK] {outcome.name}: {len(outcome.data):,} registros em {outcome.elapsed:.2f}s")
+            resultados[outcome.name] = outcome.data
+        else:
+            print(f"[ERRO] {outcome.name} ({outcome.elapsed:.2f}s): {outcome.error}")
+            resultados[outcome.name] = pd.DataFrame(columns=["CPF_CNPJ", "ORIGEM"])
+    return resultados
 
 
 def main():
@@ -103,17 +95,14 @@ def main():
     user_candiotto = os.getenv("MSSQL_USER_CANDIOTTO")
     pass_candiotto = os.getenv("MSSQL_PASSWORD_CANDIOTTO")
     
-    # Extrair AUTOJUR EMCCAMP
-    df_autojur = executar_consulta(
-        server_candiotto, database_candiotto, user_candiotto, pass_candiotto,
-        SQL_AUTOJUR_EMCCAMP, "Consulta AUTOJUR (EMCCAMP)"
-    )
-    
-    # Extrair MAX Smart Judicial
-    df_max = executar_consulta(
-        server_std, database_std, user_std, pass_std,
-        SQL_MAXSMART_JUDICIAL, "Consulta MAX Smart Judicial"
-    )
+    # AUTOJUR e MAX Smart estão em servidores diferentes: consultas em paralelo
+    jobs = [
+        QueryJob("Consulta AUTOJUR (EMCCAMP)", SQL_AUTOJUR_EMCCAMP, server_candiotto, database_candiotto, user_candiotto, pass_candiotto),
+        QueryJob("Consulta MAX Smart Judicial", SQL_MAXSMART_JUDICIAL, server_std, database_std, user_std, pass_std),
+    ]
+    resultados = executar_consultas(jobs)
+    df_autojur = resultados["Consulta AUTOJUR (EMCCAMP)"]
+    df_max = resultados["Consulta MAX Smart Judicial"]
     
     # Combinar e remover duplicatas
     print()
@@ -123,12 +112,8 @@ def main():
     
     combinados = pd.concat([df_autojur, df_max], ignore_index=True)
     
-    if 'CPF_CNPJ' in combinados.columns:
-        combinados['_CPF_DIGITO'] = combinados['CPF_CNPJ'].astype(str).str.replace(r"[^0-9]", "", regex=True)
-        unicos = combinados.drop_duplicates(subset=['_CPF_DIGITO'], keep='first')
-        unicos = unicos.drop(columns=['_CPF_DIGITO'])
-    else:
-        unicos = combinados.drop_duplicates(subset=['CPF_CNPJ'], keep='first')
+    # Mesmo CPF/CNPJ com ou sem pontuação conta uma vez só
+    unicos = dedup_by_digits(combinados, 'CPF_CNPJ', keep='first')
     
     removidos = len(combinados) - len(unicos)
     print(f"[INFO] Duplicatas removidas: {removidos:,}")
@@ -7,7 +7,6 @@ Extrai a base MAX do SQL Server para EMCCAMP.
 import os
 import sys
 import time
-import zipfile
 from datetime import datetime
 from pathlib import Path
 
@@ -20,6 +19,7 @@ load_dotenv(ROOT / ".env")
 
 from src.loaders.sql_loader import SQLLoader
 from src.core.schemas import LoaderConfig, LoaderType
+from src.utils.sql_partition import max_extraction_params
 
 # Query SQL para extração EMCCAMP MAX
 # MoClientesID = 77398 (EMCCAMP)
@@ -88,41 +88,45 @@ def main():
             "database": database,
             "username": username,
             "password": password,
+            "batch_size": int(os.getenv("MAX_FETCH_BATCH_SIZE", "50000")),
+            "fetch_engine": os.getenv("MAX_FETCH_ENGINE", "auto"),
+            # partitions/partition_column/incremental do configs/clients/emccamp.yaml
+            **max_extraction_params("emccamp"),
+            # Recarga completa do snapshot incremental
+            "full_refresh": ("--full-refresh" in sys.argv) or (os.getenv("MAX_FULL_REFRESH", "0") == "1"),
             "query": SQL_EMCCAMP_MAX,
         }
     )
     
     print("[INFO] Conectando ao SQL Server...")
     loader = SQLLoader(config, None)
-    result = loader.load()
+
+    # Lotes do fetchmany são gravados no ZIP à medida que chegam
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    csv_name = f"MaxSmart_{timestamp}.csv"
+    result = loader.export_zip(output_file, csv_name, sep=';', encoding='utf-8')
     
     if "error" in result.metadata:
         print(f"\n[ERRO] {result.metadata['error']}")
         sys.exit(1)
     
-    if result.data.empty:
+    if not result.metadata["rows"]:
         print("[ERRO] Nenhum dado extraído")
         sys.exit(1)
     
-    # Salvar como ZIP
-    print(f"\n[INFO] Salvando {len(result.data):,} registros...")
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    csv_name = f"MaxSmart_{timestamp}.csv"
-    
-    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-        csv_content = result.data.to_csv(index=False, sep=';', encoding='utf-8-sig')
-        zf.writestr(csv_name, csv_content)
-    
     tempo = time.time() - inicio
     
     print()
     print("[RESULTADO] Extração concluída:")
     print(f"  Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
     print(f"  Arquivo: {output_file}")
-    print(f"  Registros: {len(result.data):,}")
-    print(f"  Colunas: {len(result.data.columns)}")
+    print(f"  Registros: {result.metadata['rows']:,}")
+    print(f"  Colunas: {len(result.metadata['columns'])}")
     print(f"  Tempo: {tempo:.2f}s")
+    print(f"  Fetch: {result.metadata.get('rows_per_sec', 0):,.0f} linhas/s ({result.metadata.get('fetch_engine')})")
+    if "delta_mode" in result.metadata:
+        print(f"  Delta: {result.metadata['delta_fetched']:,} lidas, {result.metadata['delta_removed']:,} removidas, "
+              f"{result.metadata['delta_reentered']:,} reincluídas (watermark {result.metadata['watermark']})")
     print()
     print("[OK] EMCCAMP MAX extraído com sucesso!")
 
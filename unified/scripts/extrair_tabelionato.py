@@ -7,7 +7,6 @@ import sys
 import zipfile
 import csv
 import imaplib
-import email
 import time
 import logging
 from dataclasses import dataclass, field
@@ -38,12 +37,23 @@ logger = logging.getLogger(__name__)
 
 # Import do módulo de extração 7-Zip
 from src.utils.archives import ensure_7zip_ready, extract_with_7zip
+from src.utils.imap_cache import (
+    AttachmentCache,
+    AttachmentPart,
+    fetch_attachment,
+    fetch_bodystructure,
+    fetch_headers,
+    search_uids,
+    select_mailbox,
+)
 
 # Diretórios
 PROJECT_ROOT = ROOT
 INPUT_DIR = PROJECT_ROOT / "data" / "input" / "tabelionato"
 INPUT_DIR_CUSTAS = PROJECT_ROOT / "data" / "input" / "tabelionato_custas"
 OUTPUT_DIR = PROJECT_ROOT / "data" / "output" / "tabelionato_tratada"
+# Anexos ja baixados, por (caixa, UIDVALIDITY, UID, parte)
+IMAP_CACHE_DIR = Path(os.getenv('TABELIONATO_IMAP_CACHE_DIR') or PROJECT_ROOT / "data" / "cache" / "imap")
 
 
 # Funções utilitárias simples
@@ -119,6 +129,9 @@ class EmailDownloader:
         if not self.subject_tokens:
             self.subject_tokens = [self._normalize_text(self.subject_keyword)]
         self.attachment_filename = 'Cobrana'
+        self.mailbox = 'INBOX'
+        self.uidvalidity: Optional[int] = None
+        self.cache = AttachmentCache(IMAP_CACHE_DIR)
         logger.info(f"Conta IMAP utilizada: {self.email_user}")
         
         # Validar configuraes
@@ -162,24 +175,19 @@ class EmailDownloader:
         return decoded_string
     
     def buscar_emails_recentes(self, mail: imaplib.IMAP4_SSL, dias: int = 7) -> List[str]:
-        """Busca emails do remetente especificado (sem filtro SINCE para evitar confusao)."""
+        """Busca UIDs dos emails do remetente especificado (sem filtro SINCE para evitar confusao)."""
         try:
-            mail.select('INBOX')
+            # Somente leitura: os FETCH usam PEEK e nao marcam como lido
+            self.uidvalidity = select_mailbox(mail, self.mailbox)
             
             # Critrio de busca simplificado: apenas por remetente
             criterio = f'(FROM "{self.email_sender}")'
             logger.info(f"Buscando emails com criterio: {criterio}")
             
-            status, messages = mail.search(None, criterio)
-            
-            if status != 'OK':
-                logger.warning("Nenhum email encontrado")
-                return []
-            
-            email_ids = messages[0].split()
+            email_ids = search_uids(mail, criterio)
             logger.info(f"Encontrados {len(email_ids)} emails do remetente")
             
-            return [email_id.decode() for email_id in email_ids]
+            return email_ids
             
         except Exception as e:
             logger.error(f"Erro ao buscar emails: {e}")
@@ -224,16 +232,14 @@ class EmailDownloader:
         return None
     
     def processar_email(self, mail: imaplib.IMAP4_SSL, email_id: str) -> Optional[Tuple[str, str]]:
-        """Processa um email especfico e baixa anexos relevantes."""
+        """Processa um email especfico (por UID) e baixa anexos relevantes.
+
+        Busca so os cabecalhos e a BODYSTRUCTURE; os anexos sao baixados
+        parte a parte (ou lidos do cache local).
+        """
         try:
-            status, msg_data = mail.fetch(email_id, '(RFC822)')
-            
-            if status != 'OK':
-                logger.warning(f"No foi possvel buscar email {email_id}")
-                return None
-            
-            # Parse do email
-            email_message = email.message_from_bytes(msg_data[0][1])
+            # Apenas os cabecalhos usados no filtro, sem o corpo
+            email_message = fetch_headers(mail, email_id)
             
             # Decodificar assunto
             assunto = self.decodificar_header(email_message['Subject'])
@@ -265,7 +271,8 @@ class EmailDownloader:
                 data_hora_email = self.extrair_data_hora_assunto(assunto)
             
             # Processar anexos
-            anexo_baixado = self.processar_anexos(email_message, data_hora_email)
+            partes = fetch_bodystructure(mail, email_id)
+            anexo_baixado = self.processar_anexos(mail, email_id, partes, data_hora_email)
             
             if anexo_baixado:
                 return anexo_baixado, data_hora_email
@@ -276,16 +283,24 @@ class EmailDownloader:
             logger.error(f"Erro ao processar email {email_id}: {e}")
             return None
     
-    def processar_anexos(self, email_message, data_hora_email: str) -> Optional[str]:
-        """Processa anexos do email e salva o arquivo relevante."""
+    def processar_anexos(
+        self,
+        mail: imaplib.IMAP4_SSL,
+        email_id: str,
+        partes: List[AttachmentPart],
+        data_hora_email: str,
+    ) -> Optional[str]:
+        """Processa anexos do email (partes da BODYSTRUCTURE) e salva o arquivo relevante.
+
+        As partes sao baixadas antes de remover os arquivos anteriores.
+        """
         anexos_encontrados = []
         
-        for part in email_message.walk():
-            if part.get_content_disposition() == 'attachment':
-                filename = part.get_filename()
+        for part in partes:
+            if part.disposition == 'attachment' or part.filename:
+                filename = part.filename
                 
                 if filename:
-                    filename = self.decodificar_header(filename)
                     logger.info(f"Anexo encontrado: {filename}")
                     
                     # Verificar se  anexo do Tabelionato (Cobrana ou RecebimentoCustas)
@@ -310,11 +325,31 @@ class EmailDownloader:
             logger.warning("Nenhum anexo vlido encontrado (Cobrana ou RecebimentoCustas)")
             return None
         
+        # Baixar so as partes dos anexos (ou ler do cache)
+        conteudos = []
+        for _, _, part in anexos_encontrados:
+            try:
+                conteudo, do_cache = fetch_attachment(
+                    mail,
+                    email_id,
+                    part,
+                    mailbox=self.mailbox,
+                    uidvalidity=self.uidvalidity,
+                    cache=self.cache,
+                )
+            except Exception as e:
+                conteudo, do_cache = e, False
+            if do_cache:
+                logger.info(f"Anexo '{part.filename}' lido do cache local (UID {email_id})")
+            conteudos.append(conteudo)
+
         # Processar todos os anexos encontrados
         arquivos_salvos = []
         
-        for tipo_anexo, filename, part in anexos_encontrados:
+        for (tipo_anexo, filename, part), conteudo in zip(anexos_encontrados, conteudos):
             try:
+                if isinstance(conteudo, Exception):
+                    raise conteudo
                 if tipo_anexo == 'cobranca':
                     # Garantir que o diretrio de cobrana existe
                     INPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -344,7 +379,7 @@ class EmailDownloader:
                 
                 # Salvar contedo
                 with open(caminho_arquivo, 'wb') as f:
-                    f.write(part.get_payload(decode=True))
+                    f.write(conteudo)
                 
                 tamanho_mb = caminho_arquivo.stat().st_size / (1024 * 1024)
                 logger.info(f"Anexo '{tipo_anexo}' salvo como: {caminho_arquivo}")
@@ -380,7 +415,7 @@ class EmailDownloader:
             # Processar APENAS o email mais recente (ltimo da lista)
             if email_ids:
                 email_id = email_ids[-1]  # ltimo email (mais recente)
-                logger.info(f"Processando APENAS o email mais recente ID: {email_id}")
+                logger.info(f"Processando APENAS o email mais recente UID: {email_id}")
                 
                 resultado = self.processar_email(mail, email_id)
                 
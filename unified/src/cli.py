@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -63,6 +64,11 @@ def cmd_run(args: argparse.Namespace) -> int:
     logger = logging.getLogger(__name__)
     logger.info(f"Starting pipeline for client: {args.client}")
 
+    if args.offline:
+        # API loaders read only from the on-disk HTTP cache
+        os.environ["HTTP_OFFLINE"] = "1"
+        logger.info("Offline mode: API responses served from the HTTP cache only")
+
     # Initialize engine
     engine = PipelineEngine(config_dir=config_dir, output_dir=output_dir)
     register_processors(engine)
@@ -217,6 +223,11 @@ Examples:
         default=None,
         help="Log file path (optional)",
     )
+    run_parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve API responses only from the on-disk HTTP cache",
+    )
     run_parser.set_defaults(func=cmd_run)
 
     # List command
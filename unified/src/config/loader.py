@@ -89,6 +89,26 @@ class ConfigLoader:
         'comparacao': {
             'legacy_dir': ''
         },
+        # Repasse em memória entre etapas executadas no mesmo processo
+        'artifacts': {
+            'in_memory': True,
+            # Compacta os ZIPs em thread de fundo (concluída ao fim do pipeline).
+            # Desligado: leituras de disco logo após salvar_zip veriam o ZIP ausente
+            'background_write': False,
+            # Prefixos de ZIPs intermediários que não precisam ir para o disco
+            'skip_write': [],
+            # Cópia colunar das bases tratadas ao lado do ZIP: parquet, feather ou vazio
+            'columnar_sidecar': None,
+        },
+        # Compactação dos ZIPs exportados
+        'packaging': {
+            # 0 = sem compressão (store), 1-9 = nível do deflate, vazio = padrão do zlib
+            'compresslevel': None,
+            # Membros compactados em paralelo quando o ZIP tem mais de um CSV
+            'workers': 1,
+            # thread ou process
+            'executor': 'thread',
+        },
         'logging': {
             'level': 'INFO',
             'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -5,6 +5,7 @@ Contains base classes, schemas, configuration, and pipeline engine.
 from .schemas import (
     ClientConfig,
     ExportConfig,
+    KeyCodeType,
     KeyConfig,
     KeyGeneratorType,
     LoaderConfig,
@@ -26,6 +27,8 @@ from .base import (
     BaseProcessor,
     BaseKeyGenerator,
     BaseClientExtension,
+    ValidationFrame,
+    ValidationMask,
     ValidationResult,
     SplitResult,
     LoaderResult,
@@ -43,6 +46,7 @@ from .keys import (
     ColumnKeyGenerator,
     CustomKeyGenerator,
     create_key_generator,
+    encode_keys,
     register_key_generator,
 )
 
@@ -57,6 +61,7 @@ __all__ = [
     # Schemas
     "ClientConfig",
     "ExportConfig",
+    "KeyCodeType",
     "KeyConfig",
     "KeyGeneratorType",
     "LoaderConfig",
@@ -76,6 +81,8 @@ __all__ = [
     "BaseProcessor",
     "BaseKeyGenerator",
     "BaseClientExtension",
+    "ValidationFrame",
+    "ValidationMask",
     "ValidationResult",
     "SplitResult",
     "LoaderResult",
@@ -89,6 +96,7 @@ __all__ = [
     "ColumnKeyGenerator",
     "CustomKeyGenerator",
     "create_key_generator",
+    "encode_keys",
     "register_key_generator",
     # Engine
     "PipelineEngine",
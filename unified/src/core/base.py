@@ -5,6 +5,7 @@ All components inherit from these abstract base classes.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -31,10 +32,73 @@ class ValidationResult:
         return len(self.invalid)
 
 
+@dataclass
+class ValidationMask:
+    """Rows a validator keeps, as a boolean mask over the frame it was given.
+
+    ``keep=None`` keeps every row (e.g. the validated column is missing).
+    """
+    keep: pd.Series | None
+    errors: list[str]
+
+
+class ValidationFrame:
+    """A frame under validation, with normalized columns shared by validators.
+
+    Each column is normalized once (``astype(str)``, ``strip``, ``upper``,
+    ``to_datetime``) however many validators read it. ``alive`` marks the
+    rows still valid when a validator runs, so its error counts only cover
+    rows it actually excludes.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.alive: pd.Series | None = None
+        self._cache: dict[tuple[str, Any], pd.Series] = {}
+
+    def _cached(self, kind: str, column: Any, build) -> pd.Series:
+        key = (kind, column)
+        series = self._cache.get(key)
+        if series is None:
+            series = self._cache[key] = build()
+        return series
+
+    def text(self, column: Any) -> pd.Series:
+        """``df[column].astype(str)``."""
+        return self._cached("text", column, lambda: self.df[column].astype(str))
+
+    def stripped(self, column: Any) -> pd.Series:
+        """``df[column].astype(str).str.strip()``."""
+        return self._cached("stripped", column, lambda: self.text(column).str.strip())
+
+    def upper(self, column: Any) -> pd.Series:
+        """``df[column].astype(str).str.strip().str.upper()``."""
+        return self._cached("upper", column, lambda: self.stripped(column).str.upper())
+
+    def dates(self, column: Any) -> pd.Series:
+        """``pd.to_datetime(df[column], errors="coerce", dayfirst=True)``."""
+        return self._cached(
+            "dates", column, lambda: pd.to_datetime(self.df[column], errors="coerce", dayfirst=True)
+        )
+
+    def count(self, mask: pd.Series) -> int:
+        """Rows in ``mask`` that are still alive."""
+        if self.alive is not None:
+            mask = mask & self.alive
+        return int(mask.sum())
+
+    def any(self, mask: pd.Series) -> bool:
+        return self.count(mask) > 0
+
+
 @dataclass
 class SplitResult:
-    """Result of a split operation."""
-    splits: dict[str, pd.DataFrame]
+    """Result of a split operation.
+
+    ``splits`` may be lazy (e.g. ``LazySplits``): a group's frame is only
+    built when it is looked up.
+    """
+    splits: Mapping[str, pd.DataFrame]
 
     def get(self, name: str, default: pd.DataFrame | None = None) -> pd.DataFrame:
         return self.splits.get(name, default or pd.DataFrame())
@@ -74,6 +138,25 @@ class BaseValidator(ABC):
         """Validate the dataframe and return valid/invalid splits."""
         pass
 
+    def validate_mask(self, frame: ValidationFrame) -> ValidationMask | None:
+        """Mask of the rows to keep, without copying the frame.
+
+        Row-wise validators implement this so a validation plan can combine
+        them in one pass; None means the validator rewrites the frame and
+        only ``validate`` applies.
+        """
+        return None
+
+    def split(self, df: pd.DataFrame, result: ValidationMask) -> ValidationResult:
+        """Materialize the valid/invalid frames of a mask."""
+        if result.keep is None:
+            return ValidationResult(valid=df, invalid=pd.DataFrame(), errors=result.errors)
+        return ValidationResult(
+            valid=df[result.keep].copy(),
+            invalid=df[~result.keep].copy(),
+            errors=result.errors,
+        )
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -12,6 +12,7 @@ import yaml
 from .schemas import (
     ClientConfig,
     ExportConfig,
+    KeyCodeType,
     KeyConfig,
     KeyGeneratorType,
     LoaderConfig,
@@ -88,7 +89,7 @@ class ConfigLoader:
         if not data:
             return None
 
-        return SourceConfig(
+        source = SourceConfig(
             loader=self._parse_loader(data.get("loader", {})),
             key=self._parse_key(data.get("key", {})),
             columns=data.get("columns", {}),
@@ -97,6 +98,8 @@ class ConfigLoader:
             splitters=self._parse_splitters(data.get("splitters", [])),
             export=self._parse_export(data.get("export")),
         )
+        source.loader.projection = source.referenced_columns()
+        return source
 
     def _parse_loader(self, data: dict[str, Any]) -> LoaderConfig:
         """Parse loader configuration."""
@@ -119,12 +122,22 @@ class ConfigLoader:
         except ValueError:
             raise ConfigError(f"Unknown key type: {key_type}")
 
+        code_type = data.get("code")
+        code_enum = None
+        if code_type:
+            try:
+                code_enum = KeyCodeType(code_type)
+            except ValueError:
+                raise ConfigError(f"Unknown key code type: {code_type}")
+
         return KeyConfig(
             type=key_enum,
             components=data.get("components", []),
             separator=data.get("separator", "-"),
             column=data.get("column"),
             output_column=data.get("output_column", "CHAVE"),
+            code=code_enum,
+            code_column=data.get("code_column"),
         )
 
     def _parse_validators(self, data: list[dict[str, Any]]) -> list[ValidatorConfig]:
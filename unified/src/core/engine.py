@@ -18,7 +18,7 @@ from .keys import create_key_generator
 from .schemas import ClientConfig, ProcessorType
 
 from ..loaders import create_loader
-from ..validators import create_validator
+from ..validators import ValidationPlan
 from ..splitters import create_splitter
 
 
@@ -280,24 +280,22 @@ class PipelineEngine:
         if not config.client_source or context.client_data.empty:
             return
 
-        for validator_config in config.client_source.validators:
-            if not validator_config.enabled:
-                continue
-
-            validator = create_validator(validator_config)
-            result = validator.validate(context.client_data)
+        # Um único passe: cada validador contribui uma máscara sobre o frame original
+        plan = ValidationPlan.from_configs(config.client_source.validators)
+        result = plan.run(context.client_data)
 
+        for step in result.steps:
             # Log errors
-            for error in result.errors:
-                logger.warning(f"Validator {validator.name}: {error}")
-
-            # Keep only valid records (could be configurable)
-            context.client_data = result.valid
+            for error in step.errors:
+                logger.warning(f"Validator {step.name}: {error}")
             logger.info(
-                f"Validator {validator.name}: {result.total_valid} valid, "
-                f"{result.total_invalid} invalid"
+                f"Validator {step.name}: {step.valid} valid, "
+                f"{step.invalid} invalid"
             )
 
+        # Keep only valid records (could be configurable)
+        context.client_data = result.valid
+
     def _run_processors(
         self, context: PipelineContext, extension: BaseClientExtension | None
     ) -> None:
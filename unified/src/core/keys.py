@@ -4,13 +4,62 @@ Different strategies for generating unique identifiers.
 """
 from __future__ import annotations
 
-import re
 from typing import Callable
 
+import numpy as np
 import pandas as pd
 
 from .base import BaseKeyGenerator
-from .schemas import KeyConfig, KeyGeneratorType
+from .schemas import KeyCodeType, KeyConfig, KeyGeneratorType
+
+
+# Same character class the row-wise generator used with re.sub
+_NON_WORD_PATTERN = r"[^\w]"
+
+
+def normalize_key_component(values: pd.Series) -> pd.Series:
+    """
+    Normalize a whole key component column at once.
+
+    Missing values become empty strings, non-word characters are removed
+    and the result is upper-cased.
+    """
+    # object dtype keeps Python's Unicode-aware \w; the pyarrow string
+    # backend would treat accented letters as non-word characters.
+    text = values.astype(str).where(values.notna(), "").astype(object)
+    return text.str.replace(_NON_WORD_PATTERN, "", regex=True).str.upper()
+
+
+def encode_keys(keys: pd.Series, code: KeyCodeType | str) -> pd.Series:
+    """
+    Encode a key column into a compact numeric representation.
+
+    Args:
+        keys: Readable key column (e.g. CHAVE)
+        code: "hash" for a stable 64-bit hash, comparable across datasets,
+            or "int" for dense integer codes, valid only within this frame
+
+    Returns:
+        Numeric series aligned with ``keys``
+    """
+    code = KeyCodeType(code)
+    values = keys.to_numpy(dtype=object)
+
+    if code is KeyCodeType.HASH:
+        return pd.Series(pd.util.hash_array(values), index=keys.index, dtype="uint64")
+
+    codes, uniques = pd.factorize(values, sort=False)
+    dtype = np.int32 if len(uniques) < np.iinfo(np.int32).max else np.int64
+    return pd.Series(codes.astype(dtype), index=keys.index)
+
+
+def _add_key_code(df: pd.DataFrame, config: KeyConfig) -> pd.DataFrame:
+    """Append the configured compact key column next to the readable key."""
+    if config.code is None or config.output_column not in df.columns:
+        return df
+    code_column = config.code_column or f"{config.output_column}_{config.code.value.upper()}"
+    df[code_column] = encode_keys(df[config.output_column], config.code)
+    return df
 
 
 class CompositeKeyGenerator(BaseKeyGenerator):
@@ -38,18 +87,15 @@ class CompositeKeyGenerator(BaseKeyGenerator):
             df[self._output_column] = ""
             return df
 
-        # Generate composite key
-        def make_key(row: pd.Series) -> str:
-            parts = []
-            for col in existing:
-                value = str(row[col]) if pd.notna(row[col]) else ""
-                # Clean value: remove special chars, normalize
-                cleaned = re.sub(r"[^\w]", "", value).upper()
-                parts.append(cleaned)
-            return self.separator.join(parts)
-
-        df[self._output_column] = df.apply(make_key, axis=1)
-        return df
+        # Normalize each component column once, then concatenate whole columns
+        parts = [normalize_key_component(df[col]) for col in existing]
+        if len(parts) == 1:
+            keys = parts[0]
+        else:
+            keys = parts[0].str.cat(parts[1:], sep=self.separator)
+
+        df[self._output_column] = keys
+        return _add_key_code(df, self.config)
 
 
 class ColumnKeyGenerator(BaseKeyGenerator):
@@ -93,7 +139,7 @@ class ColumnKeyGenerator(BaseKeyGenerator):
                 .str.replace(r"[^\w-]", "", regex=True)
             )
 
-        return df
+        return _add_key_code(df, self.config)
 
 
 class CustomKeyGenerator(BaseKeyGenerator):
@@ -149,5 +195,7 @@ __all__ = [
     "ColumnKeyGenerator",
     "CustomKeyGenerator",
     "create_key_generator",
+    "encode_keys",
+    "normalize_key_component",
     "register_key_generator",
 ]
@@ -55,6 +55,12 @@ class KeyGeneratorType(str, Enum):
     CUSTOM = "custom"
 
 
+class KeyCodeType(str, Enum):
+    """Compact key encodings emitted next to the readable CHAVE."""
+    HASH = "hash"
+    INT = "int"
+
+
 @dataclass
 class KeyConfig:
     """Configuration for CHAVE (key) generation."""
@@ -63,6 +69,8 @@ class KeyConfig:
     separator: str = "-"
     column: str | None = None
     output_column: str = "CHAVE"
+    code: KeyCodeType | None = None
+    code_column: str | None = None
 
 
 @dataclass
@@ -93,6 +101,9 @@ class LoaderConfig:
     """Configuration for data loading."""
     type: LoaderType
     params: dict[str, Any] = field(default_factory=dict)
+    # Columns the owning source references (filled by the config loader);
+    # file loaders project to these when ``usecols: auto``
+    projection: list[str] = field(default_factory=list)
 
 
 @dataclass
@@ -125,6 +136,25 @@ class SourceConfig:
     splitters: list[SplitterConfig] = field(default_factory=list)
     export: ExportConfig | None = None
 
+    def referenced_columns(self) -> list[str]:
+        """Source columns used by the mapping, key, validators and splitters."""
+        names: list[str] = [*self.columns, *self.required_columns]
+        names += self.key.components
+        if self.key.column:
+            names.append(self.key.column)
+        for step in [*self.validators, *self.splitters]:
+            for param in _COLUMN_PARAMS:
+                value = step.params.get(param)
+                if isinstance(value, str):
+                    names.append(value)
+                elif isinstance(value, list):
+                    names.extend(str(item) for item in value)
+        return list(dict.fromkeys(str(name).strip().upper() for name in names))
+
+
+# Validator/splitter params that name columns of the source itself
+_COLUMN_PARAMS = ("column", "columns", "target_column", "date_column")
+
 
 @dataclass
 class PipelineConfig:
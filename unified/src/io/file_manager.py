@@ -15,6 +15,16 @@ from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
 
+from src.utils.artifacts import artifact_store
+from src.utils.io import (
+    open_zip_for_writing,
+    read_columnar_sidecar,
+    write_columnar_sidecar,
+    write_csv_member,
+    write_csv_members_parallel,
+    zip_options,
+)
+
 
 class FileManager:
     """Gerencia operações de entrada e saída de arquivos."""
@@ -29,6 +39,8 @@ class FileManager:
         self.encoding = global_cfg.get("encoding", "utf-8")
         self.csv_separator = global_cfg.get("csv_separator", ";")
         self.paths = self.config.get("paths", {})
+        # Nível de compressão e paralelismo dos ZIPs (seção packaging)
+        self.zip_options = zip_options(self.config)
 
     # ------------------------------------------------------------------
     def _validar_config(self) -> None:
@@ -109,12 +121,43 @@ class FileManager:
 
     # ------------------------------------------------------------------
     def ler_zip_csv(
-        self, arquivo_zip: Union[str, Path], nome_csv: Optional[str] = None
+        self,
+        arquivo_zip: Union[str, Path],
+        nome_csv: Optional[str] = None,
+        colunas: Optional[List[str]] = None,
+        tipado: bool = False,
     ) -> pd.DataFrame:
-        """Lê um CSV contido em um arquivo ZIP."""
+        """Lê um CSV contido em um arquivo ZIP.
+
+        ``colunas`` limita a leitura às colunas informadas que existirem.
+        Quando há sidecar colunar atualizado ao lado do ZIP, ele é usado; com
+        ``tipado`` as datas vindas da memória ou do sidecar chegam como
+        ``datetime64``.
+        """
+
+        em_memoria = artifact_store().get(
+            arquivo_zip, nome_csv, sep=self.csv_separator, columns=colunas, typed=tipado
+        )
+        if em_memoria is not None:
+            self.logger.debug(
+                "CSV reaproveitado da memória: %s (%s registros)",
+                arquivo_zip,
+                f"{len(em_memoria):,}",
+            )
+            return em_memoria
 
         zip_path = self.validar_arquivo_existe(arquivo_zip)
 
+        if nome_csv is None:
+            df = read_columnar_sidecar(zip_path, colunas, typed=tipado)
+            if df is not None:
+                self.logger.debug(
+                    "CSV carregado do sidecar colunar: %s (%s registros)",
+                    zip_path,
+                    f"{len(df):,}",
+                )
+                return df
+
         try:
             with zipfile.ZipFile(zip_path, "r") as zip_file:
                 csv_files = [
@@ -149,6 +192,7 @@ class FileManager:
                         sep=self.csv_separator,
                         encoding=self.encoding,
                         dtype=str,
+                        usecols=(lambda c: c in colunas) if colunas is not None else None,
                     )
 
             self.logger.debug(
@@ -164,15 +208,26 @@ class FileManager:
             raise ValueError(f"Erro ao ler ZIP {zip_path}: {exc}") from exc
 
     # ------------------------------------------------------------------
-    def ler_csv_ou_zip(self, arquivo: Union[str, Path]) -> pd.DataFrame:
+    def ler_csv_ou_zip(
+        self,
+        arquivo: Union[str, Path],
+        colunas: Optional[List[str]] = None,
+        tipado: bool = False,
+    ) -> pd.DataFrame:
         """Lê automaticamente arquivos CSV ou ZIP."""
 
-        path = self.validar_arquivo_existe(arquivo)
+        path = Path(arquivo)
         suffix = path.suffix.lower()
+        if suffix == ".zip" and artifact_store().members(path):
+            return self.ler_zip_csv(path, colunas=colunas, tipado=tipado)
+
+        path = self.validar_arquivo_existe(path)
 
         if suffix == ".zip":
-            return self.ler_zip_csv(path)
+            return self.ler_zip_csv(path, colunas=colunas, tipado=tipado)
         if suffix == ".csv":
+            if colunas is not None:
+                return self.ler_csv(path, usecols=lambda c: c in colunas)
             return self.ler_csv(path)
 
         raise ValueError(f"Formato de arquivo não suportado: {suffix}")
@@ -206,39 +261,70 @@ class FileManager:
     def salvar_zip(
         self, arquivos: Dict[str, Union[pd.DataFrame, Path, str]],
         arquivo_zip: Union[str, Path],
+        sidecar: bool = False,
     ) -> Path:
-        """Salva múltiplos arquivos em um ZIP."""
+        """Salva múltiplos arquivos em um ZIP.
+
+        Com ``sidecar=True`` (e ``artifacts.columnar_sidecar`` configurado), um
+        ZIP de um único DataFrame ganha também a cópia colunar ao lado.
+        """
 
         zip_path = Path(arquivo_zip)
         zip_path.parent.mkdir(parents=True, exist_ok=True)
-
-        try:
-            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
-                for nome_arquivo, conteudo in arquivos.items():
-                    if isinstance(conteudo, pd.DataFrame):
-                        csv_content = conteudo.to_csv(
-                            sep=self.csv_separator,
-                            index=False,
-                        ).encode(self.encoding)
-                        zip_file.writestr(nome_arquivo, csv_content)
-                    else:
-                        arquivo_path = Path(conteudo)
-                        if arquivo_path.exists():
-                            zip_file.write(arquivo_path, nome_arquivo)
-                        else:
-                            self.logger.warning(
-                                "Arquivo não encontrado para ZIP: %s",
-                                arquivo_path,
-                            )
-
-            self.logger.debug(
-                "ZIP criado: %s (%s arquivos)",
-                zip_path,
-                f"{len(arquivos):,}",
+        formato_sidecar = artifact_store().sidecar_format if sidecar else None
+
+        def _gravar(conteudos: Dict[str, Union[pd.DataFrame, Path, str]]) -> Path:
+            try:
+                paralelo = self.zip_options["workers"] > 1 and len(conteudos) > 1
+                if paralelo and all(isinstance(c, pd.DataFrame) for c in conteudos.values()):
+                    write_csv_members_parallel(
+                        zip_path,
+                        conteudos,
+                        self.encoding,
+                        self.zip_options["workers"],
+                        self.zip_options["executor"],
+                        self.zip_options["compresslevel"],
+                        sep=self.csv_separator,
+                    )
+                else:
+                    with open_zip_for_writing(zip_path, self.zip_options["compresslevel"]) as zip_file:
+                        for nome_arquivo, conteudo in conteudos.items():
+                            if isinstance(conteudo, pd.DataFrame):
+                                write_csv_member(
+                                    zip_file,
+                                    nome_arquivo,
+                                    conteudo,
+                                    self.encoding,
+                                    sep=self.csv_separator,
+                                )
+                            else:
+                                arquivo_path = Path(conteudo)
+                                if arquivo_path.exists():
+                                    zip_file.write(arquivo_path, nome_arquivo)
+                                else:
+                                    self.logger.warning(
+                                        "Arquivo não encontrado para ZIP: %s",
+                                        arquivo_path,
+                                    )
+
+                self.logger.debug(
+                    "ZIP criado: %s (%s arquivos)",
+                    zip_path,
+                    f"{len(conteudos):,}",
+                )
+                unico = next(iter(conteudos.values()), None)
+                if formato_sidecar and len(conteudos) == 1 and isinstance(unico, pd.DataFrame):
+                    write_columnar_sidecar(unico, zip_path, formato_sidecar)
+                return zip_path
+            except Exception as exc:  # pragma: no cover - reempacota exceções
+                raise ValueError(f"Erro ao criar ZIP {zip_path}: {exc}") from exc
+
+        # Só DataFrames podem ser servidos da memória às etapas seguintes
+        if arquivos and all(isinstance(c, pd.DataFrame) for c in arquivos.values()):
+            return artifact_store().publish(
+                zip_path, arquivos, _gravar, sep=self.csv_separator
             )
-            return zip_path
-        except Exception as exc:  # pragma: no cover - reempacota exceções
-            raise ValueError(f"Erro ao criar ZIP {zip_path}: {exc}") from exc
+        return _gravar(arquivos)
 
     # ------------------------------------------------------------------
     def listar_arquivos(
@@ -14,6 +14,9 @@ from typing import Dict, Any, Optional, Union, List
 import pandas as pd
 import logging
 
+from src.utils.artifacts import artifact_store
+from src.utils.io import remove_columnar_sidecars
+
 def clean_old_files(directory: Path, name_prefix: str, extension: str, keep: int = 1) -> None:
     """Remove arquivos antigos mantendo apenas os mais recentes por prefixo.
 
@@ -34,6 +37,7 @@ def clean_old_files(directory: Path, name_prefix: str, extension: str, keep: int
         for old in candidates[keep:]:
             try:
                 old.unlink()
+                remove_columnar_sidecars(old)
                 logger.debug(f"Removido arquivo antigo: {old}")
             except Exception:
                 logger.warning(f"Falha ao remover arquivo antigo: {old}")
@@ -186,7 +190,8 @@ class ExportacaoService:
     def exportar_zip(self, arquivos: Dict[str, Union[pd.DataFrame, Path]], 
                     nome_base: str,
                     subdir: Optional[str] = None,
-                    add_timestamp: Optional[bool] = None) -> Optional[Path]:
+                    add_timestamp: Optional[bool] = None,
+                    sidecar: bool = False) -> Optional[Path]:
         """Exporta múltiplos arquivos em ZIP.
         
         Args:
@@ -194,6 +199,7 @@ class ExportacaoService:
             nome_base: Nome base do arquivo ZIP
             subdir: Subdiretório opcional
             add_timestamp: Se deve adicionar timestamp (None usa config)
+            sidecar: Se deve gravar também a cópia colunar (bases tratadas)
             
         Returns:
             Path do arquivo ZIP exportado ou None se vazio
@@ -214,16 +220,21 @@ class ExportacaoService:
         
         # Exportar usando FileManager
         try:
-            path_exportado = self.file_manager.salvar_zip(arquivos, caminho_zip)
+            path_exportado = self.file_manager.salvar_zip(arquivos, caminho_zip, sidecar=sidecar)
+            # O entregável precisa existir no disco ao retornar, mesmo com
+            # gravação em segundo plano
+            artifact_store().wait(path_exportado)
             self.logger.debug(f"ZIP exportado: {path_exportado} ({len(arquivos)} arquivos)")
-            # Limpeza de arquivos antigos (se timestamp estiver ativo)
-            usar_timestamp = self.add_timestamp if add_timestamp is None else add_timestamp
-            if usar_timestamp and self.keep_latest_only:
-                clean_old_files(diretorio_saida, nome_base, '.zip', keep=1)
-            return path_exportado
         except Exception as e:
             self.logger.error(f"Erro ao exportar ZIP {nome_base}: {e}")
             raise
+
+        # Limpeza de arquivos antigos (se timestamp estiver ativo), só depois
+        # de gravado o novo: uma falha não apaga o entregável anterior
+        usar_timestamp = self.add_timestamp if add_timestamp is None else add_timestamp
+        if usar_timestamp and self.keep_latest_only:
+            clean_old_files(diretorio_saida, nome_base, '.zip', keep=1)
+        return path_exportado
     
     def exportar_com_configuracao(self, df: pd.DataFrame, 
                                  config_processador: Dict[str, Any],
@@ -1,17 +1,28 @@
 """
 API loader.
 Loads data from REST APIs (e.g., TOTVS).
+
+Paginated endpoints are fetched with up to ``concurrency`` page requests in
+flight over one keep-alive session; failed requests are retried with
+exponential backoff and jitter. Response bodies are decoded incrementally
+into column buffers, aborting above ``max_response_mb``.
+
+With a ``cache: {dir, ttl_seconds}`` param, responses are kept on disk:
+re-runs within the TTL skip the network, later ones revalidate with
+ETag/Last-Modified, and ``HTTP_OFFLINE=1`` serves only from the cache.
 """
 from __future__ import annotations
 
 import os
-import time
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING
 
 import pandas as pd
 import requests
 
 from ..core.base import BaseLoader, LoaderResult
+from ..utils.http_cache import cache_from_settings
+from ..utils.http_fetch import HTTPStats, cached_records, fetch_pages, get_records, make_session
+from ..utils.json_stream import ColumnBuffers, DecodeStats
 
 if TYPE_CHECKING:
     from ..core.schemas import ClientConfig, LoaderConfig
@@ -43,6 +54,8 @@ class APILoader(BaseLoader):
         params = self.params.get("query_params", {})
         body = self.params.get("body", {})
         timeout = self.params.get("timeout", 30)
+        # Memory ceiling per response body (None = unlimited)
+        max_response_mb = self.params.get("max_response_mb")
 
         # Pagination
         paginated = self.params.get("paginated", False)
@@ -51,10 +64,16 @@ class APILoader(BaseLoader):
         page_size = self.params.get("page_size", 100)
         data_key = self.params.get("data_key", "items")
         max_pages = self.params.get("max_pages", 100)
+        concurrency = int(self.params.get("concurrency", 4))
 
-        # Retry configuration
+        # Retry configuration (exponential backoff from retry_delay, capped at max_retry_delay)
         max_retries = self.params.get("max_retries", 3)
         retry_delay = self.params.get("retry_delay", 2)
+        max_retry_delay = self.params.get("max_retry_delay", 60)
+
+        # On-disk response cache (TTL per client YAML; offline = cache only)
+        client_name = self.client_config.name if self.client_config else "api"
+        cache = cache_from_settings(self.params.get("cache"), client_name)
 
         if not base_url:
             return LoaderResult(
@@ -78,9 +97,21 @@ class APILoader(BaseLoader):
         if auth_type == "basic" and username and password:
             auth = (username, password)
 
+        session = make_session(pool_size=concurrency if paginated else 1)
+        stats = HTTPStats()
+        decode_stats = DecodeStats()
+        retry = {
+            "max_retries": max_retries,
+            "retry_delay": retry_delay,
+            "max_delay": max_retry_delay,
+            "max_bytes": int(max_response_mb * 1e6) if max_response_mb else None,
+            "decode_stats": decode_stats,
+            "cache": cache,
+        }
         try:
             if paginated:
                 all_data = self._load_paginated(
+                    session=session,
                     url=url,
                     method=method,
                     headers=request_headers,
@@ -93,11 +124,13 @@ class APILoader(BaseLoader):
                     page_size=page_size,
                     data_key=data_key,
                     max_pages=max_pages,
-                    max_retries=max_retries,
-                    retry_delay=retry_delay,
+                    concurrency=concurrency,
+                    retry=retry,
+                    stats=stats,
                 )
             else:
                 all_data = self._load_single(
+                    session=session,
                     url=url,
                     method=method,
                     headers=request_headers,
@@ -106,18 +139,18 @@ class APILoader(BaseLoader):
                     auth=auth,
                     timeout=timeout,
                     data_key=data_key,
-                    max_retries=max_retries,
-                    retry_delay=retry_delay,
+                    retry=retry,
+                    stats=stats,
                 )
 
-            if not all_data:
+            if not len(all_data):
                 return LoaderResult(
                     data=pd.DataFrame(),
                     metadata={"error": "No data returned from API"},
                 )
 
             # Convert to DataFrame
-            df = pd.DataFrame(all_data)
+            df = all_data.to_frame()
 
             # Normalize column names
             df.columns = [str(c).strip().upper() for c in df.columns]
@@ -128,6 +161,16 @@ class APILoader(BaseLoader):
                     "rows": len(df),
                     "columns": list(df.columns),
                     "source": f"api:{url}",
+                    "pages": stats.pages,
+                    "requests": stats.requests,
+                    "retries": stats.retries,
+                    "cache_hits": stats.cache_hits,
+                    "not_modified": stats.not_modified,
+                    "elapsed_s": round(stats.elapsed, 3),
+                    "decoded_mb": round(decode_stats.bytes / 1e6, 3),
+                    "decode_mb_per_sec": round(decode_stats.bytes / 1e6 / stats.elapsed, 1)
+                    if stats.elapsed > 0
+                    else 0.0,
                 },
             )
 
@@ -136,9 +179,12 @@ class APILoader(BaseLoader):
                 data=pd.DataFrame(),
                 metadata={"error": f"API request failed: {e}"},
             )
+        finally:
+            session.close()
 
-    def _make_request(
+    def _fetch_records(
         self,
+        session: requests.Session,
         url: str,
         method: str,
         headers: dict,
@@ -146,64 +192,35 @@ class APILoader(BaseLoader):
         body: dict,
         auth: tuple | None,
         timeout: int,
-        max_retries: int,
-        retry_delay: int,
-    ) -> requests.Response:
-        """Make HTTP request with retry logic."""
-        last_error = None
-
-        for attempt in range(max_retries):
-            try:
-                if method == "GET":
-                    response = requests.get(
-                        url,
-                        headers=headers,
-                        params=params,
-                        auth=auth,
-                        timeout=timeout,
-                    )
-                elif method == "POST":
-                    response = requests.post(
-                        url,
-                        headers=headers,
-                        params=params,
-                        json=body,
-                        auth=auth,
-                        timeout=timeout,
-                    )
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-
-                response.raise_for_status()
-                return response
-
-            except requests.RequestException as e:
-                last_error = e
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay * (attempt + 1))
-
-        raise last_error
-
-    def _extract_data(self, response_json: Any, data_key: str) -> list[dict]:
-        """Extract data from API response."""
-        if data_key and isinstance(response_json, dict):
-            # Navigate nested keys (e.g., "data.items")
-            keys = data_key.split(".")
-            data = response_json
-            for key in keys:
-                if isinstance(data, dict) and key in data:
-                    data = data[key]
-                else:
-                    return []
-            return data if isinstance(data, list) else [data]
-        elif isinstance(response_json, list):
-            return response_json
-        elif isinstance(response_json, dict):
-            return [response_json]
-        return []
+        data_key: str,
+        retry: dict,
+        stats: HTTPStats | None = None,
+    ) -> ColumnBuffers:
+        """Make HTTP request with retry logic and decode its records.
+
+        Records are the response list, or the value under ``data_key``
+        (nested keys as "data.items") when the response is an object.
+        """
+        if method not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        return get_records(
+            session,
+            url,
+            method=method,
+            data_key=data_key,
+            headers=headers,
+            params=params,
+            json=body if method == "POST" else None,
+            auth=auth,
+            timeout=timeout,
+            stats=stats,
+            **retry,
+        )
 
     def _load_single(
         self,
+        session: requests.Session,
         url: str,
         method: str,
         headers: dict,
@@ -212,17 +229,19 @@ class APILoader(BaseLoader):
         auth: tuple | None,
         timeout: int,
         data_key: str,
-        max_retries: int,
-        retry_delay: int,
-    ) -> list[dict]:
+        retry: dict,
+        stats: HTTPStats,
+    ) -> ColumnBuffers:
         """Load data from single request."""
-        response = self._make_request(
-            url, method, headers, params, body, auth, timeout, max_retries, retry_delay
+        buffers = self._fetch_records(
+            session, url, method, headers, params, body, auth, timeout, data_key, retry, stats
         )
-        return self._extract_data(response.json(), data_key)
+        stats.pages, stats.rows = 1, len(buffers)
+        return buffers
 
     def _load_paginated(
         self,
+        session: requests.Session,
         url: str,
         method: str,
         headers: dict,
@@ -235,34 +254,52 @@ class APILoader(BaseLoader):
         page_size: int,
         data_key: str,
         max_pages: int,
-        max_retries: int,
-        retry_delay: int,
-    ) -> list[dict]:
-        """Load data from paginated API."""
-        all_data = []
-        page = 1
-
-        while page <= max_pages:
+        concurrency: int,
+        retry: dict,
+        stats: HTTPStats,
+    ) -> ColumnBuffers:
+        """Load data from paginated API.
+
+        Up to ``concurrency`` pages are requested ahead; they are assembled
+        in page order and the first page shorter than ``page_size`` is the
+        last one. Pages already in the response cache are read first, so a
+        cached re-run makes no request at all.
+        """
+
+        def page_params(page: int) -> dict:
             # Add pagination params
-            page_params = {**params, page_param: page, page_size_param: page_size}
+            return {**params, page_param: page, page_size_param: page_size}
 
-            response = self._make_request(
-                url, method, headers, page_params, body, auth, timeout, max_retries, retry_delay
+        def fetch_page(page: int) -> ColumnBuffers:
+            return self._fetch_records(
+                session, url, method, headers, page_params(page), body, auth, timeout, data_key, retry, stats
             )
 
-            data = self._extract_data(response.json(), data_key)
-            if not data:
-                break
-
-            all_data.extend(data)
+        cached_page = None
+        cache = retry.get("cache")
+        if cache is not None and method in ("GET", "POST"):
 
-            # Check if we got less than page_size (last page)
-            if len(data) < page_size:
-                break
-
-            page += 1
+            def cached_page(page: int) -> ColumnBuffers | None:
+                return cached_records(
+                    cache,
+                    url,
+                    data_key=data_key,
+                    max_bytes=retry.get("max_bytes"),
+                    decode_stats=retry.get("decode_stats"),
+                    method=method,
+                    params=page_params(page),
+                    json=body if method == "POST" else None,
+                    stats=stats,
+                )
 
-        return all_data
+        return fetch_pages(
+            fetch_page,
+            page_size=page_size,
+            max_pages=max_pages,
+            concurrency=concurrency,
+            stats=stats,
+            cached_page=cached_page,
+        )
 
 
 def create_api_loader(config: LoaderConfig, client_config: ClientConfig) -> APILoader:
@@ -0,0 +1,183 @@
+"""
+Decrypted archive cache.
+Keeps the decrypted data file of password-protected ZIPs on local disk,
+content-addressed by the archive's SHA-256, together with the extraction
+method that worked. A (path, size, mtime) stamp avoids re-hashing an
+unchanged archive. Entries are evicted least-recently-used first once the
+cache exceeds its size budget, and dropped once older than ``max_age``.
+
+The payloads are the PLAINTEXT of the encrypted archives: the cache is
+opt-in (``cache_dir`` in the loader params), its directory is created
+``0700`` and every payload ``0600``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+_INDEX_FILE = "index.json"
+_HASH_BLOCK = 1 << 20
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+DEFAULT_MAX_AGE = 24 * 3600
+
+# Serializes index updates between loaders of the same process
+_LOCK = threading.Lock()
+
+
+class DecryptedArchiveCache:
+    """Local store of decrypted archive payloads keyed by content hash."""
+
+    def __init__(
+        self,
+        directory: Path | str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float | None = DEFAULT_MAX_AGE,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = int(max_bytes)
+        # Seconds a payload is kept after extraction (None: no limit)
+        self.max_age = max_age
+        # Decrypted data is sensitive: keep the cache private to the user
+        # (the mkdir mode is masked by the umask and ignored if it exists)
+        self.directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+        os.chmod(self.directory, 0o700)
+
+    # ------------------------------------------------------------------ #
+    # Index
+    # ------------------------------------------------------------------ #
+
+    def _read_index(self) -> dict[str, Any]:
+        try:
+            with open(self.directory / _INDEX_FILE, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        index.setdefault("stamps", {})
+        index.setdefault("entries", {})
+        return index
+
+    def _write_index(self, index: dict[str, Any]) -> None:
+        tmp_path = self.directory / f"{_INDEX_FILE}.{uuid.uuid4().hex}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, self.directory / _INDEX_FILE)
+
+    # ------------------------------------------------------------------ #
+    # Lookup
+    # ------------------------------------------------------------------ #
+
+    def digest(self, archive: Path) -> str:
+        """SHA-256 of ``archive``, reused while its size and mtime are unchanged."""
+        archive = Path(archive).resolve()
+        stat = archive.stat()
+        stamp = [stat.st_size, stat.st_mtime_ns]
+
+        with _LOCK:
+            known = self._read_index()["stamps"].get(str(archive))
+        if known and known[:2] == stamp:
+            return known[2]
+
+        sha = hashlib.sha256()
+        with open(archive, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                sha.update(block)
+        digest = sha.hexdigest()
+
+        with _LOCK:
+            index = self._read_index()
+            index["stamps"][str(archive)] = [*stamp, digest]
+            self._write_index(index)
+        return digest
+
+    def method(self, digest: str) -> str | None:
+        """Extraction method that last succeeded for this archive."""
+        with _LOCK:
+            entry = self._read_index()["entries"].get(digest)
+        return entry.get("method") if entry else None
+
+    def lookup(self, digest: str) -> Path | None:
+        """Cached payload for ``digest`` (marks it as recently used)."""
+        with _LOCK:
+            index = self._read_index()
+            entry = index["entries"].get(digest)
+            if not entry or not entry.get("file"):
+                return None
+            payload = self.directory / digest / entry["file"]
+            if not payload.exists() or self._expired(entry):
+                self._drop(digest, entry)
+                self._write_index(index)
+                return None
+            entry["last_used"] = time.time()
+            self._write_index(index)
+        return payload
+
+    # ------------------------------------------------------------------ #
+    # Store
+    # ------------------------------------------------------------------ #
+
+    def staging_dir(self) -> Path:
+        """Fresh private directory inside the cache to extract into."""
+        path = self.directory / f".staging-{uuid.uuid4().hex}"
+        path.mkdir(mode=0o700)
+        return path
+
+    def store(self, digest: str, extracted: Path, method: str) -> Path:
+        """Move ``extracted`` into the entry for ``digest`` and record ``method``."""
+        entry_dir = self.directory / digest
+        size = extracted.stat().st_size
+
+        with _LOCK:
+            if entry_dir.exists():
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            entry_dir.mkdir(mode=0o700)
+            payload = entry_dir / extracted.name
+            os.replace(extracted, payload)
+            os.chmod(payload, 0o600)
+
+            index = self._read_index()
+            index["entries"][digest] = {
+                "method": method,
+                "file": payload.name,
+                "bytes": size,
+                "stored_at": time.time(),
+                "last_used": time.time(),
+            }
+            self._evict(index, keep=digest)
+            self._write_index(index)
+        return payload
+
+    def _expired(self, entry: dict[str, Any]) -> bool:
+        return self.max_age is not None and time.time() - entry.get("stored_at", 0) > self.max_age
+
+    def _drop(self, digest: str, entry: dict[str, Any]) -> None:
+        shutil.rmtree(self.directory / digest, ignore_errors=True)
+        entry["file"] = None
+        entry["bytes"] = 0
+
+    def _evict(self, index: dict[str, Any], keep: str) -> None:
+        """Drop expired payloads, then least-recently-used ones until the cache fits ``max_bytes``.
+
+        Method hints survive eviction, so a re-extraction still starts with
+        the method that worked.
+        """
+        entries = index["entries"]
+        for digest, entry in entries.items():
+            if digest != keep and entry.get("file") and self._expired(entry):
+                self._drop(digest, entry)
+        total = sum(entry.get("bytes", 0) for entry in entries.values())
+        for digest, entry in sorted(entries.items(), key=lambda item: item[1].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            if digest == keep or not entry.get("file"):
+                continue
+            total -= entry.get("bytes", 0)
+            self._drop(digest, entry)
@@ -1,6 +1,11 @@
 """
 Email loader.
 Loads data from email attachments via IMAP.
+
+Only the header fields, the BODYSTRUCTURE and the matching attachment part
+of the latest message are fetched. Attachments are kept in a local cache
+keyed by (mailbox, UIDVALIDITY, UID, part), so re-runs do not download
+them again.
 """
 from __future__ import annotations
 
@@ -17,6 +22,16 @@ from typing import TYPE_CHECKING
 import pandas as pd
 
 from ..core.base import BaseLoader, LoaderResult
+from ..utils.imap_cache import (
+    DEFAULT_KEEP,
+    AttachmentCache,
+    AttachmentPart,
+    fetch_attachment,
+    fetch_bodystructure,
+    fetch_headers,
+    search_uids,
+    select_mailbox,
+)
 
 if TYPE_CHECKING:
     from ..core.schemas import ClientConfig, LoaderConfig
@@ -51,53 +66,58 @@ class EmailLoader(BaseLoader):
 
         try:
             # Connect to IMAP server
-            mail = imaplib.IMAP4_SSL(server, port)
-            mail.login(email_addr, password)
-            mail.select(folder)
-
-            # Build search criteria
-            search_criteria = self._build_search_criteria(
-                subject_filter, sender_filter, days_back
-            )
-
-            # Search for messages
-            status, message_ids = mail.search(None, search_criteria)
-            if status != "OK" or not message_ids[0]:
-                mail.logout()
-                return LoaderResult(
-                    data=pd.DataFrame(),
-                    metadata={"error": "No matching emails found"},
+            if self.params.get("ssl", True):
+                mail = imaplib.IMAP4_SSL(server, port)
+            else:
+                mail = imaplib.IMAP4(server, port)
+            try:
+                mail.login(email_addr, password)
+                uidvalidity = select_mailbox(mail, folder)
+
+                # Build search criteria
+                search_criteria = self._build_search_criteria(
+                    subject_filter, sender_filter, days_back
                 )
 
-            # Get the most recent message
-            ids = message_ids[0].split()
-            latest_id = ids[-1]
-
-            # Fetch message
-            status, msg_data = mail.fetch(latest_id, "(RFC822)")
-            if status != "OK":
-                mail.logout()
-                return LoaderResult(
-                    data=pd.DataFrame(),
-                    metadata={"error": "Failed to fetch email"},
-                )
-
-            # Parse email
-            msg = email.message_from_bytes(msg_data[0][1])
-            mail.logout()
+                # Search for messages (UIDs are stable across sessions)
+                uids = search_uids(mail, search_criteria)
+                if not uids:
+                    return LoaderResult(
+                        data=pd.DataFrame(),
+                        metadata={"error": "No matching emails found"},
+                    )
 
-            # Extract attachment
-            with TemporaryDirectory() as temp_dir:
-                attachment_path = self._extract_attachment(
-                    msg, Path(temp_dir), attachment_pattern
+                # Get the most recent message: headers and MIME tree only
+                latest_uid = uids[-1]
+                msg = fetch_headers(mail, latest_uid)
+                part = self._select_attachment(
+                    fetch_bodystructure(mail, latest_uid), attachment_pattern
                 )
-
-                if not attachment_path:
+                if part is None:
                     return LoaderResult(
                         data=pd.DataFrame(),
                         metadata={"error": "No matching attachment found"},
                     )
 
+                # Attachment part only, served from the local cache when already downloaded
+                payload, cached = fetch_attachment(
+                    mail,
+                    latest_uid,
+                    part,
+                    mailbox=folder,
+                    uidvalidity=uidvalidity,
+                    cache=self._attachment_cache(),
+                )
+            finally:
+                try:
+                    mail.logout()
+                except Exception:
+                    pass
+
+            with TemporaryDirectory() as temp_dir:
+                attachment_path = Path(temp_dir) / Path(part.filename).name
+                attachment_path.write_bytes(payload)
+
                 # Load data from attachment
                 df = self._load_attachment(attachment_path)
 
@@ -111,6 +131,10 @@ class EmailLoader(BaseLoader):
                         "columns": list(df.columns),
                         "source": f"email:{self._decode_subject(msg)}",
                         "attachment": attachment_path.name,
+                        "uid": latest_uid,
+                        "uidvalidity": uidvalidity,
+                        "attachment_cached": cached,
+                        "attachment_bytes": len(payload),
                     },
                 )
 
@@ -120,6 +144,18 @@ class EmailLoader(BaseLoader):
                 metadata={"error": f"Email loading failed: {e}"},
             )
 
+    def _attachment_cache(self) -> AttachmentCache | None:
+        """Local attachment cache (``cache_dir``; ``use_cache: false`` disables it).
+
+        ``cache_keep`` messages (UIDs) are kept per mailbox.
+        """
+        if not self.params.get("use_cache", True):
+            return None
+        cache_dir = Path(self.params.get("cache_dir", "data/cache/imap"))
+        if not cache_dir.is_absolute():
+            cache_dir = Path(__file__).resolve().parents[2] / cache_dir
+        return AttachmentCache(cache_dir, keep=int(self.params.get("cache_keep", DEFAULT_KEEP)))
+
     def _build_search_criteria(
         self, subject: str, sender: str, days_back: int
     ) -> str:
@@ -147,35 +183,15 @@ class EmailLoader(BaseLoader):
             return str(text)
         return subject
 
-    def _extract_attachment(
-        self, msg: email.message.Message, temp_dir: Path, pattern: str
-    ) -> Path | None:
-        """Extract matching attachment from email."""
+    def _select_attachment(
+        self, parts: list[AttachmentPart], pattern: str
+    ) -> AttachmentPart | None:
+        """First attachment part whose filename matches ``pattern``."""
         import fnmatch
 
-        for part in msg.walk():
-            if part.get_content_maintype() == "multipart":
-                continue
-
-            filename = part.get_filename()
-            if not filename:
-                continue
-
-            # Decode filename
-            decoded = decode_header(filename)
-            if decoded:
-                text, encoding = decoded[0]
-                if isinstance(text, bytes):
-                    filename = text.decode(encoding or "utf-8", errors="replace")
-                else:
-                    filename = str(text)
-
-            # Check if filename matches pattern
-            if fnmatch.fnmatch(filename.lower(), pattern.lower()):
-                filepath = temp_dir / filename
-                with open(filepath, "wb") as f:
-                    f.write(part.get_payload(decode=True))
-                return filepath
+        for part in parts:
+            if part.filename and fnmatch.fnmatch(part.filename.lower(), pattern.lower()):
+                return part
 
         return None
 
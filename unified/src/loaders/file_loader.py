@@ -2,23 +2,49 @@
 File loader.
 Loads data from local files (CSV, Excel, ZIP).
 Supports password-protected ZIP files (7-Zip/AES encryption).
+
+Optional params push work down into the reader:
+
+- ``usecols``: list of columns to read, or ``auto`` for the columns the
+  source config references (mapping, required columns, key, validators).
+- ``dtypes``: per-column dtype, e.g. ``category`` or ``date``/``datetime``
+  (parsed with ``date_format``/``dayfirst``); other columns stay ``str``.
+- ``engine``: ``c`` (default), ``python`` or ``pyarrow``.
+- ``chunksize``: parse in chunks of this many rows; see
+  :meth:`FileLoader.iter_chunks` to consume them without concatenating.
+- ``cache_dir``/``cache_max_mb``/``cache_max_age_hours``: keep decrypted
+  password-protected archives in a local cache (see :mod:`.archive_cache`).
+  Off unless ``cache_dir`` is set: the cache holds the decrypted plaintext.
 """
 from __future__ import annotations
 
 import io
+import shutil
 import subprocess
 import tempfile
 import zipfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, ContextManager, Iterator, TypeVar
 
 import pandas as pd
 
 from ..core.base import BaseLoader, LoaderResult
+from .archive_cache import DEFAULT_MAX_AGE, DEFAULT_MAX_BYTES, DecryptedArchiveCache
 
 if TYPE_CHECKING:
     from ..core.schemas import ClientConfig, LoaderConfig
 
+# Rows per chunk for ``iter_chunks`` when ``chunksize`` is not configured
+_DEFAULT_CHUNKSIZE = 200_000
+
+# Copy/read buffer for decrypted archive streams
+_COPY_BLOCK = 1 << 20
+
+_DATA_SUFFIXES = (".csv", ".xlsx", ".xls")
+
+_T = TypeVar("_T")
+
 
 class FileLoader(BaseLoader):
     """Loads data from local files, including password-protected ZIPs."""
@@ -27,13 +53,11 @@ class FileLoader(BaseLoader):
     def name(self) -> str:
         return "file"
 
-    def load(self) -> LoaderResult:
+    def _resolve_path(self) -> tuple[Path | None, str | None]:
+        """Resolve the ``path`` param (glob patterns pick the newest match)."""
         file_path = self.params.get("path")
         if not file_path:
-            return LoaderResult(
-                data=pd.DataFrame(),
-                metadata={"error": "No file path specified"},
-            )
+            return None, "No file path specified"
 
         path = Path(file_path)
 
@@ -47,15 +71,18 @@ class FileLoader(BaseLoader):
                     # Get most recent file
                     path = max(matches, key=lambda p: p.stat().st_mtime)
                 else:
-                    return LoaderResult(
-                        data=pd.DataFrame(),
-                        metadata={"error": f"No files matching pattern: {file_path}"},
-                    )
+                    return None, f"No files matching pattern: {file_path}"
 
         if not path.exists():
+            return None, f"File not found: {path}"
+        return path, None
+
+    def load(self) -> LoaderResult:
+        path, error = self._resolve_path()
+        if path is None:
             return LoaderResult(
                 data=pd.DataFrame(),
-                metadata={"error": f"File not found: {path}"},
+                metadata={"error": error},
             )
 
         # Load based on file type
@@ -69,23 +96,16 @@ class FileLoader(BaseLoader):
             if suffix == ".zip":
                 df = self._load_from_zip(path, encoding, separator, sheet_name, password)
             elif suffix == ".csv":
-                df = pd.read_csv(
-                    path,
-                    sep=separator,
-                    encoding=encoding,
-                    dtype=str,
-                    low_memory=False,
-                )
+                df = self._read_csv(path, encoding, separator)
             elif suffix in (".xlsx", ".xls"):
-                df = pd.read_excel(path, sheet_name=sheet_name, dtype=str)
+                df = self._read_excel(path, sheet_name)
             else:
                 return LoaderResult(
                     data=pd.DataFrame(),
                     metadata={"error": f"Unsupported file type: {suffix}"},
                 )
 
-            # Normalize column names
-            df.columns = [str(c).strip().upper() for c in df.columns]
+            df = self._finalize(df)
 
             return LoaderResult(
                 data=df,
@@ -103,6 +123,216 @@ class FileLoader(BaseLoader):
                 metadata={"error": f"Failed to load file: {e}"},
             )
 
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Yield the source as frames of at most ``chunksize`` rows.
+
+        Plain CSVs and unencrypted ZIPs are parsed incrementally; Excel and
+        password-protected archives are loaded whole and then sliced.
+        Column names, projection and dtypes are applied per chunk, so
+        ``category`` columns may carry different categories per chunk.
+        """
+        path, error = self._resolve_path()
+        if path is None:
+            raise ValueError(error)
+
+        suffix = path.suffix.lower()
+        encoding = self.params.get("encoding", "utf-8-sig")
+        separator = self.params.get("separator", ";")
+        chunksize = self._chunksize() or _DEFAULT_CHUNKSIZE
+
+        if suffix == ".csv":
+            for chunk in self._iter_csv(path, encoding, separator, chunksize):
+                yield self._finalize(chunk)
+            return
+
+        if suffix == ".zip" and not self.params.get("password"):
+            with zipfile.ZipFile(path, "r") as zf:
+                member = next(
+                    (name for name in zf.namelist() if name.lower().endswith(".csv")), None
+                )
+                if member is not None:
+                    with zf.open(member) as f:
+                        for chunk in self._iter_csv(f, encoding, separator, chunksize):
+                            yield self._finalize(chunk)
+                    return
+
+        result = self.load()
+        if "error" in result.metadata:
+            raise ValueError(result.metadata["error"])
+        for start in range(0, len(result.data), chunksize):
+            yield result.data.iloc[start:start + chunksize]
+
+    # ------------------------------------------------------------------ #
+    # Reader options
+    # ------------------------------------------------------------------ #
+
+    def _chunksize(self) -> int | None:
+        chunksize = self.params.get("chunksize")
+        return int(chunksize) if chunksize else None
+
+    def _engine(self) -> str:
+        return str(self.params.get("engine", "c")).lower()
+
+    def _wanted_columns(self) -> set[str] | None:
+        """Normalized names from ``usecols`` (``auto`` = source projection)."""
+        usecols = self.params.get("usecols")
+        if not usecols:
+            return None
+        names = self.config.projection if usecols == "auto" else usecols
+        return {str(name).strip().upper() for name in names} or None
+
+    def _peek_header(self, source: Any, encoding: str, separator: str) -> tuple[list[str], Any]:
+        """Column names of a CSV source, plus a source positioned at its start.
+
+        Pipes (e.g. an extractor's stdout) cannot seek back, so their first
+        line is read and stitched back in front of the rest of the stream.
+        """
+        if isinstance(source, (str, Path)) or source.seekable():
+            header = pd.read_csv(source, sep=separator, encoding=encoding, nrows=0).columns
+            if not isinstance(source, (str, Path)):
+                source.seek(0)
+            return list(header), source
+
+        first_line = source.readline()
+        header = pd.read_csv(io.BytesIO(first_line), sep=separator, encoding=encoding, nrows=0).columns
+        return list(header), io.BufferedReader(_PrefixedStream(first_line, source), _COPY_BLOCK)
+
+    def _usecols(self, header: list[str] | None) -> Callable | list[str] | None:
+        """``usecols`` for the reader, matching names as ``_finalize`` normalizes them."""
+        wanted = self._wanted_columns()
+        if wanted is None:
+            return None
+        if header is None:
+            return lambda column: str(column).strip().upper() in wanted
+        # The pyarrow engine only accepts explicit names
+        return [column for column in header if str(column).strip().upper() in wanted]
+
+    def _read_csv(self, source: Any, encoding: str, separator: str) -> pd.DataFrame:
+        """Read a CSV as strings, honouring ``usecols``, ``engine`` and ``chunksize``."""
+        chunksize = self._chunksize()
+        if chunksize:
+            chunks = list(self._iter_csv(source, encoding, separator, chunksize))
+            return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+        engine = self._engine()
+        if engine == "pyarrow":
+            # pandas 2 turns nulls into 'None' strings with dtype=str on this
+            # engine, so read through pyarrow.csv like the chunked path does
+            header, source = self._peek_header(source, encoding, separator)
+            columns = self._usecols(header) or header
+            chunks = list(self._iter_arrow_batches(source, encoding, separator, columns))
+            return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+        options: dict[str, Any] = {"engine": engine}
+        if engine == "c":
+            options["low_memory"] = False
+        return pd.read_csv(
+            source,
+            sep=separator,
+            encoding=encoding,
+            dtype=str,
+            usecols=self._usecols(None),
+            **options,
+        )
+
+    def _iter_csv(
+        self, source: Any, encoding: str, separator: str, chunksize: int
+    ) -> Iterator[pd.DataFrame]:
+        """Parse a CSV incrementally into string frames of at most ``chunksize`` rows."""
+        header, source = self._peek_header(source, encoding, separator)
+        if self._engine() == "pyarrow":
+            columns = self._usecols(header) or header
+            yield from self._iter_csv_arrow(source, encoding, separator, chunksize, columns)
+            return
+
+        usecols = self._usecols(None)
+        with pd.read_csv(
+            source,
+            sep=separator,
+            encoding=encoding,
+            dtype=str,
+            usecols=usecols,
+            engine=self._engine(),
+            chunksize=chunksize,
+        ) as reader:
+            yielded = False
+            for chunk in reader:
+                yielded = True
+                yield chunk
+        if not yielded:
+            # Header-only file: keep the columns
+            columns = [column for column in header if usecols is None or usecols(column)]
+            yield pd.DataFrame({column: pd.Series(dtype=str) for column in columns})
+
+    def _iter_csv_arrow(
+        self,
+        source: Any,
+        encoding: str,
+        separator: str,
+        chunksize: int,
+        columns: list[str],
+    ) -> Iterator[pd.DataFrame]:
+        """Stream record batches from ``pyarrow.csv`` (pandas cannot chunk this engine)."""
+        for frame in self._iter_arrow_batches(source, encoding, separator, columns):
+            for start in range(0, len(frame), chunksize):
+                yield frame.iloc[start:start + chunksize].reset_index(drop=True)
+
+    def _iter_arrow_batches(
+        self, source: Any, encoding: str, separator: str, columns: list[str]
+    ) -> Iterator[pd.DataFrame]:
+        """String frames for each ``pyarrow.csv`` record batch, nulls as NaN like the C engine."""
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+
+        # Arrow skips the UTF-8 BOM itself
+        arrow_encoding = "utf8" if encoding.lower().replace("-", "") in ("utf8", "utf8sig") else encoding
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(encoding=arrow_encoding),
+            parse_options=pa_csv.ParseOptions(delimiter=separator),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                column_types={column: pa.string() for column in columns},
+                strings_can_be_null=True,
+            ),
+        )
+        yielded = False
+        for batch in reader:
+            if not batch.num_rows:
+                continue
+            yielded = True
+            frame = batch.to_pandas()
+            yield frame.where(frame.notna())
+        if not yielded:
+            yield pd.DataFrame({column: pd.Series(dtype=str) for column in columns})
+
+    def _read_excel(self, source: Any, sheet_name: int | str) -> pd.DataFrame:
+        wanted = self._wanted_columns()
+        usecols = None if wanted is None else (lambda column: str(column).strip().upper() in wanted)
+        return pd.read_excel(source, sheet_name=sheet_name, dtype=str, usecols=usecols)
+
+    def _finalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Normalize column names and apply the configured ``dtypes``."""
+        df.columns = [str(c).strip().upper() for c in df.columns]
+
+        dtypes = self.params.get("dtypes") or {}
+        date_format = self.params.get("date_format")
+        dayfirst = bool(self.params.get("dayfirst", False))
+        for column, dtype in dtypes.items():
+            column = str(column).strip().upper()
+            if column not in df.columns:
+                continue
+            kind = str(dtype).lower()
+            if kind in ("date", "datetime"):
+                parsed = pd.to_datetime(
+                    df[column], format=date_format, dayfirst=dayfirst, errors="coerce"
+                )
+                df[column] = parsed.dt.normalize() if kind == "date" else parsed
+            else:
+                df[column] = df[column].astype(kind)
+        return df
+
     def _load_from_zip(
         self,
         zip_path: Path,
@@ -138,172 +368,233 @@ class FileLoader(BaseLoader):
         sheet_name: int | str,
         password: str,
     ) -> pd.DataFrame:
-        """Load data from password-protected ZIP using multiple methods."""
-
-        # Method 1: Try pyzipper (AES encryption support)
-        try:
-            import pyzipper
-            with pyzipper.AESZipFile(zip_path, 'r') as zf:
-                zf.setpassword(password.encode())
-                return self._extract_data_from_pyzipper(zf, encoding, separator, sheet_name)
-        except ImportError:
-            pass
-        except Exception:
-            pass
-
-        # Method 2: Try standard zipfile with password
-        try:
-            with zipfile.ZipFile(zip_path, "r") as zf:
-                zf.setpassword(password.encode())
-                return self._extract_data_from_zip(zf, encoding, separator, sheet_name)
-        except Exception:
-            pass
-
-        # Method 3: Try 7-Zip command line
-        try:
-            return self._extract_with_7zip(zip_path, encoding, separator, sheet_name, password)
-        except Exception:
-            pass
-
-        # Method 4: Try unzip command line
-        try:
-            return self._extract_with_unzip(zip_path, encoding, separator, sheet_name, password)
-        except Exception as e:
-            raise ValueError(
-                f"Failed to extract password-protected ZIP. "
-                f"Install pyzipper or 7-zip: {e}"
+        """
+        Load data from password-protected ZIP using multiple methods.
+
+        Every method decrypts into a stream that is parsed directly, with no
+        temporary copy on disk. With ``cache_dir`` set, the stream is written
+        once to a :class:`DecryptedArchiveCache` entry instead and reused
+        while the archive content is unchanged; the method that worked is
+        tried first next time.
+        """
+        cache = self._decrypt_cache()
+        if cache is None:
+            df, _ = self._decrypt_archive(
+                zip_path,
+                password,
+                lambda name, stream: self._read_data_stream(
+                    name, stream, encoding, separator, sheet_name
+                ),
             )
-
-    def _extract_data_from_zip(
+            return df
+
+        digest = cache.digest(zip_path)
+        payload = cache.lookup(digest)
+        if payload is None:
+            staging = cache.staging_dir()
+            try:
+                extracted, method = self._decrypt_archive(
+                    zip_path,
+                    password,
+                    lambda name, stream: self._copy_stream(name, stream, staging),
+                    preferred=cache.method(digest),
+                )
+                payload = cache.store(digest, extracted, method)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+        return self._read_data_file(payload, encoding, separator, sheet_name)
+
+    def _decrypt_cache(self) -> DecryptedArchiveCache | None:
+        cache_dir = self.params.get("cache_dir")
+        if not cache_dir:
+            return None
+        max_mb = self.params.get("cache_max_mb")
+        max_bytes = int(float(max_mb) * 1024**2) if max_mb else DEFAULT_MAX_BYTES
+        max_hours = self.params.get("cache_max_age_hours")
+        max_age = float(max_hours) * 3600 if max_hours is not None else DEFAULT_MAX_AGE
+        return DecryptedArchiveCache(cache_dir, max_bytes, max_age)
+
+    def _decrypt_archive(
         self,
-        zf: zipfile.ZipFile,
+        zip_path: Path,
+        password: str,
+        consume: Callable[[str, BinaryIO], _T],
+        preferred: str | None = None,
+    ) -> tuple[_T, str]:
+        """
+        Open the data member with the first method that works.
+
+        ``consume`` receives the member name and a binary stream of its
+        decrypted bytes; returns its result and the method used.
+        """
+        methods: dict[str, Callable[[Path, str], ContextManager[tuple[str, BinaryIO]]]] = {
+            # Method 1: pyzipper (AES encryption support)
+            "pyzipper": self._open_with_pyzipper,
+            # Method 2: standard zipfile with password
+            "zipfile": self._open_with_zipfile,
+            # Method 3: 7-Zip command line
+            "7zip": self._open_with_7zip,
+            # Method 4: unzip command line
+            "unzip": self._open_with_unzip,
+        }
+        order = list(methods)
+        if preferred in methods:
+            order.remove(preferred)
+            order.insert(0, preferred)
+
+        last_error: Exception | None = None
+        for method in order:
+            try:
+                with methods[method](zip_path, password) as (name, stream):
+                    return consume(name, stream), method
+            except Exception as e:
+                last_error = e
+
+        raise ValueError(
+            f"Failed to extract password-protected ZIP. "
+            f"Install pyzipper or 7-zip: {last_error}"
+        )
+
+    def _read_data_stream(
+        self,
+        name: str,
+        stream: BinaryIO,
         encoding: str,
         separator: str,
         sheet_name: int | str,
     ) -> pd.DataFrame:
-        """Extract data from an open ZipFile object."""
-        for name in zf.namelist():
-            lower = name.lower()
-            if lower.endswith(".csv"):
-                with zf.open(name) as f:
-                    return pd.read_csv(
-                        f,
-                        sep=separator,
-                        encoding=encoding,
-                        dtype=str,
-                        low_memory=False,
-                    )
-            elif lower.endswith((".xlsx", ".xls")):
-                with zf.open(name) as f:
-                    return pd.read_excel(f, sheet_name=sheet_name, dtype=str)
+        """Parse a decrypted member straight from its stream."""
+        if name.lower().endswith(".csv"):
+            return self._read_csv(stream, encoding, separator)
+        # Excel needs random access
+        return self._read_excel(io.BytesIO(stream.read()), sheet_name)
 
+    def _read_data_file(
+        self,
+        path: Path,
+        encoding: str,
+        separator: str,
+        sheet_name: int | str,
+    ) -> pd.DataFrame:
+        """Parse an extracted CSV or Excel file."""
+        if path.suffix.lower() == ".csv":
+            return self._read_csv(path, encoding, separator)
+        return self._read_excel(path, sheet_name)
+
+    @staticmethod
+    def _copy_stream(name: str, stream: BinaryIO, dest: Path) -> Path:
+        target = dest / Path(name).name
+        with open(target, "wb") as out:
+            shutil.copyfileobj(stream, out, _COPY_BLOCK)
+        return target
+
+    @staticmethod
+    def _data_member(names: list[str]) -> str:
+        """First CSV or Excel member of an archive listing."""
+        for name in names:
+            if name.lower().endswith(_DATA_SUFFIXES):
+                return name
         raise ValueError(f"No CSV or Excel file found in ZIP")
 
-    def _extract_data_from_pyzipper(
+    def _extract_data_from_zip(
         self,
-        zf,
+        zf: zipfile.ZipFile,
         encoding: str,
         separator: str,
         sheet_name: int | str,
     ) -> pd.DataFrame:
-        """Extract data from a pyzipper ZipFile object."""
+        """Extract data from an open ZipFile object."""
         for name in zf.namelist():
             lower = name.lower()
             if lower.endswith(".csv"):
-                data = zf.read(name)
-                return pd.read_csv(
-                    io.BytesIO(data),
-                    sep=separator,
-                    encoding=encoding,
-                    dtype=str,
-                    low_memory=False,
-                )
+                with zf.open(name) as f:
+                    return self._read_csv(f, encoding, separator)
             elif lower.endswith((".xlsx", ".xls")):
-                data = zf.read(name)
-                return pd.read_excel(io.BytesIO(data), sheet_name=sheet_name, dtype=str)
+                with zf.open(name) as f:
+                    return self._read_excel(f, sheet_name)
 
         raise ValueError(f"No CSV or Excel file found in ZIP")
 
-    def _extract_with_7zip(
-        self,
-        zip_path: Path,
-        encoding: str,
-        separator: str,
-        sheet_name: int | str,
-        password: str,
-    ) -> pd.DataFrame:
-        """Extract using 7-Zip command line tool."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Try different 7z commands
-            for cmd in ["7z", "7za", "7zz"]:
-                try:
-                    result = subprocess.run(
-                        [cmd, "x", f"-p{password}", f"-o{temp_path}", str(zip_path), "-y"],
-                        capture_output=True,
-                        text=True,
-                        timeout=60,
-                    )
-                    if result.returncode == 0:
-                        break
-                except (FileNotFoundError, subprocess.TimeoutExpired):
-                    continue
-            else:
-                raise FileNotFoundError("7-Zip not found")
-
-            # Find and load extracted file
-            for file in temp_path.rglob("*"):
-                if file.suffix.lower() == ".csv":
-                    return pd.read_csv(
-                        file,
-                        sep=separator,
-                        encoding=encoding,
-                        dtype=str,
-                        low_memory=False,
-                    )
-                elif file.suffix.lower() in (".xlsx", ".xls"):
-                    return pd.read_excel(file, sheet_name=sheet_name, dtype=str)
-
-            raise ValueError("No CSV or Excel file found after extraction")
-
-    def _extract_with_unzip(
-        self,
-        zip_path: Path,
-        encoding: str,
-        separator: str,
-        sheet_name: int | str,
-        password: str,
-    ) -> pd.DataFrame:
-        """Extract using unzip command line tool."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            result = subprocess.run(
-                ["unzip", "-P", password, "-d", str(temp_path), str(zip_path)],
-                capture_output=True,
-                text=True,
-                timeout=60,
+    @contextmanager
+    def _open_with_pyzipper(self, zip_path: Path, password: str) -> Iterator[tuple[str, BinaryIO]]:
+        """Decrypt using pyzipper (AES-encrypted ZIPs)."""
+        import pyzipper
+
+        with pyzipper.AESZipFile(zip_path, "r") as zf:
+            zf.setpassword(password.encode())
+            name = self._data_member(zf.namelist())
+            with zf.open(name) as stream:
+                yield name, stream
+
+    @contextmanager
+    def _open_with_zipfile(self, zip_path: Path, password: str) -> Iterator[tuple[str, BinaryIO]]:
+        """Decrypt using the standard library (ZipCrypto only)."""
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            zf.setpassword(password.encode())
+            name = self._data_member(zf.namelist())
+            with zf.open(name) as stream:
+                yield name, stream
+
+    @contextmanager
+    def _open_with_7zip(self, zip_path: Path, password: str) -> Iterator[tuple[str, BinaryIO]]:
+        """Decrypt using the 7-Zip command line tool, reading its stdout (``-so``)."""
+        from ..utils.archives import stream_with_7zip
+
+        with stream_with_7zip(zip_path, senha=password, extensoes=_DATA_SUFFIXES) as (name, stream):
+            yield name, stream
+
+    @contextmanager
+    def _open_with_unzip(self, zip_path: Path, password: str) -> Iterator[tuple[str, BinaryIO]]:
+        """Decrypt using the unzip command line tool, reading its stdout (``-p``)."""
+        listing = subprocess.run(
+            ["unzip", "-Z1", str(zip_path)],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        if listing.returncode != 0:
+            raise ValueError(f"unzip failed: {listing.stderr}")
+        name = self._data_member(listing.stdout.splitlines())
+
+        with tempfile.TemporaryFile() as errors:
+            process = subprocess.Popen(
+                ["unzip", "-p", "-P", password, str(zip_path), name],
+                stdout=subprocess.PIPE,
+                stderr=errors,
             )
-
-            if result.returncode != 0:
-                raise ValueError(f"unzip failed: {result.stderr}")
-
-            # Find and load extracted file
-            for file in temp_path.rglob("*"):
-                if file.suffix.lower() == ".csv":
-                    return pd.read_csv(
-                        file,
-                        sep=separator,
-                        encoding=encoding,
-                        dtype=str,
-                        low_memory=False,
-                    )
-                elif file.suffix.lower() in (".xlsx", ".xls"):
-                    return pd.read_excel(file, sheet_name=sheet_name, dtype=str)
-
-            raise ValueError("No CSV or Excel file found after extraction")
-
+            try:
+                yield name, process.stdout
+                while process.stdout.read(_COPY_BLOCK):
+                    pass
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                process.stdout.close()
+                returncode = process.wait()
+            if returncode != 0:
+                errors.seek(0)
+                raise ValueError(f"unzip failed: {errors.read().decode(errors='replace')}")
+
+
+class _PrefixedStream(io.RawIOBase):
+    """Raw stream that replays ``prefix`` before reading on from ``stream``."""
+
+    def __init__(self, prefix: bytes, stream: BinaryIO):
+        self._prefix = prefix
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            size = min(len(buffer), len(self._prefix))
+            buffer[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
 
 def create_file_loader(config: LoaderConfig, client_config: ClientConfig) -> FileLoader:
     """Factory function to create a FileLoader."""
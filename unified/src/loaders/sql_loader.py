@@ -1,15 +1,30 @@
 """
 SQL loader.
 Loads data from SQL Server databases.
+
+Results are fetched in batches (``batch_size`` rows per ``fetchmany``, or
+Arrow record batches with ``fetch_engine: arrow``) and can be streamed
+straight into a ZIP with :meth:`SQLLoader.export_zip`. With ``partitions: N``
+the query runs as N concurrent ranges of ``partition_column``. With an
+``incremental`` block only rows changed since the last run are fetched and
+merged into a local snapshot (``full_refresh: true`` rebuilds it). ``driver: sqlite``
+points the loader at a local SQLite file, a stand-in for tests and
+benchmarks without SQL Server.
 """
 from __future__ import annotations
 
 import os
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator
 
 import pandas as pd
 
 from ..core.base import BaseLoader, LoaderResult
+from ..utils.io import open_zip_for_writing, write_csv_batches_member
+from ..utils.sql_fetch import DEFAULT_BATCH_SIZE, FetchStats, as_text, iter_query_batches, log_progress
+from ..utils.sql_incremental import DeltaStats, SnapshotStore, run_incremental
+from ..utils.sql_partition import iter_partitioned, run_partitioned
+from ..utils.sql_pool import get_pool
 
 if TYPE_CHECKING:
     from ..core.schemas import ClientConfig, LoaderConfig
@@ -18,106 +33,274 @@ if TYPE_CHECKING:
 class SQLLoader(BaseLoader):
     """Loads data from SQL Server databases."""
 
+    def __init__(self, config: LoaderConfig, client_config: ClientConfig):
+        super().__init__(config, client_config)
+        self.stats: FetchStats | None = None
+        self.delta: DeltaStats | None = None
+
     @property
     def name(self) -> str:
         return "sql"
 
     def load(self) -> LoaderResult:
-        # Get connection parameters (from params or environment)
-        server = self.params.get("server", os.getenv("SQL_SERVER", ""))
-        database = self.params.get("database", os.getenv("SQL_DATABASE", ""))
-        username = self.params.get("username", os.getenv("SQL_USER", ""))
-        password = self.params.get("password", os.getenv("SQL_PASSWORD", ""))
-        driver = self.params.get("driver", "{ODBC Driver 17 for SQL Server}")
-
-        # Query configuration
-        query = self.params.get("query", "")
-        table = self.params.get("table", "")
-        schema = self.params.get("schema", "dbo")
-
-        if not all([server, database]):
+        try:
+            frames = list(self.iter_batches())
+        except (ValueError, ConnectionError) as e:
+            return LoaderResult(data=pd.DataFrame(), metadata={"error": str(e)})
+        except Exception as e:
             return LoaderResult(
                 data=pd.DataFrame(),
-                metadata={"error": "SQL Server connection not configured"},
+                metadata={"error": f"SQL query failed: {e}"},
             )
 
-        if not query and not table:
-            return LoaderResult(
-                data=pd.DataFrame(),
-                metadata={"error": "No query or table specified"},
-            )
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        return LoaderResult(data=df, metadata=self._metadata(len(df), list(df.columns)))
+
+    def iter_batches(self) -> Iterator[pd.DataFrame]:
+        """Yield the query result in DataFrames of at most ``batch_size`` rows.
+
+        Raises:
+            ValueError: If the connection or the query is not configured
+            ConnectionError: If no driver could connect
+        """
+        settings = self._settings()
+        self.stats = None
+        self.delta = None
+        if self.params.get("incremental"):
+            yield from self._iter_incremental(settings)
+            return
+        if int(self.params.get("partitions", 1) or 1) > 1:
+            yield from self._iter_partitioned(settings)
+            return
+
+        conn, connection_string = self._get_connection(**settings)
+        if not conn:
+            raise ConnectionError("Failed to connect to SQL Server")
+
+        def track(stats: FetchStats) -> None:
+            self.stats = stats
+            log_progress(stats)
 
         try:
-            # Try pyodbc first, fall back to pymssql
-            conn = self._get_connection(server, database, username, password, driver)
+            for batch in iter_query_batches(
+                conn,
+                self._query(),
+                batch_size=int(self.params.get("batch_size", DEFAULT_BATCH_SIZE)),
+                engine=self.params.get("fetch_engine", "auto"),
+                dtype=str,
+                connection_string=connection_string,
+                progress=track,
+            ):
+                # Normalize column names
+                batch.columns = [str(c).strip().upper() for c in batch.columns]
+                yield batch
+        finally:
+            conn.close()
 
+    def _connector(self, settings: dict[str, Any]) -> Callable[[], Any]:
+        def connect() -> Any:
+            conn, _ = self._get_connection(**settings)
             if not conn:
-                return LoaderResult(
-                    data=pd.DataFrame(),
-                    metadata={"error": "Failed to connect to SQL Server"},
-                )
+                raise ConnectionError("Failed to connect to SQL Server")
+            return conn
 
-            # Build query if table specified
-            if not query:
-                query = f"SELECT * FROM [{schema}].[{table}]"
+        return connect
 
-            # Execute query
-            df = pd.read_sql(query, conn, dtype=str)
-            conn.close()
+    def _fetch_partitioned(self, settings: dict[str, Any], **kwargs: Any) -> pd.DataFrame:
+        return run_partitioned(
+            self._connector(settings),
+            self._query(),
+            self.params.get("partition_column", "Movimentacoes_ID"),
+            int(self.params["partitions"]),
+            order_by=self.params.get("order_by"),
+            **kwargs,
+        )
 
-            # Normalize column names
-            df.columns = [str(c).strip().upper() for c in df.columns]
+    def _iter_partitioned(self, settings: dict[str, Any]) -> Iterator[pd.DataFrame]:
+        """Run the query as concurrent ``partition_column`` ranges and yield the merge in batches.
 
-            return LoaderResult(
-                data=df,
-                metadata={
-                    "rows": len(df),
-                    "columns": list(df.columns),
-                    "source": f"sql:{database}.{schema}.{table}" if table else f"sql:{database}",
-                    "query": query[:100] + "..." if len(query) > 100 else query,
-                },
-            )
+        The ranges are merged back into the query's ``ORDER BY`` order (or
+        the ``order_by`` output columns) while they are fetched.
+        """
+        stats = FetchStats(engine="partitioned")
+        for batch in iter_partitioned(
+            self._connector(settings),
+            self._query(),
+            self.params.get("partition_column", "Movimentacoes_ID"),
+            int(self.params["partitions"]),
+            batch_size=int(self.params.get("batch_size", DEFAULT_BATCH_SIZE)),
+            dtype=str,
+            order_by=self.params.get("order_by"),
+            normalize_columns=lambda c: str(c).strip().upper(),
+        ):
+            stats.rows += len(batch)
+            stats.batches += 1
+            self.stats = stats
+            log_progress(stats)
+            yield batch
+
+    def _iter_incremental(self, settings: dict[str, Any]) -> Iterator[pd.DataFrame]:
+        """Bring the local snapshot up to date with a delta query, then yield it in batches.
+
+        ``incremental`` takes ``snapshot_dir``, ``watermark_column`` (an
+        update date or ``rowversion``, see :mod:`..utils.sql_incremental`) and optionally
+        ``key_column`` / ``key_expression``. A full refresh (partitioned when
+        ``partitions`` > 1) runs on ``full_refresh: true``, on the first run
+        and whenever the query changes.
+        """
+        options = self.params["incremental"]
+        if not options.get("snapshot_dir") or not options.get("watermark_column"):
+            raise ValueError("Incremental extraction needs snapshot_dir and watermark_column")
 
+        full_fetch = None
+        if int(self.params.get("partitions", 1) or 1) > 1:
+            full_fetch = lambda: self._fetch_partitioned(settings)  # noqa: E731
+
+        merged, self.delta = run_incremental(
+            self._connector(settings),
+            self._query(),
+            SnapshotStore(options["snapshot_dir"]),
+            watermark_column=options["watermark_column"],
+            key_column=options.get("key_column", "Movimentacoes_ID"),
+            key_expression=options.get("key_expression"),
+            full_refresh=bool(self.params.get("full_refresh", False)),
+            full_fetch=full_fetch,
+            order_by=self.params.get("order_by"),
+        )
+        merged = as_text(merged)
+        merged.columns = [str(c).strip().upper() for c in merged.columns]
+        yield from self._iter_frame(merged, f"incremental-{self.delta.mode}")
+
+    def _iter_frame(self, frame: pd.DataFrame, engine: str) -> Iterator[pd.DataFrame]:
+        stats = FetchStats(engine=engine)
+        batch_size = max(int(self.params.get("batch_size", DEFAULT_BATCH_SIZE)), 1)
+        for start in range(0, max(len(frame), 1), batch_size):
+            batch = frame.iloc[start:start + batch_size]
+            stats.rows += len(batch)
+            stats.batches += 1
+            self.stats = stats
+            log_progress(stats)
+            yield batch
+
+    def export_zip(
+        self,
+        zip_path: Path | str,
+        member: str,
+        sep: str = ";",
+        encoding: str = "utf-8",
+        compresslevel: int | None = None,
+    ) -> LoaderResult:
+        """Stream the query result as a CSV member of ``zip_path``.
+
+        Each batch is written as soon as it is fetched, so the full result is
+        never held in memory. ``zip_path`` is only replaced when the query
+        returned rows; the returned result carries the metadata and an empty
+        DataFrame.
+        """
+        zip_path = Path(zip_path)
+        zip_path.parent.mkdir(parents=True, exist_ok=True)
+        partial = zip_path.with_name(zip_path.name + ".partial")
+        columns: list[str] = []
+
+        def batches() -> Iterator[pd.DataFrame]:
+            for batch in self.iter_batches():
+                columns[:] = list(batch.columns)
+                yield batch
+
+        try:
+            with open_zip_for_writing(partial, compresslevel) as zf:
+                rows = write_csv_batches_member(zf, member, batches(), encoding, sep=sep)
+        except (ValueError, ConnectionError) as e:
+            partial.unlink(missing_ok=True)
+            return LoaderResult(data=pd.DataFrame(), metadata={"error": str(e)})
         except Exception as e:
+            partial.unlink(missing_ok=True)
             return LoaderResult(
                 data=pd.DataFrame(),
                 metadata={"error": f"SQL query failed: {e}"},
             )
 
+        if rows:
+            os.replace(partial, zip_path)
+        else:
+            partial.unlink(missing_ok=True)
+        metadata = self._metadata(rows, columns)
+        metadata["path"] = str(zip_path) if rows else None
+        return LoaderResult(data=pd.DataFrame(columns=columns), metadata=metadata)
+
+    def _settings(self) -> dict[str, Any]:
+        # Get connection parameters (from params or environment)
+        settings = {
+            "server": self.params.get("server", os.getenv("SQL_SERVER", "")),
+            "database": self.params.get("database", os.getenv("SQL_DATABASE", "")),
+            "username": self.params.get("username", os.getenv("SQL_USER", "")),
+            "password": self.params.get("password", os.getenv("SQL_PASSWORD", "")),
+            # Without a driver the pool probes the installed ODBC drivers
+            "driver": self.params.get("driver"),
+        }
+        sqlite = str(settings["driver"]).lower() == "sqlite"
+
+        if not settings["database"] or not (settings["server"] or sqlite):
+            raise ValueError("SQL Server connection not configured")
+        if not self.params.get("query") and not self.params.get("table"):
+            raise ValueError("No query or table specified")
+        return settings
+
+    def _query(self) -> str:
+        # Build query if table specified
+        query = self.params.get("query", "")
+        if not query:
+            schema = self.params.get("schema", "dbo")
+            query = f"SELECT * FROM [{schema}].[{self.params.get('table', '')}]"
+        return query
+
+    def _metadata(self, rows: int, columns: list[str]) -> dict[str, Any]:
+        query = self._query()
+        database = self.params.get("database", os.getenv("SQL_DATABASE", ""))
+        table = self.params.get("table", "")
+        schema = self.params.get("schema", "dbo")
+        metadata: dict[str, Any] = {
+            "rows": rows,
+            "columns": columns,
+            "source": f"sql:{database}.{schema}.{table}" if table else f"sql:{database}",
+            "query": query[:100] + "..." if len(query) > 100 else query,
+        }
+        if self.stats is not None:
+            metadata.update(
+                batches=self.stats.batches,
+                fetch_engine=self.stats.engine,
+                elapsed_s=round(self.stats.elapsed, 3),
+                rows_per_sec=round(self.stats.rows_per_sec, 1),
+            )
+        if self.delta is not None:
+            metadata.update(
+                delta_mode=self.delta.mode,
+                delta_fetched=self.delta.fetched,
+                delta_removed=self.delta.removed,
+                delta_reentered=self.delta.reentered,
+                watermark=self.delta.watermark,
+            )
+        return metadata
+
     def _get_connection(
         self,
         server: str,
         database: str,
         username: str,
         password: str,
-        driver: str,
-    ):
-        """Get database connection using available driver."""
-        # Try pyodbc first
+        driver: str | None,
+    ) -> tuple[Any, str | None]:
+        """Get database connection using available driver.
+
+        Returns the connection and, for ODBC, its connection string (used by
+        the Arrow fetch path).
+        """
+        # Pooled pyodbc connection (SQLite stand-in when driver is "sqlite");
+        # close() hands it back to the process-wide pool
         try:
-            import pyodbc
-
-            if username and password:
-                conn_str = (
-                    f"DRIVER={driver};"
-                    f"SERVER={server};"
-                    f"DATABASE={database};"
-                    f"UID={username};"
-                    f"PWD={password};"
-                    "TrustServerCertificate=yes;"
-                )
-            else:
-                conn_str = (
-                    f"DRIVER={driver};"
-                    f"SERVER={server};"
-                    f"DATABASE={database};"
-                    "Trusted_Connection=yes;"
-                    "TrustServerCertificate=yes;"
-                )
-            return pyodbc.connect(conn_str)
-        except ImportError:
-            pass
-        except Exception:
+            conn = get_pool().acquire(server, database, username, password, driver=driver)
+            return conn, conn.connection_string
+        except ConnectionError:
             pass
 
         # Fall back to pymssql
@@ -129,13 +312,13 @@ class SQLLoader(BaseLoader):
                 database=database,
                 user=username,
                 password=password,
-            )
+            ), None
         except ImportError:
             pass
         except Exception:
             pass
 
-        return None
+        return None, None
 
 
 def create_sql_loader(config: LoaderConfig, client_config: ClientConfig) -> SQLLoader:
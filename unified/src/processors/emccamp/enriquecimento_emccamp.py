@@ -10,7 +10,8 @@ import zipfile
 import pandas as pd
 
 from src.config.loader import ConfigLoader, LoadedConfig
-from src.utils.io import DatasetIO
+from src.utils.artifacts import artifact_store
+from src.utils.io import DatasetIO, zip_options
 from src.utils.output_formatter import OutputFormatter
 from src.utils.path_manager import PathManager
 
@@ -40,7 +41,7 @@ class ContactEnrichmentProcessor:
         global_cfg = config.data.get("global", {}) if isinstance(config.data, dict) else {}
         separator = csv_cfg.get("delimiter") or global_cfg.get("csv_separator", ";")
         encoding = csv_cfg.get("encoding") or global_cfg.get("encoding", "utf-8-sig")
-        self.io = DatasetIO(separator=separator, encoding=encoding)
+        self.io = DatasetIO(separator=separator, encoding=encoding, **zip_options(config.data))
 
     # ------------------------------------------------------------------ #
     # Helpers
@@ -65,6 +66,9 @@ class ContactEnrichmentProcessor:
         if "*" in resolved_path.name:
             directory = resolved_path.parent
             pattern = resolved_path.name
+            published = artifact_store().latest(directory, pattern)
+            if published is not None:
+                return published
             candidates = sorted(
                 directory.glob(pattern), key=lambda f: f.stat().st_mtime, reverse=True
             )
@@ -74,7 +78,7 @@ class ContactEnrichmentProcessor:
                 )
             return candidates[0]
 
-        if not resolved_path.exists():
+        if not resolved_path.exists() and artifact_store().members(resolved_path) is None:
             raise FileNotFoundError(f"Arquivo nao encontrado: {resolved_path}")
         return resolved_path
 
@@ -106,9 +110,37 @@ class ContactEnrichmentProcessor:
             return date.today().strftime("%d/%m/%Y")
         return parsed.strftime("%d/%m/%Y")
 
+    def _published_frames(
+        self, path: Path, members: Optional[List[str]] = None
+    ) -> Optional[Dict[str, pd.DataFrame]]:
+        """CSVs publicados em memória por uma etapa anterior (o ZIP pode ainda
+        não estar no disco); ``None`` quando é preciso ler o arquivo."""
+        published = artifact_store().members(path)
+        if published is None:
+            return None
+        names = members or [name for name in published if name.lower().endswith(".csv")]
+        if not names:
+            raise FileNotFoundError(
+                f"Arquivo {path} nao contem CSVs para aplicar filtro de chave."
+            )
+        frames = {name: artifact_store().get(path, name, sep=self.io.separator) for name in names}
+        if any(df is None for df in frames.values()):
+            # Publicado com outro separador: lê do disco, após a gravação
+            artifact_store().wait(path)
+            return None
+        return frames
+
     def _collect_keys(self, path: Path, column: str, members: Optional[List[str]] = None) -> Set[str]:
         keys: Set[str] = set()
-        if path.suffix.lower() == ".zip":
+        frames = self._published_frames(path, members)
+        if frames is not None:
+            for name, df in frames.items():
+                if column not in df.columns:
+                    raise KeyError(
+                        f"Coluna {column} ausente no arquivo {name} dentro de {path}"
+                    )
+                keys.update(df[column].astype(str).str.strip())
+        elif path.suffix.lower() == ".zip":
             with zipfile.ZipFile(path) as zf:
                 names = members or [name for name in zf.namelist() if name.lower().endswith(".csv")]
                 if not names:
@@ -10,7 +10,7 @@ from typing import Dict
 import pandas as pd
 
 from src.config.loader import ConfigLoader, LoadedConfig
-from src.utils.io import DatasetIO
+from src.utils.io import DatasetIO, zip_options
 from src.utils.logger import get_logger
 from src.utils.output_formatter import format_treatment_output
 from src.utils.path_manager import PathManager
@@ -41,7 +41,7 @@ class EmccampProcessor:
         global_cfg = config.get("global", {})
         self.encoding = global_cfg.get("encoding", "utf-8-sig")
         self.separator = global_cfg.get("csv_separator", ",")
-        self.io = DatasetIO(separator=self.separator, encoding=self.encoding)
+        self.io = DatasetIO(separator=self.separator, encoding=self.encoding, **zip_options(config))
 
         self.input_dir = self.paths.resolve_input("emccamp", "data/input/emccamp")
         self.output_dir = self.paths.resolve_output("emccamp_tratada", "emccamp_tratada")
@@ -130,7 +130,7 @@ class EmccampProcessor:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         csv_name = f"emccamp_tratada_{timestamp}.csv"
         zip_path = self.output_dir / f"emccamp_tratada_{timestamp}.zip"
-        self.io.write_zip({csv_name: df_valid}, zip_path)
+        self.io.write_zip({csv_name: df_valid}, zip_path, sidecar=True)
 
         inconsist_zip = None
         if not inconsistencias_df.empty:
@@ -11,7 +11,8 @@ import pandas as pd
 
 from src.config.loader import ConfigLoader, LoadedConfig
 from src.utils import digits_only, procv_max_menos_emccamp
-from src.utils.io import DatasetIO
+from src.utils.anti_join import key_index_for
+from src.utils.io import DatasetIO, zip_options
 from src.utils.logger import get_logger
 from src.utils.path_manager import PathManager
 from src.utils.output_formatter import format_baixa_output
@@ -198,18 +199,34 @@ def executar_baixa(
     sep = config.data.get("global", {}).get("csv_separator", ",")
     encoding = config.data.get("global", {}).get("encoding", "utf-8-sig")
     paths = PathManager(config.base_path, config.data)
-    io = DatasetIO(separator=sep, encoding=encoding)
-
-    df_emccamp = io.read(emccamp_path)
-    df_max = io.read(max_path)
-
-    df_max_filtrado, filtros_aplicados = _apply_max_filters(df_max, config, logger)
+    io = DatasetIO(separator=sep, encoding=encoding, **zip_options(config.data))
 
     chaves_cfg = config.data.get("baixa", {}).get("chaves", {})
     chave_max = chaves_cfg.get("max", "PARCELA")
     chave_emccamp = chaves_cfg.get("emccamp", "CHAVE")
 
-    df_baixa = procv_max_menos_emccamp(df_max_filtrado, df_emccamp, chave_max, chave_emccamp)
+    # Da EMCCAMP a baixa só usa a chave; as datas da MAX chegam tipadas
+    df_emccamp = io.read(emccamp_path, columns=[chave_emccamp])
+    df_max = io.read(max_path, typed=True)
+
+    df_max_filtrado, filtros_aplicados = _apply_max_filters(df_max, config, logger)
+
+    # Índices de chave das bases completas (compartilhados com batimento e devolução)
+    max_index = key_index_for(df_max, chave_max, max_path) if chave_max in df_max.columns else None
+    emccamp_index = (
+        key_index_for(df_emccamp, chave_emccamp, emccamp_path)
+        if chave_emccamp in df_emccamp.columns
+        else None
+    )
+
+    df_baixa = procv_max_menos_emccamp(
+        df_max_filtrado,
+        df_emccamp,
+        chave_max,
+        chave_emccamp,
+        max_index=max_index,
+        emccamp_index=emccamp_index,
+    )
     flow_steps['anti_join'] = len(df_baixa)
 
     df_trabalho = df_baixa.copy()
@@ -225,7 +242,7 @@ def executar_baixa(
         "data/input/doublecheck_acordo/acordos_abertos.zip",
     )
     if acordo_path.exists():
-        df_acordo = io.read(acordo_path)
+        df_acordo = io.read(acordo_path, columns=["CPFCNPJ_CLIENTE"])
         flow_steps['acordos_loaded'] = len(df_acordo)
         if "CPFCNPJ_CLIENTE" not in df_acordo.columns:
             logger.warning("Arquivo de acordos %s sem coluna CPFCNPJ_CLIENTE; filtro nao aplicado.", acordo_path)
@@ -255,7 +272,7 @@ def executar_baixa(
     # Feito DEPOIS do filtro de acordos (menos registros para fazer PROCV)
     baixa_path = paths.resolve_configured_input("baixa_emccamp_path", "data/input/baixas/baixa_emccamp.zip")
     if baixa_path.exists():
-        df_baixa = io.read(baixa_path)
+        df_baixa = io.read(baixa_path, columns=["CHAVE", "DATA_RECEBIMENTO", "VALOR_RECEBIDO"])
         flow_steps['baixas_loaded'] = len(df_baixa)
         if "CHAVE" not in df_baixa.columns:
             raise ValueError(f"Arquivo de baixas {baixa_path} sem coluna CHAVE")
@@ -5,13 +5,16 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import AbstractSet, Dict, Optional, Tuple
 
 import pandas as pd
 
 from src.config.loader import ConfigLoader, LoadedConfig
 from src.utils import digits_only, procv_emccamp_menos_max
-from src.utils.io import DatasetIO
+from src.utils.anti_join import key_index_for
+from src.utils.artifacts import artifact_store
+from src.utils.doc_sets import DIGITS, document_set
+from src.utils.io import DatasetIO, zip_options
 from src.utils.logger import get_logger
 from src.utils.output_formatter import format_batimento_output
 from src.utils.path_manager import PathManager
@@ -69,9 +72,9 @@ class BatimentoProcessor:
         self.cnpj_credor = str(empresa_cfg.get("cnpj", "")).strip()
         if not self.cnpj_credor:
             raise ValueError("CNPJ do credor nao configurado (global.empresa.cnpj)")
-        self.io = DatasetIO(separator=self.separator, encoding=self.encoding)
+        self.io = DatasetIO(separator=self.separator, encoding=self.encoding, **zip_options(config))
 
-        self.judicial_cpfs: set[str] = set()
+        self.judicial_cpfs: AbstractSet[str] = set()
 
         flags_cfg = config.get("flags", {})
         filtros_cfg = flags_cfg.get("filtros_batimento", {})
@@ -86,7 +89,17 @@ class BatimentoProcessor:
         max_path = self._resolve_file(self.max_dir, "max_tratada_*.zip")
 
         df_emccamp = self.io.read(emccamp_path)
-        df_max = self.io.read(max_path)
+        # Da MAX o batimento só usa a chave e a data de baixa (deduplicação)
+        df_max = self.io.read(max_path, columns=["CHAVE", "PARCELA", "DT_BAIXA"], typed=True)
+
+        if "CHAVE" not in df_emccamp.columns:
+            raise ValueError("Coluna CHAVE ausente na base EMCCAMP tratada")
+        if "CHAVE" not in df_max.columns:
+            raise ValueError("Coluna CHAVE ausente na base MAX tratada")
+
+        # Indices das bases completas; reaproveitados por devolucao e baixa
+        emccamp_index = key_index_for(df_emccamp, "CHAVE", emccamp_path)
+        max_index = key_index_for(df_max, "CHAVE", max_path)
 
         if self.filtrar_tipo_pagto:
             if "TIPO_PAGTO" not in df_emccamp.columns:
@@ -95,17 +108,14 @@ class BatimentoProcessor:
                 serie = df_emccamp["TIPO_PAGTO"].astype(str).str.strip().str.upper()
                 df_emccamp = df_emccamp[~serie.isin(self.tipos_pagto_excluir)].copy()
 
-        if "CHAVE" not in df_emccamp.columns:
-            raise ValueError("Coluna CHAVE ausente na base EMCCAMP tratada")
-        if "CHAVE" not in df_max.columns:
-            raise ValueError("Coluna CHAVE ausente na base MAX tratada")
-
         df_max_dedup = self._deduplicate_max(df_max)
         df_batimento = procv_emccamp_menos_max(
             df_emccamp,
             df_max_dedup,
             col_emccamp="CHAVE",
             col_max="CHAVE",
+            emccamp_index=emccamp_index,
+            max_index=max_index,
         )
 
         df_formatado = self._format_layout(df_batimento)
@@ -129,6 +139,9 @@ class BatimentoProcessor:
         return stats
 
     def _resolve_file(self, directory: Path, pattern: str) -> Path:
+        publicado = artifact_store().latest(directory, pattern)
+        if publicado is not None:
+            return publicado
         if not directory.exists():
             raise FileNotFoundError(f"Diretorio nao encontrado: {directory}")
 
@@ -195,25 +208,25 @@ class BatimentoProcessor:
 
         import zipfile
 
-        with zipfile.ZipFile(zip_path) as archive:
-            names = [name for name in archive.namelist() if name.lower().endswith(".csv")]
-            if not names:
-                self.logger.warning("Arquivo judicial sem CSV; ignorando")
-                return
-            with archive.open(names[0]) as buffer:
-                df = pd.read_csv(buffer, sep=self.separator, encoding=self.encoding, dtype=str)
-
-        column_name: Optional[str] = None
-        if "CPF_CNPJ" in df.columns:
-            column_name = "CPF_CNPJ"
-        elif "CPF" in df.columns:
-            column_name = "CPF"
-
-        if not column_name:
+        def ler_coluna_cpf(path: Path) -> Optional[pd.Series]:
+            with zipfile.ZipFile(path) as archive:
+                names = [name for name in archive.namelist() if name.lower().endswith(".csv")]
+                if not names:
+                    self.logger.warning("Arquivo judicial sem CSV; ignorando")
+                    return None
+                with archive.open(names[0]) as buffer:
+                    df = pd.read_csv(buffer, sep=self.separator, encoding=self.encoding, dtype=str)
+
+            for column_name in ("CPF_CNPJ", "CPF"):
+                if column_name in df.columns:
+                    return df[column_name]
             self.logger.warning("Coluna CPF ou CPF_CNPJ ausente no arquivo judicial; ignorando")
-            return
+            return None
 
-        self.judicial_cpfs = set(digits_only(df[column_name].dropna().astype(str)).tolist())
+        # Cache do processo: o arquivo so e relido quando muda
+        docs = document_set(zip_path, f"CPF_CNPJ|CPF:{self.separator}:{self.encoding}", DIGITS, ler_coluna_cpf)
+        if docs is not None:
+            self.judicial_cpfs = docs.values
 
     def _split_portfolios(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
         if df.empty:
@@ -9,14 +9,17 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Sequence, Tuple, Union
+from typing import AbstractSet, Any, Dict, Optional, Sequence, Tuple, Union
 
 import pandas as pd
 
 from src.config.loader import ConfigLoader, LoadedConfig
 from src.utils import digits_only, procv_max_menos_emccamp
+from src.utils.anti_join import KeyIndex, key_index_for, procv_left_minus_right
+from src.utils.artifacts import artifact_store
+from src.utils.doc_sets import CPF_CNPJ, document_set
 from src.utils.helpers import extrair_data_referencia, primeiro_valor
-from src.utils.io import DatasetIO
+from src.utils.io import DatasetIO, zip_options
 from src.utils.logger import get_logger
 from src.utils.output_formatter import OutputFormatter
 from src.utils.path_manager import PathManager
@@ -71,7 +74,7 @@ class DevolucaoProcessor:
         if not self.cnpj_credor:
             raise ValueError("CNPJ da empresa não configurado. Defina global.empresa.cnpj no config.yaml")
 
-        self.io = DatasetIO(separator=self.separator, encoding=self.encoding)
+        self.io = DatasetIO(separator=self.separator, encoding=self.encoding, **zip_options(config))
 
         # Parâmetros de devolução
         self.campanha_termo = (self.devolucao_config.get("campanha_termo") or "").strip()
@@ -101,7 +104,7 @@ class DevolucaoProcessor:
         self.status_devolucao_fixo = self.devolucao_config.get("status_devolucao_fixo", "98")
         self.remover_por_baixa = bool(self.devolucao_config.get("remover_por_baixa", True))
 
-        self._judicial_cpfs: set[str] = set()
+        self._judicial_cpfs: AbstractSet[str] = set()
 
     def process(self) -> DevolucaoStats:
         """Executa a pipeline completa de devolução."""
@@ -112,18 +115,35 @@ class DevolucaoProcessor:
         emccamp_path = self._resolve_file(self.emccamp_dir, "emccamp_tratada_*.zip")
         max_path = self._resolve_file(self.max_dir, "max_tratada_*.zip")
 
-        df_emccamp_raw = self.io.read(emccamp_path)
-        df_max_raw = self.io.read(max_path)
+        # Da EMCCAMP a devolução só usa a chave e o status; o layout vem da MAX
+        df_emccamp_raw = self.io.read(emccamp_path, columns=[self.ch_emccamp, "STATUS_TITULO"])
+        df_max_raw = self.io.read(max_path, typed=True)
+
+        # Índices de chave das bases completas (compartilhados com batimento e baixa)
+        emccamp_index = (
+            key_index_for(df_emccamp_raw, self.ch_emccamp, emccamp_path)
+            if self.ch_emccamp in df_emccamp_raw.columns
+            else None
+        )
+        max_index = (
+            key_index_for(df_max_raw, self.ch_max, max_path)
+            if self.ch_max in df_max_raw.columns
+            else None
+        )
 
         # Aplicar filtros
         df_emccamp_filtrado, emccamp_metrics = self._aplicar_filtros_emccamp(df_emccamp_raw)
         df_max_filtrado, max_metrics = self._aplicar_filtros_max(df_max_raw)
 
         # PROCV: MAX − EMCCAMP
-        df_devolucao_raw = self._identificar_devolucao(df_emccamp_filtrado, df_max_filtrado)
+        df_devolucao_raw = self._identificar_devolucao(
+            df_emccamp_filtrado, df_max_filtrado, emccamp_index, max_index
+        )
 
         # Remover por baixa (se configurado)
-        df_devolucao_sem_baixa, removidos_baixa = self._remover_registros_baixa(df_devolucao_raw)
+        df_devolucao_sem_baixa, removidos_baixa = self._remover_registros_baixa(
+            df_devolucao_raw, max_index
+        )
 
         # Dividir carteiras
         self._carregar_cpfs_judiciais()
@@ -163,6 +183,9 @@ class DevolucaoProcessor:
 
     def _resolve_file(self, directory: Path, pattern: str) -> Path:
         """Resolve o arquivo mais recente que corresponde ao padrão."""
+        publicado = artifact_store().latest(directory, pattern)
+        if publicado is not None:
+            return publicado
         if not directory.exists():
             raise FileNotFoundError(f"Diretório não encontrado: {directory}")
 
@@ -253,6 +276,8 @@ class DevolucaoProcessor:
         self,
         df_emccamp: pd.DataFrame,
         df_max: pd.DataFrame,
+        emccamp_index: Optional[KeyIndex] = None,
+        max_index: Optional[KeyIndex] = None,
     ) -> pd.DataFrame:
         """Calcula MAX − EMCCAMP e retorna DataFrame filtrado (PROCV)."""
         self.logger.info("PROCV MAX−EMCCAMP: iniciando identificação...")
@@ -268,7 +293,9 @@ class DevolucaoProcessor:
             df_max,
             df_emccamp,
             col_max=self.ch_max,
-            col_emccamp=self.ch_emccamp
+            col_emccamp=self.ch_emccamp,
+            max_index=max_index,
+            emccamp_index=emccamp_index,
         )
 
         self.logger.info("PROCV MAX−EMCCAMP: %s registros", f"{len(df_out):,}")
@@ -277,6 +304,7 @@ class DevolucaoProcessor:
     def _remover_registros_baixa(
         self,
         df: pd.DataFrame,
+        max_index: Optional[KeyIndex] = None,
     ) -> Tuple[pd.DataFrame, int]:
         """Remove registros presentes no arquivo de baixa."""
         if not self.remover_por_baixa:
@@ -310,7 +338,10 @@ class DevolucaoProcessor:
                 return df, 0
 
         try:
-            df_baixa = self.io.read(baixa_path)
+            df_baixa = self.io.read(
+                baixa_path,
+                columns=[self.ch_max, "CHAVE", "PARCELA", "NUMERO_DOC", "NUMERO DOC"],
+            )
         except Exception as exc:
             self.logger.warning("Falha ao carregar baixa %s: %s", baixa_path, exc)
             return df, 0
@@ -331,24 +362,17 @@ class DevolucaoProcessor:
             )
             return df, 0
 
-        # Criar conjunto de chaves da baixa
-        chaves_baixa = set(
-            df_baixa[coluna_baixa]
-            .astype(str)
-            .str.strip()
-            .dropna()
-            .tolist()
-        )
+        # Índice de chaves da baixa
+        indice_baixa = key_index_for(df_baixa, coluna_baixa, baixa_path)
 
-        if not chaves_baixa:
+        if len(indice_baixa) == 0:
             return df, 0
 
         # Filtrar registros
-        serie_dev = df[self.ch_max].astype(str).str.strip()
-        mask = ~serie_dev.isin(chaves_baixa)
-        removidos = int((~mask).sum())
-
-        return df.loc[mask].copy(), removidos
+        df_out = procv_left_minus_right(
+            df, df_baixa, self.ch_max, coluna_baixa, max_index, indice_baixa
+        )
+        return df_out, len(df) - len(df_out)
 
     def _carregar_cpfs_judiciais(self) -> None:
         """Carrega CPFs/CNPJs de clientes judiciais."""
@@ -365,25 +389,24 @@ class DevolucaoProcessor:
             self._judicial_cpfs = set()
             return
 
+        def ler_coluna_cpf(path: Path) -> Optional[pd.Series]:
+            df_judicial = self.io.read(path)
+            # Procurar coluna de CPF/CNPJ
+            cpf_columns = [
+                col for col in df_judicial.columns
+                if "CPF" in str(col).upper() or "CNPJ" in str(col).upper()
+            ]
+            return df_judicial[cpf_columns[0]] if cpf_columns else None
+
         try:
-            df_judicial = self.io.read(judicial_file)
+            # Cache do processo: o arquivo só é relido quando muda
+            docs = document_set(judicial_file, "CPF|CNPJ", CPF_CNPJ, ler_coluna_cpf)
         except Exception as exc:
             self.logger.warning("Falha ao carregar clientes judiciais: %s", exc)
             self._judicial_cpfs = set()
             return
 
-        # Procurar coluna de CPF/CNPJ
-        cpf_columns = [
-            col for col in df_judicial.columns
-            if "CPF" in str(col).upper() or "CNPJ" in str(col).upper()
-        ]
-        if not cpf_columns:
-            self._judicial_cpfs = set()
-            return
-
-        cpfs_norm = digits_only(df_judicial[cpf_columns[0]].dropna())
-        cpfs_valid = cpfs_norm[cpfs_norm.str.len().isin({11, 14})]
-        self._judicial_cpfs = set(cpfs_valid.tolist())
+        self._judicial_cpfs = docs.values if docs is not None else set()
 
     def _dividir_carteiras(
         self,
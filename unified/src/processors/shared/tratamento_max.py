@@ -11,7 +11,7 @@ from typing import Dict, List
 import pandas as pd
 
 from src.config.loader import ConfigLoader, LoadedConfig
-from src.utils.io import DatasetIO
+from src.utils.io import DatasetIO, zip_options
 from src.utils.logger import get_logger
 from src.utils.output_formatter import format_treatment_output
 from src.utils.path_manager import PathManager
@@ -42,7 +42,7 @@ class MaxProcessor:
         global_cfg = config.get("global", {})
         self.encoding = global_cfg.get("encoding", "utf-8-sig")
         self.separator = global_cfg.get("csv_separator", ",")
-        self.io = DatasetIO(separator=self.separator, encoding=self.encoding)
+        self.io = DatasetIO(separator=self.separator, encoding=self.encoding, **zip_options(config))
 
         self.input_dir = self.paths.resolve_input("base_max", "data/input/base_max")
         self.output_dir = self.paths.resolve_output("max_tratada", "max_tratada")
@@ -60,7 +60,7 @@ class MaxProcessor:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         csv_name = f"max_tratada_{timestamp}.csv"
         zip_path = self.output_dir / f"max_tratada_{timestamp}.zip"
-        self.io.write_zip({csv_name: df_valid}, zip_path)
+        self.io.write_zip({csv_name: df_valid}, zip_path, sidecar=True)
 
         zip_incons = None
         if not df_incons.empty:
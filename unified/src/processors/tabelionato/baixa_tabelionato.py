@@ -15,6 +15,7 @@ import os
 
 import pandas as pd
 
+from src.utils.anti_join import KeyIndex, key_index_for, procv_left_minus_right
 from src.utils.console import format_duration, format_int, print_section, suppress_console_info
 from src.utils.logger_config import (
     get_logger,
@@ -207,7 +208,12 @@ def filtrar_max_status_aberto(df_max: pd.DataFrame) -> pd.DataFrame:
         logger.error("Erro ao filtrar status aberto: %s", e)
         raise
 
-def identificar_diferenca_max_tabelionato(df_max: pd.DataFrame, df_tabelionato: pd.DataFrame) -> pd.DataFrame:
+def identificar_diferenca_max_tabelionato(
+    df_max: pd.DataFrame,
+    df_tabelionato: pd.DataFrame,
+    indice_max: Optional[KeyIndex] = None,
+    indice_tabelionato: Optional[KeyIndex] = None,
+) -> pd.DataFrame:
     """
     Identifica protocolos que esto na MAX mas no esto no Tabelionato.
     (Operao contrria ao batimento)
@@ -215,24 +221,21 @@ def identificar_diferenca_max_tabelionato(df_max: pd.DataFrame, df_tabelionato:
     Args:
         df_max: DataFrame da base MAX tratada (filtrada por status aberto)
         df_tabelionato: DataFrame da base Tabelionato tratada
+        indice_max: KeyIndex da base MAX completa (opcional)
+        indice_tabelionato: KeyIndex da base Tabelionato completa (opcional)
         
     Returns:
         DataFrame com protocolos que esto apenas na MAX
     """
     try:
         # Usar coluna CHAVE para comparao (comum em ambas as bases)
-        chaves_max = set(df_max['CHAVE'].dropna())
-        chaves_tabelionato = set(df_tabelionato['CHAVE'].dropna())
-        
-        # Chaves que esto na MAX mas no no Tabelionato
-        chaves_diferenca = chaves_max - chaves_tabelionato
-        
-        logger.info("Chaves na MAX: %s", len(chaves_max))
-        logger.info("Chaves no Tabelionato: %s", len(chaves_tabelionato))
-        logger.info("Chaves apenas na MAX: %s", len(chaves_diferenca))
+        df_resultado = procv_left_minus_right(
+            df_max, df_tabelionato, 'CHAVE', 'CHAVE', indice_max, indice_tabelionato
+        )
 
-        # Filtrar DataFrame da MAX para manter apenas as chaves da diferena
-        df_resultado = df_max[df_max['CHAVE'].isin(chaves_diferenca)].copy()
+        logger.info("Chaves na MAX: %s", df_max['CHAVE'].nunique())
+        logger.info("Chaves no Tabelionato: %s", df_tabelionato['CHAVE'].nunique())
+        logger.info("Chaves apenas na MAX: %s", df_resultado['CHAVE'].nunique())
 
         logger.info("Registros finais aps diferena: %s", len(df_resultado))
         return df_resultado
@@ -484,7 +487,12 @@ def executar_processo_baixa() -> ResultadoBaixa:
 
         # 3. Identificar diferena (MAX - Tabelionato)
         logger.info("3. Identificando protocolos apenas na MAX...")
-        df_diferenca = identificar_diferenca_max_tabelionato(df_max_aberto, df_tabelionato)
+        df_diferenca = identificar_diferenca_max_tabelionato(
+            df_max_aberto,
+            df_tabelionato,
+            key_index_for(df_max, 'CHAVE', caminho_max),
+            key_index_for(df_tabelionato, 'CHAVE', caminho_tabelionato),
+        )
 
         validacao_origem_max = localizar_chaves_ausentes(
             df_diferenca,
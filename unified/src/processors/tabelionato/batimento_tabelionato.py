@@ -12,6 +12,7 @@ from datetime import datetime
 import pandas as pd
 import zipfile
 
+from src.utils.anti_join import key_index_for, procv_left_minus_right
 from src.utils.console import format_duration, format_int, print_section, suppress_console_info
 from src.utils.formatting import formatar_moeda_serie
 from src.utils.logger_config import (
@@ -58,6 +59,7 @@ class TabelionatoBatimento:
         self.documentos_campanha78_abertos: set[str] = set()
         self.metricas_campanha78 = {"documentos_max": 0, "realocados": 0}
         self.contagem_campanhas: dict[str, int] = {}
+        self.arquivos_origem: dict[str, Path] = {}
     
     def carregar_base_tabelionato(self):
         """Carrega base Tabelionato tratada."""
@@ -75,6 +77,7 @@ class TabelionatoBatimento:
         
         arquivo_mais_recente = max(arquivos, key=lambda x: x.stat().st_mtime)
         self.logger.info(f"Carregando Tabelionato: {arquivo_mais_recente.name}")
+        self.arquivos_origem['tabelionato'] = arquivo_mais_recente
         
         with zipfile.ZipFile(arquivo_mais_recente, 'r') as zip_file:
             csv_files = [f for f in zip_file.namelist() if f.endswith('.csv')]
@@ -101,6 +104,7 @@ class TabelionatoBatimento:
 
         arquivo_mais_recente = max(arquivos, key=lambda x: x.stat().st_mtime)
         self.logger.info(f"Carregando MAX: {arquivo_mais_recente.name}")
+        self.arquivos_origem['max'] = arquivo_mais_recente
         
         with zipfile.ZipFile(arquivo_mais_recente, 'r') as zip_file:
             csv_files = [f for f in zip_file.namelist() if f.endswith('.csv')]
@@ -293,14 +297,15 @@ class TabelionatoBatimento:
                 "Coluna CHAVE ausente na base MAX tratada para cruzamento com Tabelionato"
             )
 
-        # Implementar anti-join isolado para Tabelionato
-        def _procv_tabelionato_menos_max(df_tabelionato, df_max):
-            """Anti-join isolado: retorna registros do Tabelionato no presentes no MAX."""
-            max_keys = set(df_max['CHAVE'].astype(str).str.strip().dropna())
-            mask = ~df_tabelionato['CHAVE'].astype(str).str.strip().isin(max_keys)
-            return df_tabelionato.loc[mask].copy()
-        
-        df_nao_encontradas = _procv_tabelionato_menos_max(df_tabelionato, df_max)
+        # Anti-join Tabelionato − MAX reaproveitando os índices de chave das bases tratadas
+        df_nao_encontradas = procv_left_minus_right(
+            df_tabelionato,
+            df_max,
+            'CHAVE',
+            'CHAVE',
+            key_index_for(df_tabelionato, 'CHAVE', self.arquivos_origem.get('tabelionato')),
+            key_index_for(df_max, 'CHAVE', self.arquivos_origem.get('max')),
+        )
         
         # Registrar informao sobre duplicados APENAS nos registros pendentes
         if not df_nao_encontradas.empty:
@@ -28,6 +28,7 @@ PARENT_BASE = BASE.parent
 # Carregar .env da raiz do projeto
 load_dotenv(PARENT_BASE / ".env")
 
+from src.utils.io import write_csv_batches_member  # type: ignore
 from src.utils.sql_conn import get_std_connection  # type: ignore
 from src.utils.queries_tabelionato import SQL_MAX_TABELIONATO  # type: ignore
 
@@ -82,25 +83,27 @@ def extract_max_tabelionato_data(profile: str = 'tabelionato'):
 
     try:
         logger.info('Executando consulta MAX Tabelionato no banco de dados...')
-        df = conn.execute_query(SQL_MAX_TABELIONATO)
-        if df is None or df.empty:
-            logger.error('Nenhum dado retornado pela consulta. Confirme a conexao (VPN ativa) e execute novamente.')
-            return None, 0
-
-        registros = len(df)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         csv_name = f'MaxSmart_Tabelionato_{timestamp}.csv'
         zip_path = output_dir / output_filename
-        temp_csv = output_dir / csv_name
-
-        # Salvar CSV temporrio
-        df.to_csv(temp_csv, index=False, encoding='utf-8-sig', sep=';')
-        logger.info('CSV temporario gerado: %s', temp_csv)
+        parcial = output_dir / f'{output_filename}.partial'
+
+        # Lotes do fetchmany vao direto para o membro CSV do ZIP
+        try:
+            with zipfile.ZipFile(parcial, 'w', zipfile.ZIP_DEFLATED) as zf:
+                registros = write_csv_batches_member(
+                    zf, csv_name, conn.iter_query(SQL_MAX_TABELIONATO), 'utf-8-sig', sep=';'
+                )
+        except Exception as exc:
+            parcial.unlink(missing_ok=True)
+            logger.error('Falha ao executar a consulta MAX Tabelionato: %s', exc)
+            return None, 0
 
-        # Compactar em ZIP
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.write(temp_csv, csv_name)
-        temp_csv.unlink()
+        if not registros:
+            parcial.unlink(missing_ok=True)
+            logger.error('Nenhum dado retornado pela consulta. Confirme a conexao (VPN ativa) e execute novamente.')
+            return None, 0
+        parcial.replace(zip_path)
 
         logger.info('Arquivo compactado salvo em: %s', zip_path)
         logger.info('Registros extraidos: %s', f"{registros:,}")
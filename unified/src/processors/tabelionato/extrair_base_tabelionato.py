@@ -2,17 +2,17 @@
 # -*- coding: utf-8 -*-
 """Processador de arquivos RAR/ZIP do Tabelionato - Converte TXT extrado para CSV/ZIP."""
 
+import io
 import os
 import sys
 import zipfile
 import csv
 import imaplib
-import email
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, List, Tuple
+from typing import BinaryIO, Callable, Optional, List, Tuple
 import re
 import unicodedata
 from email.header import decode_header
@@ -29,7 +29,18 @@ load_dotenv(PARENT_BASE / ".env")
 
 # Imports diretos via pacote src (fail-fast)
 
-from src.utils.archives import ensure_7zip_ready, extract_with_7zip
+from src.utils.archives import ensure_7zip_ready, extract_with_7zip, stream_with_7zip
+from src.utils.imap_cache import (
+    AttachmentCache,
+    AttachmentPart,
+    IMAPPool,
+    fetch_attachment,
+    fetch_bodystructure,
+    fetch_headers,
+    fetch_summaries,
+    search_uids,
+    select_mailbox,
+)
 from src.utils.console import format_duration, format_int, print_section, suppress_console_info
 from src.utils.logger_config import get_logger
 logger = get_logger()
@@ -39,6 +50,8 @@ PROJECT_ROOT = Path(__file__).parent.parent
 INPUT_DIR = PROJECT_ROOT / "data" / "input" / "tabelionato"
 INPUT_DIR_CUSTAS = PROJECT_ROOT / "data" / "input" / "tabelionato custas"
 OUTPUT_DIR = PROJECT_ROOT / "data" / "output" / "tabelionato_tratada"
+# Anexos ja baixados, por (caixa, UIDVALIDITY, UID, parte)
+IMAP_CACHE_DIR = Path(os.getenv('TABELIONATO_IMAP_CACHE_DIR') or PROJECT_ROOT / "data" / "cache" / "imap")
 
 
 @dataclass
@@ -86,6 +99,12 @@ class EmailDownloader:
         if not self.subject_tokens:
             self.subject_tokens = [self._normalize_text(self.subject_keyword)]
         self.attachment_filename = 'Cobrana'
+        self.mailbox = 'INBOX'
+        self.uidvalidity: Optional[int] = None
+        self.cache = AttachmentCache(IMAP_CACHE_DIR)
+        # Busca em lote: cabecalhos de todos os candidatos num FETCH so
+        self.busca_em_lote = os.getenv('TABELIONATO_IMAP_LOTE', '1') == '1'
+        self.conexoes_imap = max(int(os.getenv('TABELIONATO_IMAP_CONEXOES', '2') or 2), 1)
         logger.info(f"Conta IMAP utilizada: {self.email_user}")
         
         # Validar configuraes
@@ -129,24 +148,19 @@ class EmailDownloader:
         return decoded_string
     
     def buscar_emails_recentes(self, mail: imaplib.IMAP4_SSL, dias: int = 7) -> List[str]:
-        """Busca emails do remetente especificado (sem filtro SINCE para evitar confusao)."""
+        """Busca UIDs dos emails do remetente especificado (sem filtro SINCE para evitar confusao)."""
         try:
-            mail.select('INBOX')
+            # Somente leitura: os FETCH usam PEEK e nao marcam como lido
+            self.uidvalidity = select_mailbox(mail, self.mailbox)
             
             # Critrio de busca simplificado: apenas por remetente
             criterio = f'(FROM "{self.email_sender}")'
             logger.info(f"Buscando emails com criterio: {criterio}")
             
-            status, messages = mail.search(None, criterio)
-            
-            if status != 'OK':
-                logger.warning("Nenhum email encontrado")
-                return []
-            
-            email_ids = messages[0].split()
+            email_ids = search_uids(mail, criterio)
             logger.info(f"Encontrados {len(email_ids)} emails do remetente")
             
-            return [email_id.decode() for email_id in email_ids]
+            return email_ids
             
         except Exception as e:
             logger.error(f"Erro ao buscar emails: {e}")
@@ -190,17 +204,53 @@ class EmailDownloader:
         logger.error(f"No foi possvel extrair data do assunto: {assunto}")
         return None
     
-    def processar_email(self, mail: imaplib.IMAP4_SSL, email_id: str) -> Optional[Tuple[str, str]]:
-        """Processa um email especfico e baixa anexos relevantes."""
+    def filtrar_assuntos(self, assuntos: dict[str, str]) -> List[str]:
+        """Filtra, de uma vez, os emails cujo assunto tem todas as palavras obrigatorias.
+
+        Recebe ``{uid: assunto}`` e devolve os UIDs aceitos, na ordem recebida.
+        """
+        tokens = [token for token in self.subject_tokens if token]
+        aceitos = []
+        for email_id, assunto in assuntos.items():
+            assunto_normalizado = self._normalize_text(assunto)
+            if all(token in assunto_normalizado for token in tokens):
+                aceitos.append(email_id)
+            else:
+                logger.debug("Email %s ignorado - assunto normalizado: %s", email_id, assunto_normalizado)
+        logger.info(f"{len(aceitos)} de {len(assuntos)} emails com as palavras obrigatorias no assunto")
+        return aceitos
+
+    def _data_do_email(self, email_message, assunto: str) -> Optional[str]:
+        """Data EXATA do email (cabecalho Date); a do assunto so se ela falhar."""
+        from email.utils import parsedate_to_datetime
         try:
-            status, msg_data = mail.fetch(email_id, '(RFC822)')
-            
-            if status != 'OK':
-                logger.warning(f"No foi possvel buscar email {email_id}")
-                return None
-            
-            # Parse do email
-            email_message = email.message_from_bytes(msg_data[0][1])
+            data_hora_obj = parsedate_to_datetime(email_message['Date'])
+            # Converter para formato brasileiro - APENAS DATA
+            data_hora_email = data_hora_obj.strftime("%Y-%m-%d")
+            logger.info(f"Data EXATA do email: {data_hora_email}")
+            return data_hora_email
+        except Exception as e:
+            logger.error(f"Erro ao extrair data do email: {e}")
+            # Fallback para data do assunto apenas se falhar
+            return self.extrair_data_hora_assunto(assunto)
+
+    def processar_email(
+        self,
+        mail: imaplib.IMAP4_SSL,
+        email_id: str,
+        email_message=None,
+        partes: Optional[List[AttachmentPart]] = None,
+        pool: Optional[IMAPPool] = None,
+    ) -> Optional[Tuple[str, str]]:
+        """Processa um email especfico (por UID) e baixa anexos relevantes.
+
+        Busca so os cabecalhos e a BODYSTRUCTURE (ou usa os ja buscados em
+        lote); os anexos sao baixados parte a parte (ou lidos do cache local).
+        """
+        try:
+            # Apenas os cabecalhos usados no filtro, sem o corpo
+            if email_message is None:
+                email_message = fetch_headers(mail, email_id)
             
             # Decodificar assunto
             assunto = self.decodificar_header(email_message['Subject'])
@@ -220,19 +270,12 @@ class EmailDownloader:
                 return None
 
             # Usar data/hora EXATA do email (no do assunto)
-            from email.utils import parsedate_to_datetime
-            try:
-                data_hora_obj = parsedate_to_datetime(data_email)
-                # Converter para formato brasileiro - APENAS DATA
-                data_hora_email = data_hora_obj.strftime("%Y-%m-%d")
-                logger.info(f"Data EXATA do email: {data_hora_email}")
-            except Exception as e:
-                logger.error(f"Erro ao extrair data do email: {e}")
-                # Fallback para data do assunto apenas se falhar
-                data_hora_email = self.extrair_data_hora_assunto(assunto)
+            data_hora_email = self._data_do_email(email_message, assunto)
             
             # Processar anexos
-            anexo_baixado = self.processar_anexos(email_message, data_hora_email)
+            if partes is None:
+                partes = fetch_bodystructure(mail, email_id)
+            anexo_baixado = self.processar_anexos(mail, email_id, partes, data_hora_email, pool=pool)
             
             if anexo_baixado:
                 return anexo_baixado, data_hora_email
@@ -243,16 +286,26 @@ class EmailDownloader:
             logger.error(f"Erro ao processar email {email_id}: {e}")
             return None
     
-    def processar_anexos(self, email_message, data_hora_email: str) -> Optional[str]:
-        """Processa anexos do email e salva o arquivo relevante."""
+    def processar_anexos(
+        self,
+        mail: imaplib.IMAP4_SSL,
+        email_id: str,
+        partes: List[AttachmentPart],
+        data_hora_email: str,
+        pool: Optional[IMAPPool] = None,
+    ) -> Optional[str]:
+        """Processa anexos do email (partes da BODYSTRUCTURE) e salva o arquivo relevante.
+
+        As partes sao baixadas antes de remover os arquivos anteriores; com
+        ``pool``, cada uma em sua propria conexao IMAP.
+        """
         anexos_encontrados = []
         
-        for part in email_message.walk():
-            if part.get_content_disposition() == 'attachment':
-                filename = part.get_filename()
+        for part in partes:
+            if part.disposition == 'attachment' or part.filename:
+                filename = part.filename
                 
                 if filename:
-                    filename = self.decodificar_header(filename)
                     logger.info(f"Anexo encontrado: {filename}")
                     
                     # Verificar se  anexo do Tabelionato (Cobrana ou RecebimentoCustas)
@@ -277,11 +330,36 @@ class EmailDownloader:
             logger.warning("Nenhum anexo vlido encontrado (Cobrana ou RecebimentoCustas)")
             return None
         
+        # Baixar so as partes dos anexos (ou ler do cache), em paralelo com pool
+        def baixar(conexao: imaplib.IMAP4_SSL, part: AttachmentPart):
+            try:
+                conteudo, do_cache = fetch_attachment(
+                    conexao,
+                    email_id,
+                    part,
+                    mailbox=self.mailbox,
+                    uidvalidity=self.uidvalidity,
+                    cache=self.cache,
+                )
+            except Exception as e:
+                return e
+            if do_cache:
+                logger.info(f"Anexo '{part.filename}' lido do cache local (UID {email_id})")
+            return conteudo
+
+        partes_anexos = [part for _, _, part in anexos_encontrados]
+        if pool is not None:
+            conteudos = pool.map(baixar, partes_anexos)
+        else:
+            conteudos = [baixar(mail, part) for part in partes_anexos]
+
         # Processar todos os anexos encontrados
         arquivos_salvos = []
         
-        for tipo_anexo, filename, part in anexos_encontrados:
+        for (tipo_anexo, filename, part), conteudo in zip(anexos_encontrados, conteudos):
             try:
+                if isinstance(conteudo, Exception):
+                    raise conteudo
                 if tipo_anexo == 'cobranca':
                     # Garantir que o diretrio de cobrana existe
                     INPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -311,7 +389,7 @@ class EmailDownloader:
                 
                 # Salvar contedo
                 with open(caminho_arquivo, 'wb') as f:
-                    f.write(part.get_payload(decode=True))
+                    f.write(conteudo)
                 
                 tamanho_mb = caminho_arquivo.stat().st_size / (1024 * 1024)
                 logger.info(f"Anexo '{tipo_anexo}' salvo como: {caminho_arquivo}")
@@ -325,6 +403,30 @@ class EmailDownloader:
         # Retornar o primeiro arquivo salvo (compatibilidade com cdigo existente)
         return arquivos_salvos[0] if arquivos_salvos else None
     
+    def processar_candidatos(self, mail: imaplib.IMAP4_SSL, email_ids: List[str]) -> Optional[Tuple[str, str]]:
+        """Filtra todos os candidatos de uma vez e processa o mais recente valido.
+
+        Cabecalhos e BODYSTRUCTURE de todos os UIDs vem num unico FETCH (em
+        lotes de 500); o filtro de assunto roda sobre todos e so os anexos do
+        email escolhido sao baixados, em ate ``conexoes_imap`` conexoes.
+        """
+        resumos = fetch_summaries(mail, email_ids)
+        assuntos = {
+            email_id: self.decodificar_header(cabecalho['Subject'])
+            for email_id, (cabecalho, _) in resumos.items()
+        }
+        validos = self.filtrar_assuntos(assuntos)
+        if not validos:
+            logger.warning("Nenhum email com as palavras obrigatorias no assunto")
+            return None
+
+        # Processar APENAS o email valido mais recente (ultimo da lista)
+        email_id = validos[-1]
+        logger.info(f"Processando o email valido mais recente UID: {email_id}")
+        cabecalho, partes = resumos[email_id]
+        with IMAPPool(self.conectar_imap, self.mailbox, self.uidvalidity, self.conexoes_imap, first=mail) as pool:
+            return self.processar_email(mail, email_id, cabecalho, partes, pool=pool)
+
     def baixar_emails_tabelionato(self, dias: int = 7) -> List[Tuple[str, str]]:
         """Baixa emails do Tabelionato dos ltimos N dias."""
         logger.info("=" * 60)
@@ -344,10 +446,16 @@ class EmailDownloader:
                 logger.info("Nenhum email encontrado para download")
                 return arquivos_baixados
             
+            if self.busca_em_lote:
+                resultado = self.processar_candidatos(mail, email_ids)
+                if resultado:
+                    arquivos_baixados.append(resultado)
+                    logger.info(f"Email mais recente valido processado: {resultado[0]}")
+            
             # Processar APENAS o email mais recente (ltimo da lista)
-            if email_ids:
+            elif email_ids:
                 email_id = email_ids[-1]  # ltimo email (mais recente)
-                logger.info(f"Processando APENAS o email mais recente ID: {email_id}")
+                logger.info(f"Processando APENAS o email mais recente UID: {email_id}")
                 
                 resultado = self.processar_email(mail, email_id)
                 
@@ -371,17 +479,26 @@ class EmailDownloader:
             return arquivos_baixados
 
 
-def processar_arquivo_custas(txt_path: Path, data_hora_email: str, debug: bool = False) -> Optional[Path]:
-    """Processa arquivo de custas TXT/CSV e gera arquivo ZIP final."""
+def processar_arquivo_custas(
+    txt_path: Path | BinaryIO,
+    data_hora_email: str,
+    debug: bool = False,
+    *,
+    nome: str | None = None,
+) -> Optional[Path]:
+    """Processa arquivo de custas TXT/CSV e gera arquivo ZIP final.
+
+    ``txt_path`` pode ser um stream binario (ex.: saida do 7-Zip); nesse caso
+    ``nome`` informa o arquivo de origem, usado para escolher o separador.
+    """
     import pandas as pd
-    import re
-    from datetime import datetime
     
     try:
-        logger.info(f"Processando arquivo de custas: {txt_path}")
+        nome_origem = Path(nome) if nome else Path(txt_path)
+        logger.info(f"Processando arquivo de custas: {nome_origem}")
         
         # Ler o arquivo CSV/TXT
-        if txt_path.suffix.lower() == '.csv':
+        if nome_origem.suffix.lower() == '.csv':
             df = pd.read_csv(txt_path, encoding='utf-8-sig', sep=';')
         else:
             # Assumir que  um arquivo de largura fixa ou delimitado
@@ -497,8 +614,18 @@ def processar_arquivo_custas(txt_path: Path, data_hora_email: str, debug: bool =
         return None
 
 
-def processar_arquivo_txt(txt_path: Path, data_hora_email: str, debug: bool = False) -> Optional[Path]:
-    """Processa arquivo TXT/CSV do Tabelionato e converte para Tabelionato.zip."""
+def processar_arquivo_txt(
+    txt_path: Path | BinaryIO,
+    data_hora_email: str,
+    debug: bool = False,
+    *,
+    nome: str | None = None,
+) -> Optional[Path]:
+    """Processa arquivo TXT/CSV do Tabelionato e converte para Tabelionato.zip.
+
+    ``txt_path`` pode ser um stream binario (ex.: saida do 7-Zip), com
+    ``nome`` identificando o arquivo de origem nos logs.
+    """
 
     column_names = [
         'Protocolo', 'VrTitulo', 'DtAnuencia', 'Devedor',
@@ -554,7 +681,7 @@ def processar_arquivo_txt(txt_path: Path, data_hora_email: str, debug: bool = Fa
         return cleaned if cleaned else ''
 
     try:
-        logger.info(f"Processando arquivo: {txt_path}")
+        logger.info(f"Processando arquivo: {nome or txt_path}")
 
         column_names = [
             'Protocolo', 'VrTitulo', 'DtAnuencia', 'Devedor',
@@ -565,8 +692,13 @@ def processar_arquivo_txt(txt_path: Path, data_hora_email: str, debug: bool = Fa
         registros: List[List[str]] = []
         inconsistencias: List[dict] = []
 
-        with open(txt_path, 'r', encoding='utf-8-sig', errors='ignore') as f:
-            linhas = f.readlines()
+        if isinstance(txt_path, (str, Path)):
+            with open(txt_path, 'r', encoding='utf-8-sig', errors='ignore') as f:
+                linhas = f.readlines()
+        else:
+            leitor = io.TextIOWrapper(txt_path, encoding='utf-8-sig', errors='ignore')
+            linhas = leitor.readlines()
+            leitor.detach()  # o stream pertence a quem o abriu
 
         if not linhas:
             logger.error('Arquivo vazio ou ilegvel: nenhuma linha encontrada')
@@ -923,6 +1055,28 @@ def extrair_rar_com_senha(rar_path: Path, senha: str = "Mf4tab@") -> Optional[Pa
     return None
 
 
+def processar_compactado_em_stream(
+    arquivo: Path,
+    processar: Callable[..., Optional[Path]],
+    data_hora_email: str,
+    senha: str = "Mf4tab@",
+) -> Optional[Path]:
+    """Descompacta o TXT/CSV de ``arquivo`` com ``7z -so`` direto para ``processar``.
+
+    Evita gravar e reler o conteudo descompactado; uma falha do 7-Zip (senha,
+    arquivo corrompido) interrompe a leitura antes de qualquer saida ser gerada.
+    """
+    try:
+        with stream_with_7zip(arquivo, senha=senha) as (membro, fluxo):
+            logger.info("Processando %s direto de %s", membro, arquivo.name)
+            return processar(fluxo, data_hora_email, nome=membro)
+    except FileNotFoundError as exc:
+        logger.error("Ferramenta 7-Zip nao localizada: %s", exc)
+    except RuntimeError as exc:
+        logger.error("Falha ao extrair %s: %s", arquivo, exc)
+    return None
+
+
 def processar_cobranca(
     debug_mode: bool,
     data_hora_email: str | None = None,
@@ -956,31 +1110,38 @@ def processar_cobranca(
     logger.info(f"Tamanho: {arquivo.stat().st_size / (1024*1024):.2f} MB")
 
     suffix = arquivo.suffix.lower()
-    if suffix == '.zip':
-        txt_path = extrair_zip_com_senha(arquivo)
-    elif suffix == '.rar':
-        txt_path = extrair_rar_com_senha(arquivo)
-    elif suffix in {'.txt', '.csv'}:
-        txt_path = arquivo
+    if suffix in {'.zip', '.rar'} and not debug_mode:
+        # Sem debug o TXT nao precisa ficar em disco: o 7-Zip descompacta direto para o parser
+        if not data_hora_email:
+            logger.error("Data/hora do email nao disponivel; interrompendo processamento de cobranca para evitar data incorreta.")
+            return
+        resultado = processar_compactado_em_stream(arquivo, processar_arquivo_txt, data_hora_email)
     else:
-        logger.error(f"Formato de arquivo nao suportado: {arquivo.suffix}")
-        return
+        if suffix == '.zip':
+            txt_path = extrair_zip_com_senha(arquivo)
+        elif suffix == '.rar':
+            txt_path = extrair_rar_com_senha(arquivo)
+        elif suffix in {'.txt', '.csv'}:
+            txt_path = arquivo
+        else:
+            logger.error(f"Formato de arquivo nao suportado: {arquivo.suffix}")
+            return
 
-    if not txt_path or not txt_path.exists():
-        logger.error("Nao foi possivel extrair o arquivo de cobranca.")
-        return
+        if not txt_path or not txt_path.exists():
+            logger.error("Nao foi possivel extrair o arquivo de cobranca.")
+            return
 
-    logger.info(f"Processando arquivo: {txt_path}")
+        logger.info(f"Processando arquivo: {txt_path}")
 
-    if not data_hora_email:
-        logger.error("Data/hora do email nao disponivel; interrompendo processamento de cobranca para evitar data incorreta.")
-        return
+        if not data_hora_email:
+            logger.error("Data/hora do email nao disponivel; interrompendo processamento de cobranca para evitar data incorreta.")
+            return
 
-    resultado = processar_arquivo_txt(txt_path, data_hora_email, debug=debug_mode)
+        resultado = processar_arquivo_txt(txt_path, data_hora_email, debug=debug_mode)
 
-    if not debug_mode and txt_path.exists() and txt_path != arquivo:
-        txt_path.unlink()
-        logger.info(f"Arquivo temporario removido: {txt_path}")
+        if not debug_mode and txt_path.exists() and txt_path != arquivo:
+            txt_path.unlink()
+            logger.info(f"Arquivo temporario removido: {txt_path}")
 
     if resultado and arquivo.exists() and not debug_mode and arquivo != resultado:
         arquivo.unlink()
@@ -1019,31 +1180,38 @@ def processar_custas(
     logger.info(f"Tamanho: {arquivo.stat().st_size / (1024*1024):.2f} MB")
 
     suffix = arquivo.suffix.lower()
-    if suffix == '.zip':
-        txt_path = extrair_zip_com_senha_custas(arquivo)
-    elif suffix == '.rar':
-        txt_path = extrair_rar_com_senha_custas(arquivo)
-    elif suffix in {'.txt', '.csv'}:
-        txt_path = arquivo
+    if suffix in {'.zip', '.rar'} and not debug_mode:
+        # Sem debug o TXT nao precisa ficar em disco: o 7-Zip descompacta direto para o parser
+        if not data_hora_email:
+            logger.error("Data/hora do email nao disponivel; interrompendo processamento de custas para evitar data incorreta.")
+            return
+        resultado = processar_compactado_em_stream(arquivo, processar_arquivo_custas, data_hora_email)
     else:
-        logger.error(f"Formato de arquivo nao suportado: {arquivo.suffix}")
-        return
+        if suffix == '.zip':
+            txt_path = extrair_zip_com_senha_custas(arquivo)
+        elif suffix == '.rar':
+            txt_path = extrair_rar_com_senha_custas(arquivo)
+        elif suffix in {'.txt', '.csv'}:
+            txt_path = arquivo
+        else:
+            logger.error(f"Formato de arquivo nao suportado: {arquivo.suffix}")
+            return
 
-    if not txt_path or not txt_path.exists():
-        logger.error("Nao foi possivel extrair o arquivo de custas.")
-        return
+        if not txt_path or not txt_path.exists():
+            logger.error("Nao foi possivel extrair o arquivo de custas.")
+            return
 
-    logger.info(f"Processando arquivo de custas: {txt_path}")
+        logger.info(f"Processando arquivo de custas: {txt_path}")
 
-    if not data_hora_email:
-        logger.error("Data/hora do email nao disponivel; interrompendo processamento de custas para evitar data incorreta.")
-        return
+        if not data_hora_email:
+            logger.error("Data/hora do email nao disponivel; interrompendo processamento de custas para evitar data incorreta.")
+            return
 
-    resultado = processar_arquivo_custas(txt_path, data_hora_email, debug=debug_mode)
+        resultado = processar_arquivo_custas(txt_path, data_hora_email, debug=debug_mode)
 
-    if not debug_mode and txt_path.exists() and txt_path != arquivo:
-        txt_path.unlink()
-        logger.info(f"Arquivo temporario de custas removido: {txt_path}")
+        if not debug_mode and txt_path.exists() and txt_path != arquivo:
+            txt_path.unlink()
+            logger.info(f"Arquivo temporario de custas removido: {txt_path}")
 
     if resultado and arquivo.exists() and not debug_mode and arquivo != resultado:
         arquivo.unlink()
@@ -12,13 +12,15 @@ from dataclasses import dataclass
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+from typing import AbstractSet, Any, Dict, Iterable, Optional, Sequence, Tuple
 
 import pandas as pd
 
 from src.config.loader import ConfigLoader
 from src.io.file_manager import FileManager
 from src.io.packager import ExportacaoService
+from src.utils.anti_join import KeyIndex, key_index_for
+from src.utils.doc_sets import CPF_CNPJ, document_set
 from src.utils.filters import VicFilterApplier
 from src.utils import get_logger, log_section, digits_only, formatar_datas_serie
 
@@ -107,7 +109,7 @@ class BaixaProcessor:
         )
         self.campanha_override: Optional[str] = self.baixa_cfg.get("campanha")
 
-        self._judicial_cpfs: set[str] = set()
+        self._judicial_cpfs: AbstractSet[str] = set()
 
     # ------------------------------------------------------------------
     @staticmethod
@@ -146,10 +148,16 @@ class BaixaProcessor:
         )
 
     # ------------------------------------------------------------------
-    def _carregar_csv(self, caminho: Path | str) -> pd.DataFrame:
+    def _carregar_csv(
+        self, caminho: Path | str, colunas: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
         caminho_path = Path(caminho)
         self.logger.info("Carregando arquivo: %s", caminho_path)
-        df = self.file_manager.ler_csv_ou_zip(caminho_path)
+        df = self.file_manager.ler_csv_ou_zip(
+            caminho_path,
+            colunas=list(colunas) if colunas is not None else None,
+            tipado=True,
+        )
         self.logger.info("Arquivo carregado: %s registros", f"{len(df):,}")
         return df
 
@@ -212,33 +220,42 @@ class BaixaProcessor:
         return self._combinar_chave(df, combinacao, dataset)
 
     # ------------------------------------------------------------------
-    def _criar_chaves(
+    def _indice_chave(
         self,
-        df_vic: pd.DataFrame,
-        df_max: pd.DataFrame,
-    ) -> Tuple[pd.Series, pd.Series]:
-        chave_vic = self._serie_chave(
-            df_vic, self.chave_vic, self.combination_vic, "VIC"
-        )
-        chave_max = self._serie_chave(
-            df_max, self.chave_max, self.combination_max, "MAX"
-        )
-
-        return chave_vic.str.strip(), chave_max.str.strip()
+        df: pd.DataFrame,
+        preferida: str,
+        combinacao: Sequence[Sequence[str]],
+        dataset: str,
+        indice: Optional[KeyIndex],
+    ) -> KeyIndex:
+        """Reaproveita o índice da base completa quando a chave preferida é usada."""
+        if indice is not None and preferida in df.columns:
+            alinhado = indice.align(df.index)
+            if alinhado is not None and alinhado.keys.ne("").any():
+                return alinhado
+        serie = self._serie_chave(df, preferida, combinacao, dataset)
+        return KeyIndex.from_series(serie)
 
     # ------------------------------------------------------------------
     def _identificar_divergencias(
         self,
         df_vic: pd.DataFrame,
         df_max: pd.DataFrame,
+        vic_index: Optional[KeyIndex] = None,
+        max_index: Optional[KeyIndex] = None,
     ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
-        chave_vic, chave_max = self._criar_chaves(df_vic, df_max)
+        indice_vic = self._indice_chave(
+            df_vic, self.chave_vic, self.combination_vic, "VIC", vic_index
+        )
+        indice_max = self._indice_chave(
+            df_max, self.chave_max, self.combination_max, "MAX", max_index
+        )
+        chave_vic, chave_max = indice_vic.keys, indice_max.keys
 
         df_vic_local = df_vic.copy()
         df_vic_local[self.key_column_name] = chave_vic
 
-        conjunto_max = set(chave_max[chave_max != ""])
-        mask = df_vic_local[self.key_column_name].isin(conjunto_max)
+        mask = indice_vic.isin(indice_max, ignore_empty=True)
         divergentes = df_vic_local[mask].copy()
 
         metrics = {
@@ -412,15 +429,18 @@ class BaixaProcessor:
                 )
                 return
 
-            df_judicial = self.file_manager.ler_csv_ou_zip(judicial_file)
-            cpf_columns = [
-                col for col in df_judicial.columns if "CPF" in str(col).upper()
-            ]
-            if not cpf_columns:
+            def ler_coluna_cpf(path: Path) -> Optional[pd.Series]:
+                df_judicial = self.file_manager.ler_csv_ou_zip(path)
+                cpf_columns = [
+                    col for col in df_judicial.columns if "CPF" in str(col).upper()
+                ]
+                return df_judicial[cpf_columns[0]] if cpf_columns else None
+
+            # Cache do processo: o arquivo só é relido quando muda
+            docs = document_set(judicial_file, "CPF", CPF_CNPJ, ler_coluna_cpf)
+            if docs is None:
                 return
-            cpfs_norm = digits_only(df_judicial[cpf_columns[0]].dropna())
-            cpfs_valid = cpfs_norm[cpfs_norm.str.len().isin({11, 14})]
-            self._judicial_cpfs = set(cpfs_valid.tolist())
+            self._judicial_cpfs = docs.values
         except Exception as exc:  # pragma: no cover - logging auxiliar
             self.logger.warning("Falha ao carregar CPFs judiciais: %s", exc)
             self._judicial_cpfs = set()
@@ -515,13 +535,28 @@ class BaixaProcessor:
         inicio = datetime.now()
 
         df_vic_raw = self._carregar_csv(vic_path)
-        df_max_raw = self._carregar_csv(max_path)
+        # Da MAX a baixa usa só chave, status e tipo; o layout vem da VIC
+        colunas_max = [self.chave_max, "STATUS_TITULO", "TIPO_PARCELA", "TIPO_TITULO"]
+        colunas_max += [coluna for grupo in self.combination_max for coluna in grupo]
+        df_max_raw = self._carregar_csv(max_path, colunas=colunas_max)
 
         df_vic_filtrado, vic_metrics = self._aplicar_filtros_vic(df_vic_raw)
         df_max_filtrado, max_metrics = self._aplicar_filtros_max(df_max_raw)
 
+        # Índices de chave das bases completas (compartilhados com batimento e devolução)
+        vic_index = (
+            key_index_for(df_vic_raw, self.chave_vic, vic_path)
+            if self.chave_vic in df_vic_raw.columns
+            else None
+        )
+        max_index = (
+            key_index_for(df_max_raw, self.chave_max, max_path)
+            if self.chave_max in df_max_raw.columns
+            else None
+        )
+
         divergentes, cruzamento_metrics = self._identificar_divergencias(
-            df_vic_filtrado, df_max_filtrado
+            df_vic_filtrado, df_max_filtrado, vic_index, max_index
         )
 
         df_jud_raw, df_ext_raw = self._dividir_carteiras(divergentes)
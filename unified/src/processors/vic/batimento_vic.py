@@ -10,8 +10,9 @@ import logging
 import traceback
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, Union, Set
+from typing import AbstractSet, Dict, Any, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 from src.config.loader import ConfigLoader
@@ -19,8 +20,9 @@ from src.io.file_manager import FileManager
 from src.utils.validator import InconsistenciaManager
 from src.io.packager import ExportacaoService
 from src.utils.logger import get_logger, log_section
-from src.utils.anti_join import procv_vic_menos_max
+from src.utils.anti_join import KeyIndex, key_index_for, procv_vic_menos_max, resolve_key_index
 from src.utils.text import digits_only
+from src.utils.doc_sets import CPF, document_set
 from src.processors.vic import VicFilterApplier
 
 
@@ -57,15 +59,22 @@ class BatimentoProcessor:
         self.add_timestamp = self.global_config.get('add_timestamp', True)
 
         # CPFs judiciais
-        self.judicial_cpfs: Set[str] = set()
+        self.judicial_cpfs: AbstractSet[str] = set()
 
         self.logger.info("BatimentoProcessor inicializado com novos utilitários da Fase 1")
 
-    def carregar_arquivo(self, caminho: Union[str, Path]) -> pd.DataFrame:
-        """Carrega arquivo CSV ou extrai de ZIP usando FileManager."""
+    def carregar_arquivo(
+        self, caminho: Union[str, Path], colunas: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Carrega arquivo CSV ou extrai de ZIP usando FileManager.
+
+        ``colunas`` limita a leitura às colunas que a etapa usa.
+        """
         caminho = Path(caminho)
         if caminho.suffix.lower() == '.zip':
-            return self.file_manager.ler_csv_ou_zip(caminho)
+            return self.file_manager.ler_csv_ou_zip(caminho, colunas=colunas)
+        if colunas is not None:
+            return self.file_manager.ler_csv(caminho, usecols=lambda c: c in colunas)
         return self.file_manager.ler_csv(caminho)
 
     def carregar_cpfs_judiciais(self) -> None:
@@ -96,17 +105,22 @@ class BatimentoProcessor:
                 )
                 return
             self.logger.info(f"Carregando clientes judiciais: {judicial_file}")
-            df_judicial = self.file_manager.ler_csv_ou_zip(judicial_file)
-            cpf_columns = [col for col in df_judicial.columns if 'CPF' in col.upper()]
-            if not cpf_columns:
-                self.logger.warning(
-                    "Nenhuma coluna de CPF encontrada no arquivo judicial"
-                )
+
+            def ler_coluna_cpf(path: Path) -> Optional[pd.Series]:
+                df_judicial = self.file_manager.ler_csv_ou_zip(path)
+                cpf_columns = [col for col in df_judicial.columns if 'CPF' in col.upper()]
+                if not cpf_columns:
+                    self.logger.warning(
+                        "Nenhuma coluna de CPF encontrada no arquivo judicial"
+                    )
+                    return None
+                return df_judicial[cpf_columns[0]]
+
+            # Cache do processo: o arquivo só é relido quando muda
+            docs = document_set(judicial_file, "CPF", CPF, ler_coluna_cpf)
+            if docs is None:
                 return
-            cpfs_raw = df_judicial[cpf_columns[0]].dropna()
-            cpfs_normalized = digits_only(cpfs_raw)
-            cpfs_valid = cpfs_normalized[cpfs_normalized.str.len() == 11]
-            self.judicial_cpfs = set(cpfs_valid.tolist())
+            self.judicial_cpfs = docs.values
             self.logger.info(
                 f"CPFs judiciais carregados: {len(self.judicial_cpfs):,}"
             )
@@ -114,7 +128,13 @@ class BatimentoProcessor:
             self.logger.error(f"Erro ao carregar CPFs judiciais: {e}")
             self.judicial_cpfs = set()
 
-    def realizar_cruzamento(self, df_vic: pd.DataFrame, df_max: pd.DataFrame) -> pd.DataFrame:
+    def realizar_cruzamento(
+        self,
+        df_vic: pd.DataFrame,
+        df_max: pd.DataFrame,
+        vic_index: Optional[KeyIndex] = None,
+        max_index: Optional[KeyIndex] = None,
+    ) -> pd.DataFrame:
         """Identifica parcelas em aberto na VIC que não estão na MAX (left anti-join)."""
         self.logger.info("PROCV VIC−MAX: iniciando identificação...")
 
@@ -138,7 +158,9 @@ class BatimentoProcessor:
             )
             raise ValueError("CHAVE duplicada detectada na base VIC para batimento")
 
-        df_nao_encontradas = procv_vic_menos_max(df_vic, df_max_filtrado, 'CHAVE', 'PARCELA')
+        df_nao_encontradas = procv_vic_menos_max(
+            df_vic, df_max_filtrado, 'CHAVE', 'PARCELA', vic_index, max_index
+        )
 
         self.metrics_ultima_execucao = {
             'registros_vic': len(df_vic),
@@ -324,11 +346,24 @@ class BatimentoProcessor:
             )
 
             self.logger.info(f"Carregando dados MAX: {max_path}")
-            df_max = self.carregar_arquivo(max_path)
+            # Da MAX o batimento só usa a chave
+            df_max = self.carregar_arquivo(max_path, colunas=['PARCELA'])
             self.logger.info(f"MAX carregado: {len(df_max):,} registros")
 
+            # Índices de chave das bases completas (compartilhados com devolução e baixa)
+            vic_index = (
+                key_index_for(df_vic_raw, 'CHAVE', vic_path)
+                if 'CHAVE' in df_vic_raw.columns
+                else None
+            )
+            max_index = (
+                key_index_for(df_max, 'PARCELA', max_path)
+                if 'PARCELA' in df_max.columns
+                else None
+            )
+
             # Cruzamento
-            df_cross = self.realizar_cruzamento(df_vic, df_max)
+            df_cross = self.realizar_cruzamento(df_vic, df_max, vic_index, max_index)
 
             filtro_counts = {
                 'vic_registros_iniciais': vic_metrics.get('registros_iniciais', len(df_vic_raw)),
@@ -354,15 +389,15 @@ class BatimentoProcessor:
                 df_fmt, base_output, timestamp
             )
 
-            # Calcular validações
-            vic_keys = set(df_vic['CHAVE'].astype(str).str.strip())
+            # Calcular validações sobre os mesmos índices de chave do cruzamento
             max_df = getattr(self, '_max_filtrado', df_max)
-            max_keys = set(max_df['PARCELA'].astype(str).str.strip()) if 'PARCELA' in max_df.columns else set()
-            bat_keys = set(df_cross['CHAVE'].astype(str).str.strip()) if not df_cross.empty else set()
-            
-            validacao_subset = bat_keys.issubset(vic_keys)
-            validacao_disj = bat_keys.isdisjoint(max_keys)
-            validacao_forte = bat_keys == (vic_keys - max_keys)
+            vic_keys = resolve_key_index(df_vic, 'CHAVE', vic_index)
+            max_keys = resolve_key_index(max_df, 'PARCELA', max_index)
+            bat_keys = resolve_key_index(df_cross, 'CHAVE', vic_keys)
+
+            validacao_subset = bat_keys.difference(vic_keys).size == 0
+            validacao_disj = bat_keys.intersection(max_keys).size == 0
+            validacao_forte = np.array_equal(bat_keys.members, vic_keys.difference(max_keys))
 
             duracao = (datetime.now() - inicio).total_seconds()
             stats = {
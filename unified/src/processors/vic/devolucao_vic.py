@@ -10,8 +10,9 @@ from dataclasses import dataclass
 from datetime import datetime
 import logging
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+from typing import AbstractSet, Any, Dict, Iterable, List, Optional, Sequence, Union
 
+import numpy as np
 import pandas as pd
 
 from src.config.loader import ConfigLoader
@@ -19,8 +20,9 @@ from src.io.packager import ExportacaoService
 from src.io.file_manager import FileManager
 from src.utils.validator import InconsistenciaManager
 from src.utils.logger import get_logger, log_section
-from src.utils.anti_join import procv_max_menos_vic
+from src.utils.anti_join import KeyIndex, key_index_for, procv_max_menos_vic, resolve_key_index
 from src.utils.text import normalize_ascii_upper, digits_only
+from src.utils.doc_sets import CPF_CNPJ, document_set
 from src.utils.helpers import primeiro_valor, normalizar_data_string, extrair_data_referencia
 from src.processors.vic import VicFilterApplier
 
@@ -90,15 +92,19 @@ class DevolucaoProcessor:
         if not self.cnpj_credor:
             raise ValueError('CNPJ da empresa não configurado. Defina global.empresa.cnpj no config.yaml')
 
-        self._judicial_cpfs: set[str] = set()
+        self._judicial_cpfs: AbstractSet[str] = set()
 
         self.logger.info("DevolucaoProcessor inicializado")
 
     # ------------------------------------------------------------------
     def carregar_arquivo(self, caminho: Union[str, Path]) -> pd.DataFrame:
-        """Lê CSV ou ZIP usando o ``FileManager``."""
+        """Lê CSV ou ZIP usando o ``FileManager``.
 
-        return self.file_manager.ler_csv_ou_zip(Path(caminho))
+        Datas das bases tratadas chegam como ``datetime64`` quando vêm da
+        memória ou do sidecar colunar (aging e layout não as reinterpretam).
+        """
+
+        return self.file_manager.ler_csv_ou_zip(Path(caminho), tipado=True)
 
     # ------------------------------------------------------------------
     @staticmethod
@@ -199,19 +205,28 @@ class DevolucaoProcessor:
 
     # ------------------------------------------------------------------
     def _remover_registros_baixa(
-        self, df: pd.DataFrame, baixa_paths: Optional[Union[Dict[str, Any], Sequence[Union[str, Path]], str, Path]]
+        self,
+        df: pd.DataFrame,
+        baixa_paths: Optional[Union[Dict[str, Any], Sequence[Union[str, Path]], str, Path]],
+        max_index: Optional[KeyIndex] = None,
     ) -> tuple[pd.DataFrame, int]:
         caminhos = self._coletar_caminhos_baixa(baixa_paths)
         if not caminhos:
             return df, 0
 
-        chaves_baixa: set[str] = set()
+        # Da baixa só interessa a coluna de chave
+        colunas_chave = [self.ch_max, "NUMERO DOC", "NUMERO_DOC", "CHAVE", "PARCELA"]
+
+        indice_dev = resolve_key_index(df, self.ch_max, max_index)
+        encontrados = np.zeros(len(df), dtype=bool)
         for caminho, nome_csv in caminhos:
             try:
                 if caminho.suffix.lower() == ".zip" and nome_csv:
-                    df_baixa = self.file_manager.ler_zip_csv(caminho, nome_csv)
+                    df_baixa = self.file_manager.ler_zip_csv(
+                        caminho, nome_csv, colunas=colunas_chave
+                    )
                 else:
-                    df_baixa = self.file_manager.ler_csv_ou_zip(caminho)
+                    df_baixa = self.file_manager.ler_csv_ou_zip(caminho, colunas=colunas_chave)
             except Exception as exc:  # pragma: no cover - logging auxiliar
                 self.logger.warning("Falha ao carregar baixa %s: %s", caminho, exc)
                 continue
@@ -226,16 +241,12 @@ class DevolucaoProcessor:
                     "Arquivo de baixa %s sem coluna '%s'", caminho, self.ch_max
                 )
                 continue
-            serie = df_baixa[coluna_baixa].astype(str).str.strip()
-            chaves_baixa.update(serie.dropna().tolist())
+            encontrados |= indice_dev.isin(KeyIndex.from_frame(df_baixa, coluna_baixa))
 
-        if not chaves_baixa:
+        removidos = int(encontrados.sum())
+        if not removidos:
             return df, 0
-
-        serie_dev = df[self.ch_max].astype(str).str.strip()
-        mask = ~serie_dev.isin(chaves_baixa)
-        removidos = int((~mask).sum())
-        return df.loc[mask].copy(), removidos
+        return df.loc[~encontrados].copy(), removidos
 
 
     # ------------------------------------------------------------------
@@ -266,21 +277,20 @@ class DevolucaoProcessor:
             self._judicial_cpfs = set()
             return
 
+        def ler_coluna_cpf(path: Path) -> Optional[pd.Series]:
+            df_judicial = self.file_manager.ler_csv_ou_zip(path)
+            cpf_columns = [col for col in df_judicial.columns if "CPF" in str(col).upper()]
+            return df_judicial[cpf_columns[0]] if cpf_columns else None
+
         try:
-            df_judicial = self.file_manager.ler_csv_ou_zip(judicial_file)
+            # Cache do processo: o arquivo só é relido quando muda
+            docs = document_set(judicial_file, "CPF", CPF_CNPJ, ler_coluna_cpf)
         except Exception as exc:  # pragma: no cover - logging auxiliar
             self.logger.warning("Falha ao carregar clientes judiciais: %s", exc)
             self._judicial_cpfs = set()
             return
 
-        cpf_columns = [col for col in df_judicial.columns if "CPF" in str(col).upper()]
-        if not cpf_columns:
-            self._judicial_cpfs = set()
-            return
-
-        cpfs_norm = digits_only(df_judicial[cpf_columns[0]].dropna())
-        cpfs_valid = cpfs_norm[cpfs_norm.str.len().isin({11, 14})]
-        self._judicial_cpfs = set(cpfs_valid.tolist())
+        self._judicial_cpfs = docs.values if docs is not None else set()
 
     # ------------------------------------------------------------------
     def _mask_judicial(self, df: pd.DataFrame) -> pd.Series:
@@ -389,6 +399,8 @@ class DevolucaoProcessor:
         df_vic: pd.DataFrame,
         df_max: pd.DataFrame,
         counts_iniciais: Optional[Dict[str, Any]] = None,
+        vic_index: Optional[KeyIndex] = None,
+        max_index: Optional[KeyIndex] = None,
     ) -> pd.DataFrame:
         """Calcula K_dev = MAX − VIC e retorna DataFrame filtrado (PROCV)."""
 
@@ -444,7 +456,9 @@ class DevolucaoProcessor:
             counts["max_apos_status_excluir"] = len(df_max_f)
 
         # PROCV: MAX − VIC
-        df_out = procv_max_menos_vic(df_max_f, df_vic, self.ch_max, self.ch_vic)
+        df_out = procv_max_menos_vic(
+            df_max_f, df_vic, self.ch_max, self.ch_vic, max_index, vic_index
+        )
 
         counts["registros_devolucao"] = len(df_out)
         self.logger.info("PROCV MAX−VIC: %s registros", f"{len(df_out):,}")
@@ -526,12 +540,28 @@ class DevolucaoProcessor:
         df_max_raw = self.carregar_arquivo(max_path)
         df_max_filtrado, max_metrics = self._aplicar_filtros_max(df_max_raw)
 
+        # Índices de chave das bases completas (compartilhados com batimento e baixa)
+        vic_index = (
+            key_index_for(df_vic_raw, self.ch_vic, vic_path)
+            if self.ch_vic in df_vic_raw.columns
+            else None
+        )
+        max_index = (
+            key_index_for(df_max_raw, self.ch_max, max_path)
+            if self.ch_max in df_max_raw.columns
+            else None
+        )
+
         df_dev_raw = self.identificar_devolucao(
-            df_vic, df_max_filtrado, counts_iniciais=max_metrics
+            df_vic,
+            df_max_filtrado,
+            counts_iniciais=max_metrics,
+            vic_index=vic_index,
+            max_index=max_index,
         )
 
         df_dev_sem_baixa, removidos_baixa = self._remover_registros_baixa(
-            df_dev_raw, baixa_paths
+            df_dev_raw, baixa_paths, max_index
         )
 
         df_jud_raw, df_ext_raw = self._dividir_carteiras(df_dev_sem_baixa)
@@ -20,6 +20,7 @@ import pandas as pd
 from src.config.loader import ConfigLoader
 from src.io.file_manager import FileManager
 from src.io.packager import ExportacaoService
+from src.utils.artifacts import artifact_store
 from src.utils.logger import get_logger, log_section
 from src.utils.text import digits_only
 from src.utils.helpers import (
@@ -106,8 +107,8 @@ class EnriquecimentoVicProcessor:
 
         inicio = datetime.now()
 
-        vic_base_zip = self.file_manager.validar_arquivo_existe(vic_base_zip)
-        batimento_zip = self.file_manager.validar_arquivo_existe(batimento_zip)
+        vic_base_zip = self._resolver_zip(vic_base_zip)
+        batimento_zip = self._resolver_zip(batimento_zip)
 
         df_vic_base = self._carregar_vic_base(vic_base_zip)
         df_batimento, origem_counts = self._carregar_batimento(batimento_zip)
@@ -236,59 +237,74 @@ class EnriquecimentoVicProcessor:
         return f"{self.observacao_prefix}{data_base}"
 
     # ------------------------------------------------------------------
-    def _carregar_vic_base(self, arquivo_zip: Path) -> pd.DataFrame:
-        """Lê a base tratada produzida pelo VicProcessor."""
+    def _resolver_zip(self, arquivo_zip: Union[str, Path]) -> Path:
+        """Caminho do ZIP, aceitando um publicado em memória ainda não gravado."""
+
+        if artifact_store().members(arquivo_zip):
+            return Path(arquivo_zip)
+        return self.file_manager.validar_arquivo_existe(arquivo_zip)
 
+    def _membros_zip(self, arquivo_zip: Path) -> List[str]:
+        membros = artifact_store().members(arquivo_zip)
+        if membros is not None:
+            return membros
         with zipfile.ZipFile(arquivo_zip, "r") as zf:
-            if self.vic_csv_name not in zf.namelist():
-                raise ValueError(
-                    f"Arquivo {self.vic_csv_name} não encontrado no ZIP {arquivo_zip}"
-                )
-            with zf.open(self.vic_csv_name) as fh:
+            return zf.namelist()
+
+    def _ler_membro(self, arquivo_zip: Path, membro: str) -> pd.DataFrame:
+        """Lê um CSV do ZIP, da memória quando a etapa anterior o publicou."""
+
+        df = artifact_store().get(arquivo_zip, membro, sep=self.csv_separator)
+        if df is None:
+            artifact_store().wait(arquivo_zip)
+            with zipfile.ZipFile(arquivo_zip, "r") as zf, zf.open(membro) as fh:
                 df = pd.read_csv(
                     fh,
                     sep=self.csv_separator,
                     encoding=self.encoding,
                     dtype=str,
                 )
-        df = df.fillna("")
-        return df
+        return df.fillna("")
+
+    # ------------------------------------------------------------------
+    def _carregar_vic_base(self, arquivo_zip: Path) -> pd.DataFrame:
+        """Lê a base tratada produzida pelo VicProcessor."""
+
+        if self.vic_csv_name not in self._membros_zip(arquivo_zip):
+            raise ValueError(
+                f"Arquivo {self.vic_csv_name} não encontrado no ZIP {arquivo_zip}"
+            )
+        return self._ler_membro(arquivo_zip, self.vic_csv_name)
 
     # ------------------------------------------------------------------
     def _carregar_batimento(self, arquivo_zip: Path) -> Tuple[pd.DataFrame, Dict[str, int]]:
         """Lê todos os CSVs gerados pelo batimento (judicial/extrajudicial)."""
 
-        with zipfile.ZipFile(arquivo_zip, "r") as zf:
-            csv_files = [
-                member for member in zf.namelist() if member.lower().endswith(".csv")
-            ]
-            if not csv_files:
-                raise ValueError(
-                    f"Nenhum CSV encontrado no arquivo de batimento: {arquivo_zip}"
-                )
+        csv_files = [
+            member
+            for member in self._membros_zip(arquivo_zip)
+            if member.lower().endswith(".csv")
+        ]
+        if not csv_files:
+            raise ValueError(
+                f"Nenhum CSV encontrado no arquivo de batimento: {arquivo_zip}"
+            )
 
-            frames: List[pd.DataFrame] = []
-            origem_counts = {"judicial": 0, "extrajudicial": 0}
-
-            for member in csv_files:
-                member_lower = member.lower()
-                with zf.open(member) as fh:
-                    df = pd.read_csv(
-                        fh,
-                        sep=self.csv_separator,
-                        encoding=self.encoding,
-                        dtype=str,
-                    )
-                df = df.fillna("")
-                if "extrajudicial" in member_lower:
-                    origem = "extrajudicial"
-                elif "judicial" in member_lower:
-                    origem = "judicial"
-                else:
-                    origem = "extrajudicial"
-                origem_counts[origem] += len(df)
-                df["__origem__"] = origem
-                frames.append(df)
+        frames: List[pd.DataFrame] = []
+        origem_counts = {"judicial": 0, "extrajudicial": 0}
+
+        for member in csv_files:
+            member_lower = member.lower()
+            df = self._ler_membro(arquivo_zip, member)
+            if "extrajudicial" in member_lower:
+                origem = "extrajudicial"
+            elif "judicial" in member_lower:
+                origem = "judicial"
+            else:
+                origem = "extrajudicial"
+            origem_counts[origem] += len(df)
+            df["__origem__"] = origem
+            frames.append(df)
 
         if not frames:
             return pd.DataFrame(), origem_counts
@@ -165,7 +165,8 @@ class MaxProcessor:
         arquivo_saida = self.exportacao_service.exportar_zip(
             {f"{nome_base}.csv": df_final},
             nome_base,
-            subdir='max_tratada'
+            subdir='max_tratada',
+            sidecar=True,
         )
 
         # Inconsistências
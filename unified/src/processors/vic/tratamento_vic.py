@@ -382,6 +382,7 @@ class VicProcessor:
             nome_base=nome_base_limpa,
             subdir='vic_tratada',
             add_timestamp=self.add_timestamp,
+            sidecar=True,
         )
 
         # Inconsistências (dados inválidos)
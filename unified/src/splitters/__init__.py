@@ -17,6 +17,7 @@ from .field_value import (
     create_field_value_splitter,
     create_unique_value_splitter,
 )
+from .grouping import GroupMatcher, LazySplits, split_by_groups
 
 
 # Registry of splitter factories
@@ -69,6 +70,9 @@ __all__ = [
     "CampaignSplitter",
     "FieldValueSplitter",
     "UniqueValueSplitter",
+    "GroupMatcher",
+    "LazySplits",
+    "split_by_groups",
     "create_splitter",
     "register_splitter",
 ]
@@ -8,6 +8,7 @@ import pandas as pd
 
 from ..core.base import BaseSplitter, SplitResult
 from ..core.schemas import SplitterConfig
+from .grouping import split_by_groups
 
 
 class CampaignSplitter(BaseSplitter):
@@ -32,36 +33,13 @@ class CampaignSplitter(BaseSplitter):
             return SplitResult(splits={"default": df})
 
         values = df[column].astype(str).str.strip().str.upper()
-        splits: dict[str, pd.DataFrame] = {}
-        remaining_mask = pd.Series(True, index=df.index)
+        groups = [
+            (rule.get("name", "unknown"), [str(pattern).upper() for pattern in rule.get("patterns", [])])
+            for rule in rules
+        ]
 
-        # Process each rule in order
-        for rule in rules:
-            group_name = rule.get("name", "unknown")
-            patterns = rule.get("patterns", [])
-
-            if not patterns:
-                continue
-
-            # Match any of the patterns
-            match_mask = pd.Series(False, index=df.index)
-            for pattern in patterns:
-                pattern_upper = str(pattern).upper()
-                match_mask = match_mask | values.str.contains(
-                    pattern_upper, na=False, regex=False
-                )
-
-            # Only consider records not already assigned
-            group_mask = remaining_mask & match_mask
-            if group_mask.any():
-                splits[group_name] = df[group_mask].copy()
-                remaining_mask = remaining_mask & ~group_mask
-
-        # Add remaining to default group
-        if remaining_mask.any():
-            splits[default_group] = df[remaining_mask].copy()
-
-        return SplitResult(splits=splits)
+        # Process all rules in one pass (first matching rule wins)
+        return SplitResult(splits=split_by_groups(df, values, groups, "contains", default_group))
 
 
 def create_campaign_splitter(config: SplitterConfig) -> CampaignSplitter:
@@ -8,6 +8,7 @@ import pandas as pd
 
 from ..core.base import BaseSplitter, SplitResult
 from ..core.schemas import SplitterConfig
+from .grouping import split_by_groups
 
 
 class FieldValueSplitter(BaseSplitter):
@@ -36,43 +37,18 @@ class FieldValueSplitter(BaseSplitter):
         else:
             values = df[column].astype(str)
 
-        splits: dict[str, pd.DataFrame] = {}
-        remaining_mask = pd.Series(True, index=df.index)
-
-        # Process each mapping
+        groups = []
         for group_name, match_values in mappings.items():
             if not isinstance(match_values, list):
                 match_values = [match_values]
-
-            match_mask = pd.Series(False, index=df.index)
-            for match_value in match_values:
-                if normalize:
-                    match_str = str(match_value).strip().upper()
-                else:
-                    match_str = str(match_value)
-
-                if mode == "exact":
-                    match_mask = match_mask | (values == match_str)
-                elif mode == "contains":
-                    match_mask = match_mask | values.str.contains(
-                        match_str, na=False, regex=False
-                    )
-                elif mode == "prefix":
-                    match_mask = match_mask | values.str.startswith(match_str, na=False)
-                elif mode == "suffix":
-                    match_mask = match_mask | values.str.endswith(match_str, na=False)
-
-            # Only consider records not already assigned
-            group_mask = remaining_mask & match_mask
-            if group_mask.any():
-                splits[group_name] = df[group_mask].copy()
-                remaining_mask = remaining_mask & ~group_mask
-
-        # Add remaining to default group
-        if remaining_mask.any():
-            splits[default_group] = df[remaining_mask].copy()
-
-        return SplitResult(splits=splits)
+            if normalize:
+                match_values = [str(value).strip().upper() for value in match_values]
+            else:
+                match_values = [str(value) for value in match_values]
+            groups.append((group_name, match_values))
+
+        # Um grupo por linha em um passe; cada split só é extraído quando usado
+        return SplitResult(splits=split_by_groups(df, values, groups, mode, default_group))
 
 
 class UniqueValueSplitter(BaseSplitter):
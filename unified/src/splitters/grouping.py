@@ -0,0 +1,204 @@
+"""
+Group assignment for value-based splitters.
+Maps every row to a group ID in one pass and partitions the frame once.
+
+The splitters used to OR one full-length mask per match value and copy
+``df[mask]`` per group, which is O(groups x values x rows). Here the column
+is factorized first, so matching runs once per *distinct* value:
+
+- ``exact``: a dictionary lookup from each distinct value to its group;
+- ``contains`` / ``prefix`` / ``suffix``: an Aho-Corasick automaton over all
+  match values, so each distinct value is scanned once whatever the number
+  of groups and values.
+
+The group IDs are broadcast back through the factorized codes and the rows
+are partitioned with one stable sort; each split is only taken from the
+frame when it is accessed.
+"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+NO_GROUP = -1
+
+
+class _Automaton:
+    """Aho-Corasick automaton; each keyword carries the group it belongs to."""
+
+    def __init__(self, keywords: Sequence[tuple[str, int]], failure_links: bool = True):
+        self.goto: list[dict[str, int]] = [{}]
+        # Menor grupo cujo valor termina neste nó (ou em um sufixo dele)
+        self.output: list[int] = [NO_GROUP]
+        for keyword, group in keywords:
+            node = 0
+            for char in keyword:
+                nxt = self.goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][char] = nxt
+                    self.goto.append({})
+                    self.output.append(NO_GROUP)
+                node = nxt
+            self.output[node] = _first(self.output[node], group)
+        self.fail = [0] * len(self.goto)
+        if failure_links:
+            self._link()
+
+    def _link(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                target = self.goto[state].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] = _first(self.output[child], self.output[self.fail[child]])
+
+    def search(self, text: str) -> int:
+        """First group (lowest ID) with a keyword anywhere in ``text``."""
+        best, node = self.output[0], 0
+        goto, fail, output = self.goto, self.fail, self.output
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            best = _first(best, output[node])
+            if best == 0:
+                break
+        return best
+
+    def prefix(self, text: str) -> int:
+        """First group with a keyword that ``text`` starts with."""
+        best, node = self.output[0], 0
+        for char in text:
+            node = self.goto[node].get(char)
+            if node is None:
+                break
+            best = _first(best, self.output[node])
+        return best
+
+
+def _first(a: int, b: int) -> int:
+    if a == NO_GROUP:
+        return b
+    if b == NO_GROUP:
+        return a
+    return min(a, b)
+
+
+class GroupMatcher:
+    """Assigns each value to the first group with a matching value.
+
+    Args:
+        groups: ``(group_name, match_values)`` in priority order
+        mode: ``exact``, ``contains``, ``prefix`` or ``suffix``
+    """
+
+    def __init__(self, groups: Sequence[tuple[str, Sequence[str]]], mode: str = "exact"):
+        self.names = [name for name, _ in groups]
+        self.mode = mode
+        keywords = [(str(value), gid) for gid, (_, values) in enumerate(groups) for value in values]
+
+        if mode == "exact":
+            self._lookup: dict[str, int] = {}
+            for value, gid in keywords:
+                self._lookup.setdefault(value, gid)
+        elif mode == "suffix":
+            self._automaton = _Automaton([(value[::-1], gid) for value, gid in keywords], failure_links=False)
+        elif mode == "prefix":
+            self._automaton = _Automaton(keywords, failure_links=False)
+        else:
+            self._automaton = _Automaton(keywords)
+
+    def _match(self, value: str) -> int:
+        if self.mode == "exact":
+            return self._lookup.get(value, NO_GROUP)
+        if self.mode == "prefix":
+            return self._automaton.prefix(value)
+        if self.mode == "suffix":
+            return self._automaton.prefix(value[::-1])
+        if self.mode == "contains":
+            return self._automaton.search(value)
+        return NO_GROUP
+
+    def assign(self, values: pd.Series) -> np.ndarray:
+        """Group ID of every row (``NO_GROUP`` when nothing matches)."""
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        ids = np.fromiter(
+            (NO_GROUP if pd.isna(value) else self._match(value) for value in uniques),
+            dtype=np.int64,
+            count=len(uniques),
+        )
+        # Sentinela -1 (NA) cai no último slot: sem grupo
+        ids = np.append(ids, NO_GROUP)
+        return ids[codes]
+
+
+class LazySplits(Mapping):
+    """Named row partitions of a frame, taken from it on first access.
+
+    Holds only the row positions of each group (one stable sort of the
+    group IDs, so rows keep their original order inside each group).
+    """
+
+    def __init__(self, df: pd.DataFrame, ids: np.ndarray, names: Sequence[str], default: str):
+        self._df = df
+        order = np.argsort(ids, kind="stable")
+        sorted_ids = ids[order]
+        present, starts, counts = np.unique(sorted_ids, return_index=True, return_counts=True)
+        blocks = {
+            int(gid): order[start:start + count]
+            for gid, start, count in zip(present, starts, counts)
+        }
+        # Ordem dos grupos como configurada; o padrão por último
+        self._positions: dict[str, np.ndarray] = {}
+        for gid, name in [*enumerate(names), (NO_GROUP, default)]:
+            if gid not in blocks:
+                continue
+            if name in self._positions:
+                # Mesmo nome em mais de um grupo: linhas juntas, na ordem original
+                self._positions[name] = np.sort(np.concatenate([self._positions[name], blocks[gid]]))
+            else:
+                self._positions[name] = blocks[gid]
+        self._cache: dict[str, pd.DataFrame] = {}
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        frame = self._cache.get(name)
+        if frame is None:
+            frame = self._cache[name] = self._df.take(self._positions[name])
+        return frame
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def size(self, name: str) -> int:
+        """Rows in a split, without taking it."""
+        return len(self._positions[name])
+
+    def positions(self, name: str) -> np.ndarray:
+        return self._positions[name]
+
+
+def split_by_groups(
+    df: pd.DataFrame,
+    values: pd.Series,
+    groups: Sequence[tuple[str, Sequence[str]]],
+    mode: str,
+    default_group: str,
+) -> LazySplits:
+    """Partition ``df`` by the first group whose match values match ``values``."""
+    matcher = GroupMatcher(groups, mode)
+    return LazySplits(df, matcher.assign(values), matcher.names, default_group)
+
+
+__all__ = ["GroupMatcher", "LazySplits", "NO_GROUP", "split_by_groups"]
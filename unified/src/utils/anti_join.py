@@ -1,37 +1,218 @@
 """Operações de anti-join utilizadas nos processadores locais.
 
 Centraliza funções de diferença de conjuntos reaproveitadas
-por batimento e devolução, evitando duplicação de lógica.
+por batimento, devolução e baixa, evitando duplicação de lógica.
+
+As chaves de cada base tratada são normalizadas uma única vez em um
+:class:`KeyIndex` (chaves normalizadas + hash de 64 bits + vetor ordenado
+de hashes únicos). Os processadores reaproveitam o mesmo índice para
+LEFT − RIGHT, RIGHT − LEFT e interseção, inclusive sobre recortes
+filtrados da base, sem normalizar as chaves novamente.
 """
 
 from __future__ import annotations
 
-from typing import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from .artifacts import artifact_store
+
 
 def _normalize_series(values: pd.Series) -> pd.Series:
     """Normaliza série para comparação eficiente (string strip)."""
     return values.astype(str).str.strip()
 
 
-def procv_left_minus_right(
+def _hash_keys(keys: pd.Series) -> pd.Series:
+    return pd.Series(
+        pd.util.hash_array(keys.to_numpy(dtype=object)),
+        index=keys.index,
+        dtype="uint64",
+    )
+
+
+_EMPTY_CODE = np.uint64(pd.util.hash_array(np.array([""], dtype=object))[0])
+
+
+@dataclass(frozen=True)
+class KeyIndex:
+    """Chaves normalizadas de uma base, prontas para anti-join e interseção.
+
+    ``keys`` e ``codes`` ficam alinhados ao índice do DataFrame de origem;
+    ``members`` é o vetor ordenado de hashes únicos (chaves nulas excluídas)
+    usado nos testes de pertinência via ``np.searchsorted``.
+    """
+
+    keys: pd.Series
+    codes: pd.Series
+    members: np.ndarray
+
+    @classmethod
+    def from_series(cls, values: pd.Series) -> "KeyIndex":
+        keys = _normalize_series(values)
+        codes = _hash_keys(keys)
+        return cls(keys, codes, np.unique(codes[keys.notna()].to_numpy()))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, column: str) -> "KeyIndex":
+        if column not in df.columns:
+            raise ValueError(f"Coluna obrigatória ausente: {column}")
+        return cls.from_series(df[column])
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def align(self, index: pd.Index) -> Optional["KeyIndex"]:
+        """Recorta o índice para as linhas de ``index`` (rótulos da base original).
+
+        Retorna ``None`` quando algum rótulo não pertence à base indexada.
+        """
+        if self.codes.index.equals(index):
+            return self
+        if not index.isin(self.codes.index).all():
+            return None
+        keys = self.keys.loc[index]
+        codes = self.codes.loc[index]
+        return KeyIndex(keys, codes, np.unique(codes[keys.notna()].to_numpy()))
+
+    def contains(self, codes: np.ndarray) -> np.ndarray:
+        """Máscara booleana indicando quais hashes pertencem a este índice."""
+        if self.members.size == 0:
+            return np.zeros(len(codes), dtype=bool)
+        pos = np.searchsorted(self.members, codes)
+        pos[pos == self.members.size] = 0
+        return self.members[pos] == codes
+
+    def difference(self, other: "KeyIndex") -> np.ndarray:
+        """Hashes únicos presentes neste índice e ausentes em ``other``."""
+        return np.setdiff1d(self.members, other.members, assume_unique=True)
+
+    def intersection(self, other: "KeyIndex") -> np.ndarray:
+        """Hashes únicos presentes nos dois índices."""
+        return np.intersect1d(self.members, other.members, assume_unique=True)
+
+    def isin(self, other: "KeyIndex", ignore_empty: bool = False) -> np.ndarray:
+        """Máscara das linhas deste índice cujas chaves existem em ``other``."""
+        codes = self.codes.to_numpy()
+        mask = other.contains(codes) & self.keys.notna().to_numpy()
+        if ignore_empty:
+            mask &= codes != _EMPTY_CODE
+        return mask
+
+
+# Índices já construídos por arquivo tratado: (caminho, coluna) -> (mtime, tamanho, índice)
+# ou, para artefatos em memória, (versão da publicação, -1, índice)
+_KEY_INDEX_CACHE: Dict[Tuple[str, str], Tuple[int, int, KeyIndex]] = {}
+
+
+def key_index_for(
+    df: pd.DataFrame,
+    column: str,
+    source: Optional[Path | str] = None,
+) -> KeyIndex:
+    """Retorna o :class:`KeyIndex` de ``df[column]``.
+
+    Quando ``source`` (arquivo do qual ``df`` foi lido) é informado, o índice
+    fica em cache no processo e é reaproveitado pelas próximas etapas que lerem
+    o mesmo arquivo, inclusive sobre recortes filtrados da base.
+    """
+    if column not in df.columns:
+        raise ValueError(f"Coluna obrigatória ausente: {column}")
+    if source is None:
+        return KeyIndex.from_frame(df, column)
+
+    path = Path(source)
+    version = artifact_store().version(path)
+    if version is not None:
+        # Artefato em memória: o ZIP pode ainda não ter sido gravado
+        stamp = (version, -1)
+    else:
+        try:
+            stat = path.stat()
+        except OSError:
+            return KeyIndex.from_frame(df, column)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+    cache_key = (str(path.resolve()), column)
+    cached = _KEY_INDEX_CACHE.get(cache_key)
+    if cached and cached[:2] == stamp:
+        aligned = cached[2].align(df.index)
+        if aligned is not None:
+            return aligned
+
+    index = KeyIndex.from_frame(df, column)
+    _KEY_INDEX_CACHE[cache_key] = (*stamp, index)
+    return index
+
+
+def clear_key_index_cache() -> None:
+    """Descarta os índices de chaves mantidos em memória."""
+    _KEY_INDEX_CACHE.clear()
+
+
+def resolve_key_index(
+    df: pd.DataFrame,
+    column: str,
+    index: Optional[KeyIndex] = None,
+) -> KeyIndex:
+    """Recorta ``index`` para as linhas de ``df`` ou, se não for possível, indexa ``df[column]``."""
+    if index is not None:
+        aligned = index.align(df.index)
+        if aligned is not None:
+            return aligned
+    return KeyIndex.from_frame(df, column)
+
+
+def _validate_columns(
     df_left: pd.DataFrame,
     df_right: pd.DataFrame,
     col_left: str,
     col_right: str,
-) -> pd.DataFrame:
-    """Retorna linhas de df_left cujas chaves não estão em df_right."""
-
+) -> None:
     if col_left not in df_left.columns:
         raise ValueError(f"Coluna obrigatória ausente no LEFT: {col_left}")
     if col_right not in df_right.columns:
         raise ValueError(f"Coluna obrigatória ausente no RIGHT: {col_right}")
 
-    right_keys: Iterable[str] = set(_normalize_series(df_right[col_right]).dropna())
-    mask = ~_normalize_series(df_left[col_left]).isin(right_keys)
-    return df_left.loc[mask].copy()
+
+def procv_left_minus_right(
+    df_left: pd.DataFrame,
+    df_right: pd.DataFrame,
+    col_left: str,
+    col_right: str,
+    left_index: Optional[KeyIndex] = None,
+    right_index: Optional[KeyIndex] = None,
+) -> pd.DataFrame:
+    """Retorna linhas de df_left cujas chaves não estão em df_right.
+
+    ``left_index``/``right_index`` podem ser índices da base completa; eles são
+    recortados para as linhas presentes em cada DataFrame.
+    """
+
+    _validate_columns(df_left, df_right, col_left, col_right)
+    left = resolve_key_index(df_left, col_left, left_index)
+    right = resolve_key_index(df_right, col_right, right_index)
+    return df_left.loc[~left.isin(right)].copy()
+
+
+def procv_intersection(
+    df_left: pd.DataFrame,
+    df_right: pd.DataFrame,
+    col_left: str,
+    col_right: str,
+    left_index: Optional[KeyIndex] = None,
+    right_index: Optional[KeyIndex] = None,
+) -> pd.DataFrame:
+    """Retorna linhas de df_left cujas chaves também estão em df_right."""
+
+    _validate_columns(df_left, df_right, col_left, col_right)
+    left = resolve_key_index(df_left, col_left, left_index)
+    right = resolve_key_index(df_right, col_right, right_index)
+    return df_left.loc[left.isin(right)].copy()
 
 
 def procv_max_menos_emccamp(
@@ -39,13 +220,17 @@ def procv_max_menos_emccamp(
     df_emccamp: pd.DataFrame,
     col_max: str = "PARCELA",
     col_emccamp: str = "CHAVE",
+    max_index: Optional[KeyIndex] = None,
+    emccamp_index: Optional[KeyIndex] = None,
 ) -> pd.DataFrame:
     """Retorna registros MAX que NÃO estão em EMCCAMP (MAX - EMCCAMP).
-    
+
     Usado para gerar arquivo de devolução: títulos no sistema de cobrança
     que não existem mais no credor.
     """
-    return procv_left_minus_right(df_max, df_emccamp, col_max, col_emccamp)
+    return procv_left_minus_right(
+        df_max, df_emccamp, col_max, col_emccamp, max_index, emccamp_index
+    )
 
 
 def procv_emccamp_menos_max(
@@ -53,16 +238,53 @@ def procv_emccamp_menos_max(
     df_max: pd.DataFrame,
     col_emccamp: str = "CHAVE",
     col_max: str = "PARCELA",
+    emccamp_index: Optional[KeyIndex] = None,
+    max_index: Optional[KeyIndex] = None,
 ) -> pd.DataFrame:
     """Retorna registros EMCCAMP que NÃO estão em MAX (EMCCAMP - MAX).
-    
+
     Usado para batimento: títulos do credor ausentes no sistema de cobrança.
     """
-    return procv_left_minus_right(df_emccamp, df_max, col_emccamp, col_max)
+    return procv_left_minus_right(
+        df_emccamp, df_max, col_emccamp, col_max, emccamp_index, max_index
+    )
+
+
+def procv_max_menos_vic(
+    df_max: pd.DataFrame,
+    df_vic: pd.DataFrame,
+    col_max: str = "PARCELA",
+    col_vic: str = "CHAVE",
+    max_index: Optional[KeyIndex] = None,
+    vic_index: Optional[KeyIndex] = None,
+) -> pd.DataFrame:
+    """Retorna K_dev = K_max − K_vic (linhas de MAX não presentes em VIC)."""
+
+    return procv_left_minus_right(df_max, df_vic, col_max, col_vic, max_index, vic_index)
+
+
+def procv_vic_menos_max(
+    df_vic: pd.DataFrame,
+    df_max: pd.DataFrame,
+    col_vic: str = "CHAVE",
+    col_max: str = "PARCELA",
+    vic_index: Optional[KeyIndex] = None,
+    max_index: Optional[KeyIndex] = None,
+) -> pd.DataFrame:
+    """Retorna K_bat = K_vic − K_max (linhas de VIC não presentes em MAX)."""
+
+    return procv_left_minus_right(df_vic, df_max, col_vic, col_max, vic_index, max_index)
 
 
 __all__ = [
+    "KeyIndex",
+    "key_index_for",
+    "resolve_key_index",
+    "clear_key_index_cache",
     "procv_left_minus_right",
+    "procv_intersection",
     "procv_max_menos_emccamp",
     "procv_emccamp_menos_max",
+    "procv_max_menos_vic",
+    "procv_vic_menos_max",
 ]
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import io
 import os
 import shutil
 import subprocess
+import tempfile
 import zipfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import BinaryIO, Iterable, Iterator, List, Sequence, Tuple
 
 from .logger_config import get_logger
 
@@ -150,3 +153,102 @@ def extract_with_7zip(
         if item.is_file() and item.resolve() not in arquivos_preexistentes
     ]
     return novos_arquivos
+
+
+def _argumento_senha(senha: str | None) -> str:
+    # "-p-" impede o 7-Zip de pedir senha interativamente
+    return f"-p{senha}" if senha else "-p-"
+
+
+def list_with_7zip(
+    arquivo: Path, *, senha: str | None = None, executavel: Path | None = None
+) -> List[str]:
+    """Lista os arquivos contidos em ``arquivo`` (``7z l -slt``), sem extrair."""
+
+    executavel = executavel or find_7zip_executable()
+    comando = [str(executavel), "l", "-slt", str(arquivo), _argumento_senha(senha)]
+    resultado = subprocess.run(comando, capture_output=True, text=True, errors="replace")
+    if resultado.returncode != 0:
+        detalhe = resultado.stderr.strip() or resultado.stdout.strip() or "erro nao informado"
+        raise RuntimeError(f"Falha ao listar {arquivo} com 7-Zip (codigo {resultado.returncode}): {detalhe}")
+
+    # O primeiro bloco descreve o proprio arquivo; os membros vem apos "----------"
+    _, _, membros = resultado.stdout.partition("\n----------\n")
+    nomes: List[str] = []
+    atual: dict[str, str] = {}
+    for linha in membros.splitlines() + [""]:
+        if not linha.strip():
+            if atual.get("Path") and atual.get("Folder", "-") != "+":
+                nomes.append(atual["Path"])
+            atual = {}
+            continue
+        chave, _, valor = linha.partition(" = ")
+        atual[chave.strip()] = valor
+    return nomes
+
+
+class _SaidaProcesso(io.RawIOBase):
+    """stdout do 7-Zip que, no fim dos dados, confere o codigo de saida.
+
+    Assim uma senha errada ou um arquivo corrompido vira erro durante a
+    leitura, antes de o consumidor gravar qualquer resultado.
+    """
+
+    def __init__(self, processo: subprocess.Popen, erros: BinaryIO, arquivo: Path) -> None:
+        self._processo = processo
+        self._erros = erros
+        self._arquivo = arquivo
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        lidos = self._processo.stdout.readinto(buffer)
+        if lidos == 0:
+            self._conferir()
+        return lidos
+
+    def _conferir(self) -> None:
+        codigo = self._processo.wait()
+        if codigo != 0:
+            self._erros.seek(0)
+            detalhe = self._erros.read().decode(errors="replace").strip() or "erro nao informado"
+            raise RuntimeError(f"Falha ao extrair {self._arquivo} com 7-Zip (codigo {codigo}): {detalhe}")
+
+
+@contextmanager
+def stream_with_7zip(
+    arquivo: Path,
+    *,
+    senha: str | None = None,
+    membro: str | None = None,
+    extensoes: Sequence[str] = (".txt", ".csv"),
+) -> Iterator[Tuple[str, BinaryIO]]:
+    """Descompacta um membro de ``arquivo`` direto para um stream (``7z e -so``).
+
+    Sem ``membro``, usa o primeiro arquivo com uma das ``extensoes``. Retorna
+    ``(nome_do_membro, stream_binario)``; o conteudo nunca passa pelo disco.
+    Erros do 7-Zip sao levantados como ``RuntimeError`` ao fim da leitura.
+    """
+
+    executavel = find_7zip_executable()
+    if membro is None:
+        nomes = list_with_7zip(arquivo, senha=senha, executavel=executavel)
+        membro = next((nome for nome in nomes if Path(nome).suffix.lower() in extensoes), None)
+        if membro is None:
+            raise RuntimeError(f"Nenhum arquivo {', '.join(extensoes)} encontrado em {arquivo}")
+
+    comando = [str(executavel), "e", "-so", str(arquivo), membro, "-y", _argumento_senha(senha)]
+    with tempfile.TemporaryFile() as erros:
+        processo = subprocess.Popen(comando, stdout=subprocess.PIPE, stderr=erros)
+        fluxo = io.BufferedReader(_SaidaProcesso(processo, erros, arquivo), buffer_size=1 << 20)
+        try:
+            yield membro, fluxo
+            # Consumidor parou antes do fim: descarta o restante e confere o codigo
+            while fluxo.read(1 << 20):
+                pass
+        finally:
+            if processo.poll() is None:
+                processo.kill()
+            processo.stdout.close()
+            processo.wait()
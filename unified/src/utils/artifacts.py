@@ -0,0 +1,314 @@
+"""Armazenamento em memória dos artefatos gerados entre etapas.
+
+Quando várias etapas rodam no mesmo processo (``main_vic.py``,
+``main_emccamp.py``) e o orquestrador chama :func:`configure_artifact_store`,
+cada saída tratada é publicada aqui junto com o caminho do ZIP
+correspondente. As leituras seguintes do mesmo caminho
+(``DatasetIO.read``, ``read_csv_or_zip``, ``FileManager.ler_csv_ou_zip``)
+recebem uma cópia do DataFrame já no formato que a leitura do CSV
+produziria (``dtype=str``, nulos como ``NaN``), sem descompactar nem
+reinterpretar o arquivo.
+
+A gravação do ZIP continua acontecendo: de forma síncrona (padrão), em uma
+thread de fundo (``background_write``) ou nunca, para prefixos listados em
+``skip_write`` (artefatos intermediários que o negócio não consome).
+Gravações pendentes são concluídas em :meth:`ArtifactStore.flush` e na
+saída do processo.
+"""
+
+from __future__ import annotations
+
+import atexit
+import fnmatch
+import io
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+try:  # valores que o ``read_csv`` converte em NaN por padrão
+    from pandas._libs.parsers import STR_NA_VALUES as _CSV_NA_VALUES
+except ImportError:  # pragma: no cover - pandas sem o símbolo interno
+    _CSV_NA_VALUES = {
+        "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+        "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+        "n/a", "nan", "null",
+    }
+
+# dtype que ``read_csv(dtype=str)`` produz nesta versão do pandas
+_CSV_STR_DTYPE = pd.read_csv(io.StringIO("a\nx"), dtype=str)["a"].dtype
+
+logger = logging.getLogger(__name__)
+
+Writer = Callable[[Dict[str, pd.DataFrame]], Any]
+
+
+def _round_trip(df: pd.DataFrame, sep: str, decimal: str) -> pd.DataFrame:
+    """Escreve e relê ``df`` como CSV em memória (sem compressão)."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, sep=sep, decimal=decimal)
+    buffer.seek(0)
+    return pd.read_csv(buffer, sep=sep, dtype=str)
+
+
+def as_read_from_csv(
+    df: pd.DataFrame,
+    sep: str = ",",
+    decimal: str = ".",
+    keep_dates: bool = False,
+) -> pd.DataFrame:
+    """Retorna ``df`` como ``pd.read_csv(..., dtype=str)`` o devolveria.
+
+    Colunas que já são texto só têm os marcadores de nulo do CSV trocados por
+    ``NaN``; apenas as demais (números, datas, booleanos, tipos mistos)
+    passam por escrita/leitura em memória, preservando a formatação exata.
+    Com ``keep_dates`` as colunas ``datetime64`` voltam como estão.
+    """
+    columns = list(df.columns)
+    if not columns:
+        return pd.DataFrame(index=pd.RangeIndex(len(df)))
+    if (
+        df.empty
+        or len(set(columns)) != len(columns)
+        or not all(isinstance(col, str) for col in columns)
+    ):
+        return _round_trip(df, sep, decimal)
+
+    result: Dict[str, pd.Series] = {}
+    others: List[str] = []
+    for col in columns:
+        series = df[col]
+        if keep_dates and pd.api.types.is_datetime64_any_dtype(series):
+            result[col] = series.reset_index(drop=True)
+        elif pd.api.types.infer_dtype(series, skipna=True) == "string":
+            values = series.where(series.notna() & ~series.isin(_CSV_NA_VALUES))
+            result[col] = values.astype(_CSV_STR_DTYPE).reset_index(drop=True)
+        else:
+            others.append(col)
+
+    if others:
+        converted = _round_trip(df[others], sep, decimal)
+        for col in others:
+            result[col] = converted[col]
+
+    return pd.DataFrame({col: result[col] for col in columns})
+
+
+@dataclass
+class _Artifact:
+    frames: Dict[str, pd.DataFrame]
+    sep: str
+    decimal: str
+    version: int
+    published_at: float
+    pending: Optional[Future] = None
+    converted: Dict[Tuple[str, bool], pd.DataFrame] = field(default_factory=dict)
+
+
+class ArtifactStore:
+    """DataFrames publicados pelas etapas do pipeline, indexados pelo caminho do ZIP."""
+
+    def __init__(
+        self,
+        in_memory: bool = True,
+        background_write: bool = False,
+        skip_write: Iterable[str] = (),
+        sidecar_format: Optional[str] = None,
+    ) -> None:
+        self.in_memory = in_memory
+        self.background_write = background_write
+        self.skip_write = tuple(skip_write)
+        # Formato do sidecar colunar das bases tratadas ("parquet"/"feather")
+        self.sidecar_format = sidecar_format
+        self._artifacts: Dict[str, _Artifact] = {}
+        self._lock = threading.RLock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._version = 0
+
+    @staticmethod
+    def _key(path: Path | str) -> str:
+        return str(Path(path).resolve())
+
+    def _should_write(self, path: Path) -> bool:
+        return not any(path.name.startswith(prefix) for prefix in self.skip_write)
+
+    # ------------------------------------------------------------------
+    def publish(
+        self,
+        path: Path | str,
+        frames: Dict[str, pd.DataFrame],
+        writer: Writer,
+        sep: str = ",",
+        decimal: str = ".",
+    ) -> Path:
+        """Registra ``frames`` sob ``path`` e agenda ``writer`` para gerar o ZIP.
+
+        ``writer`` recebe um instantâneo dos DataFrames, de modo que alterações
+        posteriores feitas pela etapa não afetam o arquivo nem as leituras.
+        """
+        path = Path(path)
+        if not self.in_memory:
+            writer(frames)
+            return path
+
+        snapshot = {name: df.copy() for name, df in frames.items()}
+        with self._lock:
+            self._version += 1
+            artifact = _Artifact(snapshot, sep, decimal, self._version, time.time())
+            self._artifacts[self._key(path)] = artifact
+
+        if not self._should_write(path):
+            logger.debug("Artefato mantido apenas em memória: %s", path)
+        elif self.background_write:
+            artifact.pending = self._get_executor().submit(writer, snapshot)
+        else:
+            writer(snapshot)
+        return path
+
+    def get(
+        self,
+        path: Path | str,
+        member: Optional[str] = None,
+        sep: Optional[str] = None,
+        columns: Optional[Iterable[str]] = None,
+        typed: bool = False,
+    ) -> Optional[pd.DataFrame]:
+        """Cópia do DataFrame publicado em ``path`` ou ``None`` se não houver.
+
+        Sem ``member`` retorna o primeiro arquivo do ZIP, como as leituras
+        padrão. ``sep`` diferente do usado na publicação invalida a consulta.
+        ``columns`` restringe o resultado às colunas existentes da lista;
+        ``typed`` mantém as colunas de data como ``datetime64``.
+        """
+        if not self.in_memory:
+            return None
+        with self._lock:
+            artifact = self._artifacts.get(self._key(path))
+            if artifact is None or (sep is not None and sep != artifact.sep):
+                return None
+            if member is None:
+                member = next(iter(artifact.frames), None)
+            if member not in artifact.frames:
+                return None
+            frame = artifact.frames[member]
+            converted = artifact.converted.get((member, typed))
+        if converted is not None:
+            if columns is not None:
+                wanted = set(columns)
+                converted = converted[[col for col in converted.columns if col in wanted]]
+            return converted.copy()
+
+        if columns is not None:
+            # Projeção: converte só as colunas pedidas (sem guardar em cache)
+            wanted = set(columns)
+            frame = frame[[col for col in frame.columns if col in wanted]]
+            return as_read_from_csv(frame, artifact.sep, artifact.decimal, keep_dates=typed)
+
+        converted = as_read_from_csv(frame, artifact.sep, artifact.decimal, keep_dates=typed)
+        with self._lock:
+            artifact.converted[(member, typed)] = converted
+        return converted.copy()
+
+    def members(self, path: Path | str) -> Optional[List[str]]:
+        with self._lock:
+            artifact = self._artifacts.get(self._key(path))
+            return list(artifact.frames) if artifact else None
+
+    def version(self, path: Path | str) -> Optional[int]:
+        """Número de publicação do artefato (muda a cada nova publicação)."""
+        with self._lock:
+            artifact = self._artifacts.get(self._key(path))
+            return artifact.version if artifact else None
+
+    def latest(self, directory: Path | str, pattern: str) -> Optional[Path]:
+        """Artefato publicado mais recentemente em ``directory`` que casa com ``pattern``."""
+        directory_key = self._key(directory)
+        with self._lock:
+            candidates: List[Tuple[float, int, str]] = [
+                (artifact.published_at, artifact.version, key)
+                for key, artifact in self._artifacts.items()
+                if str(Path(key).parent) == directory_key
+                and fnmatch.fnmatch(Path(key).name, pattern)
+            ]
+        if not candidates:
+            return None
+        return Path(max(candidates)[2])
+
+    # ------------------------------------------------------------------
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="artifact-writer"
+                )
+            return self._executor
+
+    def wait(self, path: Path | str) -> None:
+        """Aguarda a gravação pendente de ``path``, propagando o erro dela."""
+        with self._lock:
+            artifact = self._artifacts.get(self._key(path))
+            if artifact is None or artifact.pending is None:
+                return
+            future, artifact.pending = artifact.pending, None
+        future.result()
+
+    def flush(self) -> None:
+        """Aguarda as gravações pendentes, propagando o primeiro erro."""
+        with self._lock:
+            pending = [a for a in self._artifacts.values() if a.pending]
+        for artifact in pending:
+            future, artifact.pending = artifact.pending, None
+            future.result()
+
+    def clear(self) -> None:
+        """Conclui gravações pendentes e descarta os artefatos em memória."""
+        self.flush()
+        with self._lock:
+            self._artifacts.clear()
+
+
+# Desligado até um orquestrador chamar ``configure_artifact_store``: scripts
+# avulsos não têm etapa seguinte para consumir os DataFrames.
+_STORE = ArtifactStore(in_memory=False)
+
+
+def artifact_store() -> ArtifactStore:
+    """Instância compartilhada pelo processo."""
+    return _STORE
+
+
+def configure_artifact_store(config: Optional[Dict[str, Any]] = None) -> ArtifactStore:
+    """Aplica a seção ``artifacts`` do config à instância do processo."""
+    cfg = (config or {}).get("artifacts", {}) or {}
+    _STORE.flush()
+    _STORE.in_memory = bool(cfg.get("in_memory", True))
+    _STORE.background_write = bool(cfg.get("background_write", False))
+    _STORE.skip_write = tuple(str(item) for item in cfg.get("skip_write", []) or [])
+    sidecar = cfg.get("columnar_sidecar")
+    if sidecar and str(sidecar).lower() not in ("parquet", "feather"):
+        raise ValueError(f"Formato de sidecar colunar inválido: {sidecar}")
+    _STORE.sidecar_format = str(sidecar).lower() if sidecar else None
+    return _STORE
+
+
+def _flush_on_exit() -> None:
+    try:
+        _STORE.flush()
+    except Exception as exc:  # pragma: no cover - saída do processo
+        logger.error("Falha ao gravar artefato pendente: %s", exc)
+
+
+atexit.register(_flush_on_exit)
+
+
+__all__ = [
+    "ArtifactStore",
+    "artifact_store",
+    "configure_artifact_store",
+    "as_read_from_csv",
+]
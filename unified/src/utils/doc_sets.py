@@ -0,0 +1,211 @@
+"""Process-level cache of document sets (blacklists, judicial client lists).
+
+The blacklist validator, the judicial splitter, the VIC filters and the
+devolução/baixa processors each read and normalized the same
+``ClientesJudiciais.zip`` / ``Blacklist VIC.xlsx`` on their own, once per
+instance. :func:`document_set` keeps one normalized, immutable set per
+
+    (path, mtime, size, column, normalization)
+
+for the whole process, so a file is read again only when it changes on
+disk. Membership is a hash lookup (O(1)); :meth:`DocumentSet.contains` does
+the vectorized lookup for a column.
+"""
+
+from __future__ import annotations
+
+import threading
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from .text import digits_only
+
+# Normalizações suportadas
+UPPER = 'upper'  # strip + maiúsculas
+DIGITS = 'digits'  # apenas dígitos, sem vazios
+CPF_CNPJ = 'cpf_cnpj'  # apenas dígitos, 11 ou 14 posições
+CPF = 'cpf'  # apenas dígitos, 11 posições
+
+_Key = Tuple[str, int, int, str, str]
+
+
+class DocumentSet:
+    """Immutable set of normalized documents."""
+
+    __slots__ = ('values', 'source')
+
+    def __init__(self, values: Iterable[str], source: Optional[Path] = None):
+        self.values = frozenset(values)
+        self.source = source
+
+    def __contains__(self, value: object) -> bool:
+        return value in self.values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __bool__(self) -> bool:
+        return bool(self.values)
+
+    def contains(self, values: pd.Series) -> pd.Series:
+        """Boolean mask of ``values`` (already normalized) present in the set."""
+        return values.isin(self.values)
+
+
+def normalize_documents(values: pd.Series, normalization: str) -> pd.Series:
+    """Apply one of the named normalizations to raw document values."""
+    values = values.dropna()
+    if normalization == UPPER:
+        return values.astype(str).str.strip().str.upper()
+    docs = digits_only(values)
+    if normalization == CPF_CNPJ:
+        return docs[docs.str.len().isin({11, 14})]
+    if normalization == CPF:
+        return docs[docs.str.len() == 11]
+    if normalization == DIGITS:
+        return docs[docs.ne('')]
+    raise ValueError(f"Normalização desconhecida: {normalization}")
+
+
+_CACHE: Dict[_Key, DocumentSet] = {}
+_LOCK = threading.Lock()
+
+
+def document_set(
+    path: Path | str,
+    column: str,
+    normalization: str,
+    read: Callable[[Path], Optional[pd.Series]],
+) -> Optional[DocumentSet]:
+    """Normalized documents of ``path``, read at most once per file version.
+
+    Args:
+        path: File with the documents
+        column: Column (or column rule) the documents come from; part of the key
+        normalization: ``upper``, ``digits``, ``cpf_cnpj`` or ``cpf``
+        read: Reads the raw column from the file; None when there is none
+
+    Returns:
+        The cached :class:`DocumentSet`, or None when ``read`` found no column.
+        Errors of ``read`` are propagated and nothing is cached.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    key: _Key = (str(path), stat.st_mtime_ns, stat.st_size, column, normalization)
+    with _LOCK:
+        cached = _CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    raw = read(path)
+    if raw is None:
+        return None
+    docs = DocumentSet(normalize_documents(raw, normalization), source=path)
+    with _LOCK:
+        # Versões antigas do mesmo arquivo não serão mais usadas
+        for stale in [k for k in _CACHE if k[0] == key[0] and k[3:] == key[3:]]:
+            del _CACHE[stale]
+        _CACHE[key] = docs
+    return docs
+
+
+def clear_document_sets() -> None:
+    """Drop every cached set (e.g. between tests)."""
+    with _LOCK:
+        _CACHE.clear()
+
+
+# ---------------------------------------------------------------------------
+# Leitura das listas usadas pelo validador blacklist e pelo splitter judicial
+# ---------------------------------------------------------------------------
+
+def resolve_source(source_path: str) -> Optional[Path]:
+    """``source_path`` itself, or the newest file matching it as a glob."""
+    path = Path(source_path)
+    if path.exists():
+        return path
+    parent = path.parent
+    if not parent.exists():
+        return None
+    matches = list(parent.glob(path.name))
+    if not matches:
+        return None
+    return max(matches, key=lambda p: p.stat().st_mtime)
+
+
+def _column(df: pd.DataFrame, column: str) -> pd.Series:
+    """The requested column, a common variation of it, or the first column."""
+    df.columns = [str(c).strip().upper() for c in df.columns]
+    column_upper = column.upper()
+    variations = [
+        column_upper,
+        column_upper.replace("_", ""),
+        column_upper.replace("_", " "),
+        "CPF",
+        "CNPJ",
+        "CPFCNPJ",
+        "CPF_CNPJ",
+        "DOCUMENTO",
+    ]
+    for var in variations:
+        if var in df.columns:
+            return df[var]
+    if len(df.columns) > 0:
+        return df.iloc[:, 0]
+    return pd.Series([], dtype=str)
+
+
+def read_document_column(path: Path, column: str) -> Optional[pd.Series]:
+    """Document column of a CSV (``;``), Excel or ZIP (first CSV/Excel inside)."""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return _column(pd.read_csv(path, sep=";", encoding="utf-8-sig", dtype=str), column)
+    if suffix in (".xlsx", ".xls"):
+        return _column(pd.read_excel(path, dtype=str), column)
+    if suffix != ".zip":
+        return None
+    with zipfile.ZipFile(path, "r") as zf:
+        for name in zf.namelist():
+            lower = name.lower()
+            if lower.endswith(".csv"):
+                with zf.open(name) as f:
+                    return _column(pd.read_csv(f, sep=";", encoding="utf-8-sig", dtype=str), column)
+            if lower.endswith((".xlsx", ".xls")):
+                with zf.open(name) as f:
+                    return _column(pd.read_excel(f, dtype=str), column)
+    return None
+
+
+def load_document_list(source_path: str, column: str) -> Optional[DocumentSet]:
+    """Blacklist/judicial list of ``source_path`` (path or glob), upper-cased.
+
+    Returns None when the file does not exist or cannot be read.
+    """
+    path = resolve_source(source_path)
+    if path is None:
+        return None
+    try:
+        return document_set(path, column, UPPER, lambda p: read_document_column(p, column))
+    except Exception:
+        return None
+
+
+__all__ = [
+    'CPF',
+    'CPF_CNPJ',
+    'DIGITS',
+    'DocumentSet',
+    'UPPER',
+    'clear_document_sets',
+    'document_set',
+    'load_document_list',
+    'normalize_documents',
+    'read_document_column',
+    'resolve_source',
+]
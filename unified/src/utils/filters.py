@@ -89,6 +89,20 @@ class VicFilterApplier:
         else:
             return {default}
 
+    @staticmethod
+    def _ler_coluna_blacklist(arquivo_path) -> Optional[pd.Series]:
+        """Lê a primeira coluna com CPF/CNPJ/DOCUMENTO de um arquivo de blacklist."""
+        if str(arquivo_path).endswith('.xlsx'):
+            df_blacklist = pd.read_excel(arquivo_path)
+        else:
+            df_blacklist = pd.read_csv(arquivo_path)
+
+        # Buscar coluna com CPF/CNPJ
+        for col in df_blacklist.columns:
+            if any(termo in col.upper() for termo in ['CPF', 'CNPJ', 'DOCUMENTO']):
+                return df_blacklist[col].astype(str)
+        return None
+
     def _obter_blacklist_docs(self) -> Set[str]:
         """Obtém documentos da blacklist (cache + SQL + arquivos)."""
         if self._blacklist_cache is not None:
@@ -97,39 +111,26 @@ class VicFilterApplier:
         docs_total: set[str] = set()
         docs_total.update(self.blacklist_clientes)
 
-        # Carregar blacklist de arquivos
+        # Carregar blacklist de arquivos (cache por versão de cada arquivo)
         blacklist_dir = self.paths_config.get("input", {}).get("blacklist")
         if blacklist_dir:
             try:
                 import os
-                import pandas as pd
-                from src.utils.text import digits_only
+                from src.utils.doc_sets import DIGITS, document_set
                 
                 if os.path.exists(blacklist_dir):
                     for arquivo in os.listdir(blacklist_dir):
                         if arquivo.endswith(('.xlsx', '.csv')):
                             arquivo_path = os.path.join(blacklist_dir, arquivo)
                             try:
-                                if arquivo.endswith('.xlsx'):
-                                    df_blacklist = pd.read_excel(arquivo_path)
-                                else:
-                                    df_blacklist = pd.read_csv(arquivo_path)
-                                
-                                # Buscar coluna com CPF/CNPJ
-                                coluna_cpf = None
-                                for col in df_blacklist.columns:
-                                    if any(termo in col.upper() for termo in ['CPF', 'CNPJ', 'DOCUMENTO']):
-                                        coluna_cpf = col
-                                        break
-                                
-                                if coluna_cpf and not df_blacklist.empty:
-                                    cpfs_arquivo = df_blacklist[coluna_cpf].astype(str)
-                                    cpfs_normalizados = digits_only(cpfs_arquivo)
-                                    cpfs_validos = {doc for doc in cpfs_normalizados if doc and doc != 'nan'}
-                                    docs_total.update(cpfs_validos)
+                                docs_arquivo = document_set(
+                                    arquivo_path, 'CPF|CNPJ|DOCUMENTO', DIGITS, self._ler_coluna_blacklist
+                                )
+                                if docs_arquivo:
+                                    docs_total.update(docs_arquivo)
                                     self.logger.info(
                                         "Blacklist arquivo %s carregada: %s documentos", 
-                                        arquivo, len(cpfs_validos)
+                                        arquivo, len(docs_arquivo)
                                     )
                             except Exception as e:
                                 self.logger.warning("Erro ao processar arquivo blacklist %s: %s", arquivo, e)
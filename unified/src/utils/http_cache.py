@@ -0,0 +1,218 @@
+"""On-disk cache of HTTP API responses.
+
+Re-running a failed pipeline used to download the TOTVS payloads again
+even when nothing changed upstream. :class:`HTTPCache` keeps each response
+body on disk, keyed by method + URL + parameters (+ JSON body):
+
+- within ``ttl`` seconds the cached body is served without any request;
+- after that, the request carries ``If-None-Match`` / ``If-Modified-Since``
+  from the stored ``ETag`` / ``Last-Modified``, and a ``304`` serves the
+  cached body again;
+- offline (``HTTP_OFFLINE=1`` or ``--offline``), only the cache is used and
+  a missing entry raises :class:`CacheMissError`.
+
+A body is only committed to the cache once it was read (and decoded) in
+full, so a truncated download never replaces a good entry.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional
+
+_CHUNK_BYTES = 1024 * 1024
+DEFAULT_TTL = 3600.0
+
+
+class CacheMissError(RuntimeError):
+    """Offline mode and no cached response for the request."""
+
+
+def offline_mode() -> bool:
+    """Whether ``HTTP_OFFLINE`` asks to serve API responses only from the cache."""
+    return os.getenv('HTTP_OFFLINE', '0').strip().lower() in ('1', 'true', 'sim', 'yes')
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body and its validators."""
+
+    body: Path
+    url: str
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    encoding: str = 'utf-8-sig'
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class CacheWriter:
+    """Copies body chunks to a temporary file; :meth:`commit` publishes it."""
+
+    def __init__(self, cache: 'HTTPCache', key: str, url: str):
+        self._cache = cache
+        self._key = key
+        self._url = url
+        self._tmp = cache.directory / f'{key}.{uuid.uuid4().hex}.tmp'
+        self._fh = open(self._tmp, 'wb')
+
+    def wrap(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        for chunk in chunks:
+            self._fh.write(chunk)
+            yield chunk
+
+    def commit(self, headers: Mapping[str, str], encoding: str) -> None:
+        self._fh.close()
+        os.replace(self._tmp, self._cache.body_path(self._key))
+        self._cache.write_meta(
+            self._key,
+            {
+                'url': self._url,
+                'stored_at': time.time(),
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'encoding': encoding,
+            },
+        )
+
+    def abort(self) -> None:
+        self._fh.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+class HTTPCache:
+    """Response bodies under ``directory``, fresh for ``ttl`` seconds."""
+
+    def __init__(self, directory: Path | str, ttl: float = DEFAULT_TTL, offline: Optional[bool] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = float(ttl)
+        self.offline = offline_mode() if offline is None else offline
+
+    @staticmethod
+    def key(method: str, url: str, params: Any = None, body: Any = None) -> str:
+        payload = json.dumps(
+            [method.upper(), url, sorted((params or {}).items()), body],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def body_path(self, key: str) -> Path:
+        return self.directory / f'{key}.body'
+
+    def meta_path(self, key: str) -> Path:
+        return self.directory / f'{key}.json'
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            with open(self.meta_path(key), 'r', encoding='utf-8') as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        body = self.body_path(key)
+        if not body.exists():
+            return None
+        return CacheEntry(
+            body=body,
+            url=meta.get('url', ''),
+            stored_at=float(meta.get('stored_at', 0)),
+            etag=meta.get('etag'),
+            last_modified=meta.get('last_modified'),
+            encoding=meta.get('encoding') or 'utf-8-sig',
+        )
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry is not None and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def write_meta(self, key: str, meta: Dict[str, Any]) -> None:
+        tmp = self.directory / f'{key}.{uuid.uuid4().hex}.json.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump(meta, fh, indent=2)
+        os.replace(tmp, self.meta_path(key))
+
+    def touch(self, key: str, entry: CacheEntry) -> None:
+        """Restart the TTL of a revalidated (``304``) entry."""
+        self.write_meta(
+            key,
+            {
+                'url': entry.url,
+                'stored_at': time.time(),
+                'etag': entry.etag,
+                'last_modified': entry.last_modified,
+                'encoding': entry.encoding,
+            },
+        )
+
+    def writer(self, key: str, url: str) -> CacheWriter:
+        return CacheWriter(self, key, url)
+
+    @staticmethod
+    def read_chunks(entry: CacheEntry) -> Iterator[bytes]:
+        with open(entry.body, 'rb') as fh:
+            while True:
+                chunk = fh.read(_CHUNK_BYTES)
+                if not chunk:
+                    return
+                yield chunk
+
+
+def cache_from_settings(settings: Optional[Mapping[str, Any]], name: str) -> Optional[HTTPCache]:
+    """Build the cache described by ``{dir, ttl_seconds, enabled}``.
+
+    ``dir`` is relative to the project root (default
+    ``data/cache/http/<name>``) and ``ttl_seconds`` defaults to one hour.
+    Returns None when no cache is configured (or ``enabled: false``), except
+    offline, where the default cache is always used.
+    """
+    settings = settings or {}
+    if not offline_mode() and (not settings or settings.get('enabled') is False):
+        return None
+    directory = Path(settings.get('dir') or f'data/cache/http/{name}')
+    if not directory.is_absolute():
+        directory = Path(__file__).resolve().parents[2] / directory
+    return HTTPCache(directory, ttl=float(settings.get('ttl_seconds', DEFAULT_TTL)))
+
+
+def cache_for_client(client: str, config_dir: Optional[Path] = None) -> Optional[HTTPCache]:
+    """Cache configured under ``extraction.http_cache`` in ``configs/clients/<client>.yaml``."""
+    import yaml
+
+    root = Path(__file__).resolve().parents[2]
+    path = Path(config_dir or root / 'configs' / 'clients') / f'{client}.yaml'
+    settings: Dict[str, Any] = {}
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as fh:
+            data = yaml.safe_load(fh) or {}
+        settings = (data.get('extraction') or {}).get('http_cache') or {}
+    return cache_from_settings(settings, client)
+
+
+__all__ = [
+    'CacheEntry',
+    'CacheMissError',
+    'CacheWriter',
+    'DEFAULT_TTL',
+    'HTTPCache',
+    'cache_for_client',
+    'cache_from_settings',
+    'offline_mode',
+]
@@ -0,0 +1,397 @@
+"""Concurrent fetching of paginated HTTP APIs.
+
+The API loader used to request page 1, wait, request page 2, and so on,
+sleeping a fixed ``retry_delay * attempt`` between retries. Here:
+
+- :func:`make_session` builds a ``requests.Session`` whose connection pool
+  keeps one keep-alive connection per in-flight request;
+- :func:`request_with_retry` retries transient failures (network errors,
+  408/429/5xx) with exponential backoff and full jitter, honouring
+  ``Retry-After``;
+- :func:`fetch_pages` keeps up to ``concurrency`` page requests in flight
+  and consumes them in page order into :class:`ColumnBuffers`, stopping at
+  the first short page;
+- :func:`get_records` decodes a JSON body into column buffers as it
+  arrives, retrying truncated bodies too, optionally through an on-disk
+  :class:`~.http_cache.HTTPCache` (:func:`cached_records` reads only the
+  cache);
+- :func:`date_windows` and :func:`iter_in_order` split a date-filtered
+  download into windows fetched concurrently and consumed in order, each
+  window retried on its own.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .http_cache import CacheMissError, HTTPCache
+from .json_stream import ColumnBuffers, DecodeStats, decode_records
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+_CHUNK_BYTES = 1024 * 1024
+_DECODE_LOCK = threading.Lock()
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+@dataclass
+class HTTPStats:
+    """Running totals of a paginated fetch."""
+
+    pages: int = 0
+    rows: int = 0
+    requests: int = 0
+    retries: int = 0
+    cache_hits: int = 0
+    not_modified: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, **counts: int) -> None:
+        """Increment counters; safe to call from the page threads."""
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+def make_session(pool_size: int = 4, headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """Session whose HTTP(S) pool holds ``pool_size`` keep-alive connections per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 60.0, rng: Callable[[], float] = random.random) -> float:
+    """Full-jitter exponential backoff: uniform in ``[0, min(cap, base * 2**attempt))``."""
+    return min(cap, base * (2 ** attempt)) * rng()
+
+
+def _retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get('Retry-After', ''))
+    except ValueError:
+        return None
+
+
+def _drain(response: Optional[requests.Response]) -> None:
+    # Lê o corpo (curto) da resposta de erro para a conexão voltar ao pool
+    try:
+        if response is not None:
+            response.content
+    except requests.RequestException:
+        pass
+
+
+def request_with_retry(
+    session: requests.Session,
+    method: str,
+    url: str,
+    *,
+    max_retries: int = 3,
+    retry_delay: float = 2.0,
+    max_delay: float = 60.0,
+    stats: Optional[HTTPStats] = None,
+    read: Optional[Callable[[requests.Response], Any]] = None,
+    **kwargs: Any,
+) -> Any:
+    """Send a request, retrying transient failures up to ``max_retries`` attempts.
+
+    Client errors other than 408/429 are raised at once: repeating them
+    cannot succeed. With ``read``, the body is consumed inside the retry
+    loop and its result returned, so a connection dropped mid-body (or a
+    truncated, undecodable body) is retried as well.
+    """
+    last_error: Optional[Exception] = None
+    for attempt in range(max(max_retries, 1)):
+        response = None
+        try:
+            if stats is not None:
+                stats.add(requests=1)
+            response = session.request(method, url, **kwargs)
+            response.raise_for_status()
+            return read(response) if read is not None else response
+        except (requests.RequestException, ValueError) as exc:
+            if isinstance(exc, ValueError) and read is None:
+                raise
+            if isinstance(exc, requests.HTTPError):
+                _drain(response)
+            last_error = exc
+            status = getattr(getattr(exc, 'response', None), 'status_code', None)
+            if status is not None and status not in RETRY_STATUSES:
+                raise
+            if attempt < max_retries - 1:
+                if stats is not None:
+                    stats.add(retries=1)
+                delay = _retry_after(response)
+                if delay is None:
+                    delay = backoff_delay(attempt, retry_delay, max_delay)
+                delay = min(delay, max_delay)
+                logger.debug("Retry %d for %s in %.2fs: %s", attempt + 1, url, delay, exc)
+                time.sleep(delay)
+        finally:
+            if read is not None and response is not None:
+                response.close()
+    assert last_error is not None
+    raise last_error
+
+
+def _json_encoding(response: requests.Response) -> str:
+    encoding = (response.encoding or 'utf-8').lower()
+    # utf-8-sig também aceita corpo com BOM
+    return 'utf-8-sig' if encoding in ('utf-8', 'utf8') else encoding
+
+
+def _decode(
+    chunks: Iterator[bytes],
+    encoding: str,
+    data_key: str,
+    max_bytes: Optional[int],
+    decode_stats: Optional[DecodeStats],
+) -> ColumnBuffers:
+    run = DecodeStats()
+    buffers = decode_records(chunks, data_key, encoding=encoding, max_bytes=max_bytes, stats=run)
+    # Consome o que sobrou do corpo para manter a conexão keep-alive
+    for _ in chunks:
+        pass
+    if decode_stats is not None:
+        # Só a tentativa que deu certo entra na conta
+        with _DECODE_LOCK:
+            decode_stats.bytes += run.bytes
+            decode_stats.records += run.records
+    return buffers
+
+
+def _usable(cache: HTTPCache, entry: Any) -> bool:
+    """Whether ``entry`` may be served without a request (fresh, or offline)."""
+    return entry is not None and (cache.offline or cache.is_fresh(entry))
+
+
+def cached_records(
+    cache: HTTPCache,
+    url: str,
+    *,
+    data_key: str = '',
+    max_bytes: Optional[int] = None,
+    decode_stats: Optional[DecodeStats] = None,
+    method: str = 'GET',
+    params: Any = None,
+    json: Any = None,
+    stats: Optional[HTTPStats] = None,
+) -> Optional[ColumnBuffers]:
+    """Records :func:`get_records` would serve from ``cache`` without a request, else ``None``."""
+    entry = cache.get(cache.key(method, url, params, json))
+    if not _usable(cache, entry):
+        return None
+    if stats is not None:
+        stats.add(cache_hits=1)
+    return _decode(cache.read_chunks(entry), entry.encoding, data_key, max_bytes, decode_stats)
+
+
+def get_records(
+    session: requests.Session,
+    url: str,
+    *,
+    data_key: str = '',
+    max_bytes: Optional[int] = None,
+    decode_stats: Optional[DecodeStats] = None,
+    method: str = 'GET',
+    cache: Optional[HTTPCache] = None,
+    **kwargs: Any,
+) -> ColumnBuffers:
+    """Request ``url`` and decode its JSON records straight into column buffers.
+
+    The body is streamed through :func:`~.json_stream.decode_records`
+    (``data_key`` and ``max_bytes`` as there) inside the retry loop of
+    :func:`request_with_retry`, so a truncated body is requested again.
+
+    With a ``cache``, a fresh entry is decoded from disk without a request,
+    a stale one is revalidated (``304`` decodes it from disk) and a full
+    body is stored once decoded. Offline, a missing entry raises
+    :class:`~.http_cache.CacheMissError`.
+    """
+    stats: Optional[HTTPStats] = kwargs.get('stats')
+
+    def decode(chunks: Iterator[bytes], encoding: str) -> ColumnBuffers:
+        return _decode(chunks, encoding, data_key, max_bytes, decode_stats)
+
+    key, entry = '', None
+    if cache is not None:
+        key = cache.key(method, url, kwargs.get('params'), kwargs.get('json'))
+        entry = cache.get(key)
+        if _usable(cache, entry):
+            if stats is not None:
+                stats.add(cache_hits=1)
+            return decode(cache.read_chunks(entry), entry.encoding)
+        if cache.offline:
+            raise CacheMissError(f"Sem resposta em cache para {url} (modo offline)")
+        kwargs['headers'] = {**(kwargs.get('headers') or {}), **cache.conditional_headers(entry)}
+
+    def read(response: requests.Response) -> ColumnBuffers:
+        if response.status_code == 304 and cache is not None and entry is not None:
+            cache.touch(key, entry)
+            if stats is not None:
+                stats.add(not_modified=1)
+            return decode(cache.read_chunks(entry), entry.encoding)
+        encoding = _json_encoding(response)
+        chunks = response.iter_content(chunk_size=_CHUNK_BYTES)
+        if cache is None:
+            return decode(chunks, encoding)
+        writer = cache.writer(key, url)
+        try:
+            buffers = decode(writer.wrap(chunks), encoding)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.commit(response.headers, encoding)
+        return buffers
+
+    return request_with_retry(session, method, url, stream=True, read=read, **kwargs)
+
+
+def date_windows(start: date, end: date, days: int) -> List[Tuple[date, date]]:
+    """Split ``start..end`` (inclusive) into consecutive windows of ``days`` days.
+
+    ``days <= 0`` returns the whole range as a single window.
+    """
+    if end < start:
+        return []
+    if days <= 0:
+        return [(start, end)]
+    windows = []
+    while start <= end:
+        stop = min(start + timedelta(days=days - 1), end)
+        windows.append((start, stop))
+        start = stop + timedelta(days=1)
+    return windows
+
+
+def iter_in_order(fn: Callable[[T], R], items: Iterable[T], concurrency: int = 4) -> Iterator[R]:
+    """Yield ``fn(item)`` for each item, in order, with up to ``concurrency`` calls running.
+
+    Only ``concurrency`` results are computed ahead of the consumer. Closing
+    the generator early cancels the calls not yet started; an error is
+    raised when its item is reached.
+    """
+    items = iter(items)
+    concurrency = max(int(concurrency), 1)
+    pending: Deque[Future] = deque()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='http')
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= concurrency:
+                break
+        while pending:
+            result = pending.popleft().result()
+            for item in items:
+                pending.append(executor.submit(fn, item))
+                break
+            yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def fetch_pages(
+    fetch_page: Callable[[int], Union[List[Any], ColumnBuffers]],
+    *,
+    page_size: int,
+    max_pages: int,
+    concurrency: int = 4,
+    first_page: int = 1,
+    stats: Optional[HTTPStats] = None,
+    cached_page: Optional[Callable[[int], Optional[Union[List[Any], ColumnBuffers]]]] = None,
+) -> ColumnBuffers:
+    """Fetch pages ``first_page..`` with up to ``concurrency`` requests in flight.
+
+    ``fetch_page(n)`` returns the records of page ``n`` (a list or
+    :class:`ColumnBuffers`). Pages are consumed
+    in order; the first empty or short page ends the fetch and pages
+    requested past it are discarded (up to ``concurrency - 1`` extra
+    requests). An error on a page that is consumed is raised.
+
+    ``cached_page(n)`` returns the records of page ``n`` when they can be
+    served without a request (``None`` otherwise). Those pages are read
+    first, one by one, so a re-run whose pages are all cached stops at the
+    cached short page and never requests pages past it.
+    """
+    buffers = ColumnBuffers()
+
+    def consume(records: Union[List[Any], ColumnBuffers]) -> bool:
+        rows = len(records)
+        if stats is not None:
+            stats.add(pages=1, rows=rows)
+        if isinstance(records, ColumnBuffers):
+            buffers.merge(records)
+        else:
+            buffers.extend(records)
+        return rows < page_size
+
+    page, last_page = first_page, first_page + max_pages
+    if cached_page is not None:
+        while page < last_page:
+            records = cached_page(page)
+            if records is None:
+                break
+            page += 1
+            if consume(records):
+                return buffers
+
+    pages = iter_in_order(fetch_page, range(page, last_page), concurrency)
+    try:
+        for records in pages:
+            if consume(records):
+                break
+    finally:
+        pages.close()
+    return buffers
+
+
+__all__ = [
+    'ColumnBuffers',
+    'HTTPStats',
+    'RETRY_STATUSES',
+    'backoff_delay',
+    'cached_records',
+    'date_windows',
+    'fetch_pages',
+    'get_records',
+    'iter_in_order',
+    'make_session',
+    'request_with_retry',
+]
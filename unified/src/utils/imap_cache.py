@@ -0,0 +1,500 @@
+"""Partial IMAP fetches and a local cache of downloaded attachments.
+
+The email extractors used to ``FETCH (RFC822)`` the whole message on every
+run and walk it to find the attachment. Here:
+
+- :func:`fetch_bodystructure` reads the MIME tree (``BODYSTRUCTURE``) and
+  :func:`fetch_headers` only the header fields needed to filter messages;
+- :func:`fetch_summaries` does the same for many messages in one command,
+  so candidate messages can be filtered in bulk;
+- :func:`fetch_part` downloads a single body section (``BODY.PEEK[2]``),
+  decoding its transfer encoding, and :class:`IMAPPool` spreads part
+  downloads over a few connections;
+- :class:`AttachmentCache` keeps each attachment on disk keyed by
+  (mailbox, UIDVALIDITY, UID, section). A UID is only unique within one
+  UIDVALIDITY of the mailbox, so a server-side renumbering never serves a
+  stale file. Each store prunes the mailbox down to its current
+  UIDVALIDITY and most recent UIDs.
+
+All commands use UIDs (``mail.uid(...)``) and ``PEEK``, so the
+``\\Seen`` flags are left untouched.
+"""
+
+from __future__ import annotations
+
+import base64
+import email
+import imaplib
+import os
+import queue
+import quopri
+import re
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.header import decode_header, make_header
+from email.utils import collapse_rfc2231_value, decode_rfc2231
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+_LITERAL = re.compile(rb'\{(\d+)\}$')
+_SAFE_NAME = re.compile(r'[^A-Za-z0-9._-]+')
+
+# Mensagens (UIDs) mantidas por caixa no cache de anexos
+DEFAULT_KEEP = 20
+
+Token = Union[str, bytes, None, list]
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+@dataclass(frozen=True)
+class AttachmentPart:
+    """A leaf body part of a message, as described by ``BODYSTRUCTURE``."""
+
+    section: str
+    content_type: str
+    filename: str
+    encoding: str
+    size: int
+    disposition: Optional[str] = None
+
+
+class AttachmentCache:
+    """Attachments on disk under ``directory/<mailbox>/<uidvalidity>/<uid>.<section>``.
+
+    After each :meth:`put` the mailbox keeps only the current UIDVALIDITY
+    and its ``keep`` highest UIDs (``keep=None`` disables pruning).
+    """
+
+    def __init__(self, directory: Path | str, keep: Optional[int] = DEFAULT_KEEP):
+        self.directory = Path(directory)
+        self.keep = keep
+
+    def _mailbox_dir(self, mailbox: str) -> Path:
+        return self.directory / (_SAFE_NAME.sub('_', mailbox) or '_')
+
+    def path(self, mailbox: str, uidvalidity: int | str, uid: int | str, section: str) -> Path:
+        return self._mailbox_dir(mailbox) / str(uidvalidity) / f'{uid}.{section}.bin'
+
+    def get(self, mailbox: str, uidvalidity: int | str, uid: int | str, section: str) -> Optional[bytes]:
+        try:
+            return self.path(mailbox, uidvalidity, uid, section).read_bytes()
+        except OSError:
+            return None
+
+    def put(self, mailbox: str, uidvalidity: int | str, uid: int | str, section: str, data: bytes) -> Path:
+        target = self.path(mailbox, uidvalidity, uid, section)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f'{target.name}.{uuid.uuid4().hex}.tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+        if self.keep is not None:
+            self.prune(mailbox, uidvalidity, self.keep)
+        return target
+
+    def prune(self, mailbox: str, uidvalidity: int | str, keep: int = DEFAULT_KEEP) -> int:
+        """Drop other UIDVALIDITYs of ``mailbox`` and all but its ``keep`` highest UIDs.
+
+        Returns the number of files removed. Files still being written are left alone.
+        """
+        folder = self._mailbox_dir(mailbox)
+        removed = 0
+        for child in list(folder.iterdir()) if folder.is_dir() else []:
+            if child.is_dir() and child.name != str(uidvalidity):
+                # UIDs de outra UIDVALIDITY não apontam mais para as mesmas mensagens
+                removed += sum(1 for item in child.rglob('*') if item.is_file())
+                shutil.rmtree(child, ignore_errors=True)
+
+        by_uid: Dict[int, List[Path]] = {}
+        current = folder / str(uidvalidity)
+        for item in list(current.iterdir()) if current.is_dir() else []:
+            uid = item.name.split('.', 1)[0]
+            if uid.isdigit() and not item.name.endswith('.tmp'):
+                by_uid.setdefault(int(uid), []).append(item)
+        for uid in sorted(by_uid, reverse=True)[max(int(keep), 0):]:
+            for item in by_uid[uid]:
+                item.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+# ---------------------------------------------------------------------------
+# Parsing of FETCH responses
+# ---------------------------------------------------------------------------
+
+def _tokenize(text: bytes, tokens: List[Any]) -> None:
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i:i + 1]
+        if ch in b' \r\n':
+            i += 1
+        elif ch in b'()':
+            tokens.append(ch.decode())
+            i += 1
+        elif ch == b'"':
+            i += 1
+            out = bytearray()
+            while i < n and text[i:i + 1] != b'"':
+                if text[i:i + 1] == b'\\':
+                    i += 1
+                out += text[i:i + 1]
+                i += 1
+            tokens.append(('str', bytes(out).decode('utf-8', errors='replace')))
+            i += 1
+        else:
+            start, depth = i, 0
+            # BODY[HEADER.FIELDS (SUBJECT DATE)] é um átomo só
+            while i < n and (depth or text[i:i + 1] not in b' ()\r\n'):
+                if text[i:i + 1] == b'[':
+                    depth += 1
+                elif text[i:i + 1] == b']':
+                    depth -= 1
+                i += 1
+            atom = text[start:i].decode('ascii', errors='replace')
+            tokens.append(None if atom.upper() == 'NIL' else ('atom', atom))
+
+
+def _tokens(data: Sequence[Any]) -> List[Any]:
+    """Flatten imaplib's FETCH data (lines and ``(head, literal)`` tuples) into tokens."""
+    tokens: List[Any] = []
+    for item in data:
+        if item is None:
+            continue
+        if isinstance(item, tuple):
+            head, literal = item[0], item[1]
+            match = _LITERAL.search(head.rstrip())
+            _tokenize(head.rstrip()[:match.start()] if match else head, tokens)
+            tokens.append(('lit', literal))
+        else:
+            _tokenize(item, tokens)
+    return tokens
+
+
+def _nest(tokens: List[Any]) -> List[Token]:
+    stack: List[List[Token]] = [[]]
+    for token in tokens:
+        if token == '(':
+            stack.append([])
+        elif token == ')':
+            if len(stack) == 1:
+                continue
+            done = stack.pop()
+            stack[-1].append(done)
+        elif token is None:
+            stack[-1].append(None)
+        else:
+            stack[-1].append(token[1])
+    while len(stack) > 1:
+        done = stack.pop()
+        stack[-1].append(done)
+    return stack[0]
+
+
+def parse_fetch(data: Sequence[Any]) -> List[Dict[str, Token]]:
+    """Parse the data of a (UID) FETCH into one ``{item: value}`` dict per message.
+
+    Item names are upper-cased (``UID``, ``BODYSTRUCTURE``,
+    ``BODY[HEADER.FIELDS (SUBJECT)]``); literals come back as bytes.
+    """
+    messages = []
+    for value in _nest(_tokens(data)):
+        if not isinstance(value, list):
+            continue
+        items = {}
+        for name, item in zip(value[0::2], value[1::2]):
+            if isinstance(name, str):
+                items[name.upper()] = item
+        messages.append(items)
+    return messages
+
+
+def _text(value: Token) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return str(value)
+
+
+def _params(value: Token) -> Dict[str, str]:
+    if not isinstance(value, list):
+        return {}
+    return {_text(k).lower(): _text(v) for k, v in zip(value[0::2], value[1::2])}
+
+
+def _decode_filename(params: Dict[str, str]) -> str:
+    for key in ('filename', 'name'):
+        if key in params:
+            return str(make_header(decode_header(params[key])))
+        if f'{key}*' in params:
+            return collapse_rfc2231_value(decode_rfc2231(params[f'{key}*']))
+    return ''
+
+
+def _walk(body: List[Token], section: str, parts: List[AttachmentPart]) -> None:
+    if body and isinstance(body[0], list):
+        # Subpartes vêm antes do subtipo; as listas depois dele são parâmetros
+        children = []
+        for child in body:
+            if not isinstance(child, list):
+                break
+            children.append(child)
+        for index, child in enumerate(children, start=1):
+            _walk(child, f'{section}.{index}' if section else str(index), parts)
+        return
+    maintype, subtype = _text(body[0]).lower(), _text(body[1]).lower()
+    params = _params(body[2])
+    # Extensões vêm depois dos campos fixos de cada tipo
+    if maintype == 'text':
+        extension = 8
+    elif (maintype, subtype) == ('message', 'rfc822'):
+        extension = 10
+    else:
+        extension = 7
+    disposition = body[extension + 1] if len(body) > extension + 1 else None
+    disposition_type = None
+    if isinstance(disposition, list) and disposition:
+        disposition_type = _text(disposition[0]).lower()
+        params = {**params, **_params(disposition[1] if len(disposition) > 1 else None)}
+    size = body[6] if len(body) > 6 else 0
+    parts.append(
+        AttachmentPart(
+            section=section or '1',
+            content_type=f'{maintype}/{subtype}',
+            filename=_decode_filename(params),
+            encoding=_text(body[5]).lower() if len(body) > 5 else '7bit',
+            size=int(size) if str(size or '').isdigit() else 0,
+            disposition=disposition_type,
+        )
+    )
+
+
+def body_parts(bodystructure: Token) -> List[AttachmentPart]:
+    """Leaf parts of a parsed ``BODYSTRUCTURE``, numbered as IMAP body sections."""
+    parts: List[AttachmentPart] = []
+    if isinstance(bodystructure, list):
+        _walk(bodystructure, '', parts)
+    return parts
+
+
+def decode_transfer(data: bytes, encoding: str) -> bytes:
+    """Undo the part's Content-Transfer-Encoding."""
+    encoding = (encoding or '').lower()
+    if encoding == 'base64':
+        return base64.b64decode(data)
+    if encoding == 'quoted-printable':
+        return quopri.decodestring(data)
+    return data
+
+
+# ---------------------------------------------------------------------------
+# IMAP commands
+# ---------------------------------------------------------------------------
+
+def _check(typ: str, data: Any, what: str) -> None:
+    if typ != 'OK':
+        raise imaplib.IMAP4.error(f"{what} failed: {data!r}")
+
+
+def select_mailbox(mail: imaplib.IMAP4, mailbox: str = 'INBOX') -> int:
+    """Select ``mailbox`` read-only and return its UIDVALIDITY."""
+    typ, data = mail.select(mailbox, readonly=True)
+    _check(typ, data, f"SELECT {mailbox}")
+    _, values = mail.response('UIDVALIDITY')
+    for value in values or []:
+        if value:
+            return int(value)
+    raise imaplib.IMAP4.error(f"UIDVALIDITY ausente em {mailbox}")
+
+
+def search_uids(mail: imaplib.IMAP4, criteria: str) -> List[str]:
+    """UIDs matching ``criteria``, in ascending order."""
+    typ, data = mail.uid('SEARCH', None, criteria)
+    _check(typ, data, f"UID SEARCH {criteria}")
+    found = b' '.join(item for item in data if item)
+    return sorted({uid.decode() for uid in found.split()}, key=int)
+
+
+def fetch_items(mail: imaplib.IMAP4, uids: Union[str, Iterable[str]], items: str) -> Dict[str, Dict[str, Token]]:
+    """``UID FETCH`` ``items`` for one or more UIDs, returned by UID."""
+    uid_set = uids if isinstance(uids, str) else ','.join(uids)
+    typ, data = mail.uid('FETCH', uid_set, items)
+    _check(typ, data, f"UID FETCH {items}")
+    return {_text(message['UID']): message for message in parse_fetch(data) if 'UID' in message}
+
+
+def fetch_bodystructure(mail: imaplib.IMAP4, uid: str) -> List[AttachmentPart]:
+    """Leaf parts of message ``uid``, without downloading any body."""
+    message = fetch_items(mail, uid, '(BODYSTRUCTURE)').get(str(uid), {})
+    return body_parts(message.get('BODYSTRUCTURE'))
+
+
+def _header_message(message: Dict[str, Token]) -> email.message.Message:
+    raw = next((v for k, v in message.items() if k.startswith('BODY[')), b'')
+    return email.message_from_bytes(raw if isinstance(raw, bytes) else _text(raw).encode())
+
+
+def fetch_headers(
+    mail: imaplib.IMAP4,
+    uid: str,
+    fields: Sequence[str] = ('SUBJECT', 'FROM', 'DATE'),
+) -> email.message.Message:
+    """Only the named header fields of message ``uid``."""
+    wanted = ' '.join(fields)
+    message = fetch_items(mail, uid, f'(BODY.PEEK[HEADER.FIELDS ({wanted})])').get(str(uid), {})
+    return _header_message(message)
+
+
+def fetch_summaries(
+    mail: imaplib.IMAP4,
+    uids: Sequence[str],
+    fields: Sequence[str] = ('SUBJECT', 'FROM', 'DATE'),
+    batch_size: int = 500,
+) -> Dict[str, Tuple[email.message.Message, List[AttachmentPart]]]:
+    """Header fields and BODYSTRUCTURE of many messages, one ``UID FETCH`` per ``batch_size`` UIDs.
+
+    Returns ``{uid: (headers, parts)}`` in the order of ``uids``.
+    """
+    wanted = ' '.join(fields)
+    items = f'(BODYSTRUCTURE BODY.PEEK[HEADER.FIELDS ({wanted})])'
+    fetched: Dict[str, Dict[str, Token]] = {}
+    uids = [str(uid) for uid in uids]
+    for start in range(0, len(uids), max(batch_size, 1)):
+        fetched.update(fetch_items(mail, uids[start:start + batch_size], items))
+    return {
+        uid: (_header_message(fetched[uid]), body_parts(fetched[uid].get('BODYSTRUCTURE')))
+        for uid in uids
+        if uid in fetched
+    }
+
+
+def fetch_part(mail: imaplib.IMAP4, uid: str, part: AttachmentPart) -> bytes:
+    """Download and decode one body section of message ``uid``."""
+    message = fetch_items(mail, uid, f'(BODY.PEEK[{part.section}])').get(str(uid), {})
+    raw = message.get(f'BODY[{part.section}]')
+    if raw is None:
+        raise imaplib.IMAP4.error(f"Parte {part.section} ausente na mensagem UID {uid}")
+    return decode_transfer(raw if isinstance(raw, bytes) else _text(raw).encode(), part.encoding)
+
+
+def fetch_attachment(
+    mail: imaplib.IMAP4,
+    uid: str,
+    part: AttachmentPart,
+    *,
+    mailbox: str,
+    uidvalidity: int,
+    cache: Optional[AttachmentCache] = None,
+) -> Tuple[bytes, bool]:
+    """Attachment bytes from the cache, or fetched and stored; returns (data, from_cache)."""
+    if cache is not None:
+        data = cache.get(mailbox, uidvalidity, uid, part.section)
+        if data is not None:
+            return data, True
+    data = fetch_part(mail, uid, part)
+    if cache is not None:
+        cache.put(mailbox, uidvalidity, uid, part.section, data)
+    return data, False
+
+
+class IMAPPool:
+    """Up to ``size`` connections selected on the same mailbox, for parallel part downloads.
+
+    ``first`` (an already selected connection) is reused; the others are
+    opened with ``connect`` on demand and must report the same
+    UIDVALIDITY, otherwise the UIDs would point at other messages.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], imaplib.IMAP4],
+        mailbox: str,
+        uidvalidity: int,
+        size: int = 2,
+        first: Optional[imaplib.IMAP4] = None,
+    ):
+        self._connect = connect
+        self.mailbox = mailbox
+        self.uidvalidity = uidvalidity
+        self.size = max(int(size), 1)
+        self._idle: 'queue.Queue[imaplib.IMAP4]' = queue.Queue()
+        self._opened: List[imaplib.IMAP4] = []
+        self._lock = threading.Lock()
+        self._count = 0
+        if first is not None:
+            self._idle.put(first)
+            self._count = 1
+
+    def _acquire(self) -> imaplib.IMAP4:
+        with self._lock:
+            create = self._idle.empty() and self._count < self.size
+            if create:
+                self._count += 1
+        if not create:
+            return self._idle.get()
+        try:
+            mail = self._connect()
+            self._opened.append(mail)
+            uidvalidity = select_mailbox(mail, self.mailbox)
+        except Exception:
+            with self._lock:
+                self._count -= 1
+            raise
+        if uidvalidity != self.uidvalidity:
+            raise imaplib.IMAP4.error(
+                f"UIDVALIDITY de {self.mailbox} mudou durante a leitura ({self.uidvalidity} -> {uidvalidity})"
+            )
+        return mail
+
+    def map(self, fn: Callable[[imaplib.IMAP4, T], R], items: Iterable[T]) -> List[R]:
+        """``fn(connection, item)`` for each item, in order, over up to ``size`` connections."""
+        items = list(items)
+
+        def run(item: T) -> R:
+            mail = self._acquire()
+            try:
+                return fn(mail, item)
+            finally:
+                self._idle.put(mail)
+
+        workers = min(self.size, len(items))
+        if workers <= 1:
+            return [run(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='imap') as executor:
+            return list(executor.map(run, items))
+
+    def close(self) -> None:
+        """Log out the connections this pool opened (``first`` stays open)."""
+        for mail in self._opened:
+            try:
+                mail.logout()
+            except Exception:
+                pass
+        self._opened = []
+
+    def __enter__(self) -> 'IMAPPool':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+__all__ = [
+    'AttachmentCache',
+    'AttachmentPart',
+    'IMAPPool',
+    'body_parts',
+    'decode_transfer',
+    'fetch_attachment',
+    'fetch_bodystructure',
+    'fetch_headers',
+    'fetch_items',
+    'fetch_part',
+    'fetch_summaries',
+    'parse_fetch',
+    'search_uids',
+    'select_mailbox',
+]
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import io
+import logging
+import struct
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 import pandas as pd
 
+from .artifacts import artifact_store, as_read_from_csv
+
+logger = logging.getLogger(__name__)
+
 
 def ensure_directory(path: Path) -> Path:
     """Create directory hierarchy if needed and return the path."""
@@ -13,20 +25,395 @@ def ensure_directory(path: Path) -> Path:
     return path
 
 
-def read_csv_or_zip(path: Path, sep: str = ',', encoding: str = 'utf-8-sig') -> pd.DataFrame:
+SIDECAR_SUFFIXES = {'parquet': '.parquet', 'feather': '.feather'}
+
+
+def _project(columns: Optional[Iterable[str]]) -> Optional[Callable[[str], bool]]:
+    if columns is None:
+        return None
+    wanted = set(columns)
+    return lambda name: name in wanted
+
+
+def columnar_sidecar_path(path: Path, fmt: str = 'parquet') -> Path:
+    """Path of the columnar sidecar stored next to ``path``."""
+    return Path(path).with_suffix(SIDECAR_SUFFIXES[fmt])
+
+
+def remove_columnar_sidecars(path: Path) -> None:
+    """Delete any sidecar written next to ``path`` (best-effort)."""
+    for fmt in SIDECAR_SUFFIXES:
+        try:
+            columnar_sidecar_path(path, fmt).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def write_columnar_sidecar(
+    df: pd.DataFrame,
+    path: Path,
+    fmt: str = 'parquet',
+    decimal: str = '.',
+) -> Optional[Path]:
+    """Write ``df`` with its dtypes next to ``path`` as Parquet or Feather.
+
+    Needs ``pyarrow``; without it nothing is written. The CSV decimal separator
+    is kept in the schema metadata so string reads match the CSV exactly.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        logger.debug("pyarrow indisponível; sidecar colunar não gerado para %s", path)
+        return None
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        # Colunas com tipos mistos seguem como texto, igual ao CSV
+        mixed = [
+            col for col in df.columns
+            if df[col].dtype == object
+            and pd.api.types.infer_dtype(df[col], skipna=True) not in ('string', 'empty')
+        ]
+        df = df.copy()
+        df[mixed] = as_read_from_csv(df[mixed], decimal=decimal)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'csv_decimal'] = decimal.encode()
+    table = table.replace_schema_metadata(metadata)
+
+    target = columnar_sidecar_path(path, fmt)
+    if fmt == 'feather':
+        from pyarrow import feather
+        feather.write_feather(table, target)
+    else:
+        import pyarrow.parquet as pq
+        pq.write_table(table, target)
+    return target
+
+
+def read_columnar_sidecar(
+    path: Path,
+    columns: Optional[Iterable[str]] = None,
+    typed: bool = False,
+) -> Optional[pd.DataFrame]:
+    """Read the sidecar of ``path`` if one exists and is not older than it.
+
+    Only ``columns`` (those that exist) are read from the file. Returns
+    ``None`` when there is no usable sidecar (or ``pyarrow`` is missing).
+    The frame matches ``read_csv(dtype=str)``; with ``typed`` the date
+    columns stay ``datetime64`` instead of being formatted as text.
+    """
     path = Path(path)
+    try:
+        source_mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    for fmt in SIDECAR_SUFFIXES:
+        target = columnar_sidecar_path(path, fmt)
+        try:
+            if target.stat().st_mtime_ns < source_mtime:
+                continue
+        except OSError:
+            continue
+        try:
+            import pyarrow.ipc
+            import pyarrow.parquet as pq
+        except ImportError:
+            return None
+
+        if fmt == 'feather':
+            with pyarrow.ipc.open_file(target) as reader:
+                schema = reader.schema
+        else:
+            schema = pq.read_schema(target)
+        keep = _project(columns)
+        selected = [name for name in schema.names if keep is None or keep(name)]
+        if fmt == 'feather':
+            from pyarrow import feather
+            table = feather.read_table(target, columns=selected)
+        else:
+            table = pq.read_table(target, columns=selected)
+        decimal = (schema.metadata or {}).get(b'csv_decimal', b'.').decode()
+        df = table.to_pandas(date_as_object=False)
+        return as_read_from_csv(df, decimal=decimal, keep_dates=typed)
+    return None
+
+
+def read_csv_or_zip(
+    path: Path,
+    sep: str = ',',
+    encoding: str = 'utf-8-sig',
+    columns: Optional[Iterable[str]] = None,
+    typed: bool = False,
+) -> pd.DataFrame:
+    """Read a CSV or the first CSV of a ZIP as strings.
+
+    ``columns`` limits the result to those columns (missing ones are ignored).
+    Frames published in memory and columnar sidecars are used before the file;
+    from those, ``typed`` keeps date columns as ``datetime64`` (a plain CSV
+    read still returns them as text).
+    """
+    path = Path(path)
+    in_memory = artifact_store().get(path, sep=sep, columns=columns, typed=typed)
+    if in_memory is not None:
+        return in_memory
     if not path.exists():
         raise FileNotFoundError(path)
 
+    sidecar = read_columnar_sidecar(path, columns, typed=typed)
+    if sidecar is not None:
+        return sidecar
+
+    usecols = _project(columns)
     if path.suffix.lower() == '.zip':
-        import zipfile
         with zipfile.ZipFile(path) as zf:
             members = zf.namelist()
             if not members:
                 raise ValueError(f"ZIP vazio: {path}")
             with zf.open(members[0]) as buffer:
-                return pd.read_csv(buffer, sep=sep, encoding=encoding, dtype=str)
-    return pd.read_csv(path, sep=sep, encoding=encoding, dtype=str)
+                return pd.read_csv(buffer, sep=sep, encoding=encoding, dtype=str, usecols=usecols)
+    return pd.read_csv(path, sep=sep, encoding=encoding, dtype=str, usecols=usecols)
+
+
+def write_csv_member(
+    zf: zipfile.ZipFile,
+    name: str,
+    df: pd.DataFrame,
+    encoding: str = 'utf-8-sig',
+    **to_csv_kwargs,
+) -> None:
+    """Stream ``df`` as CSV straight into a new member of the open ``zf``.
+
+    pandas already renders ``to_csv`` in fixed row chunks, so writing through
+    a text wrapper over the ZIP entry yields the same bytes as rendering the
+    whole CSV in memory, while only one chunk is held at a time.
+    """
+    zinfo = _member_info(zf, name)
+    # Estimativa folgada do tamanho descompactado para decidir o ZIP64
+    force_zip64 = len(df) * max(len(df.columns), 1) * 64 > zipfile.ZIP64_LIMIT
+
+    with zf.open(zinfo, 'w', force_zip64=force_zip64) as raw:
+        with io.TextIOWrapper(raw, encoding=encoding, newline='') as text:
+            df.to_csv(text, index=False, **to_csv_kwargs)
+
+
+def write_csv_batches_member(
+    zf: zipfile.ZipFile,
+    name: str,
+    batches: Iterable[pd.DataFrame],
+    encoding: str = 'utf-8-sig',
+    **to_csv_kwargs,
+) -> int:
+    """Stream consecutive ``batches`` of one table into a single CSV member.
+
+    The header comes from the first batch; the bytes match writing the
+    concatenated frame with :func:`write_csv_member`. Returns the row count.
+    """
+    rows = 0
+    with open_text_member(zf, name, encoding) as text:
+        for position, batch in enumerate(batches):
+            batch.to_csv(text, index=False, header=position == 0, **to_csv_kwargs)
+            rows += len(batch)
+    return rows
+
+
+@contextmanager
+def open_text_member(zf: zipfile.ZipFile, name: str, encoding: str = 'utf-8-sig') -> Iterator[TextIO]:
+    """Text handle on a new member of the open ``zf``, for content of unknown size."""
+    # O total só é conhecido no fim: ZIP64 sempre habilitado
+    with zf.open(_member_info(zf, name), 'w', force_zip64=True) as raw:
+        with io.TextIOWrapper(raw, encoding=encoding, newline='') as text:
+            yield text
+
+
+def _member_info(zf: zipfile.ZipFile, name: str) -> zipfile.ZipInfo:
+    zinfo = zipfile.ZipInfo(name, date_time=time.localtime(time.time())[:6])
+    zinfo.compress_type = zf.compression
+    # Mesmos metadados que ``ZipFile.writestr`` usaria
+    if hasattr(zinfo, 'compress_level'):
+        zinfo.compress_level = zf.compresslevel
+    else:  # Python < 3.13
+        zinfo._compresslevel = zf.compresslevel
+    zinfo.external_attr = 0o600 << 16
+    return zinfo
+
+
+class _DeflateSink(io.RawIOBase):
+    """Binary sink that deflates (or stores) whatever is written, tracking CRC and sizes."""
+
+    def __init__(self, compresslevel: Optional[int]) -> None:
+        super().__init__()
+        self._compressor = (
+            None
+            if compresslevel == 0
+            else zlib.compressobj(-1 if compresslevel is None else compresslevel, zlib.DEFLATED, -15)
+        )
+        self.chunks: List[bytes] = []
+        self.crc = 0
+        self.file_size = 0
+        self.compress_size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.crc = zlib.crc32(data, self.crc)
+        self.file_size += len(data)
+        self._emit(self._compressor.compress(data) if self._compressor else data)
+        return len(data)
+
+    def _emit(self, chunk: bytes) -> None:
+        if chunk:
+            self.chunks.append(chunk)
+            self.compress_size += len(chunk)
+
+    def finish(self) -> Tuple[List[bytes], int, int, int]:
+        if self._compressor:
+            self._emit(self._compressor.flush())
+        return self.chunks, self.crc, self.file_size, self.compress_size
+
+
+def _render_member(
+    df: pd.DataFrame,
+    encoding: str,
+    compresslevel: Optional[int],
+    to_csv_kwargs: Dict[str, object],
+) -> Tuple[List[bytes], int, int, int]:
+    """Serialize and compress one member; runs on a worker thread or process."""
+    sink = _DeflateSink(compresslevel)
+    text = io.TextIOWrapper(io.BufferedWriter(sink, buffer_size=1 << 20), encoding=encoding, newline='')
+    df.to_csv(text, index=False, **to_csv_kwargs)
+    text.flush()
+    return sink.finish()
+
+
+class _RawZipWriter:
+    """Minimal ZIP writer for members compressed elsewhere.
+
+    Writes each local header and its compressed bytes, then the central
+    directory (ZIP64 records when sizes, offsets or the member count need
+    them), on a plain binary file: no ``ZipFile`` state is involved.
+    """
+
+    def __init__(self, fp: BinaryIO) -> None:
+        self.fp = fp
+        self.members: List[zipfile.ZipInfo] = []
+
+    @staticmethod
+    def _name(zinfo: zipfile.ZipInfo) -> Tuple[bytes, int]:
+        try:
+            return zinfo.filename.encode('ascii'), zinfo.flag_bits
+        except UnicodeEncodeError:
+            return zinfo.filename.encode('utf-8'), zinfo.flag_bits | 0x800
+
+    def add(self, zinfo: zipfile.ZipInfo, chunks: Iterable[bytes]) -> None:
+        zinfo.header_offset = self.fp.tell()
+        self.fp.write(zinfo.FileHeader(max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT))
+        for chunk in chunks:
+            self.fp.write(chunk)
+        self.members.append(zinfo)
+
+    def close(self) -> None:
+        start = self.fp.tell()
+        for zinfo in self.members:
+            sizes = []
+            file_size, compress_size, offset = zinfo.file_size, zinfo.compress_size, zinfo.header_offset
+            if file_size > zipfile.ZIP64_LIMIT:
+                sizes.append(file_size)
+                file_size = 0xFFFFFFFF
+            if compress_size > zipfile.ZIP64_LIMIT:
+                sizes.append(compress_size)
+                compress_size = 0xFFFFFFFF
+            if offset > zipfile.ZIP64_LIMIT:
+                sizes.append(offset)
+                offset = 0xFFFFFFFF
+            extra = struct.pack(f'<HH{len(sizes)}Q', 1, 8 * len(sizes), *sizes) if sizes else b''
+            name, flags = self._name(zinfo)
+            year, month, day, hour, minute, second = zinfo.date_time
+            dosdate = (year - 1980) << 9 | month << 5 | day
+            dostime = hour << 11 | minute << 5 | second // 2
+            version = max(zinfo.extract_version, 45 if sizes else 20)
+            self.fp.write(struct.pack(
+                '<4s4B4HL2L5H2L', b'PK\x01\x02', max(zinfo.create_version, version),
+                zinfo.create_system, version, 0, flags, zinfo.compress_type, dostime, dosdate,
+                zinfo.CRC, compress_size, file_size, len(name), len(extra), 0, 0, 0,
+                zinfo.external_attr, offset,
+            ))
+            self.fp.write(name)
+            self.fp.write(extra)
+
+        end = self.fp.tell()
+        count, size = len(self.members), end - start
+        if count >= 0xFFFF or size > zipfile.ZIP64_LIMIT or start > zipfile.ZIP64_LIMIT:
+            self.fp.write(struct.pack('<4sQ2H2L4Q', b'PK\x06\x06', 44, 45, 45, 0, 0, count, count, size, start))
+            self.fp.write(struct.pack('<4sLQL', b'PK\x06\x07', 0, end, 1))
+            count, size, start = min(count, 0xFFFF), min(size, 0xFFFFFFFF), min(start, 0xFFFFFFFF)
+        self.fp.write(struct.pack('<4s4H2LH', b'PK\x05\x06', 0, 0, count, count, size, start, 0))
+
+
+def write_csv_members_parallel(
+    zip_path: Path,
+    frames: Dict[str, pd.DataFrame],
+    encoding: str = 'utf-8-sig',
+    workers: int = 2,
+    executor: str = 'thread',
+    compresslevel: Optional[int] = None,
+    **to_csv_kwargs,
+) -> None:
+    """Write ``zip_path`` with ``frames`` serialized and compressed on a pool.
+
+    Members are appended in order as their workers finish; ``compresslevel``
+    follows :func:`open_zip_for_writing` (0 stores). ``executor='process'``
+    sidesteps the GIL held by ``to_csv`` at the cost of pickling each frame;
+    threads only overlap the deflate step.
+    """
+    pool_cls = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    with open(zip_path, 'wb') as fp, pool_cls(max_workers=min(workers, len(frames))) as pool:
+        futures = [
+            (name, pool.submit(_render_member, df, encoding, compresslevel, to_csv_kwargs))
+            for name, df in frames.items()
+        ]
+        writer = _RawZipWriter(fp)
+        for name, future in futures:
+            chunks, crc, file_size, compress_size = future.result()
+            zinfo = zipfile.ZipInfo(name, date_time=time.localtime(time.time())[:6])
+            zinfo.compress_type = zipfile.ZIP_STORED if compresslevel == 0 else zipfile.ZIP_DEFLATED
+            zinfo.external_attr = 0o600 << 16
+            zinfo.CRC, zinfo.file_size, zinfo.compress_size = crc, file_size, compress_size
+            writer.add(zinfo, chunks)
+        writer.close()
+
+
+def zip_options(config: Optional[Dict[str, object]]) -> Dict[str, object]:
+    """ZIP writing options from the ``packaging`` section of the config.
+
+    ``compresslevel`` 0 stores members uncompressed; 1-9 are deflate levels.
+    ``workers`` > 1 compresses multi-member archives in parallel using a
+    ``thread`` or ``process`` ``executor``.
+    """
+    cfg = (config or {}).get('packaging', {}) or {}
+    level = cfg.get('compresslevel')
+    executor = str(cfg.get('executor', 'thread')).lower()
+    if level is not None and not 0 <= int(level) <= 9:
+        raise ValueError(f"packaging.compresslevel inválido: {level}")
+    if executor not in ('thread', 'process'):
+        raise ValueError(f"packaging.executor inválido: {executor}")
+    return {
+        'compresslevel': None if level is None else int(level),
+        'workers': max(int(cfg.get('workers', 1) or 1), 1),
+        'executor': executor,
+    }
+
+
+def open_zip_for_writing(path: Path, compresslevel: Optional[int] = None) -> zipfile.ZipFile:
+    """Open ``path`` for writing; ``compresslevel=0`` means store-only."""
+    if compresslevel == 0:
+        return zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED)
+    return zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
 
 
 def write_csv_to_zip(
@@ -34,20 +421,38 @@ def write_csv_to_zip(
     zip_path: Path,
     sep: str = ',',
     encoding: str = 'utf-8-sig',
+    sidecar: bool = False,
+    compresslevel: Optional[int] = None,
+    workers: int = 1,
+    executor: str = 'thread',
 ) -> Path:
-    import io
-    import zipfile
+    """Write each frame as a CSV member of ``zip_path``.
 
+    With ``sidecar=True`` and a configured ``artifacts.columnar_sidecar``
+    format, a single-member ZIP also gets a Parquet/Feather copy next to it.
+    ``compresslevel``, ``workers`` and ``executor`` are described in
+    :func:`zip_options`.
+    """
     zip_path = Path(zip_path)
     zip_path.parent.mkdir(parents=True, exist_ok=True)
+    sidecar_format = artifact_store().sidecar_format if sidecar else None
 
-    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
-        for name, df in dataframes.items():
-            buffer = io.StringIO()
-            # Usa vírgula como separador decimal em todos os CSVs
-            df.to_csv(buffer, index=False, sep=sep, decimal=',')
-            zf.writestr(name, buffer.getvalue().encode(encoding))
-    return zip_path
+    def _write(frames: Dict[str, pd.DataFrame]) -> Path:
+        # Usa vírgula como separador decimal em todos os CSVs
+        if workers > 1 and len(frames) > 1:
+            write_csv_members_parallel(
+                zip_path, frames, encoding, workers, executor, compresslevel, sep=sep, decimal=','
+            )
+        else:
+            with open_zip_for_writing(zip_path, compresslevel) as zf:
+                for name, df in frames.items():
+                    write_csv_member(zf, name, df, encoding, sep=sep, decimal=',')
+        if sidecar_format and len(frames) == 1:
+            write_columnar_sidecar(next(iter(frames.values())), zip_path, sidecar_format, decimal=',')
+        return zip_path
+
+    # Etapas seguintes no mesmo processo leem o DataFrame direto da memória
+    return artifact_store().publish(zip_path, dataframes, _write, sep=sep, decimal=',')
 
 
 @dataclass(slots=True)
@@ -56,12 +461,31 @@ class DatasetIO:
 
     separator: str
     encoding: str
+    compresslevel: Optional[int] = None
+    workers: int = 1
+    executor: str = 'thread'
 
-    def read(self, path: Path) -> pd.DataFrame:
-        return read_csv_or_zip(path, sep=self.separator, encoding=self.encoding)
+    def read(
+        self,
+        path: Path,
+        columns: Optional[Iterable[str]] = None,
+        typed: bool = False,
+    ) -> pd.DataFrame:
+        return read_csv_or_zip(
+            path, sep=self.separator, encoding=self.encoding, columns=columns, typed=typed
+        )
 
-    def write_zip(self, frames: Dict[str, pd.DataFrame], path: Path) -> Path:
-        return write_csv_to_zip(frames, path, sep=self.separator, encoding=self.encoding)
+    def write_zip(self, frames: Dict[str, pd.DataFrame], path: Path, sidecar: bool = False) -> Path:
+        return write_csv_to_zip(
+            frames,
+            path,
+            sep=self.separator,
+            encoding=self.encoding,
+            sidecar=sidecar,
+            compresslevel=self.compresslevel,
+            workers=self.workers,
+            executor=self.executor,
+        )
 
     def split_by_mask(
         self,
@@ -73,6 +497,9 @@ class DatasetIO:
 
     @staticmethod
     def latest_file(directory: Path, pattern: str) -> Path:
+        published = artifact_store().latest(directory, pattern)
+        if published is not None:
+            return published
         candidates = sorted(directory.glob(pattern), key=lambda item: item.stat().st_mtime, reverse=True)
         if not candidates:
             raise FileNotFoundError(f"Nenhum arquivo correspondente a {pattern} em {directory}")
@@ -0,0 +1,347 @@
+"""Incremental decoding of JSON API payloads into column buffers.
+
+``resp.json()`` followed by ``pd.DataFrame(data)`` holds the payload three
+times: the body bytes, the list of dicts and the DataFrame. :func:`decode_records`
+reads the body in chunks instead, decodes one record at a time with
+``json.JSONDecoder.raw_decode`` and appends it straight into
+:class:`ColumnBuffers`; only the current chunk and the columns stay in
+memory.
+
+The records are the top-level array, or the array found under a dotted
+``data_key`` (``"data.items"``) when the top level is an object, following
+the rules the API loader always applied to ``resp.json()``. A ``max_bytes``
+ceiling aborts the decode with :class:`PayloadTooLargeError` once that many
+bytes were read, and :class:`DecodeStats` reports the throughput.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = ' \t\n\r'
+_TRIM_AT = 1024 * 1024
+# Chave ausente no registro, como em pd.DataFrame(list_of_dicts)
+_MISSING = np.nan
+
+
+class PayloadTooLargeError(RuntimeError):
+    """The payload exceeded the configured ``max_bytes`` ceiling."""
+
+
+@dataclass
+class DecodeStats:
+    """Bytes and records decoded so far."""
+
+    bytes: int = 0
+    records: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def mb_per_sec(self) -> float:
+        elapsed = self.elapsed
+        return self.bytes / 1e6 / elapsed if elapsed > 0 else 0.0
+
+
+class ColumnBuffers:
+    """Row records appended into one list per column.
+
+    Keys missing from a record become ``NaN``; a key first seen late is
+    back-filled, so :meth:`to_frame` matches ``pd.DataFrame(list_of_dicts)``
+    without keeping the dicts around.
+    """
+
+    def __init__(self) -> None:
+        self.columns: Dict[Any, List[Any]] = {}
+        self.rows = 0
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def append(self, record: Any) -> None:
+        columns = self.columns
+        if not isinstance(record, dict):
+            record = {0: record}
+        for key, value in record.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [_MISSING] * self.rows
+            column.append(value)
+        self.rows += 1
+        if len(record) < len(columns):
+            for column in columns.values():
+                if len(column) < self.rows:
+                    column.append(_MISSING)
+
+    def extend(self, records: Iterable[Any], batch_size: int = 4096) -> None:
+        """Append ``records`` a batch at a time.
+
+        Batches whose records all have the same keys (the usual API page)
+        are copied column by column instead of record by record.
+        """
+        batch: List[Any] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                self._extend_batch(batch)
+                batch = []
+        if batch:
+            self._extend_batch(batch)
+
+    def _extend_batch(self, batch: List[Any]) -> None:
+        first = batch[0]
+        keys = first.keys() if isinstance(first, dict) else None
+        if keys is None or not all(isinstance(r, dict) and r.keys() == keys for r in batch):
+            for record in batch:
+                self.append(record)
+            return
+        columns = self.columns
+        for key in keys:
+            if key not in columns:
+                columns[key] = [_MISSING] * self.rows
+        for key, column in columns.items():
+            if key in keys:
+                column.extend([record[key] for record in batch])
+            else:
+                column.extend([_MISSING] * len(batch))
+        self.rows += len(batch)
+
+    def merge(self, other: 'ColumnBuffers') -> None:
+        """Append the rows of ``other`` (consumed: its lists are reused when possible)."""
+        if not self.rows:
+            self.columns, self.rows = other.columns, other.rows
+            other.columns, other.rows = {}, 0
+            return
+        for key, values in other.columns.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [_MISSING] * self.rows
+            column.extend(values)
+        self.rows += other.rows
+        for column in self.columns.values():
+            if len(column) < self.rows:
+                column.extend([_MISSING] * (self.rows - len(column)))
+        other.columns, other.rows = {}, 0
+
+    def to_frame(self, dtype: Any = None) -> pd.DataFrame:
+        """Build the DataFrame, releasing each column list as it is converted.
+
+        Without ``dtype`` the columns are inferred as ``pd.DataFrame`` infers
+        a list of dicts; the buffers are empty afterwards.
+        """
+        arrays = {}
+        for key in list(self.columns):
+            values = self.columns.pop(key)
+            arrays[key] = np.fromiter(values, dtype=object, count=len(values))
+            del values
+        self.rows = 0
+        frame = pd.DataFrame(arrays, columns=list(arrays), dtype=dtype)
+        return frame.infer_objects() if dtype is None else frame
+
+
+class _TextStream:
+    """Text buffer refilled from byte chunks, with a read position."""
+
+    def __init__(self, chunks: Iterable[bytes], encoding: str, max_bytes: Optional[int], stats: DecodeStats):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._max_bytes = max_bytes
+        self._stats = stats
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+        self.fills = 0
+
+    def fill(self) -> bool:
+        """Append the next chunk; False at the end of the stream."""
+        if self.eof:
+            return False
+        if self.pos > _TRIM_AT:
+            self.text, self.pos = self.text[self.pos:], 0
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            self._stats.bytes += len(chunk)
+            if self._max_bytes is not None and self._stats.bytes > self._max_bytes:
+                raise PayloadTooLargeError(
+                    f"Payload acima do limite de {self._max_bytes / 1e6:.0f} MB"
+                )
+            self.text += self._decoder.decode(chunk)
+            self.fills += 1
+            return True
+        self.text += self._decoder.decode(b'', final=True)
+        self.eof = True
+        return False
+
+    def grow(self) -> bool:
+        """Read until the pending text doubles, so a large value is re-parsed O(log n) times."""
+        target = 2 * max(len(self.text) - self.pos, 1)
+        grew = False
+        while len(self.text) - self.pos < target and self.fill():
+            grew = True
+        return grew
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at the end), without consuming it."""
+        text, pos = self.text, self.pos
+        if pos < len(text) and text[pos] not in _WHITESPACE:
+            return text[pos]
+        while True:
+            text, pos = self.text, self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Esperado {char!r}", self.text, self.pos)
+        self.pos += 1
+
+    def complete_values(self) -> Optional[List[Any]]:
+        """Decode every array element up to the last ``}`` in the buffer at once.
+
+        A cut inside a string or a nested object is never valid JSON, so a
+        failed attempt returns None and the caller decodes one value at a
+        time instead.
+        """
+        text, pos = self.text, self.pos
+        cut = text.rfind('}', pos)
+        if cut < pos:
+            return None
+        try:
+            values = json.loads('[' + text[pos:cut + 1] + ']')
+        except json.JSONDecodeError:
+            return None
+        self.pos = cut + 1
+        return values
+
+    def value(self, scan: Callable[[str, int], Any]) -> Any:
+        """Decode the next complete JSON value with the decoder's ``scan_once``."""
+        self.peek()
+        while True:
+            try:
+                value, end = scan(self.text, self.pos)
+            except (StopIteration, json.JSONDecodeError) as exc:
+                if self.grow():
+                    continue
+                if isinstance(exc, StopIteration):
+                    raise json.JSONDecodeError("Expecting value", self.text, self.pos) from None
+                raise
+            # Número no fim do buffer pode continuar no próximo bloco
+            if end == len(self.text) and not self.eof and self.grow():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_records(
+    chunks: Iterable[bytes],
+    data_key: str = '',
+    *,
+    encoding: str = 'utf-8-sig',
+    max_bytes: Optional[int] = None,
+    stats: Optional[DecodeStats] = None,
+) -> Iterator[Any]:
+    """Yield the records of a JSON payload read from byte ``chunks``."""
+    stats = stats if stats is not None else DecodeStats()
+    stream = _TextStream(chunks, encoding, max_bytes, stats)
+    scan = json.JSONDecoder().scan_once
+    path: Sequence[str] = data_key.split('.') if data_key else ()
+
+    first = stream.peek()
+    if first == '':
+        return
+    if first != '[':
+        # Desce pelas chaves de data_key; chave ausente = nenhum registro
+        for key in path:
+            if stream.peek() != '{':
+                return
+            stream.expect('{')
+            while True:
+                if stream.peek() == '}':
+                    return
+                name = stream.value(scan)
+                stream.expect(':')
+                if name == key:
+                    break
+                stream.value(scan)
+                if stream.peek() == ',':
+                    stream.pos += 1
+        if stream.peek() != '[':
+            stats.records += 1
+            yield stream.value(scan)
+            return
+
+    stream.expect('[')
+    if stream.peek() == ']':
+        return
+    # Registros completos do bloco saem de uma vez; só a emenda entre blocos
+    # (ou um bloco que não deu certo) é lida registro a registro
+    failed_at = -1
+    while True:
+        records = None
+        if stream.fills != failed_at:
+            records = stream.complete_values()
+            if records is None:
+                failed_at = stream.fills
+        if records:
+            stats.records += len(records)
+            yield from records
+        else:
+            stats.records += 1
+            yield stream.value(scan)
+        if stream.peek() == ',':
+            stream.pos += 1
+            continue
+        stream.expect(']')
+        return
+
+
+def decode_records(
+    chunks: Iterable[bytes],
+    data_key: str = '',
+    *,
+    encoding: str = 'utf-8-sig',
+    max_bytes: Optional[int] = None,
+    stats: Optional[DecodeStats] = None,
+) -> ColumnBuffers:
+    """Decode a JSON payload from byte ``chunks`` into :class:`ColumnBuffers`.
+
+    Raises:
+        PayloadTooLargeError: If more than ``max_bytes`` bytes were read
+        json.JSONDecodeError: If the payload is not valid (or truncated) JSON
+    """
+    stats = stats if stats is not None else DecodeStats()
+    buffers = ColumnBuffers()
+    buffers.extend(iter_records(chunks, data_key, encoding=encoding, max_bytes=max_bytes, stats=stats))
+    logger.debug(
+        "JSON: %d registros, %.1f MB em %.2fs (%.1f MB/s)",
+        stats.records, stats.bytes / 1e6, stats.elapsed, stats.mb_per_sec,
+    )
+    return buffers
+
+
+__all__ = [
+    'ColumnBuffers',
+    'DecodeStats',
+    'PayloadTooLargeError',
+    'decode_records',
+    'iter_records',
+]
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict
 
-from .io import ensure_directory
+from .io import ensure_directory, remove_columnar_sidecars
 
 
 @dataclass(frozen=True, slots=True)
@@ -67,6 +67,7 @@ class PathManager:
         for candidate in directory.glob(pattern):
             try:
                 candidate.unlink()
+                remove_columnar_sidecars(candidate)
                 if logger and not silent:
                     logger.info("Removed old file: %s", candidate.name)
             except Exception as exc:  # pragma: no cover - defensive cleanup
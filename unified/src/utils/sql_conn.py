@@ -7,15 +7,18 @@ Classes e funes para conectar com bancos SQL Server.
 Implementa Fail-Fast para credenciais ausentes.
 """
 
-import pyodbc
+import sqlite3
 import pandas as pd
 from pathlib import Path
 import os
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Optional
 from dotenv import load_dotenv
 import warnings
 
+from .sql_pool import get_pool
+from .sql_fetch import DEFAULT_BATCH_SIZE, iter_query_batches, log_progress, read_query
+
 # Suprimir avisos do pandas sobre conexes DBAPI2
 warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy connectable')
 
@@ -80,36 +83,20 @@ class SQLServerConnection:
         self.username = username
         self.password = password
         self.connection = None
+        self.connection_string: Optional[str] = None
     
     def connect(self) -> bool:
-        """Estabelece conexo com o banco de dados."""
-        # Lista de drivers ODBC para tentar
-        drivers = [
-            "ODBC Driver 18 for SQL Server",
-            "ODBC Driver 17 for SQL Server",
-            "ODBC Driver 13 for SQL Server",
-            "ODBC Driver 11 for SQL Server",
-            "SQL Server Native Client 11.0",
-            "SQL Server",
-        ]
-        
-        for driver in drivers:
-            try:
-                connection_string = (
-                    f"DRIVER={{{driver}}};"
-                    f"SERVER={self.server};"
-                    f"DATABASE={self.database};"
-                    f"UID={self.username};"
-                    f"PWD={self.password};"
-                    f"TrustServerCertificate=yes;"
-                    f"Timeout=30;"
-                )
-                self.connection = pyodbc.connect(connection_string, timeout=30)
-                return True
-            except Exception:
-                continue
-        
-        return False
+        """Obtem uma conexao do pool do processo (reutilizada quando possivel)."""
+        try:
+            # O pool lembra o driver ODBC que funcionou para este servidor
+            self.connection = get_pool().acquire(
+                self.server, self.database, self.username, self.password
+            )
+        except ConnectionError:
+            return False
+        # Reaproveitada pelo fetch via Arrow (arrow-odbc)
+        self.connection_string = self.connection.connection_string
+        return True
     
     def execute_query(self, query: str) -> Optional[pd.DataFrame]:
         """Executa uma consulta SQL e retorna um DataFrame."""
@@ -117,13 +104,51 @@ class SQLServerConnection:
             return None
         
         try:
-            df = pd.read_sql(query, self.connection)
-            return df
+            # Mesmo fetch em lotes do iter_query, concatenado ao final
+            return read_query(self.connection, query, connection_string=self.connection_string)
         except Exception:
             return None
+
+    def iter_query(
+        self,
+        query: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        engine: str = 'auto',
+        progress=log_progress,
+    ) -> Iterator[pd.DataFrame]:
+        """Executa a consulta e entrega o resultado em lotes de DataFrames.
+
+        Usa ``fetchmany`` (ou lotes Arrow quando disponivel) e informa o
+        progresso em linhas/s a cada lote. Erros de consulta sao propagados.
+        """
+        if not self.connection:
+            raise RuntimeError("Conexao nao estabelecida")
+        return iter_query_batches(
+            self.connection,
+            query,
+            batch_size=batch_size,
+            engine=engine,
+            connection_string=self.connection_string,
+            progress=progress,
+        )
     
     def close(self):
-        """Fecha a conexo com o banco."""
+        """Devolve a conexao ao pool."""
         if self.connection:
             self.connection.close()
-            self.connection = None
\ No newline at end of file
+            self.connection = None
+
+
+class SQLiteConnection(SQLServerConnection):
+    """Substituto local do SQL Server sobre um arquivo SQLite (testes e benchmarks)."""
+
+    def __init__(self, database: str):
+        super().__init__('', database, '', '')
+
+    def connect(self) -> bool:
+        """Abre (ou reutiliza do pool) o arquivo SQLite indicado em ``database``."""
+        try:
+            self.connection = get_pool().acquire('', self.database, driver='sqlite')
+            return True
+        except sqlite3.Error:
+            return False
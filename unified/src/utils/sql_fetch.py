@@ -0,0 +1,379 @@
+"""Batched fetching of SQL query results.
+
+``pd.read_sql`` pulls the whole result through DB-API row tuples before it
+builds a single DataFrame. :func:`iter_query_batches` runs the query once
+and yields DataFrames of at most ``batch_size`` rows instead, so extractions
+can hand each batch to the writer while the next one is fetched.
+
+Two fetch engines are available:
+
+- ``dbapi``: ``cursor.fetchmany`` on any DB-API connection (pyodbc,
+  pymssql, sqlite3 as a local stand-in).
+- ``arrow``: Arrow record batches, through ``arrow_odbc`` when an ODBC
+  connection string is given, or through cursors that expose
+  ``fetch_record_batch`` (ADBC drivers). Rows never become Python tuples.
+
+``auto`` picks ``arrow`` when one of those is available. Every batch is
+reported to a progress callback with the running rows/sec.
+
+With ``dtype=str`` every value is converted by one fixed rule (see
+:func:`_text`), never through per-batch type inference, so a value reads the
+same whatever batch it lands in and whatever the ``batch_size``. On the
+``arrow`` engine the rule is applied column by column with Arrow/NumPy
+kernels (:func:`_arrow_text`); the per-value :func:`_text` is only used for
+DB-API rows and for Arrow types without a kernel.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FETCH_ENGINES = ('auto', 'dbapi', 'arrow')
+DEFAULT_BATCH_SIZE = 50_000
+
+# dtype que ``astype(str)`` produz nesta versão do pandas (object ou str)
+_STR_DTYPE = pd.Series(['x']).astype(str).dtype
+
+
+@dataclass
+class FetchStats:
+    """Running totals of a batched fetch."""
+
+    rows: int = 0
+    batches: int = 0
+    engine: str = 'dbapi'
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_sec(self) -> float:
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+
+ProgressCallback = Callable[[FetchStats], None]
+
+
+def log_progress(stats: FetchStats) -> None:
+    """Default progress callback: one log line per batch."""
+    logger.info(
+        "Lote %s (%s): %s linhas em %.1fs (%s linhas/s)",
+        stats.batches,
+        stats.engine,
+        f"{stats.rows:,}",
+        stats.elapsed,
+        f"{stats.rows_per_sec:,.0f}",
+    )
+
+
+def _arrow_odbc_available() -> bool:
+    try:
+        import arrow_odbc  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _supports_record_batches(connection: Any) -> bool:
+    if connection is None:
+        return False
+    cursor = connection.cursor()
+    try:
+        return hasattr(cursor, 'fetch_record_batch')
+    finally:
+        cursor.close()
+
+
+def _is_text(dtype: Any) -> bool:
+    return dtype is str or dtype == 'str'
+
+
+def _text(value: Any) -> Any:
+    """``value`` as text, by a rule that does not depend on its neighbours.
+
+    NULL stays missing; integers keep no decimal part (``'4'``, not the
+    ``'4.0'`` a NULL elsewhere in the column made ``pd.read_sql`` return);
+    decimals go through ``float`` as ``coerce_float`` did; midnight datetimes
+    print as dates.
+    """
+    if value is None:
+        return math.nan
+    if isinstance(value, float):
+        return value if math.isnan(value) else str(value)
+    if isinstance(value, Decimal):
+        return str(float(value))
+    if isinstance(value, datetime):
+        if value.tzinfo is None and value == datetime.combine(value.date(), datetime.min.time()):
+            return value.date().isoformat()
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _is_raw(dtype: Any) -> bool:
+    return dtype is object or dtype == 'object'
+
+
+def _value_frame(data: Dict[str, Sequence[Any]], columns: List[str], dtype: Any) -> pd.DataFrame:
+    """Frame of the driver's values as they are (``object``) or as :func:`_text`."""
+    if _is_text(dtype):
+        series = {c: pd.Series([_text(v) for v in data[c]], dtype=_STR_DTYPE) for c in columns}
+    else:
+        series = {c: pd.Series(list(data[c]), dtype=object) for c in columns}
+    return pd.DataFrame(series, columns=columns)
+
+
+def as_text(frame: pd.DataFrame) -> pd.DataFrame:
+    """``frame`` with every value converted by the ``dtype=str`` rule.
+
+    Meant for frames fetched with ``dtype=object`` (driver values untouched),
+    e.g. partitions that must be sorted on their database types first.
+    """
+    columns = list(frame.columns)
+    data = {c: frame.iloc[:, i].tolist() for i, c in enumerate(columns)}
+    return _value_frame(data, columns, str).set_axis(frame.index)
+
+
+def _float_text(values: Any) -> Any:
+    """``str(float)`` of ``values`` (float64 array), cast by Arrow where it agrees.
+
+    Arrow prints the same shortest digits as Python but drops the ``.0`` of
+    whole numbers and switches to exponents at other magnitudes; those
+    values get Python's ``repr`` (few in money columns).
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    text = pc.cast(pa.array(values), pa.string())
+    text = pc.if_else(
+        pc.match_substring(text, '.'), text, pc.binary_join_element_wise(text, '.0', '')
+    )
+    out = text.to_numpy(zero_copy_only=False)
+    with np.errstate(invalid='ignore'):
+        magnitude = np.abs(values)
+        plain = (magnitude == 0) | ((magnitude >= 1e-4) & (magnitude < 1e16))
+    other = np.flatnonzero(~plain | np.asarray(pc.match_substring(text, 'e')))
+    out[other] = [repr(float(v)) for v in values[other]]
+    return out
+
+
+def _timestamp_text(values: Any) -> Any:
+    """``_text`` of naive datetimes (``datetime64[us]`` array): midnight as a date."""
+    import numpy as np
+
+    out = np.datetime_as_string(values, unit='D').astype(object)
+    other = np.flatnonzero(values != values.astype('datetime64[D]'))
+    if len(other):
+        clock = values[other]
+        whole = clock == clock.astype('datetime64[s]')
+        text = np.where(
+            whole,
+            np.datetime_as_string(clock, unit='s'),
+            np.datetime_as_string(clock, unit='us'),
+        )
+        out[other] = [value.replace('T', ' ') for value in text]
+    return out
+
+
+def _arrow_text(column: Any) -> pd.Series:
+    """Arrow ``column`` as text by the :func:`_text` rule, one kernel per column."""
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    kind = column.type
+    if len(column) == 0:
+        return pd.Series([], dtype=_STR_DTYPE)
+    valid = pc.is_valid(column).to_numpy(zero_copy_only=False)
+    if pa.types.is_string(kind) or pa.types.is_large_string(kind):
+        text = column.to_numpy(zero_copy_only=False)
+    elif pa.types.is_integer(kind):
+        text = pc.cast(column, pa.string()).to_numpy(zero_copy_only=False)
+    elif pa.types.is_boolean(kind):
+        text = pc.if_else(column, 'True', 'False').to_numpy(zero_copy_only=False)
+    elif pa.types.is_floating(kind) or pa.types.is_decimal(kind):
+        # Decimais passam por float, como no ``coerce_float``; converte-se o
+        # texto exato do decimal (o cast direto do Arrow não arredonda igual
+        # a ``float(Decimal)``). NaN fica ausente.
+        if pa.types.is_decimal(kind):
+            column = pc.cast(column, pa.string())
+        values = pc.cast(column, pa.float64()).to_numpy(zero_copy_only=False)
+        valid = valid & ~np.isnan(values)
+        text = _float_text(np.where(valid, values, 0.0))
+    elif pa.types.is_date(kind):
+        text = pc.cast(pc.cast(column, pa.date32()), pa.string()).to_numpy(zero_copy_only=False)
+    elif pa.types.is_timestamp(kind) and kind.tz is None and kind.unit in ('s', 'ms', 'us'):
+        values = column.to_numpy(zero_copy_only=False).astype('datetime64[us]')
+        text = _timestamp_text(np.where(valid, values, np.datetime64(0, 'us')))
+    else:
+        return pd.Series([_text(v) for v in column.to_pylist()], dtype=_STR_DTYPE)
+    series = pd.Series(text, dtype=object).where(valid, math.nan)
+    return series.astype(_STR_DTYPE)
+
+
+def _frame_from_rows(rows: Sequence[Any], columns: List[str], dtype: Any) -> pd.DataFrame:
+    if _is_text(dtype) or _is_raw(dtype):
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        return _value_frame(dict(zip(columns, values)), columns, dtype)
+    # Mesmos passos do ``pd.read_sql``: from_records com coerce_float e astype
+    frame = pd.DataFrame.from_records(list(rows), columns=columns, coerce_float=True)
+    return frame.astype(dtype) if dtype is not None else frame
+
+
+def _frame_from_arrow(batch: Any, dtype: Any) -> pd.DataFrame:
+    import pyarrow as pa
+
+    columns = list(batch.schema.names)
+    if _is_text(dtype):
+        series = {name: _arrow_text(batch.column(i)) for i, name in enumerate(columns)}
+        return pd.DataFrame(series, columns=columns)
+    if _is_raw(dtype):
+        return _value_frame(batch.to_pydict(), columns, dtype)
+
+    # Decimals become floats, as ``coerce_float`` does on the DB-API path
+    fields = [
+        pa.field(f.name, pa.float64()) if pa.types.is_decimal(f.type) else f
+        for f in batch.schema
+    ]
+    if any(a.type != b.type for a, b in zip(fields, batch.schema)):
+        batch = batch.cast(pa.schema(fields))
+    frame = batch.to_pandas()
+    return frame.astype(dtype) if dtype is not None else frame
+
+
+def _iter_dbapi(connection: Any, query: str, batch_size: int, dtype: Any) -> Iterator[pd.DataFrame]:
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query)
+        columns = [column[0] for column in cursor.description or []]
+        yielded = False
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yielded = True
+            yield _frame_from_rows(rows, columns, dtype)
+        if not yielded:
+            yield _frame_from_rows([], columns, dtype)
+    finally:
+        cursor.close()
+
+
+def _iter_record_batches(batches: Any, schema: Any, batch_size: int, dtype: Any) -> Iterator[pd.DataFrame]:
+    yielded = False
+    for batch in batches:
+        for start in range(0, batch.num_rows, batch_size):
+            yielded = True
+            yield _frame_from_arrow(batch.slice(start, batch_size), dtype)
+    if not yielded:
+        yield _frame_from_arrow(schema.empty_table(), dtype)
+
+
+def _iter_arrow(
+    connection: Any,
+    query: str,
+    batch_size: int,
+    dtype: Any,
+    connection_string: Optional[str],
+) -> Iterator[pd.DataFrame]:
+    if connection_string and _arrow_odbc_available():
+        from arrow_odbc import read_arrow_batches_from_odbc
+
+        reader = read_arrow_batches_from_odbc(
+            query=query, connection_string=connection_string, batch_size=batch_size
+        )
+        yield from _iter_record_batches(reader, reader.schema, batch_size, dtype)
+        return
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query)
+        reader = cursor.fetch_record_batch()
+        yield from _iter_record_batches(reader, reader.schema, batch_size, dtype)
+    finally:
+        cursor.close()
+
+
+def resolve_fetch_engine(
+    engine: str, connection: Any = None, connection_string: Optional[str] = None
+) -> str:
+    """Concrete engine for ``engine`` given what the connection supports."""
+    engine = str(engine or 'auto').lower()
+    if engine not in FETCH_ENGINES:
+        raise ValueError(f"Unknown fetch engine: {engine}")
+    arrow_ready = (connection_string is not None and _arrow_odbc_available()) or (
+        _supports_record_batches(connection)
+    )
+    if engine == 'arrow' and not arrow_ready:
+        raise ValueError(
+            "Arrow fetch needs arrow-odbc with a connection string or an ADBC connection"
+        )
+    if engine == 'auto':
+        return 'arrow' if arrow_ready else 'dbapi'
+    return engine
+
+
+def iter_query_batches(
+    connection: Any,
+    query: str,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    engine: str = 'auto',
+    dtype: Any = None,
+    connection_string: Optional[str] = None,
+    progress: Optional[ProgressCallback] = log_progress,
+) -> Iterator[pd.DataFrame]:
+    """Run ``query`` and yield its result in DataFrames of at most ``batch_size`` rows.
+
+    ``dtype`` is applied to every batch like ``pd.read_sql(dtype=...)``,
+    except ``str``, which follows :func:`_text` value by value, and
+    ``object``, which keeps the driver's values untouched. An empty
+    result still yields one empty frame carrying the column names.
+    """
+    batch_size = max(int(batch_size), 1)
+    resolved = resolve_fetch_engine(engine, connection, connection_string)
+    if resolved == 'arrow':
+        batches = _iter_arrow(connection, query, batch_size, dtype, connection_string)
+    else:
+        batches = _iter_dbapi(connection, query, batch_size, dtype)
+
+    stats = FetchStats(engine=resolved)
+    for frame in batches:
+        stats.rows += len(frame)
+        stats.batches += 1
+        if progress is not None:
+            progress(stats)
+        yield frame
+
+
+def read_query(connection: Any, query: str, **kwargs: Any) -> pd.DataFrame:
+    """Whole result of :func:`iter_query_batches` as one DataFrame."""
+    frames = list(iter_query_batches(connection, query, **kwargs))
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+__all__ = [
+    'DEFAULT_BATCH_SIZE',
+    'FETCH_ENGINES',
+    'FetchStats',
+    'as_text',
+    'iter_query_batches',
+    'log_progress',
+    'read_query',
+    'resolve_fetch_engine',
+]
@@ -0,0 +1,287 @@
+"""Incremental (delta) extraction against a local snapshot.
+
+The MAX extraction re-reads every ``Movimentacoes`` row of a client on each
+run, although only a small share changes from one day to the next.
+:func:`run_incremental` keeps the last result as a Parquet snapshot keyed
+by ``Movimentacoes_ID`` and, on the next run:
+
+1. fetches only the rows whose watermark column is at or after the stored
+   watermark, and upserts them;
+2. reads the IDs the query currently selects (a light ``SELECT DISTINCT``
+   of the key only) to drop rows that left the filter (e.g. a title that
+   was paid) and to fetch rows that re-entered it without a new watermark.
+
+The watermark must move whenever a row changes (an update date or a
+``rowversion``). A creation date or the ID only catches new rows: edits to
+existing rows that stay inside the filter are never re-read.
+
+A full refresh runs when asked, when there is no snapshot yet or when the
+query changed since the snapshot was taken.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .sql_fetch import read_query
+from .sql_partition import add_predicate, sort_like_query, split_query, sql_dialect
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = 'snapshot.parquet'
+META_FILE = 'snapshot.json'
+_IN_CHUNK = 500
+
+Connect = Callable[[], Any]
+
+
+@dataclass
+class DeltaStats:
+    """What an incremental run did."""
+
+    mode: str
+    fetched: int = 0
+    removed: int = 0
+    reentered: int = 0
+    rows: int = 0
+    watermark: Optional[str] = None
+
+
+class SnapshotStore:
+    """Parquet snapshot of a query result plus its JSON metadata."""
+
+    def __init__(self, directory: Path | str):
+        self.directory = Path(directory)
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.directory / SNAPSHOT_FILE
+
+    @property
+    def meta_path(self) -> Path:
+        return self.directory / META_FILE
+
+    def load(self) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
+        """Snapshot and metadata, or ``(None, {})`` when there is none."""
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as fh:
+                meta = json.load(fh)
+            return pd.read_parquet(self.snapshot_path), meta
+        except (OSError, ValueError):
+            return None, {}
+
+    def save(self, frame: pd.DataFrame, meta: Dict[str, Any]) -> None:
+        """Replace snapshot and metadata (metadata last, so a crash forces a full refresh)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.meta_path.unlink(missing_ok=True)
+        tmp = self.directory / f'{SNAPSHOT_FILE}.{uuid.uuid4().hex}'
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, self.snapshot_path)
+        tmp = self.directory / f'{META_FILE}.{uuid.uuid4().hex}'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump(meta, fh, indent=2)
+        os.replace(tmp, self.meta_path)
+
+
+def query_fingerprint(query: str, key_expression: str, watermark_column: str) -> str:
+    """Hash of the query and delta settings, ignoring whitespace differences."""
+    text = '\n'.join([re.sub(r'\s+', ' ', query).strip(), key_expression, watermark_column])
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _scalar(connection: Any, sql: str) -> Any:
+    frame = read_query(connection, sql, engine='dbapi', progress=None)
+    value = frame.iloc[0, 0] if len(frame) else None
+    return None if pd.isna(value) else value
+
+
+def _encode_watermark(value: Any) -> Optional[Dict[str, Any]]:
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        # rowversion chega do pyodbc como 8 bytes; guardado em hexadecimal
+        return {'type': 'rowversion', 'value': bytes(value).hex()}
+    try:
+        return {'type': 'int', 'value': int(value)}
+    except (TypeError, ValueError):
+        return {'type': 'timestamp', 'value': pd.Timestamp(value).isoformat()}
+
+
+def _watermark_literal(watermark: Dict[str, Any], dialect: str) -> str:
+    if watermark['type'] == 'int':
+        return str(int(watermark['value']))
+    if watermark['type'] == 'rowversion':
+        # Literal binário: 0x... no SQL Server, X'...' no SQLite
+        value = bytes.fromhex(watermark['value']).hex().upper()
+        return f"X'{value}'" if dialect == 'sqlite' else f"0x{value}"
+    # Truncated to the second: ">=" then re-reads a few rows instead of missing any.
+    # 'YYYYMMDD HH:MM:SS' is unambiguous under any SQL Server DATEFORMAT.
+    moment = pd.Timestamp(watermark['value']).floor('s')
+    return f"'{moment.strftime('%Y-%m-%d %H:%M:%S' if dialect == 'sqlite' else '%Y%m%d %H:%M:%S')}'"
+
+
+def _key_literal(value: Any) -> str:
+    try:
+        return str(int(value))
+    except (TypeError, ValueError):
+        return "'" + str(value).replace("'", "''") + "'"
+
+
+def _column(frame: pd.DataFrame, name: str) -> str:
+    for column in frame.columns:
+        if str(column).strip().upper() == name.strip().upper():
+            return column
+    raise ValueError(f"Coluna chave {name} ausente no resultado da consulta")
+
+
+def _as_keys(values: pd.Series) -> pd.Series:
+    # Comparação por texto: '123' do snapshot casa com 123 vindo do banco
+    return values.map(lambda v: _key_literal(v).strip("'"))
+
+
+def run_incremental(
+    connect: Connect,
+    query: str,
+    store: SnapshotStore,
+    *,
+    watermark_column: str,
+    key_column: str = 'Movimentacoes_ID',
+    key_expression: Optional[str] = None,
+    full_refresh: bool = False,
+    full_fetch: Optional[Callable[[], pd.DataFrame]] = None,
+    order_by: Optional[Sequence[str]] = None,
+) -> Tuple[pd.DataFrame, DeltaStats]:
+    """Bring the snapshot in ``store`` up to date and return the full result.
+
+    ``key_column`` is the key's name in the result, ``key_expression`` its
+    SQL expression (defaults to ``key_column``). ``full_fetch`` overrides how
+    a full refresh reads the whole result (e.g. partitioned); it must keep
+    the database types. The returned frame is sorted like the query and
+    keeps the database types too.
+    """
+    key_expression = key_expression or key_column
+    parts = split_query(query)
+    where = f"\nWHERE {parts.where.strip()}\n" if parts.where else ''
+    fingerprint = query_fingerprint(query, key_expression, watermark_column)
+
+    connection = connect()
+    try:
+        dialect = sql_dialect(connection)
+        # Lido antes dos dados: o que mudar durante a extração entra no próximo delta
+        watermark = _encode_watermark(
+            _scalar(connection, f"SELECT MAX({watermark_column})\nFROM {parts.source.strip()}{where}")
+        )
+    finally:
+        connection.close()
+
+    snapshot, meta = (None, {}) if full_refresh else store.load()
+    if snapshot is None or meta.get('fingerprint') != fingerprint or not meta.get('watermark'):
+        if full_fetch is not None:
+            frame = full_fetch()
+        else:
+            connection = connect()
+            try:
+                frame = read_query(connection, query, progress=None)
+            finally:
+                connection.close()
+        stats = DeltaStats(mode='full', fetched=len(frame), rows=len(frame))
+    else:
+        frame, stats = _apply_delta(
+            connect, query, parts, where, snapshot, meta['watermark'], dialect,
+            key_column, key_expression, watermark_column,
+        )
+        frame = sort_like_query(frame, query, order_by)
+
+    stats.watermark = watermark['value'] if watermark else None
+    try:
+        store.save(frame, {'fingerprint': fingerprint, 'watermark': watermark, 'rows': len(frame)})
+    except Exception as exc:
+        # Sem snapshot válido a próxima execução faz carga completa
+        store.meta_path.unlink(missing_ok=True)
+        logger.warning("Snapshot incremental não salvo em %s: %s", store.directory, exc)
+    logger.info("Extração %s: %s", stats.mode, asdict(stats))
+    return frame, stats
+
+
+def _apply_delta(
+    connect: Connect,
+    query: str,
+    parts: Any,
+    where: str,
+    snapshot: pd.DataFrame,
+    watermark: Dict[str, Any],
+    dialect: str,
+    key_column: str,
+    key_expression: str,
+    watermark_column: str,
+) -> Tuple[pd.DataFrame, DeltaStats]:
+    connection = connect()
+    try:
+        delta = read_query(
+            connection,
+            add_predicate(query, f"{watermark_column} >= {_watermark_literal(watermark, dialect)}"),
+            progress=None,
+        )
+        current = read_query(
+            connection,
+            f"SELECT DISTINCT {key_expression}\nFROM {parts.source.strip()}{where}",
+            engine='dbapi',
+            progress=None,
+        ).iloc[:, 0]
+
+        key = _column(snapshot, key_column)
+        snapshot_keys = _as_keys(snapshot[key])
+        current_keys = pd.Index(_as_keys(current).unique())
+        delta_keys = _as_keys(delta[_column(delta, key_column)]) if len(delta) else pd.Series([], dtype=object)
+
+        # Upsert: a versão nova de cada chave do delta substitui a antiga
+        kept = snapshot.loc[~snapshot_keys.isin(delta_keys).to_numpy()]
+        frames = [f for f in (kept, delta) if len(f)]
+        merged = pd.concat(frames, ignore_index=True) if frames else snapshot.iloc[:0]
+
+        # Fora do filtro atual (ex.: título baixado) sai do snapshot
+        merged_keys = _as_keys(merged[_column(merged, key_column)]) if len(merged) else pd.Series([], dtype=object)
+        inside = merged_keys.isin(current_keys).to_numpy()
+        removed = int((~inside).sum())
+        merged = merged.loc[inside]
+
+        # De volta ao filtro sem watermark novo: busca pela chave
+        missing = current_keys.difference(pd.Index(merged_keys[inside].unique()))
+        reentered = []
+        for start in range(0, len(missing), _IN_CHUNK):
+            chunk = ', '.join(_key_literal(k) for k in missing[start:start + _IN_CHUNK])
+            reentered.append(
+                read_query(connection, add_predicate(query, f"{key_expression} IN ({chunk})"), progress=None)
+            )
+        reentered = [f for f in reentered if len(f)]
+        if reentered:
+            merged = pd.concat([merged, *reentered], ignore_index=True)
+    finally:
+        connection.close()
+
+    stats = DeltaStats(
+        mode='delta',
+        fetched=len(delta),
+        removed=removed,
+        reentered=sum(len(f) for f in reentered),
+        rows=len(merged),
+    )
+    return merged.reset_index(drop=True), stats
+
+
+__all__ = [
+    'DeltaStats',
+    'SnapshotStore',
+    'query_fingerprint',
+    'run_incremental',
+]
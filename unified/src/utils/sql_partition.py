@@ -0,0 +1,524 @@
+"""Partitioned, concurrent execution of one large SELECT.
+
+The MAX extraction is a single ``SELECT DISTINCT ... ORDER BY`` over every
+``Movimentacoes`` row of a client. :func:`run_partitioned` splits it into N
+ranges of one column (``Movimentacoes_ID`` or ``MoDataVencimento``), runs
+the ranges at the same time on pooled connections and merges the results
+back into the order of the original ``ORDER BY`` as they arrive
+(:func:`iter_partitioned`), without holding the whole result.
+
+The range predicate is added to the query's top-level ``WHERE``, so the
+template needs no placeholder. The partition column must be part of what
+makes a row distinct (it is, when selected), otherwise ``DISTINCT`` across
+partitions could keep duplicates. Rows where the column is NULL go to the
+first partition.
+"""
+
+from __future__ import annotations
+
+import math
+import queue
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .sql_fetch import DEFAULT_BATCH_SIZE, as_text, iter_query_batches, read_query
+
+_KEYWORDS = re.compile(r'\b(SELECT|FROM|WHERE|GROUP\s+BY|HAVING|ORDER\s+BY)\b', re.IGNORECASE)
+_ALIAS = re.compile(r"^(?P<expr>.+?)\s+AS\s+(?P<alias>'[^']+'|\"[^\"]+\"|\[[^\]]+\]|\w+)$", re.IGNORECASE | re.DOTALL)
+
+Bound = Any
+Connect = Callable[[], Any]
+
+
+@dataclass
+class QueryParts:
+    """Top-level clauses of a SELECT statement (text without the keywords)."""
+
+    select: str
+    source: str
+    where: Optional[str]
+    tail: str
+    order_by: Optional[str]
+
+
+def _mask_literals(query: str) -> str:
+    """``query`` with strings and comments blanked out (same length)."""
+    out = list(query)
+    i, n = 0, len(query)
+    while i < n:
+        if query.startswith('--', i):
+            end = query.find('\n', i)
+            end = n if end == -1 else end
+        elif query.startswith('/*', i):
+            end = query.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+        elif query[i] == "'":
+            end = i + 1
+            while end < n:
+                if query[end] == "'" and not query.startswith("''", end):
+                    break
+                end += 2 if query.startswith("''", end) else 1
+            end = min(end + 1, n)
+            # Keep the quotes so aliases like AS 'CHAVE' stay recognisable
+            for j in range(i + 1, end - 1):
+                out[j] = ' '
+            i = end
+            continue
+        else:
+            i += 1
+            continue
+        for j in range(i, end):
+            out[j] = ' '
+        i = end
+    return ''.join(out)
+
+
+def _top_level_keywords(query: str) -> List[Tuple[str, int, int]]:
+    masked = _mask_literals(query)
+    depth = 0
+    found = []
+    position = 0
+    for match in _KEYWORDS.finditer(masked):
+        for char in masked[position:match.start()]:
+            depth += char == '('
+            depth -= char == ')'
+        position = match.start()
+        if depth == 0:
+            keyword = re.sub(r'\s+', ' ', match.group(1).upper())
+            found.append((keyword, match.start(), match.end()))
+    return found
+
+
+def split_query(query: str) -> QueryParts:
+    """Split ``query`` into its top-level clauses.
+
+    Raises:
+        ValueError: If the query is not a single plain SELECT
+    """
+    keywords = _top_level_keywords(query)
+    names = [name for name, _, _ in keywords]
+    if not names or names[0] != 'SELECT' or 'FROM' not in names or names.count('SELECT') > 1:
+        raise ValueError("Particionamento exige um único SELECT ... FROM")
+
+    spans: Dict[str, str] = {}
+    for index, (name, _, end) in enumerate(keywords):
+        stop = keywords[index + 1][1] if index + 1 < len(keywords) else len(query)
+        spans[name] = query[end:stop]
+
+    tail = ''
+    for name in ('GROUP BY', 'HAVING'):
+        if name in spans:
+            tail += f"\n{name} {spans[name]}"
+    return QueryParts(
+        select=spans['SELECT'],
+        source=spans['FROM'],
+        where=spans.get('WHERE'),
+        tail=tail,
+        order_by=spans.get('ORDER BY'),
+    )
+
+
+def _with_predicate(parts: QueryParts, predicate: str) -> str:
+    # A quebra de linha antes do ')' protege contra comentários "--" no fim do WHERE
+    where = f"({parts.where.strip()}\n) AND {predicate}" if parts.where else predicate
+    return f"SELECT {parts.select.strip()}\nFROM {parts.source.strip()}\nWHERE {where}{parts.tail}"
+
+
+def add_predicate(query: str, predicate: str) -> str:
+    """``query`` restricted by ``predicate`` in its top-level ``WHERE`` (ORDER BY kept)."""
+    parts = split_query(query)
+    order = f"\nORDER BY {parts.order_by.strip()}" if parts.order_by else ''
+    return _with_predicate(parts, predicate) + order
+
+
+def _literal(value: Bound, dialect: str = 'mssql') -> str:
+    if isinstance(value, (date, datetime, pd.Timestamp)):
+        # Ranges of dates always start at midnight. 'YYYYMMDD' is read the
+        # same way under any SQL Server DATEFORMAT; SQLite compares ISO text.
+        day = pd.Timestamp(value)
+        return f"'{day.strftime('%Y-%m-%d' if dialect == 'sqlite' else '%Y%m%d')}'"
+    return str(int(value))
+
+
+def sql_dialect(connection: Any) -> str:
+    """``'sqlite'`` for the SQLite stand-in, ``'mssql'`` otherwise."""
+    import sqlite3
+
+    raw = getattr(connection, 'raw', connection)
+    return 'sqlite' if isinstance(raw, sqlite3.Connection) else 'mssql'
+
+
+def _coerce_bound(value: Any) -> Bound:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return pd.Timestamp(value)
+    return pd.Timestamp(value) if isinstance(value, (date, datetime)) else value
+
+
+def column_bounds(connection: Any, query: str, column: str) -> Optional[Tuple[Bound, Bound]]:
+    """MIN and MAX of ``column`` over the rows ``query`` selects (None when empty)."""
+    parts = split_query(query)
+    where = f"\nWHERE {parts.where.strip()}\n" if parts.where else ''
+    sql = f"SELECT MIN({column}) AS lo, MAX({column}) AS hi\nFROM {parts.source.strip()}{where}"
+    row = read_query(connection, sql, engine='dbapi', progress=None).iloc[0]
+    if pd.isna(row['lo']) or pd.isna(row['hi']):
+        return None
+    return _coerce_bound(row['lo']), _coerce_bound(row['hi'])
+
+
+def make_ranges(lo: Bound, hi: Bound, count: int) -> List[Tuple[Bound, Bound]]:
+    """Split ``[lo, hi]`` into at most ``count`` contiguous ranges of equal width.
+
+    Integer bounds give integer ranges; timestamps are split by day.
+    """
+    count = max(int(count), 1)
+    if isinstance(lo, pd.Timestamp):
+        lo, hi = lo.normalize(), hi.normalize() + pd.Timedelta(days=1)
+        days = max((hi - lo).days, 1)
+        step = math.ceil(days / count)
+        edges = [min(lo + pd.Timedelta(days=step * i), hi) for i in range(count)] + [hi]
+    else:
+        hi = hi + 1
+        step = max(math.ceil((hi - lo) / count), 1)
+        edges = [min(lo + step * i, hi) for i in range(count)] + [hi]
+    edges = sorted(set(edges))
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def partition_queries(
+    query: str, column: str, ranges: Sequence[Tuple[Bound, Bound]], dialect: str = 'mssql'
+) -> List[str]:
+    """One query per half-open range ``[lo, hi)``; the first also takes NULLs."""
+    parts = split_query(query)
+    order = f"\nORDER BY {parts.order_by.strip()}" if parts.order_by else ''
+    queries = []
+    for index, (lo, hi) in enumerate(ranges):
+        predicate = f"({column} >= {_literal(lo, dialect)} AND {column} < {_literal(hi, dialect)}"
+        predicate += f" OR {column} IS NULL)" if index == 0 else ")"
+        queries.append(_with_predicate(parts, predicate) + order)
+    return queries
+
+
+def _unquote(name: str) -> str:
+    name = name.strip()
+    if name[:1] in ("'", '"', '[') and len(name) > 1:
+        return name[1:-1]
+    return name
+
+
+def _normalize_expr(expr: str) -> str:
+    return re.sub(r'\s+', '', expr).upper()
+
+
+def _split_commas(text: str) -> List[str]:
+    masked = _mask_literals(text)
+    items, depth, start = [], 0, 0
+    for i, char in enumerate(masked):
+        depth += char == '('
+        depth -= char == ')'
+        if char == ',' and depth == 0:
+            items.append(text[start:i])
+            start = i + 1
+    items.append(text[start:])
+    return [item for item in items if item.strip()]
+
+
+def order_columns(query: str) -> List[Tuple[str, bool]]:
+    """Output columns and directions matching the query's ``ORDER BY``.
+
+    Each ORDER BY expression is mapped to the alias it has in the SELECT
+    list (``MoDataVencimento`` -> ``VENCIMENTO``).
+
+    Raises:
+        ValueError: If an ORDER BY expression is not in the SELECT list
+    """
+    parts = split_query(query)
+    if not parts.order_by:
+        return []
+    select = re.sub(r'^\s*(DISTINCT|ALL)\b', '', _mask_comments(parts.select), flags=re.IGNORECASE)
+    aliases: Dict[str, str] = {}
+    names = set()
+    for item in _split_commas(select):
+        match = _ALIAS.match(item.strip())
+        expr, alias = (match.group('expr'), _unquote(match.group('alias'))) if match else (item, item.strip().split('.')[-1])
+        aliases.setdefault(_normalize_expr(expr), alias)
+        names.add(_normalize_expr(alias))
+        aliases.setdefault(_normalize_expr(alias), alias)
+
+    columns = []
+    for item in _split_commas(_mask_comments(parts.order_by)):
+        item = item.strip()
+        ascending = True
+        direction = re.search(r'\s+(ASC|DESC)$', item, re.IGNORECASE)
+        if direction:
+            ascending = direction.group(1).upper() == 'ASC'
+            item = item[:direction.start()]
+        key = _normalize_expr(_unquote(item))
+        if key not in aliases:
+            raise ValueError(f"ORDER BY {item.strip()} não está na lista do SELECT")
+        columns.append((aliases[key], ascending))
+    return columns
+
+
+def _mask_comments(text: str) -> str:
+    text = re.sub(r'--[^\n]*', ' ', text)
+    return re.sub(r'/\*.*?\*/', ' ', text, flags=re.DOTALL)
+
+
+def sort_like_query(
+    frame: pd.DataFrame, query: str, order_by: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """Sort ``frame`` as the query's ``ORDER BY`` would (or by ``order_by``, ascending).
+
+    Sorting uses the frame's own types, so it must run before any cast to
+    str. NULLs come first on ascending keys and last on descending ones, as
+    in SQL Server.
+    """
+    keys = [(name, True) for name in order_by] if order_by else order_columns(query)
+    columns = {str(c).strip().upper(): c for c in frame.columns}
+    # Stable sorts from the last key to the first: each key keeps its own
+    # direction and NULL placement
+    for name, ascending in reversed(keys):
+        frame = frame.sort_values(
+            columns.get(name.strip().upper(), name), ascending=ascending, kind='stable',
+            na_position='first' if ascending else 'last', ignore_index=True,
+        )
+    return frame
+
+
+_DONE = object()
+_PART = '\x00partition'
+
+
+def _put(out: 'queue.Queue[Any]', item: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(
+    connect: Connect, sql: str, batch_size: int, dtype: Any, out: 'queue.Queue[Any]', stop: threading.Event
+) -> None:
+    """Stream one partition into ``out`` (batches, then ``_DONE`` or the error)."""
+    try:
+        conn = connect()
+        try:
+            for frame in iter_query_batches(conn, sql, batch_size=batch_size, dtype=dtype, progress=None):
+                if not _put(out, frame, stop):
+                    return
+        finally:
+            conn.close()
+    except BaseException as exc:  # repassado ao consumidor
+        _put(out, exc, stop)
+        return
+    _put(out, _DONE, stop)
+
+
+def _take(source: 'queue.Queue[Any]') -> Any:
+    item = source.get()
+    if isinstance(item, BaseException):
+        raise item
+    return item
+
+
+def _merge_streams(
+    sources: List['queue.Queue[Any]'], query: str, order_by: Optional[Sequence[str]]
+) -> Iterator[pd.DataFrame]:
+    """K-way merge of partitions already ordered by the query's ``ORDER BY``.
+
+    Buffered rows are released up to the smallest "last buffered row" among
+    the partitions still fetching: nothing they send later sorts before it.
+    """
+    keys = [(name, True) for name in order_by] if order_by else order_columns(query)
+    columns: Optional[List[Any]] = None
+    if not keys:
+        # Sem ORDER BY a ordem é livre: as faixas saem uma após a outra
+        for source in sources:
+            while (item := _take(source)) is not _DONE:
+                columns = list(item.columns)
+                if len(item):
+                    yield item
+        if columns is not None:
+            yield pd.DataFrame(columns=columns)
+        return
+
+    active = set(range(len(sources)))
+    pending: Optional[pd.DataFrame] = None
+    while active:
+        held = set() if pending is None else set(pending[_PART].unique())
+        for index in sorted(active - held):
+            while index in active:
+                item = _take(sources[index])
+                if item is _DONE:
+                    active.discard(index)
+                    continue
+                columns = list(item.columns)
+                if len(item):
+                    item = item.assign(**{_PART: index})
+                    pending = item if pending is None else pd.concat([pending, item], ignore_index=True)
+                    break
+        if pending is None or pending.empty:
+            continue
+        pending = sort_like_query(pending, query, order_by)
+        marks = pending[_PART].to_numpy()
+        if active:
+            bound = min(int(np.flatnonzero(marks == index)[-1]) for index in active)
+        else:
+            bound = len(pending) - 1
+        yield pending.iloc[:bound + 1].drop(columns=_PART).reset_index(drop=True)
+        pending = pending.iloc[bound + 1:].reset_index(drop=True)
+    if columns is not None:
+        yield pd.DataFrame(columns=columns)
+
+
+def _rebatch(frames: Iterator[pd.DataFrame], batch_size: int) -> Iterator[pd.DataFrame]:
+    """``frames`` regrouped into frames of ``batch_size`` rows (the last may be shorter)."""
+    held: List[pd.DataFrame] = []
+    size = 0
+    last: Optional[pd.DataFrame] = None
+    yielded = False
+    for frame in frames:
+        last = frame
+        if not len(frame):
+            continue
+        held.append(frame)
+        size += len(frame)
+        while size >= batch_size:
+            merged = held[0] if len(held) == 1 else pd.concat(held, ignore_index=True)
+            yield merged.iloc[:batch_size].reset_index(drop=True)
+            yielded = True
+            rest = merged.iloc[batch_size:].reset_index(drop=True)
+            held, size = ([rest], len(rest)) if len(rest) else ([], 0)
+    if held:
+        yield held[0] if len(held) == 1 else pd.concat(held, ignore_index=True)
+    elif not yielded and last is not None:
+        yield last.iloc[:0]
+
+
+def iter_partitioned(
+    connect: Connect,
+    query: str,
+    column: str,
+    partitions: int,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dtype: Any = None,
+    order_by: Optional[Sequence[str]] = None,
+    prefetch: int = 2,
+    normalize_columns: Optional[Callable[[str], str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """Run ``query`` as ``partitions`` range queries on ``column`` and stream the merge.
+
+    ``connect`` returns a fresh (pooled) DB-API connection; each partition
+    runs on its own thread and connection and hands batches of
+    ``batch_size`` rows to a queue of ``prefetch`` batches, so at most
+    ``partitions * (prefetch + 1)`` batches are in memory. Each partition
+    keeps the query's ``ORDER BY`` and the partitions are merged on their
+    database types (or on the ``order_by`` output columns, ascending),
+    NULLs first on ascending keys as in SQL Server. ``dtype`` is applied to
+    the merged batches; with ``dtype=str`` the partitions keep the driver's
+    values until then, so the text does not depend on the partition a row
+    came from. An empty result yields one empty frame with the columns.
+    """
+    text = dtype is str or dtype == 'str'
+    batch_size = max(int(batch_size), 1)
+
+    connection = connect()
+    try:
+        dialect = sql_dialect(connection)
+        bounds = column_bounds(connection, query, column)
+    finally:
+        connection.close()
+    queries = [query] if bounds is None else partition_queries(
+        query, column, make_ranges(*bounds, partitions), dialect
+    )
+
+    stop = threading.Event()
+    sources: List['queue.Queue[Any]'] = [queue.Queue(maxsize=max(int(prefetch), 1)) for _ in queries]
+    threads = [
+        threading.Thread(
+            target=_produce,
+            args=(connect, sql, batch_size, object if text else None, source, stop),
+            name=f'sql-part-{index}',
+            daemon=True,
+        )
+        for index, (sql, source) in enumerate(zip(queries, sources))
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for frame in _rebatch(_merge_streams(sources, query, order_by), batch_size):
+            if normalize_columns is not None:
+                frame.columns = [normalize_columns(c) for c in frame.columns]
+            if text:
+                yield as_text(frame)
+            else:
+                yield frame.astype(dtype) if dtype is not None else frame
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def run_partitioned(connect: Connect, query: str, column: str, partitions: int, **kwargs: Any) -> pd.DataFrame:
+    """Whole result of :func:`iter_partitioned` as one DataFrame."""
+    frames = list(iter_partitioned(connect, query, column, partitions, **kwargs))
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+def max_extraction_params(client: str, config_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Partitioning and incremental settings for a client's MAX extraction script.
+
+    Read from ``extraction.max`` in ``configs/clients/<client>.yaml``, or
+    from the SQL loader params of ``max_source``. A relative
+    ``incremental.snapshot_dir`` is resolved against the project root.
+    """
+    import yaml
+
+    root = Path(__file__).resolve().parents[2]
+    config_dir = config_dir or root / 'configs' / 'clients'
+    path = Path(config_dir) / f'{client}.yaml'
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as fh:
+        data = yaml.safe_load(fh) or {}
+    params = (data.get('extraction') or {}).get('max')
+    if params is None:
+        loader = (data.get('max_source') or {}).get('loader') or {}
+        params = loader.get('params', {}) if loader.get('type') == 'sql' else {}
+    result = {key: params[key] for key in ('partitions', 'partition_column', 'incremental') if key in params}
+    if result.get('incremental', {}).get('snapshot_dir'):
+        result['incremental'] = dict(result['incremental'])
+        result['incremental']['snapshot_dir'] = str(root / result['incremental']['snapshot_dir'])
+    return result
+
+
+__all__ = [
+    'QueryParts',
+    'add_predicate',
+    'column_bounds',
+    'iter_partitioned',
+    'make_ranges',
+    'max_extraction_params',
+    'order_columns',
+    'partition_queries',
+    'run_partitioned',
+    'split_query',
+    'sort_like_query',
+    'sql_dialect',
+]
@@ -0,0 +1,302 @@
+"""Process-wide pool of SQL Server connections.
+
+Every extraction used to open its own ODBC connection, probing up to six
+driver names with 30 s timeouts and paying a TLS handshake each time. The
+pool keeps released connections per ``(server, database, user)``, remembers
+which driver worked for each server, and checks an idle connection is still
+alive (``SELECT 1``) before handing it out again.
+
+Pooled connections are returned wrapped in :class:`PooledConnection`, which
+behaves like the DB-API connection except that ``close()`` gives it back to
+the pool. ``driver="sqlite"`` opens ``database`` as a local SQLite file, a
+stand-in for tests and benchmarks.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ODBC_DRIVERS: Tuple[str, ...] = (
+    "ODBC Driver 18 for SQL Server",
+    "ODBC Driver 17 for SQL Server",
+    "ODBC Driver 13 for SQL Server",
+    "ODBC Driver 11 for SQL Server",
+    "SQL Server Native Client 11.0",
+    "SQL Server",
+)
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_IDLE = 4
+
+PoolKey = Tuple[str, str, str]
+Connector = Callable[[str, str, str, str, str, int], Any]
+
+
+def odbc_connection_string(
+    driver: str, server: str, database: str, username: str = '', password: str = ''
+) -> str:
+    """ODBC connection string for SQL Server (integrated auth without credentials)."""
+    driver = driver if driver.startswith('{') else f"{{{driver}}}"
+    auth = f"UID={username};PWD={password};" if username and password else "Trusted_Connection=yes;"
+    return (
+        f"DRIVER={driver};"
+        f"SERVER={server};"
+        f"DATABASE={database};"
+        f"{auth}"
+        "TrustServerCertificate=yes;"
+    )
+
+
+def _connect_odbc(driver: str, server: str, database: str, username: str, password: str, timeout: int) -> Any:
+    import pyodbc
+
+    return pyodbc.connect(odbc_connection_string(driver, server, database, username, password), timeout=timeout)
+
+
+def _connect_sqlite(database: str) -> Any:
+    # Threads of the same process take turns on a pooled connection
+    return sqlite3.connect(database, check_same_thread=False)
+
+
+class PooledConnection:
+    """DB-API connection on loan from a :class:`ConnectionPool`.
+
+    Attribute access is delegated to the underlying connection; ``close()``
+    returns it to the pool instead of closing it.
+    """
+
+    def __init__(self, pool: 'ConnectionPool', key: PoolKey, raw: Any, driver: str, connection_string: Optional[str]):
+        self._pool = pool
+        self._key = key
+        self.raw = raw
+        self.driver = driver
+        self.connection_string = connection_string
+        self._released = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)
+
+    def cursor(self) -> Any:
+        return self.raw.cursor()
+
+    def close(self) -> None:
+        """Give the connection back to the pool (idempotent)."""
+        if not self._released:
+            self._released = True
+            self._pool.release(self)
+
+    def discard(self) -> None:
+        """Really close the connection, e.g. after a network error."""
+        if not self._released:
+            self._released = True
+            self._pool.discard(self)
+
+    def __enter__(self) -> 'PooledConnection':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+@dataclass
+class PoolStats:
+    """Counters of a :class:`ConnectionPool`."""
+
+    opened: int = 0
+    reused: int = 0
+    discarded: int = 0
+    probes: int = 0
+
+
+class ConnectionPool:
+    """Thread-safe pool of DB-API connections keyed by ``(server, database, user)``."""
+
+    def __init__(
+        self,
+        max_idle: int = DEFAULT_MAX_IDLE,
+        connector: Connector = _connect_odbc,
+        drivers: Sequence[str] = ODBC_DRIVERS,
+        ping_query: str = "SELECT 1",
+    ) -> None:
+        self.max_idle = max_idle
+        self.connector = connector
+        self.drivers = tuple(drivers)
+        self.ping_query = ping_query
+        self.stats = PoolStats()
+        self._idle: Dict[PoolKey, List[Tuple[Any, str, Optional[str]]]] = {}
+        self._drivers: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Checkout
+    # ------------------------------------------------------------------ #
+
+    def acquire(
+        self,
+        server: str,
+        database: str,
+        username: str = '',
+        password: str = '',
+        *,
+        driver: Optional[str] = None,
+        timeout: int = DEFAULT_TIMEOUT,
+    ) -> PooledConnection:
+        """Hand out a live connection, reusing an idle one when possible.
+
+        ``driver`` forces one ODBC driver; otherwise the driver that worked
+        for ``server`` before is tried first, then :data:`ODBC_DRIVERS`.
+
+        Raises:
+            ConnectionError: If no driver could connect
+        """
+        key = (server, database, username)
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                entry = idle.pop() if idle else None
+            if entry is None:
+                break
+            raw, used_driver, connection_string = entry
+            if self._is_alive(raw):
+                with self._lock:
+                    self.stats.reused += 1
+                return PooledConnection(self, key, raw, used_driver, connection_string)
+            self._close_quietly(raw)
+            with self._lock:
+                self.stats.discarded += 1
+
+        raw, used_driver = self._open(server, database, username, password, driver, timeout)
+        with self._lock:
+            self.stats.opened += 1
+        connection_string = (
+            None if used_driver == 'sqlite'
+            else odbc_connection_string(used_driver, server, database, username, password)
+        )
+        return PooledConnection(self, key, raw, used_driver, connection_string)
+
+    @contextmanager
+    def connection(self, server: str, database: str, username: str = '', password: str = '', **kwargs: Any) -> Iterator[PooledConnection]:
+        """``with pool.connection(...) as conn`` - discarded if the block fails."""
+        conn = self.acquire(server, database, username, password, **kwargs)
+        try:
+            yield conn
+        except BaseException:
+            conn.discard()
+            raise
+        conn.close()
+
+    def _open(
+        self, server: str, database: str, username: str, password: str, driver: Optional[str], timeout: int
+    ) -> Tuple[Any, str]:
+        if driver and driver.lower() == 'sqlite':
+            return _connect_sqlite(database), 'sqlite'
+
+        if driver:
+            candidates = [driver.strip('{}')]
+        else:
+            with self._lock:
+                known = self._drivers.get(server)
+            candidates = [known] if known else []
+            candidates += [name for name in self.drivers if name != known]
+
+        errors = []
+        for name in candidates:
+            with self._lock:
+                self.stats.probes += 1
+            try:
+                raw = self.connector(name, server, database, username, password, timeout)
+            except ImportError:
+                raise ConnectionError("pyodbc nao instalado") from None
+            except Exception as exc:
+                errors.append(f"{name}: {exc}")
+                continue
+            with self._lock:
+                if self._drivers.get(server) != name:
+                    logger.info("Driver ODBC para %s: %s", server, name)
+                self._drivers[server] = name
+            return raw, name
+
+        raise ConnectionError(f"Falha ao conectar em {server}/{database}: " + "; ".join(errors))
+
+    def _is_alive(self, raw: Any) -> bool:
+        try:
+            cursor = raw.cursor()
+            try:
+                cursor.execute(self.ping_query)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    # ------------------------------------------------------------------ #
+    # Return
+    # ------------------------------------------------------------------ #
+
+    def release(self, conn: PooledConnection) -> None:
+        """Put ``conn`` back as idle (closing it if the pool is full)."""
+        try:
+            # Nothing of the previous user's transaction survives the loan
+            conn.raw.rollback()
+        except Exception:
+            self.discard(conn)
+            return
+        with self._lock:
+            idle = self._idle.setdefault(conn._key, [])
+            if len(idle) < self.max_idle:
+                idle.append((conn.raw, conn.driver, conn.connection_string))
+                return
+        self._close_quietly(conn.raw)
+
+    def discard(self, conn: PooledConnection) -> None:
+        """Close ``conn`` for good instead of pooling it."""
+        with self._lock:
+            self.stats.discarded += 1
+        self._close_quietly(conn.raw)
+
+    def known_driver(self, server: str) -> Optional[str]:
+        """Driver that last connected to ``server``."""
+        with self._lock:
+            return self._drivers.get(server)
+
+    def close_all(self) -> None:
+        """Close every idle connection (the driver cache is kept)."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for entries in idle.values():
+            for raw, _, _ in entries:
+                self._close_quietly(raw)
+
+    @staticmethod
+    def _close_quietly(raw: Any) -> None:
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+
+_POOL = ConnectionPool()
+atexit.register(_POOL.close_all)
+
+
+def get_pool() -> ConnectionPool:
+    """The process-wide pool shared by loaders and extraction scripts."""
+    return _POOL
+
+
+__all__ = [
+    'ConnectionPool',
+    'ODBC_DRIVERS',
+    'PoolStats',
+    'PooledConnection',
+    'get_pool',
+    'odbc_connection_string',
+]
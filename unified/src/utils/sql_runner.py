@@ -0,0 +1,115 @@
+"""Concurrent execution of independent SQL queries.
+
+Extractions such as the judicial one query several databases that share no
+state (AUTOJUR on Candiotto, MaxSmart on STD). :func:`run_concurrently` runs
+each :class:`QueryJob` on its own thread with a pooled connection, so the
+total wait is the slowest query rather than the sum of all of them, and
+records how long each source took.
+
+``driver="sqlite"`` on a job points it at a local SQLite file, a stand-in
+backend for running the extraction offline.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+import pandas as pd
+
+from .sql_fetch import read_query
+from .sql_pool import get_pool
+
+
+@dataclass(frozen=True)
+class QueryJob:
+    """One query against one database."""
+
+    name: str
+    query: str
+    server: str
+    database: str
+    username: str = ''
+    password: str = ''
+    driver: Optional[str] = None
+
+
+@dataclass
+class QueryOutcome:
+    """Result of a :class:`QueryJob`; ``error`` is set when it failed."""
+
+    name: str
+    data: pd.DataFrame
+    elapsed: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+Backend = Callable[[QueryJob], pd.DataFrame]
+
+
+def pooled_backend(job: QueryJob) -> pd.DataFrame:
+    """Run ``job`` on a connection from the process-wide pool (all columns as str)."""
+    with get_pool().connection(
+        job.server, job.database, job.username, job.password, driver=job.driver
+    ) as conn:
+        return read_query(conn, job.query, dtype=str, progress=None)
+
+
+def _timed(job: QueryJob, backend: Backend) -> QueryOutcome:
+    start = time.perf_counter()
+    try:
+        data = backend(job)
+        error = None
+    except Exception as exc:
+        data = pd.DataFrame()
+        error = str(exc) or type(exc).__name__
+    return QueryOutcome(job.name, data, time.perf_counter() - start, error)
+
+
+def run_concurrently(
+    jobs: Sequence[QueryJob],
+    backend: Backend = pooled_backend,
+    max_workers: Optional[int] = None,
+) -> List[QueryOutcome]:
+    """Run ``jobs`` at the same time; outcomes come back in job order.
+
+    A failing job does not cancel the others: its outcome carries the error
+    and an empty DataFrame.
+    """
+    if not jobs:
+        return []
+    workers = max_workers or len(jobs)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sql') as executor:
+        return list(executor.map(lambda job: _timed(job, backend), jobs))
+
+
+def dedup_by_digits(frame: pd.DataFrame, column: str, keep: str = 'first') -> pd.DataFrame:
+    """Drop rows whose ``column`` has the same digits (``'123.456'`` == ``'123456'``).
+
+    Missing values count as an empty document, as ``astype(str)`` followed by
+    stripping non-digits did before.
+    """
+    if frame.empty:
+        return frame
+    digits = (
+        frame[column]
+        .astype('string')
+        .fillna('')
+        .str.replace(r'\D', '', regex=True)
+    )
+    return frame.loc[~digits.duplicated(keep=keep).to_numpy()]
+
+
+__all__ = [
+    'QueryJob',
+    'QueryOutcome',
+    'dedup_by_digits',
+    'pooled_backend',
+    'run_concurrently',
+]
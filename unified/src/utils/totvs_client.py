@@ -1,18 +1,26 @@
 from __future__ import annotations
 
+import logging
 import os
+import shutil
+import tempfile
 from datetime import date, timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pandas as pd
-import requests
 
-from src.config.loader import LoadedConfig
-from src.utils.io import write_csv_to_zip
+from src.utils.http_cache import HTTPCache, cache_for_client
+from src.utils.http_fetch import date_windows, get_records, iter_in_order, make_session
+from src.utils.json_stream import DecodeStats
+from src.utils.io import open_text_member, open_zip_for_writing, write_csv_to_zip
 from src.utils.logger import get_logger
 from src.utils.path_manager import PathManager
 from src.utils.output_formatter import OutputFormatter
 
+if TYPE_CHECKING:
+    from src.config.loader import LoadedConfig
+
 
 def baixar_emccamp(config: LoadedConfig) -> tuple[Path, int]:
     """Baixa dados EMCCAMP via API. Retorna (path, num_registros)."""
@@ -50,22 +58,27 @@ def baixar_emccamp(config: LoadedConfig) -> tuple[Path, int]:
         parametros.append(f"DATA_VENCIMENTO_FINAL={data_fim}")
 
     parametros_str = ";".join(parametros)
+
+    # Janelas de vencimento baixadas em paralelo (EMCCAMP_JANELA_DIAS=0: uma requisição só)
+    janela_dias = int(os.getenv("EMCCAMP_JANELA_DIAS", "0") or 0)
+    paralelas = int(os.getenv("EMCCAMP_JANELAS_PARALELAS", "4") or 4)
+    tentativas = int(os.getenv("EMCCAMP_JANELA_TENTATIVAS", "3") or 3)
+    if janela_dias > 0:
+        janelas = date_windows(date.fromisoformat(data_inicio), date.fromisoformat(data_fim), janela_dias)
+    else:
+        janelas = [(data_inicio, data_fim)]
+
     print(OutputFormatter.header("INTERVALO DE VENCIMENTO EMCCAMP"))
     print(OutputFormatter.metric("Data inicial (env)", data_inicio))
     if data_fim_env.upper() == "AUTO" or not data_fim_env:
         print(OutputFormatter.metric("Data final (auto, hoje-6)", data_fim))
     else:
         print(OutputFormatter.metric("Data final (env)", data_fim))
+    if len(janelas) > 1:
+        print(OutputFormatter.metric("Janelas", f"{len(janelas)} x {janela_dias} dias ({paralelas} em paralelo)"))
     print(OutputFormatter.footer())
     print(f"{base_url}?parameters={parametros_str}")
 
-    params = {"parameters": parametros_str}
-
-    resp = requests.get(full_url, params=params, auth=(user, password), timeout=(15, 180))
-    resp.raise_for_status()
-
-    data = resp.json()
-    df = pd.DataFrame(data)
     timestamp = os.environ.get("EMCCAMP_RUN_TS") or pd.Timestamp.utcnow().strftime("%Y%m%d_%H%M%S")
     csv_name = f"Emccamp_{timestamp}.csv"
     zip_path = input_dir / "Emccamp.zip"
@@ -74,8 +87,131 @@ def baixar_emccamp(config: LoadedConfig) -> tuple[Path, int]:
     sep = global_cfg.get("csv_separator", ";")
     encoding = global_cfg.get("encoding", "utf-8-sig")
 
-    write_csv_to_zip({csv_name: df}, zip_path, sep=sep, encoding=encoding)
-    return zip_path, len(df)
+    registros = baixar_janelas_para_zip(
+        full_url,
+        janelas,
+        zip_path,
+        csv_name,
+        auth=(user, password),
+        paralelas=paralelas,
+        tentativas=tentativas,
+        sep=sep,
+        encoding=encoding,
+        logger=logger,
+        cache=cache_for_client("emccamp"),
+    )
+    return zip_path, registros
+
+
+def _parametros_vencimento(inicio: date | str, fim: date | str) -> dict[str, str]:
+    # str(date) já é AAAA-MM-DD
+    return {"parameters": f"DATA_VENCIMENTO_INICIAL={inicio};DATA_VENCIMENTO_FINAL={fim}"}
+
+
+def baixar_janelas_para_zip(
+    url: str,
+    janelas: list[tuple[date | str, date | str]],
+    zip_path: Path,
+    csv_name: str,
+    *,
+    auth: tuple[str, str] | None = None,
+    paralelas: int = 4,
+    tentativas: int = 3,
+    timeout: tuple[float, float] = (15, 180),
+    sep: str = ";",
+    encoding: str = "utf-8-sig",
+    logger: logging.Logger | None = None,
+    cache: HTTPCache | None = None,
+) -> int:
+    """Baixa cada janela de vencimento e grava tudo como um único CSV dentro do ZIP.
+
+    Até ``paralelas`` janelas ficam em andamento; cada uma é repetida
+    sozinha (até ``tentativas`` vezes) se falhar. Cada janela, na ordem das
+    datas, é gravada num fragmento CSV temporário assim que chega; no fim o
+    ZIP recebe o cabeçalho formado pela união das colunas de todas as
+    janelas (como a resposta única fazia) e os fragmentos em sequência. O
+    ZIP só é substituído no fim. Com ``cache``, cada janela já baixada é
+    lida do disco dentro do TTL (ou revalidada por ETag/Last-Modified
+    depois dele). Retorna o número de registros.
+
+    Os valores saem como vieram no JSON: um inteiro com nulos em outras
+    linhas é gravado ``123``, e não ``123.0`` como na resposta única.
+    """
+    zip_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = zip_path.with_name(zip_path.name + ".partial")
+    session = make_session(pool_size=max(paralelas, 1))
+    if auth:
+        session.auth = auth
+
+    decode_stats = DecodeStats()
+
+    def baixar(janela: tuple[date | str, date | str]) -> pd.DataFrame:
+        dados = get_records(
+            session,
+            url,
+            params=_parametros_vencimento(*janela),
+            timeout=timeout,
+            max_retries=tentativas,
+            max_bytes=_limite_resposta(),
+            decode_stats=decode_stats,
+            cache=cache,
+        )
+        # object: valores exatamente como no JSON, iguais em todas as janelas
+        df = dados.to_frame(dtype=object)
+        if logger:
+            logger.info("Janela %s a %s: %s registros", janela[0], janela[1], len(df))
+        return df
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="janelas_", dir=zip_path.parent) as pasta:
+            # Cada janela vai para um fragmento CSV sem cabeçalho assim que chega
+            fragmentos: list[tuple[Path, list[str]]] = []
+            registros = 0
+            for posicao, df in enumerate(iter_in_order(baixar, janelas, paralelas)):
+                if df.empty:
+                    continue
+                fragmento = Path(pasta) / f"{posicao:05d}.csv"
+                with open(fragmento, "w", encoding="utf-8", newline="") as fh:
+                    df.to_csv(fh, index=False, header=False, sep=sep)
+                fragmentos.append((fragmento, list(df.columns)))
+                registros += len(df)
+
+            # União das colunas, na ordem em que aparecem
+            colunas = list(dict.fromkeys(c for _, cols in fragmentos for c in cols))
+            with open_zip_for_writing(partial) as zf, open_text_member(zf, csv_name, encoding) as texto:
+                if colunas:
+                    pd.DataFrame(columns=colunas).to_csv(texto, index=False, sep=sep)
+                for fragmento, cols in fragmentos:
+                    if cols == colunas:
+                        with open(fragmento, encoding="utf-8", newline="") as fh:
+                            shutil.copyfileobj(fh, texto)
+                        continue
+                    # Só as janelas com outras colunas são relidas (como texto) e reindexadas
+                    for parte in pd.read_csv(
+                        fragmento, sep=sep, header=None, names=cols, dtype=str,
+                        keep_default_na=False, encoding="utf-8", chunksize=100_000,
+                    ):
+                        parte.reindex(columns=colunas).to_csv(texto, index=False, header=False, sep=sep)
+        os.replace(partial, zip_path)
+    finally:
+        partial.unlink(missing_ok=True)
+        session.close()
+    _registrar_decodificacao(decode_stats, logger)
+    return registros
+
+
+def _limite_resposta() -> int | None:
+    """Teto de bytes por resposta JSON (TOTVS_MAX_RESPONSE_MB; vazio = sem limite)."""
+    limite = (os.getenv("TOTVS_MAX_RESPONSE_MB") or "").strip()
+    return int(float(limite) * 1e6) if limite else None
+
+
+def _registrar_decodificacao(stats: DecodeStats, logger: logging.Logger | None) -> None:
+    if logger:
+        logger.info(
+            "JSON TOTVS: %s registros, %.1f MB decodificados em %.2fs (%.1f MB/s)",
+            stats.records, stats.bytes / 1e6, stats.elapsed, stats.mb_per_sec,
+        )
 
 
 def baixar_baixas_emccamp(config: LoadedConfig) -> tuple[Path, int]:
@@ -104,11 +240,21 @@ def baixar_baixas_emccamp(config: LoadedConfig) -> tuple[Path, int]:
     if not user or not password:
         raise RuntimeError("Variaveis TOTVS_USER e TOTVS_PASS devem estar configuradas")
 
-    resp = requests.get(full_url, auth=(user, password), timeout=(15, 180))
-    resp.raise_for_status()
-
-    data = resp.json()
-    df = pd.DataFrame(data)
+    # JSON decodificado direto em colunas: o histórico inteiro vem numa resposta só
+    decode_stats = DecodeStats()
+    with make_session(pool_size=1) as session:
+        dados = get_records(
+            session,
+            full_url,
+            auth=(user, password),
+            timeout=(15, 180),
+            max_retries=1,
+            max_bytes=_limite_resposta(),
+            decode_stats=decode_stats,
+            cache=cache_for_client("emccamp"),
+        )
+    _registrar_decodificacao(decode_stats, logger)
+    df = dados.to_frame()
     if df.empty:
         logger.warning("API de baixas retornou nenhum registro.")
         df = pd.DataFrame(columns=["NUM_VENDA", "ID_PARCELA", "HONORARIO_BAIXADO", "DATA_RECEBIMENTO", "VALOR_RECEBIDO"])
@@ -29,21 +29,18 @@ class MaxValidator:
         )
 
     def validar_dados(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        df = df.copy()
-        df['motivo_inconsistencia'] = ''
+        motivos = MotivosInconsistencia(len(df))
 
         coluna = 'CHAVE' if 'CHAVE' in df.columns else 'PARCELA'
         if coluna in df.columns:
             chaves = df[coluna].astype(str).str.strip()
             mask_vazia = chaves.eq('') | df[coluna].isna()
-            df.loc[mask_vazia, 'motivo_inconsistencia'] += 'CHAVE_VAZIA;'
+            motivos.marcar(mask_vazia, 'CHAVE_VAZIA')
 
             mask_invalida = ~chaves.str.match(self.regex_chave, na=False)
-            df.loc[mask_invalida & ~mask_vazia, 'motivo_inconsistencia'] += 'CHAVE_FORMATO_INVALIDO;'
+            motivos.marcar(mask_invalida & ~mask_vazia, 'CHAVE_FORMATO_INVALIDO')
 
-        dados_invalidos = df[df['motivo_inconsistencia'] != '']
-        dados_validos = df[df['motivo_inconsistencia'] == ''].drop('motivo_inconsistencia', axis=1)
-        return dados_validos, dados_invalidos
+        return motivos.dividir(df)
 
     def validar_amostra(self, df: pd.DataFrame, n_amostras: int = 10) -> Dict[str, Any]:
         if len(df) == 0:
@@ -93,13 +90,11 @@ class VicValidator:
         Returns:
             Tuple[pd.DataFrame, pd.DataFrame]: (dados_validos, dados_invalidos)
         """
-        df = df.copy()
-        df['motivo_inconsistencia'] = ''
+        motivos = MotivosInconsistencia(len(df))
 
         # Validar VENCIMENTO
         if 'VENCIMENTO' in df.columns:
-            mask_venc_inval = df['VENCIMENTO'].isna()
-            df.loc[mask_venc_inval, 'motivo_inconsistencia'] += 'VENCIMENTO_INVALIDO;'
+            motivos.marcar(df['VENCIMENTO'].isna(), 'VENCIMENTO_INVALIDO')
 
         # Validar CPF/CNPJ (principal validação VIC)
         if 'CPFCNPJ_CLIENTE' in df.columns:
@@ -109,13 +104,12 @@ class VicValidator:
                 docs.str.lower().eq('nan') | docs.str.lower().eq('none') |
                 df['CPFCNPJ_CLIENTE'].isna()
             )
-            df.loc[mask_doc_vazio, 'motivo_inconsistencia'] += 'CPF/CNPJ nulo ou vazio;'
+            motivos.marcar(mask_doc_vazio, 'CPF/CNPJ nulo ou vazio')
         else:
             self.logger.warning("Coluna CPFCNPJ_CLIENTE não encontrada no DataFrame")
 
         # Separar válidos e inválidos
-        dados_invalidos = df[df['motivo_inconsistencia'] != '']
-        dados_validos = df[df['motivo_inconsistencia'] == ''].drop(columns=['motivo_inconsistencia'])
+        dados_validos, dados_invalidos = motivos.dividir(df)
         
         # Log das estatísticas
         total = len(df)
@@ -124,12 +118,10 @@ class VicValidator:
         
         self.logger.info(f"Validação VIC: {total:,} total, {validos:,} válidos, {invalidos:,} inválidos")
         
-        if invalidos > 0 and not dados_invalidos.empty:
-            # Contar motivos de inconsistência
-            motivos = dados_invalidos['motivo_inconsistencia'].str.split(';').explode()
-            motivos = motivos[motivos.str.strip() != ''].value_counts()
-            for motivo, count in motivos.items():
-                self.logger.info(f"  - {motivo.strip()}: {count:,} registros")
+        # Contar motivos de inconsistência (direto da máscara de bits)
+        for motivo, count in motivos.contagem().items():
+            if count:
+                self.logger.info(f"  - {motivo}: {count:,} registros")
         
         return dados_validos, dados_invalidos
 
@@ -150,10 +142,115 @@ class VicValidator:
         return motivos.to_dict()
 
 
+class MotivosInconsistencia:
+    """Rastreador colunar de inconsistências de uma execução.
+
+    Guarda uma única coluna inteira (``uint64``) com um bit por motivo para
+    cada registro, em vez de um dicionário por registro inválido. Marcar,
+    separar e contar motivos são operações vetorizadas; o texto dos motivos
+    (``'MOTIVO_A;MOTIVO_B;'``) só é montado na exportação, uma vez por
+    combinação distinta de bits.
+    """
+
+    MAX_MOTIVOS = 64
+
+    def __init__(self, total_registros: int = 0):
+        """Inicializa o rastreador.
+
+        Args:
+            total_registros: Quantidade de registros do DataFrame validado
+        """
+        self.codigos: Dict[str, int] = {}
+        self.bits = np.zeros(total_registros, dtype=np.uint64)
+
+    def codigo(self, motivo: str) -> int:
+        """Bit do motivo (atribuído na primeira vez em que aparece)."""
+        codigo = self.codigos.get(motivo)
+        if codigo is None:
+            if len(self.codigos) >= self.MAX_MOTIVOS:
+                raise ValueError(f"Mais de {self.MAX_MOTIVOS} motivos de inconsistência distintos")
+            codigo = self.codigos[motivo] = len(self.codigos)
+        return codigo
+
+    def _garantir_tamanho(self, tamanho: int) -> None:
+        if tamanho > len(self.bits):
+            self.bits = np.concatenate([self.bits, np.zeros(tamanho - len(self.bits), dtype=np.uint64)])
+
+    def marcar(self, registros: Any, motivo: str) -> None:
+        """Marca o motivo nos registros indicados.
+
+        Args:
+            registros: Máscara booleana (uma posição por registro) ou
+                posições dos registros inválidos
+            motivo: Motivo da inconsistência
+        """
+        bit = np.uint64(1) << np.uint64(self.codigo(motivo))
+        valores = np.asarray(registros)
+        if valores.dtype == bool:
+            self._garantir_tamanho(len(valores))
+            self.bits[:len(valores)][valores] |= bit
+            return
+        posicoes = valores.astype(np.intp, copy=False).ravel()
+        if posicoes.size:
+            self._garantir_tamanho(int(posicoes.max()) + 1)
+            self.bits[posicoes] |= bit
+
+    def invalidos(self, total_registros: Optional[int] = None) -> np.ndarray:
+        """Máscara booleana dos registros com ao menos um motivo."""
+        if total_registros is not None:
+            self._garantir_tamanho(total_registros)
+            return self.bits[:total_registros] != 0
+        return self.bits != 0
+
+    def contagem(self) -> Dict[str, int]:
+        """Quantidade de registros por motivo."""
+        return {
+            motivo: int(np.count_nonzero(self.bits & (np.uint64(1) << np.uint64(codigo))))
+            for motivo, codigo in self.codigos.items()
+        }
+
+    def motivos(self, bits: Optional[np.ndarray] = None, separador: str = ';') -> np.ndarray:
+        """Texto dos motivos de cada registro (``'A;B;'``, vazio se válido).
+
+        Args:
+            bits: Máscaras a expandir (padrão: todos os registros)
+            separador: Separador após cada motivo
+        """
+        bits = self.bits if bits is None else np.asarray(bits, dtype=np.uint64)
+        combinacoes, inverso = np.unique(bits, return_inverse=True)
+        ordem = sorted(self.codigos.items(), key=lambda item: item[1])
+        textos = np.array(
+            [
+                ''.join(f"{motivo}{separador}" for motivo, codigo in ordem if (int(valor) >> codigo) & 1)
+                for valor in combinacoes
+            ],
+            dtype=object,
+        )
+        return textos[inverso.ravel()]
+
+    def dividir(self, df: pd.DataFrame, coluna: str = 'motivo_inconsistencia') -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Separa válidos e inválidos; os inválidos recebem a coluna de motivos.
+
+        Args:
+            df: DataFrame validado (as posições correspondem às marcações)
+            coluna: Nome da coluna de motivos nos inválidos
+
+        Returns:
+            Tupla com (DataFrame válidos, DataFrame inválidos)
+        """
+        mascara = self.invalidos(len(df))
+        dados_validos = df[~mascara].copy()
+        dados_invalidos = df[mascara].copy()
+        dados_invalidos[coluna] = self.motivos(self.bits[:len(df)][mascara])
+        return dados_validos, dados_invalidos
+
+
 class InconsistenciaManager:
     """Gerenciador consolidado de inconsistências e validações.
     
-    Consolida funcionalidades do módulo inconsistencias.py.
+    Consolida funcionalidades do módulo inconsistencias.py. Os motivos de
+    cada execução ficam em um :class:`MotivosInconsistencia` (um bit por
+    motivo por registro); os índices informados são posições no DataFrame.
     """
     
     def __init__(self, config: Dict[str, Any]):
@@ -165,8 +262,11 @@ class InconsistenciaManager:
         self.config = config
         self.logger = logging.getLogger(__name__)
         
-        # Lista para armazenar inconsistências
-        self.inconsistencias: List[Dict[str, Any]] = []
+        # Máscara de bits da execução atual
+        self.rastreador = MotivosInconsistencia()
+        self.detalhes: Dict[str, Optional[str]] = {}
+        self.valores_originais: Dict[Tuple[int, str], str] = {}
+        self._bits_invalidos: Optional[pd.Series] = None
         
         # Contadores
         self.contadores = {
@@ -175,6 +275,17 @@ class InconsistenciaManager:
             'registros_invalidos': 0,
             'motivos': Counter()
         }
+
+    def iniciar(self, total_registros: int = 0) -> None:
+        """Começa uma nova execução, descartando os motivos anteriores.
+        
+        Args:
+            total_registros: Quantidade de registros a validar
+        """
+        self.rastreador = MotivosInconsistencia(total_registros)
+        self.detalhes = {}
+        self.valores_originais = {}
+        self._bits_invalidos = None
     
     def adicionar_motivo(self, indice: int, motivo: str, 
                         detalhes: Optional[str] = None, 
@@ -182,36 +293,56 @@ class InconsistenciaManager:
         """Adiciona motivo de inconsistência.
         
         Args:
-            indice: Índice do registro no DataFrame
+            indice: Posição do registro no DataFrame
             motivo: Motivo da inconsistência
             detalhes: Detalhes adicionais (opcional)
             valor_original: Valor original que causou a inconsistência
         """
-        inconsistencia = {
-            'indice': indice,
-            'motivo': motivo,
-            'detalhes': detalhes,
-            'valor_original': valor_original
-        }
-        
-        self.inconsistencias.append(inconsistencia)
-        self.contadores['motivos'][motivo] += 1
+        self.rastreador.marcar([indice], motivo)
+        if detalhes is not None:
+            self.detalhes[motivo] = detalhes
+        if valor_original is not None:
+            self.valores_originais[(int(indice), motivo)] = valor_original
         
         self.logger.debug(f"Inconsistência adicionada: {motivo} (índice {indice})")
     
-    def adicionar_motivos_em_lote(self, indices: List[int], motivo: str, 
+    def adicionar_motivos_em_lote(self, indices: Any, motivo: str, 
                                  detalhes: Optional[str] = None) -> None:
         """Adiciona mesmo motivo para múltiplos registros.
         
         Args:
-            indices: Lista de índices dos registros
+            indices: Posições dos registros ou máscara booleana
             motivo: Motivo da inconsistência
             detalhes: Detalhes adicionais (opcional)
         """
-        for indice in indices:
-            self.adicionar_motivo(indice, motivo, detalhes)
+        valores = np.asarray(indices)
+        self.rastreador.marcar(valores, motivo)
+        if detalhes is not None:
+            self.detalhes[motivo] = detalhes
         
-        self.logger.debug(f"Inconsistências em lote: {motivo} ({len(indices)} registros)")
+        quantidade = int(valores.sum()) if valores.dtype == bool else valores.size
+        self.logger.debug(f"Inconsistências em lote: {motivo} ({quantidade} registros)")
+
+    @property
+    def inconsistencias(self) -> List[Dict[str, Any]]:
+        """Inconsistências como lista de dicionários (montada sob demanda)."""
+        resultado = []
+        for motivo, codigo in self.rastreador.codigos.items():
+            bit = np.uint64(1) << np.uint64(codigo)
+            for indice in np.flatnonzero(self.rastreador.bits & bit):
+                resultado.append({
+                    'indice': int(indice),
+                    'motivo': motivo,
+                    'detalhes': self.detalhes.get(motivo),
+                    'valor_original': self.valores_originais.get((int(indice), motivo)),
+                })
+        return resultado
+
+    def contar_motivos(self) -> Dict[str, int]:
+        """Quantidade de registros por motivo na execução atual."""
+        contagem = self.rastreador.contagem()
+        self.contadores['motivos'] = Counter({m: c for m, c in contagem.items() if c})
+        return dict(self.contadores['motivos'])
     
     def dividir_validos_invalidos(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Divide DataFrame em registros válidos e inválidos.
@@ -222,22 +353,26 @@ class InconsistenciaManager:
         Returns:
             Tupla com (DataFrame válidos, DataFrame inválidos)
         """
-        if not self.inconsistencias:
+        mascara = self.rastreador.invalidos(len(df))
+        self.contadores['total_registros'] = len(df)
+        self.contar_motivos()
+
+        if not mascara.any():
             # Todos os registros são válidos
-            self.contadores['total_registros'] = len(df)
+            self._bits_invalidos = None
             self.contadores['registros_validos'] = len(df)
             self.contadores['registros_invalidos'] = 0
             return df.copy(), pd.DataFrame()
         
-        # Índices dos registros inválidos
-        indices_invalidos = {inc['indice'] for inc in self.inconsistencias}
-        
         # Dividir DataFrames
-        df_invalidos = df.iloc[list(indices_invalidos)].copy()
-        df_validos = df.drop(indices_invalidos).copy()
+        df_invalidos = df[mascara].copy()
+        df_validos = df[~mascara].copy()
+        # Bits guardados pelo índice: o texto só é montado na exportação
+        self._bits_invalidos = pd.Series(
+            self.rastreador.bits[:len(df)][mascara], index=df_invalidos.index
+        )
         
         # Atualizar contadores
-        self.contadores['total_registros'] = len(df)
         self.contadores['registros_validos'] = len(df_validos)
         self.contadores['registros_invalidos'] = len(df_invalidos)
         
@@ -254,10 +389,11 @@ class InconsistenciaManager:
         Returns:
             Dict com estatísticas detalhadas
         """
+        motivos = self.contar_motivos()
         return {
-            'total_inconsistencias': len(self.inconsistencias),
+            'total_inconsistencias': sum(motivos.values()),
             'contadores': dict(self.contadores),
-            'motivos_detalhados': dict(self.contadores['motivos'])
+            'motivos_detalhados': motivos
         }
 
     def criar_dataframe_inconsistencias(self, df_invalidos: pd.DataFrame) -> pd.DataFrame:
@@ -265,11 +401,21 @@ class InconsistenciaManager:
 
         Compatível com chamadas antigas que esperavam um DF pronto para exportação.
         Mantém todas as colunas do DF inválido e garante a presença de
-        'motivo_inconsistencia' (se não existir, preenche vazio).
+        'motivo_inconsistencia': se não existir, é expandida da máscara de
+        bits de :meth:`dividir_validos_invalidos` (ou preenchida vazia).
         """
         df_out = df_invalidos.copy()
         if 'motivo_inconsistencia' not in df_out.columns:
-            df_out['motivo_inconsistencia'] = ''
+            bits_invalidos = self._bits_invalidos
+            if (
+                bits_invalidos is not None
+                and bits_invalidos.index.is_unique
+                and df_out.index.isin(bits_invalidos.index).all()
+            ):
+                bits = bits_invalidos.reindex(df_out.index).to_numpy(dtype=np.uint64)
+                df_out['motivo_inconsistencia'] = self.rastreador.motivos(bits)
+            else:
+                df_out['motivo_inconsistencia'] = ''
         # Opcional: reordenar para dar destaque ao motivo
         cols = list(df_out.columns)
         if 'motivo_inconsistencia' in cols:
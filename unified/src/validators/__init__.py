@@ -18,6 +18,7 @@ from .status import StatusValidator, create_status_validator
 from .type_filter import TypeFilterValidator, create_type_filter_validator
 from .linebreak import LineBreakValidator, create_linebreak_validator
 from .daterange import DateRangeValidator, create_daterange_validator
+from .plan import PlanResult, ValidationPlan, ValidationStep
 
 
 # Registry of validator factories
@@ -81,6 +82,9 @@ __all__ = [
     "TypeFilterValidator",
     "LineBreakValidator",
     "DateRangeValidator",
+    "ValidationPlan",
+    "ValidationStep",
+    "PlanResult",
     "create_validator",
     "register_validator",
 ]
@@ -9,7 +9,7 @@ from datetime import date, datetime, timedelta
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, ValidationFrame, ValidationMask, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
@@ -23,12 +23,14 @@ class AgingValidator(BaseValidator):
     def validate(self, df: pd.DataFrame) -> ValidationResult:
         if not self.enabled or df.empty:
             return ValidationResult(valid=df, invalid=pd.DataFrame(), errors=[])
+        return self.split(df, self.validate_mask(ValidationFrame(df)))
 
+    def validate_mask(self, frame: ValidationFrame) -> ValidationMask:
+        df = frame.df
         date_column = self.params.get("date_column", "VENCIMENTO")
         if date_column not in df.columns:
-            return ValidationResult(
-                valid=df,
-                invalid=pd.DataFrame(),
+            return ValidationMask(
+                keep=None,
                 errors=[f"Date column '{date_column}' not found, skipping aging validation"],
             )
 
@@ -45,9 +47,8 @@ class AgingValidator(BaseValidator):
         if max_age_days is not None:
             min_date = today - timedelta(days=max_age_days)
 
-        # Convert date column to datetime
-        df_copy = df.copy()
-        date_series = pd.to_datetime(df_copy[date_column], errors="coerce", dayfirst=True)
+        # Convert date column to datetime (shared with other date validators)
+        date_series = frame.dates(date_column)
 
         # Build mask
         valid_mask = pd.Series(True, index=df.index)
@@ -55,11 +56,11 @@ class AgingValidator(BaseValidator):
 
         # Handle null dates
         null_dates = date_series.isna()
-        if null_dates.any():
+        if frame.any(null_dates):
             null_action = self.params.get("null_action", "include")
             if null_action == "exclude":
                 valid_mask = valid_mask & ~null_dates
-                errors.append(f"{null_dates.sum()} records with null dates excluded")
+                errors.append(f"{frame.count(null_dates)} records with null dates excluded")
             elif null_action == "include":
                 pass  # Keep null dates as valid
 
@@ -69,22 +70,18 @@ class AgingValidator(BaseValidator):
         if min_date is not None:
             min_dt = pd.Timestamp(min_date)
             too_old = non_null_mask & (date_series < min_dt)
-            if too_old.any():
+            if frame.any(too_old):
                 valid_mask = valid_mask & ~too_old
-                errors.append(f"{too_old.sum()} records before {min_date} excluded")
+                errors.append(f"{frame.count(too_old)} records before {min_date} excluded")
 
         if max_date is not None:
             max_dt = pd.Timestamp(max_date)
             too_new = non_null_mask & (date_series > max_dt)
-            if too_new.any():
+            if frame.any(too_new):
                 valid_mask = valid_mask & ~too_new
-                errors.append(f"{too_new.sum()} records after {max_date} excluded")
+                errors.append(f"{frame.count(too_new)} records after {max_date} excluded")
 
-        return ValidationResult(
-            valid=df[valid_mask].copy(),
-            invalid=df[~valid_mask].copy(),
-            errors=errors,
-        )
+        return ValidationMask(keep=valid_mask, errors=errors)
 
     def _parse_date(self, value: str | date | None) -> date | None:
         """Parse a date value from string or date object."""
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, ValidationFrame, ValidationMask, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
@@ -20,19 +20,18 @@ class CampaignValidator(BaseValidator):
     def validate(self, df: pd.DataFrame) -> ValidationResult:
         if not self.enabled or df.empty:
             return ValidationResult(valid=df, invalid=pd.DataFrame(), errors=[])
+        return self.split(df, self.validate_mask(ValidationFrame(df)))
 
+    def validate_mask(self, frame: ValidationFrame) -> ValidationMask:
+        df = frame.df
         column = self.params.get("column", "CAMPANHA")
         include_patterns = self.params.get("include", [])
         exclude_patterns = self.params.get("exclude", [])
 
         if column not in df.columns:
-            return ValidationResult(
-                valid=df,
-                invalid=pd.DataFrame(),
-                errors=[f"Campaign column '{column}' not found"],
-            )
+            return ValidationMask(keep=None, errors=[f"Campaign column '{column}' not found"])
 
-        values = df[column].astype(str).str.strip().str.upper()
+        values = frame.upper(column)
         valid_mask = pd.Series(True, index=df.index)
         errors = []
 
@@ -45,7 +44,7 @@ class CampaignValidator(BaseValidator):
                     pattern_upper, na=False, regex=False
                 )
             valid_mask = valid_mask & include_mask
-            excluded = (~include_mask).sum()
+            excluded = frame.count(~include_mask)
             if excluded > 0:
                 errors.append(
                     f"{excluded} records excluded (campaign not in: {include_patterns})"
@@ -60,17 +59,13 @@ class CampaignValidator(BaseValidator):
                     pattern_upper, na=False, regex=False
                 )
             valid_mask = valid_mask & ~exclude_mask
-            excluded = exclude_mask.sum()
+            excluded = frame.count(exclude_mask)
             if excluded > 0:
                 errors.append(
                     f"{excluded} records excluded (campaign in: {exclude_patterns})"
                 )
 
-        return ValidationResult(
-            valid=df[valid_mask].copy(),
-            invalid=df[~valid_mask].copy(),
-            errors=errors,
-        )
+        return ValidationMask(keep=valid_mask, errors=errors)
 
 
 def create_campaign_validator(config: ValidatorConfig) -> CampaignValidator:
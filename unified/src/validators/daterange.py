@@ -9,7 +9,7 @@ from datetime import date, datetime
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, ValidationFrame, ValidationMask, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
@@ -23,7 +23,10 @@ class DateRangeValidator(BaseValidator):
     def validate(self, df: pd.DataFrame) -> ValidationResult:
         if not self.enabled or df.empty:
             return ValidationResult(valid=df, invalid=pd.DataFrame(), errors=[])
+        return self.split(df, self.validate_mask(ValidationFrame(df)))
 
+    def validate_mask(self, frame: ValidationFrame) -> ValidationMask:
+        df = frame.df
         column = self.params.get("column", "VENCIMENTO")
         min_year = self.params.get("min_year", 1900)
         max_year = self.params.get("max_year", 2100)
@@ -32,24 +35,20 @@ class DateRangeValidator(BaseValidator):
         null_action = self.params.get("null_action", "include")  # include, exclude
 
         if column not in df.columns:
-            return ValidationResult(
-                valid=df,
-                invalid=pd.DataFrame(),
-                errors=[f"Date column '{column}' not found"],
-            )
+            return ValidationMask(keep=None, errors=[f"Date column '{column}' not found"])
 
-        # Parse dates
-        date_series = pd.to_datetime(df[column], errors="coerce", dayfirst=True)
+        # Parse dates (shared with other date validators)
+        date_series = frame.dates(column)
 
         valid_mask = pd.Series(True, index=df.index)
         errors = []
 
         # Handle null dates
         null_mask = date_series.isna()
-        if null_mask.any():
+        if frame.any(null_mask):
             if null_action == "exclude":
                 valid_mask = valid_mask & ~null_mask
-                errors.append(f"{null_mask.sum()} records with null dates excluded")
+                errors.append(f"{frame.count(null_mask)} records with null dates excluded")
 
         # Build min/max date thresholds
         min_threshold = None
@@ -76,25 +75,21 @@ class DateRangeValidator(BaseValidator):
 
         if min_threshold:
             before_min = non_null_mask & (date_series < min_threshold)
-            if before_min.any():
+            if frame.any(before_min):
                 valid_mask = valid_mask & ~before_min
                 errors.append(
-                    f"{before_min.sum()} records before {min_threshold.date()} excluded"
+                    f"{frame.count(before_min)} records before {min_threshold.date()} excluded"
                 )
 
         if max_threshold:
             after_max = non_null_mask & (date_series > max_threshold)
-            if after_max.any():
+            if frame.any(after_max):
                 valid_mask = valid_mask & ~after_max
                 errors.append(
-                    f"{after_max.sum()} records after {max_threshold.date()} excluded"
+                    f"{frame.count(after_max)} records after {max_threshold.date()} excluded"
                 )
 
-        return ValidationResult(
-            valid=df[valid_mask].copy(),
-            invalid=df[~valid_mask].copy(),
-            errors=errors,
-        )
+        return ValidationMask(keep=valid_mask, errors=errors)
 
 
 def create_daterange_validator(config: ValidatorConfig) -> DateRangeValidator:
@@ -7,7 +7,7 @@ from __future__ import annotations
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, ValidationFrame, ValidationMask, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
@@ -22,43 +22,21 @@ class LineBreakValidator(BaseValidator):
         if not self.enabled or df.empty:
             return ValidationResult(valid=df, invalid=pd.DataFrame(), errors=[])
 
-        # Columns to check for line breaks
-        columns = self.params.get("columns", [])
-        check_all = self.params.get("check_all", False)
         action = self.params.get("action", "exclude")  # exclude, flag, clean
+        if action not in ("flag", "clean"):
+            return self.split(df, self.validate_mask(ValidationFrame(df)))
 
-        if check_all:
-            # Check all string columns
-            columns = [col for col in df.columns if df[col].dtype == object]
-
+        columns, has_linebreak = self._find_linebreaks(ValidationFrame(df))
         if not columns:
             return ValidationResult(valid=df, invalid=pd.DataFrame(), errors=[])
 
-        # Build mask for records with line breaks
-        has_linebreak = pd.Series(False, index=df.index)
-
-        for col in columns:
-            if col not in df.columns:
-                continue
-            # Check for various line break characters
-            col_has_break = (
-                df[col].astype(str).str.contains(r'[\n\r]', na=False, regex=True)
-            )
-            has_linebreak = has_linebreak | col_has_break
-
         affected_count = has_linebreak.sum()
         errors = []
 
         if affected_count > 0:
             errors.append(f"{affected_count} records have internal line breaks")
 
-        if action == "exclude":
-            return ValidationResult(
-                valid=df[~has_linebreak].copy(),
-                invalid=df[has_linebreak].copy(),
-                errors=errors,
-            )
-        elif action == "flag":
+        if action == "flag":
             # Add flag column but keep all records
             df = df.copy()
             df["_HAS_LINEBREAK"] = has_linebreak
@@ -67,7 +45,7 @@ class LineBreakValidator(BaseValidator):
                 invalid=pd.DataFrame(),
                 errors=errors,
             )
-        elif action == "clean":
+        else:  # clean
             # Clean line breaks from specified columns
             df = df.copy()
             for col in columns:
@@ -78,12 +56,44 @@ class LineBreakValidator(BaseValidator):
                 invalid=pd.DataFrame(),
                 errors=[f"Cleaned line breaks from {affected_count} records"],
             )
-        else:
-            return ValidationResult(
-                valid=df[~has_linebreak].copy(),
-                invalid=df[has_linebreak].copy(),
-                errors=errors,
-            )
+
+    def validate_mask(self, frame: ValidationFrame) -> ValidationMask | None:
+        # flag/clean rewrite the frame: only validate() applies
+        if self.params.get("action", "exclude") in ("flag", "clean"):
+            return None
+
+        columns, has_linebreak = self._find_linebreaks(frame)
+        if not columns:
+            return ValidationMask(keep=None, errors=[])
+
+        affected_count = frame.count(has_linebreak)
+        errors = []
+        if affected_count > 0:
+            errors.append(f"{affected_count} records have internal line breaks")
+        return ValidationMask(keep=~has_linebreak, errors=errors)
+
+    def _find_linebreaks(self, frame: ValidationFrame) -> tuple[list, pd.Series]:
+        """Columns checked and the mask of records with line breaks in any of them."""
+        df = frame.df
+        # Columns to check for line breaks
+        columns = self.params.get("columns", [])
+        check_all = self.params.get("check_all", False)
+
+        if check_all:
+            # Check all string columns
+            columns = [col for col in df.columns if df[col].dtype == object]
+
+        # Build mask for records with line breaks
+        has_linebreak = pd.Series(False, index=df.index)
+
+        for col in columns:
+            if col not in df.columns:
+                continue
+            # Check for various line break characters
+            col_has_break = frame.text(col).str.contains(r'[\n\r]', na=False, regex=True)
+            has_linebreak = has_linebreak | col_has_break
+
+        return columns, has_linebreak
 
 
 def create_linebreak_validator(config: ValidatorConfig) -> LineBreakValidator:
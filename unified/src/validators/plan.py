@@ -0,0 +1,122 @@
+"""
+Validation plan.
+Runs the configured validators as one pass over the client frame.
+
+Each validator used to normalize its column again and copy the surviving
+rows (plus a throwaway invalid frame) before the next one ran. The plan
+asks each validator for a boolean mask over the original frame instead
+(``validate_mask``), shares the normalized columns between them
+(``ValidationFrame``) and builds the valid frame once at the end; the
+invalid frame is only built if someone asks for it.
+
+A validator without a mask (e.g. linebreak with ``action: clean``) rewrites
+the frame: the rows still valid are materialized, it runs through
+``validate`` and the plan continues on its output.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from ..core.base import BaseValidator, ValidationFrame
+from ..core.schemas import ValidatorConfig
+
+
+@dataclass
+class ValidationStep:
+    """Outcome of one validator within the plan."""
+    name: str
+    valid: int
+    invalid: int
+    errors: list[str]
+
+
+@dataclass
+class PlanResult:
+    """Valid rows of the whole plan, with per-validator counts."""
+    valid: pd.DataFrame
+    steps: list[ValidationStep]
+    _invalid_parts: list[tuple[pd.DataFrame, np.ndarray]] = field(default_factory=list, repr=False)
+
+    @property
+    def invalid(self) -> pd.DataFrame:
+        """Rows rejected by any validator (built on first access)."""
+        parts = [df[~keep] for df, keep in self._invalid_parts if (~keep).any()]
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat(parts) if len(parts) > 1 else parts[0].copy()
+
+    @property
+    def total_valid(self) -> int:
+        return len(self.valid)
+
+    @property
+    def total_invalid(self) -> int:
+        return sum(int((~keep).sum()) for _, keep in self._invalid_parts)
+
+
+def _rows(df: pd.DataFrame, keep: np.ndarray) -> pd.DataFrame:
+    """Independent copy of the ``keep`` rows (safe to modify, no ``SettingWithCopyWarning``)."""
+    return df.copy() if keep.all() else df[keep].copy()
+
+
+class ValidationPlan:
+    """Validators compiled into a single masking pass."""
+
+    def __init__(self, validators: list[BaseValidator]):
+        self.validators = [v for v in validators if v.enabled]
+
+    @classmethod
+    def from_configs(cls, configs: list[ValidatorConfig]) -> ValidationPlan:
+        from . import create_validator
+
+        return cls([create_validator(c) for c in configs if c.enabled])
+
+    def run(self, df: pd.DataFrame) -> PlanResult:
+        steps: list[ValidationStep] = []
+        invalid_parts: list[tuple[pd.DataFrame, np.ndarray]] = []
+        frame = ValidationFrame(df)
+        keep = np.ones(len(df), dtype=bool)
+
+        for validator in self.validators:
+            alive = int(keep.sum())
+            if not alive:
+                # Mesmo comportamento de validate() com frame vazio
+                steps.append(ValidationStep(validator.name, 0, 0, []))
+                continue
+
+            frame.alive = None if alive == len(keep) else pd.Series(keep, index=frame.df.index)
+            result = validator.validate_mask(frame)
+
+            if result is None:
+                # Validador reescreve o frame: materializa os válidos até aqui
+                invalid_parts.append((frame.df, keep))
+                current = _rows(frame.df, keep)
+                outcome = validator.validate(current)
+                steps.append(
+                    ValidationStep(validator.name, outcome.total_valid, outcome.total_invalid, outcome.errors)
+                )
+                if outcome.total_invalid:
+                    invalid_parts.append((outcome.invalid, np.zeros(len(outcome.invalid), dtype=bool)))
+                frame = ValidationFrame(outcome.valid)
+                keep = np.ones(len(outcome.valid), dtype=bool)
+                continue
+
+            if result.keep is None:
+                steps.append(ValidationStep(validator.name, alive, 0, result.errors))
+                continue
+
+            mask = np.asarray(result.keep, dtype=bool)
+            after = keep & mask
+            remaining = int(after.sum())
+            steps.append(ValidationStep(validator.name, remaining, alive - remaining, result.errors))
+            keep = after
+
+        invalid_parts.append((frame.df, keep))
+        valid = _rows(frame.df, keep)
+        return PlanResult(valid=valid, steps=steps, _invalid_parts=invalid_parts)
+
+
+__all__ = ["PlanResult", "ValidationPlan", "ValidationStep"]
@@ -8,12 +8,58 @@ import re
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, ValidationFrame, ValidationMask, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
+# Alternativa de dígitos: ^\d{11}$, [0-9]{14}, \d{11,14} (âncoras opcionais)
+_DIGITS = re.compile(r"(\^?)(\\d|\[0-9\])\{(\d+)(?:,(\d+))?\}(\$?)")
+
+
+def _strip_group(pattern: str) -> str:
+    """``^(?:a|b)$`` -> ``^a$|^b$`` when the group spans the whole pattern."""
+    match = re.fullmatch(r"(\^?)\((?:\?:)?([^()]*)\)(\$?)", pattern)
+    if not match:
+        return pattern
+    start, body, end = match.groups()
+    return "|".join(f"{start}{alt}{end}" for alt in body.split("|"))
+
+
+def digit_lengths(pattern: str, mode: str) -> tuple[set[int], bool] | None:
+    """Lengths accepted by a pure digit-count pattern, or None if it is anything else.
+
+    Covers the usual CPF/CNPJ rules (``^\\d{11}$|^\\d{14}$``,
+    ``[0-9]{11,14}``...). Returns the lengths and whether only ASCII digits
+    count (``[0-9]``; Python's ``\\d`` takes any Unicode decimal). In
+    ``match``/``search`` mode every alternative must be anchored at both
+    ends, otherwise a prefix match would be enough.
+    """
+    lengths: set[int] = set()
+    ascii_only = False
+    for alternative in _strip_group(pattern).split("|"):
+        match = _DIGITS.fullmatch(alternative)
+        if not match:
+            return None
+        start, digit, low, high, end = match.groups()
+        if mode != "fullmatch" and not (start and end):
+            return None
+        if digit != "\\d":
+            ascii_only = True
+        lengths.update(range(int(low), int(high or low) + 1))
+    return (lengths, ascii_only) if lengths else None
+
+
 class RegexValidator(BaseValidator):
-    """Validates column values against regex patterns."""
+    """Validates column values against regex patterns.
+
+    ``pattern`` may be a single pattern or a list. With ``combine: any``
+    (default) a value is valid if it matches one of them, and the list is
+    compiled into a single alternation; with ``combine: all`` it must match
+    every pattern. Matching uses the vectorized ``str.fullmatch`` /
+    ``str.match`` / ``str.contains`` kernels of the column (RE2 for
+    Arrow-backed strings), and pure digit-length patterns (CPF/CNPJ) skip
+    regex altogether.
+    """
 
     @property
     def name(self) -> str:
@@ -22,56 +68,105 @@ class RegexValidator(BaseValidator):
     def validate(self, df: pd.DataFrame) -> ValidationResult:
         if not self.enabled or df.empty:
             return ValidationResult(valid=df, invalid=pd.DataFrame(), errors=[])
+        return self.split(df, self.validate_mask(ValidationFrame(df)))
 
+    def validate_mask(self, frame: ValidationFrame) -> ValidationMask:
+        df = frame.df
         column = self.params.get("column")
         pattern = self.params.get("pattern")
         mode = self.params.get("mode", "match")  # match, fullmatch, search
+        combine = self.params.get("combine", "any")  # any, all
 
         if not column or not pattern:
-            return ValidationResult(
-                valid=df,
-                invalid=pd.DataFrame(),
+            return ValidationMask(
+                keep=None,
                 errors=["Regex validator requires 'column' and 'pattern' params"],
             )
 
         if column not in df.columns:
-            return ValidationResult(
-                valid=df,
-                invalid=pd.DataFrame(),
-                errors=[f"Column '{column}' not found"],
-            )
+            return ValidationMask(keep=None, errors=[f"Column '{column}' not found"])
 
+        patterns = [pattern] if isinstance(pattern, str) else list(pattern)
         try:
-            compiled = re.compile(pattern)
+            for item in patterns:
+                re.compile(item)
         except re.error as e:
-            return ValidationResult(
-                valid=df,
-                invalid=pd.DataFrame(),
-                errors=[f"Invalid regex pattern: {e}"],
-            )
+            return ValidationMask(keep=None, errors=[f"Invalid regex pattern: {e}"])
 
         # Apply regex validation
-        values = df[column].astype(str).fillna("")
-
-        if mode == "fullmatch":
-            valid_mask = values.apply(lambda x: bool(compiled.fullmatch(x)))
-        elif mode == "search":
-            valid_mask = values.apply(lambda x: bool(compiled.search(x)))
-        else:  # match (default)
-            valid_mask = values.apply(lambda x: bool(compiled.match(x)))
-
-        invalid_count = (~valid_mask).sum()
+        values = frame.text(column).fillna("")
+
+        if combine == "all":
+            valid_mask = self._matches(values, patterns[0], mode)
+            for item in patterns[1:]:
+                valid_mask &= self._matches(values, item, mode)
+        else:
+            rules = [digit_lengths(item, mode) for item in patterns]
+            if all(rule is not None for rule in rules):
+                lengths = set().union(*(rule[0] for rule in rules))
+                valid_mask = self._digits(values, lengths, any(rule[1] for rule in rules), mode)
+            else:
+                valid_mask = self._matches(values, self._fuse(patterns), mode)
+
+        invalid_count = frame.count(~valid_mask)
         errors = []
         if invalid_count > 0:
+            shown = pattern if isinstance(pattern, str) else "', '".join(patterns)
             errors.append(
-                f"{invalid_count} records in '{column}' don't match pattern '{pattern}'"
+                f"{invalid_count} records in '{column}' don't match pattern '{shown}'"
             )
 
-        return ValidationResult(
-            valid=df[valid_mask].copy(),
-            invalid=df[~valid_mask].copy(),
-            errors=errors,
-        )
+        return ValidationMask(keep=valid_mask, errors=errors)
+
+    @staticmethod
+    def _fuse(patterns: list[str]) -> str | list[str]:
+        """Patterns joined into one alternation (a list if they cannot be)."""
+        if len(patterns) == 1:
+            return patterns[0]
+        fused = "|".join(f"(?:{item})" for item in patterns)
+        try:
+            re.compile(fused)
+        except re.error:
+            # Flags inline ((?i)...) não podem ir no meio de uma alternância
+            return patterns
+        return fused
+
+    @staticmethod
+    def _digits(values: pd.Series, lengths: set[int], ascii_only: bool, mode: str) -> pd.Series:
+        """Digits only, with one of ``lengths`` characters: no regex."""
+        if mode != "fullmatch":
+            # '$' também casa antes de um '\n' final
+            values = values.str.removesuffix("\n")
+        size = values.str.len()
+        if ascii_only:
+            # str.isascii só existe no pandas 3
+            valid = values.str.fullmatch(r"[0-9]*")
+        else:
+            valid = values.str.isdecimal()
+        if 0 in lengths:
+            valid |= size.eq(0)
+        return (valid & size.isin(lengths)).fillna(False).astype(bool)
+
+    @classmethod
+    def _matches(cls, values: pd.Series, pattern: str | list[str], mode: str) -> pd.Series:
+        """Boolean mask of ``values`` matching ``pattern`` (any of a list) in ``mode``."""
+        if isinstance(pattern, list):
+            valid = cls._matches(values, pattern[0], mode)
+            for item in pattern[1:]:
+                valid |= cls._matches(values, item, mode)
+            return valid
+
+        rule = digit_lengths(pattern, mode)
+        if rule is not None:
+            return cls._digits(values, rule[0], rule[1], mode)
+
+        if mode == "fullmatch":
+            valid = values.str.fullmatch(pattern, na=False)
+        elif mode == "search":
+            valid = values.str.contains(pattern, regex=True, na=False)
+        else:  # match (default)
+            valid = values.str.match(pattern, na=False)
+        return valid.astype(bool)
 
 
 def create_regex_validator(config: ValidatorConfig) -> RegexValidator:
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, ValidationFrame, ValidationMask, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
@@ -22,10 +22,6 @@ class RequiredValidator(BaseValidator):
             return ValidationResult(valid=df, invalid=pd.DataFrame(), errors=[])
 
         columns = self.params.get("columns", [])
-        if not columns:
-            return ValidationResult(valid=df, invalid=pd.DataFrame(), errors=[])
-
-        # Check which columns exist
         missing_cols = [col for col in columns if col not in df.columns]
         if missing_cols:
             return ValidationResult(
@@ -34,22 +30,34 @@ class RequiredValidator(BaseValidator):
                 errors=[f"Missing required columns: {missing_cols}"],
             )
 
+        return self.split(df, self.validate_mask(ValidationFrame(df)))
+
+    def validate_mask(self, frame: ValidationFrame) -> ValidationMask:
+        df = frame.df
+        columns = self.params.get("columns", [])
+        if not columns:
+            return ValidationMask(keep=None, errors=[])
+
+        # Check which columns exist
+        missing_cols = [col for col in columns if col not in df.columns]
+        if missing_cols:
+            return ValidationMask(
+                keep=pd.Series(False, index=df.index),
+                errors=[f"Missing required columns: {missing_cols}"],
+            )
+
         # Build mask for valid rows (all required columns have values)
         valid_mask = pd.Series(True, index=df.index)
         errors = []
 
         for col in columns:
-            col_valid = df[col].notna() & (df[col].astype(str).str.strip() != "")
-            invalid_count = (~col_valid).sum()
+            col_valid = df[col].notna() & (frame.stripped(col) != "")
+            invalid_count = frame.count(~col_valid)
             if invalid_count > 0:
                 errors.append(f"Column '{col}' has {invalid_count} empty/null values")
             valid_mask = valid_mask & col_valid
 
-        return ValidationResult(
-            valid=df[valid_mask].copy(),
-            invalid=df[~valid_mask].copy(),
-            errors=errors,
-        )
+        return ValidationMask(keep=valid_mask, errors=errors)
 
 
 def create_required_validator(config: ValidatorConfig) -> RequiredValidator:
@@ -7,7 +7,7 @@ from __future__ import annotations
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, ValidationFrame, ValidationMask, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
@@ -21,24 +21,23 @@ class StatusValidator(BaseValidator):
     def validate(self, df: pd.DataFrame) -> ValidationResult:
         if not self.enabled or df.empty:
             return ValidationResult(valid=df, invalid=pd.DataFrame(), errors=[])
+        return self.split(df, self.validate_mask(ValidationFrame(df)))
 
+    def validate_mask(self, frame: ValidationFrame) -> ValidationMask:
+        df = frame.df
         column = self.params.get("column", "STATUS_TITULO")
         include = self.params.get("include", [])
         exclude = self.params.get("exclude", [])
         case_sensitive = self.params.get("case_sensitive", False)
 
         if column not in df.columns:
-            return ValidationResult(
-                valid=df,
-                invalid=pd.DataFrame(),
-                errors=[f"Status column '{column}' not found"],
-            )
+            return ValidationMask(keep=None, errors=[f"Status column '{column}' not found"])
 
         # Normalize values for comparison
         if case_sensitive:
-            values = df[column].astype(str).str.strip()
+            values = frame.stripped(column)
         else:
-            values = df[column].astype(str).str.strip().str.upper()
+            values = frame.upper(column)
 
         valid_mask = pd.Series(True, index=df.index)
         errors = []
@@ -48,7 +47,7 @@ class StatusValidator(BaseValidator):
             if not case_sensitive:
                 include = [str(v).upper() for v in include]
             include_mask = values.isin(include)
-            excluded = (~include_mask).sum()
+            excluded = frame.count(~include_mask)
             if excluded > 0:
                 errors.append(
                     f"{excluded} records excluded (status not in: {include})"
@@ -60,18 +59,14 @@ class StatusValidator(BaseValidator):
             if not case_sensitive:
                 exclude = [str(v).upper() for v in exclude]
             exclude_mask = values.isin(exclude)
-            excluded = exclude_mask.sum()
+            excluded = frame.count(exclude_mask)
             if excluded > 0:
                 errors.append(
                     f"{excluded} records excluded (status in: {exclude})"
                 )
             valid_mask = valid_mask & ~exclude_mask
 
-        return ValidationResult(
-            valid=df[valid_mask].copy(),
-            invalid=df[~valid_mask].copy(),
-            errors=errors,
-        )
+        return ValidationMask(keep=valid_mask, errors=errors)
 
 
 def create_status_validator(config: ValidatorConfig) -> StatusValidator:
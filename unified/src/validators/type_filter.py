@@ -7,7 +7,7 @@ from __future__ import annotations
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, ValidationFrame, ValidationMask, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
@@ -21,7 +21,10 @@ class TypeFilterValidator(BaseValidator):
     def validate(self, df: pd.DataFrame) -> ValidationResult:
         if not self.enabled or df.empty:
             return ValidationResult(valid=df, invalid=pd.DataFrame(), errors=[])
+        return self.split(df, self.validate_mask(ValidationFrame(df)))
 
+    def validate_mask(self, frame: ValidationFrame) -> ValidationMask:
+        df = frame.df
         column = self.params.get("column", "TIPO_PARCELA")
         include = self.params.get("include", [])
         exclude = self.params.get("exclude", [])
@@ -29,17 +32,13 @@ class TypeFilterValidator(BaseValidator):
         match_mode = self.params.get("match_mode", "exact")  # exact, contains, startswith
 
         if column not in df.columns:
-            return ValidationResult(
-                valid=df,
-                invalid=pd.DataFrame(),
-                errors=[f"Type column '{column}' not found"],
-            )
+            return ValidationMask(keep=None, errors=[f"Type column '{column}' not found"])
 
         # Normalize values for comparison
         if case_sensitive:
-            values = df[column].astype(str).str.strip()
+            values = frame.stripped(column)
         else:
-            values = df[column].astype(str).str.strip().str.upper()
+            values = frame.upper(column)
 
         valid_mask = pd.Series(True, index=df.index)
         errors = []
@@ -62,7 +61,7 @@ class TypeFilterValidator(BaseValidator):
             else:
                 include_mask = values.isin(include)
 
-            excluded = (~include_mask).sum()
+            excluded = frame.count(~include_mask)
             if excluded > 0:
                 errors.append(f"{excluded} records excluded (type not in allowed list)")
             valid_mask = valid_mask & include_mask
@@ -85,16 +84,12 @@ class TypeFilterValidator(BaseValidator):
             else:
                 exclude_mask = values.isin(exclude)
 
-            excluded = exclude_mask.sum()
+            excluded = frame.count(exclude_mask)
             if excluded > 0:
                 errors.append(f"{excluded} records excluded (type in exclusion list)")
             valid_mask = valid_mask & ~exclude_mask
 
-        return ValidationResult(
-            valid=df[valid_mask].copy(),
-            invalid=df[~valid_mask].copy(),
-            errors=errors,
-        )
+        return ValidationMask(keep=valid_mask, errors=errors)
 
 
 def create_type_filter_validator(config: ValidatorConfig) -> TypeFilterValidator:
@@ -0,0 +1,96 @@
+"""
+Benchmark for the incremental JSON decoder.
+Compares ``resp.json()`` -> ``pd.DataFrame(data)`` with ``decode_records``
+fed 1 MiB chunks, on a payload shaped like the TOTVS baixas consult.
+
+Usage:
+    python tests/benchmark_json_stream.py
+    python tests/benchmark_json_stream.py --sizes 100000 500000
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.json_stream import DecodeStats, decode_records
+
+CHUNK = 1024 * 1024
+
+
+def make_payload(rows: int, seed: int = 42) -> bytes:
+    rng = np.random.default_rng(seed)
+    records = [
+        {
+            "NUM_VENDA": int(venda),
+            "ID_PARCELA": int(parcela),
+            "HONORARIO_BAIXADO": float(honorario),
+            "DATA_RECEBIMENTO": f"{1 + dia % 28:02d}/{1 + dia % 12:02d}/2024",
+            "VALOR_RECEBIDO": float(valor),
+            "CLIENTE": f"CLIENTE {venda % 9973}",
+        }
+        for venda, parcela, honorario, dia, valor in zip(
+            rng.integers(1, 10**6, rows),
+            rng.integers(1, 360, rows),
+            rng.choice([0.0, 10.0, 25.5], rows),
+            rng.integers(0, 365, rows),
+            rng.normal(500, 120, rows).round(2),
+        )
+    ]
+    return json.dumps(records, ensure_ascii=False).encode("utf-8")
+
+
+def measure(func):
+    """Return (result, seconds, peak MiB allocated while running ``func``)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def legacy_decode(payload: bytes) -> pd.DataFrame:
+    """The original path: whole body -> list of dicts -> DataFrame."""
+    body = bytes(payload)  # resp.content
+    return pd.DataFrame(json.loads(body))
+
+
+def streamed_decode(payload: bytes) -> pd.DataFrame:
+    view = memoryview(payload)
+    chunks = (bytes(view[i:i + CHUNK]) for i in range(0, len(payload), CHUNK))
+    return decode_records(chunks, stats=DecodeStats()).to_frame()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark streaming JSON decoding")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 500_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'MB':>7} {'legacy (s)':>11} {'legacy MiB':>11} {'stream (s)':>11} {'stream MiB':>11} {'MB/s':>7}")
+    for rows in args.sizes:
+        payload = make_payload(rows)
+        old, t_old, m_old = measure(lambda: legacy_decode(payload))
+        new, t_new, m_new = measure(lambda: streamed_decode(payload))
+
+        if not old.equals(new):
+            print(f"MISMATCH at {rows} rows")
+            return 1
+
+        size = len(payload) / 1e6
+        print(
+            f"{rows:>10} {size:>7.1f} {t_old:>11.2f} {m_old:>11.1f} {t_new:>11.2f} {m_new:>11.1f} {size / t_new:>7.1f}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
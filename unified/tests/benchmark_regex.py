@@ -0,0 +1,83 @@
+"""
+Benchmark for RegexValidator.
+Compares the original apply-based matching with the vectorized kernels and
+the digit-length fast path on a CPF column.
+
+Usage:
+    python tests/benchmark_regex.py
+    python tests/benchmark_regex.py --sizes 100000 1000000
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import ValidatorConfig, ValidatorType
+from src.validators.regex import RegexValidator
+
+CPF_CNPJ = r"^\d{11}$|^\d{14}$"
+PARCELA = r"^[0-9]{3,}-[0-9]{2,}$"
+
+
+def make_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """CPF/CNPJ column as loaded with dtype=str, with ~2% malformed values."""
+    rng = np.random.default_rng(seed)
+    docs = pd.Series(rng.integers(10**10, 10**11, rows).astype(str), dtype=object)
+    cnpj = rng.random(rows) < 0.2
+    docs[cnpj] = docs[cnpj] + "123"
+    bad = rng.random(rows) < 0.02
+    docs[bad] = docs[bad].str[:7] + "-X"
+    parcelas = pd.Series(rng.integers(100, 99_999, rows).astype(str), dtype=object) + "-01"
+    return pd.DataFrame({"CPF_CNPJ": docs, "PARCELA": parcelas}).astype(str)
+
+
+def apply_based(values: pd.Series, pattern: str) -> pd.Series:
+    """The original path: one compiled-pattern call per row."""
+    compiled = re.compile(pattern)
+    return values.astype(str).fillna("").apply(lambda x: bool(compiled.fullmatch(x)))
+
+
+def validator(column: str, pattern: str) -> RegexValidator:
+    return RegexValidator(
+        ValidatorConfig(ValidatorType.REGEX, params={"column": column, "pattern": pattern, "mode": "fullmatch"})
+    )
+
+
+def timed(func) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark RegexValidator")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(
+        f"{'rows':>10} {'column':>9} {'apply (s)':>11} {'vectorized (s)':>15} {'speedup':>9}"
+    )
+    for rows in args.sizes:
+        df = make_frame(rows)
+        # CPF_CNPJ usa o atalho sem regex; PARCELA o kernel vetorizado
+        for column, pattern in (("CPF_CNPJ", CPF_CNPJ), ("PARCELA", PARCELA)):
+            t_apply, expected = timed(lambda: apply_based(df[column], pattern))
+            t_vec, result = timed(lambda: validator(column, pattern).validate(df))
+
+            if list(result.valid.index) != list(expected[expected].index):
+                print(f"MISMATCH at {rows} rows ({column})")
+                return 1
+
+            print(f"{rows:>10} {column:>9} {t_apply:>11.2f} {t_vec:>15.2f} {t_apply / t_vec:>8.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
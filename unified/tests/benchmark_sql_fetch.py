@@ -0,0 +1,113 @@
+"""
+Benchmark for batched SQL extraction.
+Compares the original ``pd.read_sql`` -> ``to_csv`` -> ``writestr`` path with
+SQLLoader.export_zip, which streams fetchmany batches into the ZIP, on a
+SQLite stand-in for the MAX ``Movimentacoes`` table.
+
+Usage:
+    python tests/benchmark_sql_fetch.py
+    python tests/benchmark_sql_fetch.py --sizes 200000 1000000 --batch-size 100000
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders.sql_loader import SQLLoader
+
+QUERY = "SELECT * FROM Movimentacoes"
+
+
+def make_database(path: Path, rows: int, seed: int = 42) -> None:
+    """Create a MAX-like Movimentacoes table with ``rows`` rows."""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "CAMPANHA": rng.choice(["CAMPANHA 60", "CAMPANHA 80", "CAMPANHA 96"], rows),
+        "CPFCNPJ_CLIENTE": rng.integers(10**10, 10**11, rows).astype(str),
+        "NUMERO_CONTRATO": pd.Series(rng.integers(1, 200_000, rows).astype(str)).radd("CT-"),
+        "PARCELA": rng.integers(1, 360, rows).astype(str),
+        "Movimentacoes_ID": np.arange(rows),
+        "VENCIMENTO": (pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 900, rows), unit="D")).astype(str),
+        "VALOR": rng.normal(500, 120, rows).round(2),
+        "STATUS_TITULO": rng.choice(["EM ABERTO", "BAIXADO"], rows),
+    })
+    with sqlite3.connect(path) as conn:
+        frame.to_sql("Movimentacoes", conn, index=False)
+
+
+def measure(func) -> tuple[float, float]:
+    """Return (seconds, peak MiB allocated while running ``func``)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def legacy_extract(database: Path, zip_path: Path) -> None:
+    """The original path: whole result through read_sql, then one CSV string."""
+    with sqlite3.connect(database) as conn:
+        df = pd.read_sql(QUERY, conn, dtype=str)
+    df.columns = [str(c).strip().upper() for c in df.columns]
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("MaxSmart.csv", df.to_csv(index=False, sep=";"))
+
+
+def batched_extract(database: Path, zip_path: Path, batch_size: int) -> None:
+    config = LoaderConfig(
+        type=LoaderType.SQL,
+        params={"driver": "sqlite", "database": str(database), "query": QUERY, "batch_size": batch_size},
+    )
+    result = SQLLoader(config, None).export_zip(zip_path, "MaxSmart.csv")
+    if "error" in result.metadata:
+        raise RuntimeError(result.metadata["error"])
+
+
+def member_bytes(zip_path: Path) -> bytes:
+    with zipfile.ZipFile(zip_path) as zf:
+        return zf.read(zf.namelist()[0])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark batched SQL extraction")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[200_000, 1_000_000])
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'legacy (s)':>11} {'legacy MiB':>11} {'batch (s)':>10} {'batch MiB':>10} {'rows/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        for rows in args.sizes:
+            database = tmp_dir / f"max_{rows}.sqlite"
+            make_database(database, rows)
+            old_zip = tmp_dir / "legacy.zip"
+            new_zip = tmp_dir / "batched.zip"
+
+            t_old, m_old = measure(lambda: legacy_extract(database, old_zip))
+            t_new, m_new = measure(lambda: batched_extract(database, new_zip, args.batch_size))
+
+            if member_bytes(old_zip) != member_bytes(new_zip):
+                print(f"MISMATCH at {rows} rows")
+                return 1
+
+            print(
+                f"{rows:>10} {t_old:>11.2f} {m_old:>11.1f} {t_new:>10.2f} {m_new:>10.1f} {rows / t_new:>10,.0f}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Benchmark for write_csv_to_zip.
+Compares peak Python memory of the streaming writer with the original
+StringIO -> encode -> writestr path, and checks both produce the same CSV bytes.
+
+Usage:
+    python tests/benchmark_zip_writer.py
+    python tests/benchmark_zip_writer.py --sizes 200000 1000000
+"""
+import argparse
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.io import write_csv_to_zip
+
+
+def make_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Build a devolucao-like export: text, dates and decimal values."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "CPFCNPJ_CLIENTE": pd.Series(rng.integers(10**10, 10**11, rows).astype(str), dtype=object),
+        "NOME": pd.Series(rng.choice(["JOÃO DA SILVA", "MARIA SOUZA", "ACME LTDA"], rows), dtype=object),
+        "CHAVE": pd.Series(rng.integers(1, 10**6, rows).astype(str), dtype=object).radd("CT-"),
+        "VENCIMENTO": pd.to_datetime("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D"),
+        "VALOR": rng.normal(1500, 400, rows).round(2),
+        "STATUS": pd.Series(rng.choice(["EM ABERTO", "BAIXADO", ""], rows), dtype=object),
+    })
+
+
+def legacy_write(frames: dict, zip_path: Path, sep: str = ";", encoding: str = "utf-8-sig") -> Path:
+    """The original writer: full CSV in a StringIO, encoded, then writestr."""
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, df in frames.items():
+            buffer = io.StringIO()
+            df.to_csv(buffer, index=False, sep=sep, decimal=",")
+            zf.writestr(name, buffer.getvalue().encode(encoding))
+    return zip_path
+
+
+def measure(func) -> tuple[float, float]:
+    """Return (seconds, peak MiB allocated while running ``func``)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def member_bytes(zip_path: Path) -> bytes:
+    with zipfile.ZipFile(zip_path) as zf:
+        return zf.read(zf.namelist()[0])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark streaming ZIP writer")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[200_000, 1_000_000, 3_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'legacy (s)':>11} {'legacy MiB':>11} {'stream (s)':>11} {'stream MiB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        for rows in args.sizes:
+            frames = {"devolucao.csv": make_frame(rows)}
+            old_zip = tmp_dir / "legacy.zip"
+            new_zip = tmp_dir / "stream.zip"
+
+            t_old, m_old = measure(lambda: legacy_write(frames, old_zip))
+            t_new, m_new = measure(lambda: write_csv_to_zip(frames, new_zip, sep=";"))
+
+            if member_bytes(old_zip) != member_bytes(new_zip):
+                print(f"MISMATCH at {rows} rows")
+                return 1
+
+            print(f"{rows:>10} {t_old:>11.2f} {m_old:>11.1f} {t_new:>11.2f} {m_new:>11.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
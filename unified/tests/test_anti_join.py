@@ -0,0 +1,73 @@
+"""
+Tests for the anti-join helpers and the shared KeyIndex.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.anti_join import (
+    KeyIndex,
+    clear_key_index_cache,
+    key_index_for,
+    procv_intersection,
+    procv_left_minus_right,
+    procv_max_menos_emccamp,
+)
+
+
+def test_procv_left_minus_right_basic():
+    df_left = pd.DataFrame({"A": ["1", " 2", "3", "4"], "X": [10, 20, 30, 40]})
+    df_right = pd.DataFrame({"B": ["2 ", "5"]})
+
+    out = procv_left_minus_right(df_left, df_right, col_left="A", col_right="B")
+
+    assert out["X"].tolist() == [10, 30, 40]
+
+
+def test_procv_max_menos_emccamp_uses_cols():
+    df_max = pd.DataFrame({"CHAVE": ["a", "b", "c"], "VAL": [1, 2, 3]})
+    df_emc = pd.DataFrame({"CHAVE": ["b"]})
+
+    out = procv_max_menos_emccamp(df_max, df_emc, col_max="CHAVE", col_emccamp="CHAVE")
+
+    assert out["CHAVE"].tolist() == ["a", "c"]
+
+
+def test_index_is_reused_on_filtered_frames():
+    df_left = pd.DataFrame({"K": ["a", "b", "c", "d"], "S": ["x", "y", "x", "y"]})
+    df_right = pd.DataFrame({"K": ["b", "c"]})
+    left_index = KeyIndex.from_frame(df_left, "K")
+    right_index = KeyIndex.from_frame(df_right, "K")
+
+    filtrado = df_left[df_left["S"] == "x"]
+    minus = procv_left_minus_right(filtrado, df_right, "K", "K", left_index, right_index)
+    inter = procv_intersection(filtrado, df_right, "K", "K", left_index, right_index)
+
+    assert minus["K"].tolist() == ["a"]
+    assert inter["K"].tolist() == ["c"]
+    assert left_index.difference(right_index).size == 2
+    assert left_index.intersection(right_index).size == 2
+
+
+def test_isin_can_ignore_empty_keys():
+    left = KeyIndex.from_series(pd.Series(["", "a"]))
+    right = KeyIndex.from_series(pd.Series(["", "a"]))
+
+    assert left.isin(right).tolist() == [True, True]
+    assert left.isin(right, ignore_empty=True).tolist() == [False, True]
+
+
+def test_key_index_for_caches_by_source(tmp_path):
+    clear_key_index_cache()
+    source = tmp_path / "max_tratada.csv"
+    source.write_text("CHAVE\na\nb\n", encoding="utf-8")
+    df = pd.read_csv(source, dtype=str)
+
+    first = key_index_for(df, "CHAVE", source)
+    again = key_index_for(df.iloc[[1]], "CHAVE", source)
+
+    assert again.codes.iloc[0] == first.codes.iloc[1]
+    assert key_index_for(df, "CHAVE", source) is first
@@ -0,0 +1,127 @@
+"""
+Tests for the concurrent paginated APILoader against a local HTTP stand-in.
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders.api_loader import APILoader
+from src.utils.http_fetch import ColumnBuffers, backoff_delay
+
+RECORDS = [
+    {"id": i, "documento": f"{i:011d}", "valor": i / 4, **({"obs": "parcial"} if i % 7 == 0 else {})}
+    for i in range(1, 1_046)
+]
+PAGE_SIZE = 100
+DELAY = 0.05
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        args = parse_qs(urlparse(self.path).query)
+        page, size = int(args["page"][0]), int(args["pageSize"][0])
+        with server.lock:
+            server.calls.append(page)
+            server.connections.add(self.client_address)
+            fail = page in server.flaky and server.calls.count(page) == 1
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            # páginas pares demoram mais: a ordem de chegada não é a ordem das páginas
+            time.sleep(DELAY * (2 if page % 2 == 0 else 1))
+            if fail:
+                self.send_response(503)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = json.dumps({"data": {"items": RECORDS[(page - 1) * size:page * size]}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.lock = threading.Lock()
+    server.calls, server.connections, server.flaky = [], set(), {3}
+    server.active = server.peak = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _load(server, **params):
+    config = LoaderConfig(
+        type=LoaderType.API,
+        params={
+            "base_url": f"http://127.0.0.1:{server.server_address[1]}",
+            "endpoint": "/titulos",
+            "paginated": True,
+            "page_size": PAGE_SIZE,
+            "data_key": "data.items",
+            "retry_delay": 0.01,
+            **params,
+        },
+    )
+    return APILoader(config, None).load()
+
+
+def test_concurrent_pages_match_sequential_order(api):
+    start = time.perf_counter()
+    result = _load(api, concurrency=4)
+    elapsed = time.perf_counter() - start
+
+    assert "error" not in result.metadata, result.metadata
+    expected = pd.DataFrame(RECORDS)
+    expected.columns = [c.upper() for c in expected.columns]
+    pd.testing.assert_frame_equal(result.data, expected)
+
+    assert result.metadata["pages"] == 11 and result.metadata["retries"] == 1
+    assert api.peak > 1
+    # sequencial seriam ~11 páginas * 75ms; keep-alive reaproveita as conexões
+    assert elapsed < 11 * DELAY * 1.5
+    assert len(api.connections) <= 4
+
+
+def test_sequential_concurrency_and_client_errors(api):
+    api.flaky = set()
+    result = _load(api, concurrency=1, max_pages=3)
+    assert len(result.data) == 3 * PAGE_SIZE and api.peak == 1
+
+    broken = _load(api, endpoint="/titulos?page=x")
+    assert "error" in broken.metadata
+
+
+def test_column_buffers_and_backoff():
+    buffers = ColumnBuffers()
+    records = [{"a": 1}, {"b": 2}, {"a": 3, "c": None}]
+    buffers.extend(records)
+    pd.testing.assert_frame_equal(buffers.to_frame(), pd.DataFrame(records))
+
+    assert backoff_delay(3, 0.5, cap=60, rng=lambda: 1.0) == 4.0
+    assert backoff_delay(10, 0.5, cap=5, rng=lambda: 0.5) == 2.5
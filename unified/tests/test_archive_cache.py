@@ -0,0 +1,116 @@
+"""
+Tests for the decrypted-archive cache used by FileLoader for password-protected ZIPs.
+"""
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders.archive_cache import DecryptedArchiveCache
+from src.loaders.file_loader import FileLoader
+
+pytestmark = pytest.mark.skipif(shutil.which("zip") is None, reason="zip CLI not available")
+
+PASSWORD = "Mf4tab@"
+
+
+def _encrypted_zip(tmp_path: Path, name: str, rows: int) -> Path:
+    csv_path = tmp_path / f"{name}.csv"
+    pd.DataFrame({"PROTOCOLO": [f"P{i}" for i in range(rows)], "CUSTAS": ["1,00"] * rows}).to_csv(
+        csv_path, sep=";", index=False
+    )
+    zip_path = tmp_path / f"{name}.zip"
+    subprocess.run(
+        ["zip", "-j", "-q", "-P", PASSWORD, str(zip_path), str(csv_path)], check=True
+    )
+    csv_path.unlink()
+    return zip_path
+
+
+def _loader(path: Path, cache_dir: Path, **params) -> FileLoader:
+    config = LoaderConfig(
+        type=LoaderType.FILE,
+        params={"path": str(path), "password": PASSWORD, "cache_dir": str(cache_dir), **params},
+    )
+    return FileLoader(config, None)
+
+
+def test_second_load_reads_cached_payload(tmp_path, monkeypatch):
+    archive = _encrypted_zip(tmp_path, "Tabelionato", 3)
+    cache_dir = tmp_path / "cache"
+
+    first = _loader(archive, cache_dir).load()
+    assert first.data["PROTOCOLO"].tolist() == ["P0", "P1", "P2"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("archive decrypted twice")
+
+    monkeypatch.setattr(FileLoader, "_decrypt_archive", fail)
+    second = _loader(archive, cache_dir).load()
+    pd.testing.assert_frame_equal(second.data, first.data)
+
+
+def test_remembered_method_is_tried_first(tmp_path, monkeypatch):
+    archive = _encrypted_zip(tmp_path, "Tabelionato", 2)
+    cache_dir = tmp_path / "cache"
+    _loader(archive, cache_dir).load()
+
+    cache = DecryptedArchiveCache(cache_dir)
+    digest = cache.digest(archive)
+    method = cache.method(digest)
+    assert method in ("pyzipper", "zipfile")
+
+    # Payload lost (e.g. evicted): only the remembered method should run
+    shutil.rmtree(cache_dir / digest)
+    calls = []
+    for name in ("pyzipper", "zipfile", "7zip", "unzip"):
+        original = getattr(FileLoader, f"_open_with_{name}")
+
+        def spy(self, *args, _name=name, _original=original):
+            calls.append(_name)
+            return _original(self, *args)
+
+        monkeypatch.setattr(FileLoader, f"_open_with_{name}", spy)
+
+    assert len(_loader(archive, cache_dir).load().data) == 2
+    assert calls == [method]
+
+
+def test_size_based_eviction_keeps_method_hint(tmp_path):
+    old = _encrypted_zip(tmp_path, "old", 1_000)
+    new = _encrypted_zip(tmp_path, "new", 1_000)
+    cache_dir = tmp_path / "cache"
+
+    # Orçamento de ~15 KB: só cabe um payload (~12 KB) por vez
+    for archive in (old, new):
+        _loader(archive, cache_dir, cache_max_mb=0.015).load()
+
+    cache = DecryptedArchiveCache(cache_dir)
+    assert cache.lookup(cache.digest(old)) is None
+    assert cache.method(cache.digest(old)) in ("pyzipper", "zipfile")
+    assert cache.lookup(cache.digest(new)) is not None
+
+
+def test_payloads_expire_and_stay_private(tmp_path):
+    archive = _encrypted_zip(tmp_path, "Tabelionato", 3)
+    cache_dir = tmp_path / "cache"
+    _loader(archive, cache_dir).load()
+
+    cache = DecryptedArchiveCache(cache_dir)
+    payload = cache.lookup(cache.digest(archive))
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    assert payload.stat().st_mode & 0o777 == 0o600
+
+    # Vencido o prazo, a entrada é apagada e o arquivo volta a ser extraído
+    expired = DecryptedArchiveCache(cache_dir, max_age=0)
+    assert expired.lookup(expired.digest(archive)) is None
+    assert not payload.parent.exists()
+    assert expired.method(expired.digest(archive)) in ("pyzipper", "zipfile")
+    assert len(_loader(archive, cache_dir, cache_max_age_hours=1).load().data) == 3
+    assert cache.lookup(cache.digest(archive)) is not None
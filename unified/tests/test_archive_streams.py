@@ -0,0 +1,126 @@
+"""
+Tests for decompressing archive members straight into the parser
+(7-Zip ``-so`` / unzip ``-p``) instead of extracting to a temp directory.
+A small Python script stands in for the 7-Zip executable.
+"""
+import io
+import logging
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import logger_config
+
+# Evita que o logger do Tabelionato crie data/logs ao importar utils.archives
+if logger_config.TabelionatoLogger._logger is None:
+    logger_config.TabelionatoLogger._logger = logging.getLogger("tabelionato")
+
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders.file_loader import FileLoader
+from src.utils.archives import list_with_7zip, stream_with_7zip
+
+pytestmark = pytest.mark.skipif(shutil.which("zip") is None, reason="zip CLI not available")
+
+PASSWORD = "Mf4tab@"
+CSV = "PROTOCOLO;CUSTAS;CREDOR\n" + "".join(f"P{i};{i},00;ACME\n" for i in range(5_000))
+
+FAKE_7Z = """\
+import sys, zipfile
+
+args = sys.argv[1:]
+senha = next((a[2:] for a in args if a.startswith("-p")), "-")
+if args[0] == "l":
+    arquivo = args[2]
+    print(f"Path = {arquivo}\\nType = zip\\n\\n----------")
+    with zipfile.ZipFile(arquivo) as zf:
+        for info in zf.infolist():
+            print(f"Path = {info.filename}\\nFolder = {'+' if info.is_dir() else '-'}\\n")
+elif args[0] == "e":
+    arquivo, membro = args[2], args[3]
+    try:
+        with zipfile.ZipFile(arquivo) as zf, zf.open(membro, pwd=senha.encode()) as origem:
+            while bloco := origem.read(4096):
+                sys.stdout.buffer.write(bloco)
+    except RuntimeError:
+        sys.stderr.write(f"ERROR: Wrong password : {membro}\\n")
+        sys.exit(2)
+"""
+
+
+@pytest.fixture
+def fake_7zip(tmp_path, monkeypatch):
+    script = tmp_path / "7z"
+    script.write_text(f"#!{sys.executable}\n" + FAKE_7Z)
+    script.chmod(0o755)
+    monkeypatch.setenv("SEVEN_ZIP_PATH", str(script))
+    return script
+
+
+@pytest.fixture
+def encrypted_zip(tmp_path):
+    folder = tmp_path / "conteudo"
+    folder.mkdir()
+    (folder / "leiame.md").write_text("x")
+    (folder / "cobranca.csv").write_text(CSV, encoding="utf-8")
+    path = tmp_path / "cobranca.zip"
+    subprocess.run(
+        ["zip", "-j", "-q", "-P", PASSWORD, str(path), str(folder / "leiame.md"), str(folder / "cobranca.csv")],
+        check=True,
+    )
+    return path
+
+
+def test_stream_with_7zip_yields_member_bytes(fake_7zip, encrypted_zip):
+    assert list_with_7zip(encrypted_zip, senha=PASSWORD) == ["leiame.md", "cobranca.csv"]
+
+    with stream_with_7zip(encrypted_zip, senha=PASSWORD) as (membro, fluxo):
+        assert membro == "cobranca.csv"
+        assert fluxo.read() == CSV.encode("utf-8")
+
+
+def test_stream_with_7zip_raises_on_wrong_password_while_reading(fake_7zip, encrypted_zip):
+    with pytest.raises(RuntimeError, match="Wrong password"):
+        with stream_with_7zip(encrypted_zip, senha="errada") as (_, fluxo):
+            pd.read_csv(fluxo, sep=";")
+
+
+def test_stream_with_7zip_stops_early_without_hanging(fake_7zip, encrypted_zip):
+    with stream_with_7zip(encrypted_zip, senha=PASSWORD) as (_, fluxo):
+        assert fluxo.readline() == b"PROTOCOLO;CUSTAS;CREDOR\n"
+
+
+@pytest.mark.parametrize("method", ["7zip", "unzip"])
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_file_loader_parses_command_line_streams(fake_7zip, encrypted_zip, monkeypatch, method, engine):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    if method == "unzip" and shutil.which("unzip") is None:
+        pytest.skip("unzip CLI not available")
+
+    def unavailable(self, *args):
+        raise ValueError("unavailable")
+
+    for other in {"pyzipper", "zipfile", "7zip"} - {method}:
+        monkeypatch.setattr(FileLoader, f"_open_with_{other}", unavailable)
+
+    config = LoaderConfig(
+        type=LoaderType.FILE,
+        params={
+            "path": str(encrypted_zip),
+            "password": PASSWORD,
+            "encoding": "utf-8",
+            "usecols": ["PROTOCOLO", "CUSTAS"],
+            "engine": engine,
+        },
+    )
+    result = FileLoader(config, None).load()
+
+    assert "error" not in result.metadata, result.metadata
+    expected = pd.read_csv(io.StringIO(CSV), sep=";", dtype=str, usecols=["PROTOCOLO", "CUSTAS"])
+    pd.testing.assert_frame_equal(result.data, expected)
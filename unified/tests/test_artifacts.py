@@ -0,0 +1,143 @@
+"""
+Tests for the in-memory stage handoff (artifact store).
+Frames served from memory must match what re-reading the ZIP would return.
+"""
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.io.file_manager import FileManager
+from src.io.packager import ExportacaoService
+from src.utils.artifacts import artifact_store, configure_artifact_store
+from src.utils.io import DatasetIO, write_csv_to_zip
+
+
+@pytest.fixture
+def store():
+    yield configure_artifact_store({"artifacts": {"in_memory": True}})
+    artifact_store().clear()
+    configure_artifact_store({"artifacts": {"in_memory": False}})
+
+
+def _mixed_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "CHAVE": ["A-1", "", "NA", None, " b;2 "],
+            "VALOR": [1.5, 2.0, np.nan, 1234.25, -0.1],
+            "QTD": [1, 2, 3, 4, 5],
+            "VENCIMENTO": pd.to_datetime(["2024-01-31", None, "2023-12-01", "2024-02-29", "2024-03-01"]),
+            "FLAG": [True, False, True, True, False],
+            "MISTO": ["x", 1, None, 2.5, "y"],
+        }
+    )
+
+
+def _read_from_disk(path: Path, sep: str, encoding: str) -> pd.DataFrame:
+    with zipfile.ZipFile(path) as zf, zf.open(zf.namelist()[0]) as fh:
+        return pd.read_csv(fh, sep=sep, encoding=encoding, dtype=str)
+
+
+def test_dataset_io_serves_same_frame_as_zip(store, tmp_path):
+    io = DatasetIO(separator=";", encoding="utf-8-sig")
+    path = io.write_zip({"base.csv": _mixed_frame()}, tmp_path / "base_tratada_1.zip")
+
+    from_memory = io.read(path)
+    pd.testing.assert_frame_equal(from_memory, _read_from_disk(path, ";", "utf-8-sig"))
+
+    # Cada leitura recebe uma cópia independente
+    from_memory.loc[0, "CHAVE"] = "alterado"
+    assert io.read(path).loc[0, "CHAVE"] == "A-1"
+
+
+def test_projected_and_typed_read_from_memory(store, tmp_path):
+    io = DatasetIO(separator=";", encoding="utf-8-sig")
+    path = io.write_zip({"base.csv": _mixed_frame()}, tmp_path / "base_tratada_2.zip")
+
+    typed = io.read(path, columns=["VENCIMENTO", "VALOR", "AUSENTE"], typed=True)
+    assert list(typed.columns) == ["VALOR", "VENCIMENTO"]
+    assert pd.api.types.is_datetime64_any_dtype(typed["VENCIMENTO"])
+    expected = _read_from_disk(path, ";", "utf-8-sig")
+    assert typed["VALOR"].tolist()[:2] == expected["VALOR"].tolist()[:2]
+
+    # A leitura completa em texto não é afetada pela projeção anterior
+    pd.testing.assert_frame_equal(io.read(path), expected)
+
+
+def test_file_manager_serves_same_frame_as_zip(store, tmp_path):
+    config = {
+        "global": {"encoding": "utf-8", "csv_separator": ";"},
+        "paths": {"input": {}, "output": {"base": str(tmp_path)}},
+    }
+    manager = FileManager(config)
+    path = manager.salvar_zip({"vic.csv": _mixed_frame()}, tmp_path / "vic_base_limpa.zip")
+
+    pd.testing.assert_frame_equal(
+        manager.ler_csv_ou_zip(path), _read_from_disk(path, ";", "utf-8")
+    )
+
+
+def test_background_write_uses_snapshot(tmp_path):
+    configure_artifact_store({"artifacts": {"in_memory": True, "background_write": True}})
+    try:
+        df = pd.DataFrame({"CHAVE": ["1", "2"]})
+        path = write_csv_to_zip({"a.csv": df}, tmp_path / "a.zip", sep=";")
+        df.loc[0, "CHAVE"] = "mudou"
+
+        artifact_store().flush()
+        assert _read_from_disk(path, ";", "utf-8-sig")["CHAVE"].tolist() == ["1", "2"]
+    finally:
+        artifact_store().clear()
+        configure_artifact_store({"artifacts": {"in_memory": False}})
+
+
+def test_skip_write_keeps_artifact_only_in_memory(tmp_path):
+    configure_artifact_store({"artifacts": {"skip_write": ["max_tratada"]}})
+    try:
+        df = pd.DataFrame({"CHAVE": ["1", "2"]})
+        write_csv_to_zip({"m.csv": df}, tmp_path / "max_tratada_20240101.zip", sep=";")
+
+        latest = DatasetIO.latest_file(tmp_path, "max_tratada_*.zip")
+        assert not latest.exists()
+        assert DatasetIO(";", "utf-8-sig").read(latest)["CHAVE"].tolist() == ["1", "2"]
+    finally:
+        artifact_store().clear()
+        configure_artifact_store({"artifacts": {"in_memory": False}})
+
+
+def test_disabled_store_reads_from_disk(tmp_path):
+    df = pd.DataFrame({"CHAVE": ["1"]})
+    path = write_csv_to_zip({"a.csv": df}, tmp_path / "a.zip", sep=";")
+
+    assert artifact_store().get(path) is None
+    assert path.exists()
+
+
+def test_export_waits_for_background_write(tmp_path):
+    configure_artifact_store({"artifacts": {"in_memory": True, "background_write": True}})
+    try:
+        config = {
+            "global": {"encoding": "utf-8", "csv_separator": ";"},
+            "paths": {"input": {}, "output": {"base": str(tmp_path)}},
+        }
+        antigo = tmp_path / "vic_tratada_20240101_000000.zip"
+        write_csv_to_zip({"a.csv": pd.DataFrame({"CHAVE": ["0"]})}, antigo, sep=";")
+        artifact_store().flush()
+
+        # Ocupa o gravador para que o ZIP novo ainda esteja pendente
+        artifact_store()._get_executor().submit(time.sleep, 0.2)
+        exportacao = ExportacaoService(config, FileManager(config))
+        path = exportacao.exportar_zip({"vic.csv": pd.DataFrame({"CHAVE": ["1"]})}, "vic_tratada")
+
+        # Entregável já no disco ao retornar; o anterior só sai depois dele
+        assert path.exists() and not antigo.exists()
+        assert _read_from_disk(path, ";", "utf-8")["CHAVE"].tolist() == ["1"]
+    finally:
+        artifact_store().clear()
+        configure_artifact_store({"artifacts": {"in_memory": False}})
@@ -0,0 +1,98 @@
+"""
+Tests for the Parquet/Feather sidecar written next to tratada ZIPs.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.io.file_manager import FileManager
+from src.utils.artifacts import artifact_store, configure_artifact_store
+from src.utils.io import (
+    DatasetIO,
+    columnar_sidecar_path,
+    read_columnar_sidecar,
+    write_csv_to_zip,
+)
+from src.utils.path_manager import PathManager
+
+
+@pytest.fixture(params=["parquet", "feather"])
+def sidecar_format(request):
+    configure_artifact_store({"artifacts": {"in_memory": False, "columnar_sidecar": request.param}})
+    yield request.param
+    configure_artifact_store({"artifacts": {"in_memory": False}})
+
+
+def _tratada() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "CHAVE": ["1-01", "2-01", None],
+            "VENCIMENTO": pd.to_datetime(["2024-01-31", None, "2024-02-29"]),
+            "VALOR": [10.5, None, 3.0],
+            "STATUS": ["EM ABERTO", "NA", ""],
+        }
+    )
+
+
+def _csv_only(path: Path, sep: str, encoding: str) -> pd.DataFrame:
+    # Sidecar mais antigo que o ZIP é ignorado: força a leitura do CSV
+    sidecar = next(p for p in path.parent.iterdir() if p.suffix in (".parquet", ".feather"))
+    os.utime(sidecar, ns=(0, 0))
+    return DatasetIO(sep, encoding).read(path)
+
+
+def test_dataset_io_prefers_sidecar_with_same_content(sidecar_format, tmp_path):
+    io = DatasetIO(separator=";", encoding="utf-8-sig")
+    path = io.write_zip({"max_tratada.csv": _tratada()}, tmp_path / "max_tratada_1.zip", sidecar=True)
+    assert columnar_sidecar_path(path, sidecar_format).exists()
+
+    from_sidecar = io.read(path)
+    pd.testing.assert_frame_equal(from_sidecar, _csv_only(path, ";", "utf-8-sig"))
+
+
+def test_projection_and_typed_read(sidecar_format, tmp_path):
+    path = write_csv_to_zip({"t.csv": _tratada()}, tmp_path / "t.zip", sep=";", sidecar=True)
+
+    projected = read_columnar_sidecar(path, columns=["VALOR", "CHAVE", "AUSENTE"])
+    assert list(projected.columns) == ["CHAVE", "VALOR"]
+    assert projected["VALOR"].tolist()[0] == "10,5"
+
+    typed = read_columnar_sidecar(path, columns=["VENCIMENTO", "VALOR"], typed=True)
+    assert pd.api.types.is_datetime64_any_dtype(typed["VENCIMENTO"])
+    assert typed["VENCIMENTO"].isna().tolist() == [False, True, False]
+    # Só as datas mudam; o resto continua como no CSV
+    assert typed["VALOR"].tolist()[0] == "10,5"
+
+
+def test_file_manager_reads_sidecar_and_cleanup_removes_it(sidecar_format, tmp_path):
+    config = {
+        "global": {"encoding": "utf-8", "csv_separator": ";"},
+        "paths": {"input": {}, "output": {"base": str(tmp_path)}},
+    }
+    manager = FileManager(config)
+    path = manager.salvar_zip({"vic.csv": _tratada()}, tmp_path / "vic_base_limpa_1.zip", sidecar=True)
+
+    df = manager.ler_csv_ou_zip(path, colunas=["STATUS"])
+    assert list(df.columns) == ["STATUS"]
+    assert df["STATUS"].isna().tolist() == [False, True, True]
+
+    PathManager.cleanup(tmp_path, "vic_base_limpa_*.zip")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_no_sidecar_without_flag(tmp_path):
+    configure_artifact_store({"artifacts": {"in_memory": False, "columnar_sidecar": "parquet"}})
+    try:
+        path = write_csv_to_zip({"t.csv": _tratada()}, tmp_path / "t.zip", sep=";")
+        assert not columnar_sidecar_path(path).exists()
+        assert read_columnar_sidecar(path) is None
+    finally:
+        configure_artifact_store({"artifacts": {"in_memory": False}})
+        artifact_store().clear()
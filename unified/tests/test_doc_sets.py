@@ -0,0 +1,76 @@
+"""
+Tests for the process-level document set cache: the blacklist validator and
+the judicial splitter read a list once per file version, each normalization
+gets its own entry, and a rewritten file is read again.
+"""
+import io
+import os
+import sys
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import SplitterConfig, SplitterType, ValidatorConfig, ValidatorType
+from src.splitters import JudicialSplitter
+from src.utils import doc_sets
+from src.utils.doc_sets import CPF_CNPJ, DIGITS, clear_document_sets, document_set
+from src.validators import BlacklistValidator
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    clear_document_sets()
+    yield
+    clear_document_sets()
+
+
+def _write_zip(path: Path, rows: list[str]) -> None:
+    buffer = io.StringIO()
+    pd.DataFrame({"CPF": rows, "NOME": "x"}).to_csv(buffer, sep=";", index=False)
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("ClientesJudiciais.csv", buffer.getvalue())
+
+
+def test_validator_and_splitter_share_one_read(tmp_path, monkeypatch):
+    judicial = tmp_path / "ClientesJudiciais.zip"
+    _write_zip(judicial, ["12345678901", " 98765432100 ", None])
+    reads = []
+    original = doc_sets.read_document_column
+    monkeypatch.setattr(doc_sets, "read_document_column", lambda p, c: reads.append(p) or original(p, c))
+
+    params = {"source_path": str(tmp_path / "Clientes*.zip"), "source_column": "CPF_CNPJ", "target_column": "DOC"}
+    df = pd.DataFrame({"DOC": ["12345678901", "98765432100", "11111111111"]})
+
+    result = BlacklistValidator(ValidatorConfig(ValidatorType.BLACKLIST, params=params)).validate(df)
+    assert result.valid["DOC"].tolist() == ["11111111111"]
+    splits = JudicialSplitter(SplitterConfig(SplitterType.JUDICIAL, params=params)).split(df).splits
+    assert splits["judicial"]["DOC"].tolist() == ["12345678901", "98765432100"]
+    assert len(reads) == 1
+
+    # arquivo reescrito: nova versão é lida de novo
+    _write_zip(judicial, ["11111111111"])
+    os.utime(judicial, ns=(judicial.stat().st_atime_ns, judicial.stat().st_mtime_ns + 10**9))
+    result = BlacklistValidator(ValidatorConfig(ValidatorType.BLACKLIST, params=params)).validate(df)
+    assert result.valid["DOC"].tolist() == ["12345678901", "98765432100"]
+    assert len(reads) == 2
+
+
+def test_normalizations_are_keyed_separately(tmp_path):
+    path = tmp_path / "blacklist.csv"
+    path.write_text("CPF\n123.456.789-01\n12.345.678/0001-90\n12345\n\n")
+    calls = []
+
+    def read(p):
+        calls.append(p)
+        return pd.read_csv(p, dtype=str)["CPF"]
+
+    digits = document_set(path, "CPF", DIGITS, read)
+    valid = document_set(path, "CPF", CPF_CNPJ, read)
+    assert set(digits) == {"12345678901", "12345678000190", "12345"}
+    assert set(valid) == {"12345678901", "12345678000190"}
+    assert document_set(path, "CPF", DIGITS, read) is digits and len(calls) == 2
+    assert "12345" in digits and valid.contains(pd.Series(["12345", "12345678901"])).tolist() == [False, True]
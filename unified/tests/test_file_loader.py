@@ -0,0 +1,90 @@
+"""
+Tests for FileLoader column projection, dtypes and chunked reading.
+"""
+import sys
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import ConfigLoader
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders.file_loader import FileLoader
+
+CSV = (
+    "campanha;parcela;vencimento;valor;status_titulo;observacao\n"
+    "C1;P-1;31/01/2024;10,5;EM ABERTO;x\n"
+    "C2;P-2;;;BAIXADO;\n"
+    "C1;P-3;29/02/2024;3,0;EM ABERTO;NA\n"
+    "C2;P-4;01/03/2024;7,25;BAIXADO;y\n"
+    "C1;P-5;15/04/2024;1,0;EM ABERTO;z\n"
+)
+
+
+@pytest.fixture
+def max_zip(tmp_path):
+    path = tmp_path / "MaxSmart.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("MaxSmart.csv", ("﻿" + CSV).encode("utf-8"))
+    return path
+
+
+def _loader(path: Path, **params) -> FileLoader:
+    config = LoaderConfig(type=LoaderType.FILE, params={"path": str(path), **params})
+    return FileLoader(config, None)
+
+
+def test_auto_usecols_uses_source_projection(max_zip):
+    client = ConfigLoader().load_from_dict({
+        "max_source": {
+            "loader": {"type": "file", "params": {"path": str(max_zip), "usecols": "auto"}},
+            "key": {"type": "column", "column": "PARCELA"},
+            "columns": {"VENCIMENTO": "VENCIMENTO", "VALOR": "VALOR"},
+            "required_columns": ["PARCELA"],
+            "validators": [{"type": "status", "params": {"column": "STATUS_TITULO"}}],
+        }
+    })
+    assert client.max_source.loader.projection == ["VENCIMENTO", "VALOR", "PARCELA", "STATUS_TITULO"]
+
+    projected = FileLoader(client.max_source.loader, client).load().data
+    full = _loader(max_zip).load().data
+    assert list(projected.columns) == ["PARCELA", "VENCIMENTO", "VALOR", "STATUS_TITULO"]
+    pd.testing.assert_frame_equal(projected, full[list(projected.columns)])
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_dtypes_and_engine(max_zip, engine):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    df = _loader(
+        max_zip,
+        engine=engine,
+        usecols=["campanha", "VENCIMENTO", "status_titulo", "OBSERVACAO"],
+        dtypes={"CAMPANHA": "category", "STATUS_TITULO": "category", "VENCIMENTO": "date"},
+        date_format="%d/%m/%Y",
+    ).load().data
+
+    assert isinstance(df["CAMPANHA"].dtype, pd.CategoricalDtype)
+    assert set(df["STATUS_TITULO"].cat.categories) == {"EM ABERTO", "BAIXADO"}
+    assert df["VENCIMENTO"].tolist()[:3] == [pd.Timestamp("2024-01-31"), pd.NaT, pd.Timestamp("2024-02-29")]
+    assert df["OBSERVACAO"].isna().tolist() == [False, True, True, False, False]
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_iter_chunks_matches_full_load(max_zip, tmp_path, engine):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    full = _loader(max_zip).load().data
+
+    csv_path = tmp_path / "max.csv"
+    csv_path.write_text(CSV, encoding="utf-8")
+    for path in (max_zip, csv_path):
+        pd.testing.assert_frame_equal(_loader(path, engine=engine).load().data, full)
+        loader = _loader(path, engine=engine, chunksize=2)
+        chunks = list(loader.iter_chunks())
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), full)
+        pd.testing.assert_frame_equal(loader.load().data, full)
@@ -0,0 +1,132 @@
+"""
+Tests for the on-disk HTTP response cache against a local stand-in that
+honours ETag / If-None-Match: fresh entries skip the network, stale ones
+are revalidated (304), and offline runs are served only from disk.
+"""
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders.api_loader import APILoader
+from src.utils.http_cache import CacheMissError, HTTPCache
+from src.utils.http_fetch import HTTPStats, get_records, make_session
+
+RECORDS = [{"NUM_VENDA": 500 + i, "PARCELA": i % 12, "VALOR": i * 2.5} for i in range(300)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        args = parse_qs(urlparse(self.path).query)
+        page = int(args.get("page", ["1"])[0])
+        etag = f'"v{server.version}-p{page}"'
+        with server.lock:
+            server.calls.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        rows = RECORDS[(page - 1) * 100:page * 100] if server.version == 1 else RECORDS[:5]
+        body = json.dumps({"items": rows}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.lock = threading.Lock()
+    server.calls, server.version = [], 1
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, cache, stats=None, page=1):
+    url = f"http://127.0.0.1:{server.server_address[1]}/titulos"
+    with make_session(pool_size=1) as session:
+        rows = get_records(
+            session, url, data_key="items", params={"page": page}, timeout=5,
+            retry_delay=0.01, cache=cache, stats=stats,
+        )
+    return rows.to_frame()
+
+
+def test_fresh_entry_skips_network_and_stale_entry_revalidates(api, tmp_path):
+    expected = pd.DataFrame(RECORDS[:100])
+    stats = HTTPStats()
+    fresh = HTTPCache(tmp_path, ttl=3600, offline=False)
+    pd.testing.assert_frame_equal(_get(api, fresh, stats), expected)
+    pd.testing.assert_frame_equal(_get(api, fresh, stats), expected)
+    assert api.calls == [None] and stats.cache_hits == 1
+
+    stale = HTTPCache(tmp_path, ttl=0, offline=False)
+    pd.testing.assert_frame_equal(_get(api, stale, stats), expected)
+    assert api.calls[-1] == '"v1-p1"' and stats.not_modified == 1
+
+    # conteúdo mudou no servidor: 200 substitui a entrada
+    api.version = 2
+    pd.testing.assert_frame_equal(_get(api, stale, stats), pd.DataFrame(RECORDS[:5]))
+    entry = stale.get(stale.key("GET", f"http://127.0.0.1:{api.server_address[1]}/titulos", {"page": 1}))
+    assert entry.etag == '"v2-p1"'
+
+
+def test_offline_serves_cache_only(api, tmp_path):
+    _get(api, HTTPCache(tmp_path, ttl=0, offline=False))
+    calls = len(api.calls)
+
+    offline = HTTPCache(tmp_path, ttl=0, offline=True)
+    pd.testing.assert_frame_equal(_get(api, offline), pd.DataFrame(RECORDS[:100]))
+    with pytest.raises(CacheMissError):
+        _get(api, offline, page=2)
+    assert len(api.calls) == calls
+
+
+def test_api_loader_rerun_within_ttl(api, tmp_path, monkeypatch):
+    monkeypatch.delenv("HTTP_OFFLINE", raising=False)
+    config = LoaderConfig(
+        type=LoaderType.API,
+        params={
+            "base_url": f"http://127.0.0.1:{api.server_address[1]}",
+            "endpoint": "/titulos",
+            "paginated": True,
+            "page_size": 100,
+            "data_key": "items",
+            "concurrency": 4,
+            "cache": {"dir": str(tmp_path), "ttl_seconds": 3600},
+        },
+    )
+    first = APILoader(config, None).load()
+    calls = len(api.calls)
+    second = APILoader(config, None).load()
+
+    assert "error" not in second.metadata, second.metadata
+    pd.testing.assert_frame_equal(first.data, second.data)
+    assert len(first.data) == len(RECORDS)
+    assert len(api.calls) == calls and second.metadata["cache_hits"] == second.metadata["pages"]
+    assert second.metadata["requests"] == 0
+
+    monkeypatch.setenv("HTTP_OFFLINE", "1")
+    offline = APILoader(config, None).load()
+    pd.testing.assert_frame_equal(offline.data, first.data)
@@ -0,0 +1,154 @@
+"""
+Tests for date-windowed concurrent downloads (EMCCAMP/TOTVS) against a
+local HTTP stand-in: windows come back in date order, a failed or
+truncated window is retried on its own, and the ZIP gets one CSV.
+"""
+import io
+import json
+import sys
+import threading
+import time
+import zipfile
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.http_fetch import date_windows, get_records, iter_in_order, make_session
+from src.utils.io import open_zip_for_writing, write_csv_batches_member
+from src.utils.totvs_client import baixar_janelas_para_zip
+
+START, END = date(2024, 1, 1), date(2024, 3, 31)
+RECORDS = [
+    {"NUM_VENDA": 1000 + i, "DATA_VENCIMENTO": (START + timedelta(days=i % 91)).isoformat(), "VALOR": i / 3}
+    for i in range(2_000)
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        raw = parse_qs(urlparse(self.path).query)["parameters"][0]
+        params = dict(part.split("=") for part in raw.split(";"))
+        inicio, fim = params["DATA_VENCIMENTO_INICIAL"], params["DATA_VENCIMENTO_FINAL"]
+        with server.lock:
+            server.calls.append(inicio)
+            attempt = server.calls.count(inicio)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            time.sleep(0.05)
+            rows = [r for r in RECORDS if inicio <= r["DATA_VENCIMENTO"] <= fim]
+            if inicio in server.extra:
+                rows = [{**r, "OBS": "nova"} for r in rows]
+            body = json.dumps(rows).encode()
+            if inicio in server.fail and attempt == 1:
+                self.send_response(502)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if inicio in server.truncate and attempt == 1:
+                # conexão cai no meio do corpo
+                self.wfile.write(body[: len(body) // 2])
+                self.close_connection = True
+                return
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.lock = threading.Lock()
+    server.calls, server.active, server.peak = [], 0, 0
+    server.fail, server.truncate, server.extra = {"2024-01-15"}, {"2024-02-12"}, set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_date_windows_cover_range_once():
+    windows = date_windows(START, END, 14)
+    assert windows[0] == (START, date(2024, 1, 14)) and windows[-1][1] == END
+    days = sum((b - a).days + 1 for a, b in windows)
+    assert days == (END - START).days + 1
+    assert all(b + timedelta(days=1) == c for (_, b), (c, _) in zip(windows, windows[1:]))
+    assert date_windows(START, END, 0) == [(START, END)]
+
+
+def test_windows_stream_into_zip_in_order(api, tmp_path):
+    url = f"http://127.0.0.1:{api.server_address[1]}/consulta"
+    session = make_session(pool_size=4)
+
+    def fetch(window):
+        params = {"parameters": f"DATA_VENCIMENTO_INICIAL={window[0]};DATA_VENCIMENTO_FINAL={window[1]}"}
+        rows = get_records(session, url, params=params, timeout=5, max_retries=3, retry_delay=0.01)
+        return rows.to_frame(dtype=object)
+
+    windows = date_windows(START, END, 14)
+    zip_path = tmp_path / "Emccamp.zip"
+    with open_zip_for_writing(zip_path) as zf:
+        rows = write_csv_batches_member(zf, "Emccamp.csv", iter_in_order(fetch, windows, 4), "utf-8-sig", sep=";")
+    session.close()
+
+    assert rows == len(RECORDS) and api.peak > 1
+    # só as janelas com falha foram repetidas
+    assert len(api.calls) == len(windows) + 2
+    with zipfile.ZipFile(zip_path) as zf:
+        data = pd.read_csv(io.BytesIO(zf.read("Emccamp.csv")), sep=";", encoding="utf-8-sig")
+    # janelas na ordem das datas; dentro da janela, na ordem da API
+    expected = pd.DataFrame(
+        [r for a, b in windows for r in RECORDS if a.isoformat() <= r["DATA_VENCIMENTO"] <= b.isoformat()]
+    )
+    pd.testing.assert_frame_equal(data, expected)
+
+
+def test_window_columns_are_united(api, tmp_path):
+    # chave que só aparece numa janela posterior entra no cabeçalho
+    api.extra = {"2024-03-11"}
+    url = f"http://127.0.0.1:{api.server_address[1]}/consulta"
+    windows = date_windows(START, END, 14)
+    zip_path = tmp_path / "Emccamp.zip"
+
+    rows = baixar_janelas_para_zip(url, windows, zip_path, "Emccamp.csv", paralelas=4)
+
+    assert rows == len(RECORDS)
+    # fragmentos temporários das janelas não ficam para trás
+    assert [p.name for p in tmp_path.iterdir()] == ["Emccamp.zip"]
+    with zipfile.ZipFile(zip_path) as zf:
+        data = pd.read_csv(io.BytesIO(zf.read("Emccamp.csv")), sep=";", encoding="utf-8-sig", dtype=str)
+    assert list(data.columns) == ["NUM_VENDA", "DATA_VENCIMENTO", "VALOR", "OBS"]
+    with_obs = data["DATA_VENCIMENTO"].between("2024-03-11", "2024-03-24")
+    assert (data.loc[with_obs, "OBS"] == "nova").all() and data.loc[~with_obs, "OBS"].isna().all()
+
+
+def test_iter_in_order_raises_on_failed_item():
+    def fn(n):
+        if n == 3:
+            raise RuntimeError("janela 3")
+        time.sleep(0.01 * (5 - n))
+        return n
+
+    results = []
+    with pytest.raises(RuntimeError):
+        for value in iter_in_order(fn, range(6), concurrency=3):
+            results.append(value)
+    assert results == [0, 1, 2]
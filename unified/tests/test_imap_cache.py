@@ -0,0 +1,266 @@
+"""
+Tests for partial IMAP fetches and the attachment cache against a local
+IMAP stand-in: only headers, BODYSTRUCTURE and the attachment part are
+fetched, and a re-run is served from the cache until UIDVALIDITY changes.
+Candidate headers come back in one FETCH and parts can be downloaded over
+a small connection pool.
+"""
+import imaplib
+import io
+import socketserver
+import sys
+import threading
+import time
+import zipfile
+from email.message import EmailMessage
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders.email_loader import EmailLoader
+from src.utils.imap_cache import (
+    AttachmentCache,
+    IMAPPool,
+    body_parts,
+    fetch_attachment,
+    fetch_summaries,
+    parse_fetch,
+    search_uids,
+    select_mailbox,
+)
+
+CSV = "CPF;VALOR\n12345678901;10,50\n98765432100;7,00\n"
+
+
+def _zip(text: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        # data fixa: o mesmo conteúdo gera sempre os mesmos bytes
+        zf.writestr(zipfile.ZipInfo("base.csv", date_time=(2024, 10, 7, 8, 0, 0)), text)
+    return buffer.getvalue()
+
+
+def _message(uid: int, text: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = f"Base de Cobranca {uid}"
+    msg["From"] = "envio@cartorio.example"
+    msg["Date"] = "Mon, 07 Oct 2024 08:00:00 -0300"
+    msg.set_content("Segue a base.\n")
+    msg.add_attachment(b"%PDF-1.4 relatorio", maintype="application", subtype="pdf", filename="relatorio.pdf")
+    msg.add_attachment(_zip(text), maintype="application", subtype="zip", filename="Cobrança.zip")
+    return msg
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _bodystructure(msg: EmailMessage) -> str:
+    parts = []
+    for part in msg.get_payload():
+        maintype, subtype = part.get_content_type().split("/")
+        body = part.get_payload()
+        params = " ".join(f"{_quote(k.upper())} {_quote(v)}" for k, v in part.get_params()[1:])
+        encoding = part.get("Content-Transfer-Encoding", "7bit")
+        params = f"({params})" if params else "NIL"
+        fields = f'{_quote(maintype)} {_quote(subtype)} {params} NIL NIL {_quote(encoding)} {len(body)}'
+        if maintype == "text":
+            fields += f" {body.count(chr(10))}"
+        filename = part.get_param("filename", header="Content-Disposition")
+        if filename:
+            fields += f' NIL ("attachment" ("FILENAME" {_quote(filename)})) NIL'
+        parts.append(f"({fields})")
+    return "(" + "".join(parts) + ' "MIXED" ("BOUNDARY" "x") NIL NIL)'
+
+
+class _IMAPHandler(socketserver.StreamRequestHandler):
+    def send(self, line):
+        self.wfile.write((line if isinstance(line, bytes) else line.encode()) + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.send("* OK stand-in ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            tag, command, *rest = line.decode().rstrip("\r\n").split(" ", 2)
+            command = command.upper()
+            args = rest[0] if rest else ""
+            if command == "CAPABILITY":
+                self.send("* CAPABILITY IMAP4rev1")
+            elif command in ("SELECT", "EXAMINE"):
+                self.send(f"* {len(server.messages)} EXISTS")
+                self.send(f"* OK [UIDVALIDITY {server.uidvalidity}] UIDs valid")
+                self.send(f"{tag} OK [READ-ONLY] done")
+                continue
+            elif command == "LOGOUT":
+                self.send("* BYE")
+                self.send(f"{tag} OK done")
+                return
+            elif command == "UID":
+                sub, rest_args = args.split(" ", 1)
+                if sub.upper() == "SEARCH":
+                    self.send("* SEARCH " + " ".join(str(uid) for uid in server.messages))
+                else:
+                    uid_set, items = rest_args.split(" ", 1)
+                    with server.lock:
+                        server.fetches.append(items)
+                    for seq, uid in enumerate(uid_set.split(","), start=1):
+                        self._fetch(seq, int(uid), items.strip("()"))
+            self.send(f"{tag} OK done")
+
+    def _fetch(self, seq, uid, items):
+        msg = self.server.messages[uid]
+        inline, literal = [], None
+        if "BODYSTRUCTURE" in items:
+            inline.append(f"BODYSTRUCTURE {_bodystructure(msg)}")
+        if "HEADER.FIELDS" in items:
+            wanted = items[items.index("HEADER.FIELDS (") + 15:].split(")")[0].split()
+            policy = msg.policy.clone(linesep="\r\n")
+            data = "".join(policy.fold(k, v) for k, v in msg.items() if k.upper() in wanted) + "\r\n"
+            literal = (f"BODY[HEADER.FIELDS ({' '.join(wanted)})]", data.encode())
+        elif items.startswith("BODY.PEEK["):
+            section = int(items[len("BODY.PEEK["):-1])
+            literal = (f"BODY[{section}]", msg.get_payload()[section - 1].get_payload().encode())
+            time.sleep(self.server.delay)
+        head = f"* {seq} FETCH (UID {uid} " + " ".join(inline)
+        if literal is None:
+            self.send(head + ")")
+            return
+        name, payload = literal
+        self.wfile.write(f"{head} {name} {{{len(payload)}}}\r\n".encode() + payload + b")\r\n")
+
+
+@pytest.fixture
+def imap():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _IMAPHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.messages = {3: _message(3, "CPF;VALOR\n1;1\n"), 7: _message(7, CSV)}
+    server.uidvalidity, server.fetches = 42, []
+    server.connections, server.delay = 0, 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _load(server, cache_dir):
+    config = LoaderConfig(
+        type=LoaderType.EMAIL,
+        params={
+            "server": "127.0.0.1",
+            "port": server.server_address[1],
+            "ssl": False,
+            "email": "robo@example.com",
+            "password": "segredo",
+            "attachment_pattern": "cobran*.zip",
+            "cache_dir": str(cache_dir),
+        },
+    )
+    return EmailLoader(config, None).load()
+
+
+def test_parse_fetch_with_literal_filename():
+    data = [
+        (
+            b'1 (UID 9 BODYSTRUCTURE ((("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "7BIT" 12 1)'
+            b'("TEXT" "HTML" NIL NIL NIL "QUOTED-PRINTABLE" 40 2) "ALTERNATIVE")'
+            b'("APPLICATION" "ZIP" ("NAME" {10}',
+            b"base 1.zip",
+        ),
+        b') NIL NIL "BASE64" 2048 NIL ("ATTACHMENT" NIL) NIL) "MIXED"))',
+    ]
+    [message] = parse_fetch(data)
+    parts = body_parts(message["BODYSTRUCTURE"])
+    assert [p.section for p in parts] == ["1.1", "1.2", "2"]
+    assert parts[2].filename == "base 1.zip" and parts[2].encoding == "base64"
+    assert parts[2].disposition == "attachment" and parts[2].size == 2048
+
+
+def test_email_loader_fetches_attachment_part_once(imap, tmp_path):
+    first = _load(imap, tmp_path)
+    assert "error" not in first.metadata, first.metadata
+    assert first.metadata["uid"] == "7" and not first.metadata["attachment_cached"]
+    assert first.metadata["source"] == "email:Base de Cobranca 7"
+    expected = pd.read_csv(io.StringIO(CSV), sep=";", dtype=str)
+    pd.testing.assert_frame_equal(first.data, expected)
+    # nunca a mensagem inteira; só a parte 3 (o ZIP), não o PDF
+    assert not any("RFC822" in items or items == "(BODY.PEEK[])" for items in imap.fetches)
+    assert [i for i in imap.fetches if i.startswith("(BODY.PEEK[") and "HEADER" not in i] == ["(BODY.PEEK[3])"]
+
+    imap.fetches.clear()
+    second = _load(imap, tmp_path)
+    assert second.metadata["attachment_cached"]
+    pd.testing.assert_frame_equal(second.data, expected)
+    assert "(BODY.PEEK[3])" not in imap.fetches
+
+    # UIDs renumerados no servidor: o cache antigo não vale mais
+    imap.uidvalidity = 43
+    imap.fetches.clear()
+    third = _load(imap, tmp_path)
+    assert not third.metadata["attachment_cached"] and "(BODY.PEEK[3])" in imap.fetches
+
+
+def _connect(server):
+    mail = imaplib.IMAP4("127.0.0.1", server.server_address[1])
+    mail.login("robo@example.com", "segredo")
+    return mail
+
+
+def test_batched_summaries_and_pooled_parts(imap, tmp_path):
+    imap.messages = {uid: _message(uid, f"CPF;VALOR\n{uid};1\n") for uid in range(10, 70, 3)}
+    imap.delay = 0.2
+    mail = _connect(imap)
+    uidvalidity = select_mailbox(mail)
+    uids = search_uids(mail, '(FROM "envio@cartorio.example")')
+
+    summaries = fetch_summaries(mail, uids)
+    # um único FETCH para todos os candidatos
+    assert len(imap.fetches) == 1 and list(summaries) == uids
+    headers, parts = summaries[uids[-1]]
+    assert headers["Subject"] == f"Base de Cobranca {uids[-1]}"
+    assert [p.filename for p in parts] == ["", "relatorio.pdf", "Cobrança.zip"]
+
+    wanted = [(uid, summaries[uid][1][2]) for uid in uids[-4:]]
+
+    def download(conn, item):
+        uid, part = item
+        return fetch_attachment(conn, uid, part, mailbox="INBOX", uidvalidity=uidvalidity, cache=AttachmentCache(tmp_path))[0]
+
+    start = time.perf_counter()
+    with IMAPPool(lambda: _connect(imap), "INBOX", uidvalidity, size=2, first=mail) as pool:
+        payloads = pool.map(download, wanted)
+    elapsed = time.perf_counter() - start
+    mail.logout()
+
+    assert payloads == [_zip(f"CPF;VALOR\n{uid};1\n") for uid, _ in wanted]
+    # 4 partes de 0,2s em 2 conexões
+    assert imap.connections == 2 and elapsed < 4 * imap.delay
+
+
+def test_attachment_cache_keeps_last_uids_of_current_uidvalidity(tmp_path):
+    cache = AttachmentCache(tmp_path, keep=2)
+    cache.put("INBOX", 7, 1, "2", b"antigo")
+    for uid in (10, 12, 11):
+        cache.put("INBOX", 8, uid, "2", b"x")
+        cache.put("INBOX", 8, uid, "3", b"y")
+
+    assert not (tmp_path / "INBOX" / "7").exists()
+    assert sorted(p.name for p in (tmp_path / "INBOX" / "8").iterdir()) == [
+        "11.2.bin", "11.3.bin", "12.2.bin", "12.3.bin",
+    ]
+    assert cache.get("INBOX", 8, 12, "3") == b"y" and cache.get("INBOX", 8, 10, "2") is None
+
+    # keep=None desliga a limpeza
+    AttachmentCache(tmp_path).put("Outra", 1, 1, "2", b"z")
+    AttachmentCache(tmp_path, keep=None).put("Outra", 2, 1, "2", b"z")
+    assert (tmp_path / "Outra" / "1").exists()
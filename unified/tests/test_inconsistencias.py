@@ -0,0 +1,72 @@
+"""
+Tests for the columnar inconsistency tracker: one bit per reason per row,
+vectorized counts and split, and reason text expanded only on export.
+"""
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.validator import (
+    InconsistenciaManager,
+    MaxValidator,
+    MotivosInconsistencia,
+    VicValidator,
+)
+
+
+def test_manager_bitmask_split_counts_and_export():
+    df = pd.DataFrame({"CHAVE": list("abcdef"), "VALOR": range(6)}, index=[10, 11, 12, 13, 14, 15])
+    manager = InconsistenciaManager({})
+    manager.iniciar(len(df))
+    manager.adicionar_motivos_em_lote([1, 3, 4], "CPF_VAZIO", detalhes="documento ausente")
+    manager.adicionar_motivos_em_lote(np.array([False, False, False, True, False, True]), "VENCIMENTO_INVALIDO")
+    manager.adicionar_motivo(3, "CPF_VAZIO", valor_original="")
+
+    validos, invalidos = manager.dividir_validos_invalidos(df)
+    assert list(validos.index) == [10, 12] and list(invalidos.index) == [11, 13, 14, 15]
+    assert "motivo_inconsistencia" not in invalidos.columns
+    assert manager.contar_motivos() == {"CPF_VAZIO": 3, "VENCIMENTO_INVALIDO": 2}
+    assert manager.contadores["registros_invalidos"] == 4
+
+    exportado = manager.criar_dataframe_inconsistencias(invalidos)
+    assert list(exportado.columns) == ["motivo_inconsistencia", "CHAVE", "VALOR"]
+    assert exportado["motivo_inconsistencia"].tolist() == [
+        "CPF_VAZIO;", "CPF_VAZIO;VENCIMENTO_INVALIDO;", "CPF_VAZIO;", "VENCIMENTO_INVALIDO;",
+    ]
+
+    registros = manager.inconsistencias
+    assert len(registros) == 5 and manager.obter_estatisticas()["total_inconsistencias"] == 5
+    assert {"indice": 3, "motivo": "CPF_VAZIO", "detalhes": "documento ausente", "valor_original": ""} in registros
+
+
+def test_validators_build_reason_text_from_bits():
+    logger = logging.getLogger("test")
+    vic = pd.DataFrame({
+        "CPFCNPJ_CLIENTE": ["123", "", None, "456"],
+        "VENCIMENTO": [pd.Timestamp("2024-01-01"), pd.NaT, pd.NaT, pd.Timestamp("2024-02-01")],
+    })
+    validos, invalidos = VicValidator({}, logger).validar_dados(vic)
+    assert list(validos.index) == [0, 3] and list(validos.columns) == list(vic.columns)
+    assert invalidos["motivo_inconsistencia"].tolist() == [
+        "VENCIMENTO_INVALIDO;CPF/CNPJ nulo ou vazio;"
+    ] * 2
+
+    chaves = pd.DataFrame({"CHAVE": ["1-2", "", "abc", "9-9"]})
+    validos, invalidos = MaxValidator({}, logger).validar_dados(chaves)
+    assert validos["CHAVE"].tolist() == ["1-2", "9-9"]
+    assert invalidos["motivo_inconsistencia"].tolist() == ["CHAVE_VAZIA;", "CHAVE_FORMATO_INVALIDO;"]
+
+
+def test_tracker_grows_and_expands_unique_combinations_once():
+    rastreador = MotivosInconsistencia()
+    rastreador.marcar([4], "A")
+    rastreador.marcar(np.arange(200_000) % 2 == 0, "B")
+    assert len(rastreador.bits) == 200_000
+    assert rastreador.contagem() == {"A": 1, "B": 100_000}
+    textos = rastreador.motivos()
+    assert textos[4] == "A;B;" and textos[1] == "" and textos[2] == "B;"
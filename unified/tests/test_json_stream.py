@@ -0,0 +1,70 @@
+"""
+Tests for the incremental JSON-to-columns decoder.
+Whatever the chunking, the frame must equal ``pd.DataFrame(resp.json())``.
+"""
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.json_stream import DecodeStats, PayloadTooLargeError, decode_records
+
+RECORDS = [
+    {
+        "NUM_VENDA": 10_000 + i,
+        "ID_PARCELA": str(i % 37),
+        "NOME": "JOSÉ ÁVILA" if i % 5 else "Conceição \"Ltda\"",
+        "VALOR_RECEBIDO": i * 1.25 if i % 11 else None,
+        "HONORARIO_BAIXADO": i % 3,
+        **({"OBS": ["a", {"b": 1}]} if i % 17 == 0 else {}),
+    }
+    for i in range(500)
+]
+
+
+def _chunks(payload: bytes, size: int):
+    return (payload[i:i + size] for i in range(0, len(payload), size))
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096, 10**7])
+def test_decoded_columns_match_list_of_dicts(size):
+    payload = json.dumps(RECORDS, ensure_ascii=False, indent=1).encode("utf-8")
+    stats = DecodeStats()
+    frame = decode_records(_chunks(b"\xef\xbb\xbf" + payload, size), stats=stats).to_frame()
+
+    pd.testing.assert_frame_equal(frame, pd.DataFrame(RECORDS))
+    assert stats.records == len(RECORDS) and stats.bytes == len(payload) + 3
+
+
+@pytest.mark.parametrize(
+    "document, data_key, expected",
+    [
+        ({"meta": {"total": 2}, "data": {"items": RECORDS[:2]}}, "data.items", RECORDS[:2]),
+        ({"data": {"outros": [1]}}, "data.items", []),
+        ({"data": 5}, "data.items", []),
+        ({"data": {"items": RECORDS[0]}}, "data.items", [RECORDS[0]]),
+        (RECORDS[:3], "data.items", RECORDS[:3]),
+        (RECORDS[0], "", [RECORDS[0]]),
+        ([], "", []),
+    ],
+)
+def test_data_key_follows_extract_rules(document, data_key, expected):
+    payload = json.dumps(document).encode()
+    frame = decode_records(_chunks(payload, 5), data_key).to_frame()
+    pd.testing.assert_frame_equal(frame, pd.DataFrame(expected), check_column_type=False, check_index_type=False)
+
+
+def test_ceiling_and_truncated_payload():
+    payload = json.dumps(RECORDS).encode()
+    with pytest.raises(PayloadTooLargeError):
+        decode_records(_chunks(payload, 1024), max_bytes=10_000)
+
+    with pytest.raises(json.JSONDecodeError):
+        decode_records(_chunks(payload[: len(payload) // 2], 1024))
+    with pytest.raises(json.JSONDecodeError):
+        # número cortado no fim do corpo
+        decode_records(_chunks(b"[1, 2, 3", 2))
@@ -0,0 +1,56 @@
+"""
+Tests for the vectorized RegexValidator: same rows as matching each value
+with Python's re, for single and multiple patterns, and the digit-length
+fast path for CPF/CNPJ rules.
+"""
+import re
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import ValidatorConfig, ValidatorType
+from src.validators.regex import RegexValidator, digit_lengths
+
+VALUES = ["12345678901", "12345678901234", "12345678901\n", "1234567890", "123.456.789-01",
+          "", None, "123-45", "ABC-12", "abc", "12345678901x"]
+
+
+def _validate(pattern, mode, **params):
+    config = ValidatorConfig(
+        ValidatorType.REGEX, params={"column": "DOC", "pattern": pattern, "mode": mode, **params}
+    )
+    return RegexValidator(config).validate(pd.DataFrame({"DOC": VALUES}))
+
+
+def _expected(patterns, mode, combine=any):
+    compiled = [re.compile(p) for p in patterns]
+    texts = pd.Series(VALUES).astype(str).fillna("")
+    return [i for i, text in enumerate(texts) if combine(getattr(c, mode)(text) for c in compiled)]
+
+
+@pytest.mark.parametrize("mode", ["fullmatch", "match", "search"])
+@pytest.mark.parametrize(
+    "pattern",
+    [r"^\d{11}$|^\d{14}$", r"[0-9]{11,14}", r"^[0-9]{3,}-[0-9]{2,}$", [r"^\d{11}$", r"^\d{14}$"], [r"^\d{3}-", r"(?i)abc"]],
+)
+def test_vectorized_matches_python_re(pattern, mode):
+    patterns = [pattern] if isinstance(pattern, str) else pattern
+    result = _validate(pattern, mode)
+    assert list(result.valid.index) == _expected(patterns, mode)
+    assert result.total_invalid == len(VALUES) - result.total_valid
+
+
+def test_combine_all_requires_every_pattern():
+    result = _validate([r"\d", r"-"], "search", combine="all")
+    assert list(result.valid.index) == _expected([r"\d", r"-"], "search", combine=all)
+
+
+def test_digit_length_rules():
+    assert digit_lengths(r"^\d{11}$|^\d{14}$", "match") == ({11, 14}, False)
+    assert digit_lengths(r"^(?:[0-9]{11}|\d{14})$", "fullmatch") == ({11, 14}, True)
+    assert digit_lengths(r"\d{11}", "match") is None  # prefixo bastaria
+    assert digit_lengths(r"^\d{3,}$", "fullmatch") is None
@@ -0,0 +1,112 @@
+"""
+Tests for the single-pass group assignment of the value splitters: the same
+groups, rows and row order as checking every group's values with one mask
+each, for every match mode, and splits taken from the frame only on access.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import SplitterConfig, SplitterType
+from src.splitters import CampaignSplitter, FieldValueSplitter, LazySplits
+
+MAPPINGS = {
+    "sao_paulo": ["SAO PAULO", "SP"],
+    "santos": "SANTOS",
+    "rio": ["RIO DE JANEIRO", "RJ", "RIO"],
+    "interior": ["CAMPINAS", "SAO", "O"],
+}
+
+
+def _frame(rows: int = 2_000) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    cidades = np.array(
+        ["Sao Paulo", " sp", "SANTOS", "rio de janeiro", "RJ", "Campinas", "BELO HORIZONTE",
+         "SAO JOSE", "PORTO ALEGRE", "", "NITEROI", "SPRIO"], dtype=object
+    )
+    df = pd.DataFrame({"CIDADE": cidades[rng.integers(0, len(cidades), rows)], "VALOR": np.arange(rows)})
+    df.loc[rng.random(rows) < 0.02, "CIDADE"] = None
+    df.index = df.index * 3
+    return df
+
+
+def _masks(df, mode, normalize=True, default="outras"):
+    """The per-group mask loop the splitter used to run."""
+    values = df["CIDADE"].astype(str)
+    if normalize:
+        values = values.str.strip().str.upper()
+    splits, remaining = {}, pd.Series(True, index=df.index)
+    for group, match_values in MAPPINGS.items():
+        match = pd.Series(False, index=df.index)
+        for value in match_values if isinstance(match_values, list) else [match_values]:
+            value = str(value).strip().upper() if normalize else str(value)
+            if mode == "exact":
+                match |= values == value
+            elif mode == "contains":
+                match |= values.str.contains(value, na=False, regex=False)
+            elif mode == "prefix":
+                match |= values.str.startswith(value, na=False)
+            else:
+                match |= values.str.endswith(value, na=False)
+        group_mask = remaining & match
+        if group_mask.any():
+            splits[group] = df[group_mask]
+            remaining &= ~group_mask
+    if remaining.any():
+        splits[default] = df[remaining]
+    return splits
+
+
+def _split(df, **params):
+    config = SplitterConfig(
+        SplitterType.FIELD_VALUE,
+        params={"column": "CIDADE", "mappings": MAPPINGS, "default_group": "outras", **params},
+    )
+    return FieldValueSplitter(config).split(df)
+
+
+@pytest.mark.parametrize("mode", ["exact", "contains", "prefix", "suffix"])
+@pytest.mark.parametrize("normalize", [True, False])
+def test_field_value_matches_mask_loop(mode, normalize):
+    df = _frame()
+    result = _split(df, mode=mode, normalize=normalize)
+    expected = _masks(df, mode, normalize)
+
+    assert result.names == list(expected)
+    for name, frame in expected.items():
+        pd.testing.assert_frame_equal(result.splits[name], frame)
+
+
+def test_splits_are_taken_on_access():
+    df = _frame()
+    result = _split(df, mode="contains")
+    splits = result.splits
+    assert isinstance(splits, LazySplits) and not splits._cache
+    assert sum(splits.size(name) for name in splits) == len(df)
+    assert result.get("rio") is result.get("rio")
+    assert list(splits._cache) == ["rio"]
+
+
+def test_campaign_first_rule_wins():
+    df = pd.DataFrame({"CAMPANHA": ["Acordo Judicial", "judicial", "Campanha Verão", "acordo", None]})
+    config = SplitterConfig(
+        SplitterType.CAMPAIGN,
+        params={
+            "rules": [
+                {"name": "judicial", "patterns": ["judic"]},
+                {"name": "vazia", "patterns": []},
+                {"name": "acordos", "patterns": ["ACORDO", "Verão"]},
+            ]
+        },
+    )
+    splits = CampaignSplitter(config).split(df).splits
+    assert {name: list(frame.index) for name, frame in splits.items()} == {
+        "judicial": [0, 1],
+        "acordos": [2, 3],
+        "outros": [4],
+    }
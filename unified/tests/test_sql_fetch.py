@@ -0,0 +1,191 @@
+"""
+Tests for batched SQL fetching, using SQLite as the SQL Server stand-in.
+Batches must add up to what ``pd.read_sql`` returns for the same query
+(with ``dtype=str``, the same strings with NULLs kept missing).
+"""
+import sqlite3
+import sys
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders.sql_loader import SQLLoader
+from src.utils.sql_fetch import iter_query_batches, read_query
+
+QUERY = "SELECT Movimentacoes_ID, MoContrato AS contrato, MoValorDocumento AS valor FROM Movimentacoes"
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "max.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE Movimentacoes (Movimentacoes_ID INTEGER, MoContrato TEXT, MoValorDocumento REAL)")
+        conn.executemany(
+            "INSERT INTO Movimentacoes VALUES (?, ?, ?)",
+            [(i, f"CT-{i % 97}" if i % 11 else None, i * 1.5) for i in range(1, 1_001)],
+        )
+    return path
+
+
+def _read_sql_text(conn, query: str = QUERY) -> pd.DataFrame:
+    raw = pd.read_sql(query, conn)
+    return raw.astype(str).where(raw.notna())
+
+
+def _loader(database: Path, **params) -> SQLLoader:
+    config = LoaderConfig(
+        type=LoaderType.SQL,
+        params={"driver": "sqlite", "database": str(database), "query": QUERY, **params},
+    )
+    return SQLLoader(config, None)
+
+
+def test_batches_match_read_sql(database):
+    seen = []
+    with sqlite3.connect(database) as conn:
+        expected = _read_sql_text(conn)
+        batches = list(iter_query_batches(conn, QUERY, batch_size=300, dtype=str, progress=seen.append))
+
+    assert [len(b) for b in batches] == [300, 300, 300, 100]
+    assert seen[-1].rows == 1_000 and seen[-1].batches == 4 and seen[-1].engine == "dbapi"
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), expected)
+
+
+def test_text_does_not_depend_on_batch_size(tmp_path):
+    path = tmp_path / "nulls.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER, n INTEGER, valor REAL, obs TEXT)")
+        conn.executemany(
+            "INSERT INTO t VALUES (?, ?, ?, ?)",
+            [(1, 1, 1.0, "a"), (2, 2, None, None), (3, None, 2.5, "c"), (4, 4, 3.0, None)],
+        )
+        query = "SELECT * FROM t ORDER BY id"
+        frames = [
+            read_query(conn, query, batch_size=size, dtype=str, progress=None) for size in (1, 2, 3, 4)
+        ]
+
+    table = pa.table({
+        "id": pa.array([1, 2, 3, 4], pa.int64()),
+        "n": pa.array([1, 2, None, 4], pa.int64()),
+        "valor": pa.array([1.0, None, 2.5, 3.0], pa.float64()),
+        "obs": pa.array(["a", None, "c", None], pa.string()),
+    })
+    frames.append(read_query(_ArrowConnection(table), "SELECT", batch_size=1, dtype=str, progress=None))
+
+    for frame in frames:
+        pd.testing.assert_frame_equal(frame, frames[-1])
+    assert frames[0]["n"].tolist()[:2] == ["1", "2"] and frames[0]["n"].isna().tolist() == [False, False, True, False]
+    assert frames[0]["valor"].tolist()[0] == "1.0" and frames[0]["obs"].isna().sum() == 2
+
+
+def test_empty_result_keeps_columns(database):
+    with sqlite3.connect(database) as conn:
+        frame = read_query(conn, QUERY + " WHERE 1 = 0", batch_size=10, progress=None)
+    assert frame.empty
+    assert list(frame.columns) == ["Movimentacoes_ID", "contrato", "valor"]
+
+
+class _ArrowCursor:
+    """Minimal ADBC-like cursor over a fixed Arrow table."""
+
+    def __init__(self, table: pa.Table):
+        self.table = table
+
+    def execute(self, query):
+        pass
+
+    def fetch_record_batch(self):
+        return pa.RecordBatchReader.from_batches(self.table.schema, self.table.to_batches(max_chunksize=400))
+
+    def close(self):
+        pass
+
+
+class _ArrowConnection:
+    def __init__(self, table: pa.Table):
+        self.table = table
+
+    def cursor(self):
+        return _ArrowCursor(self.table)
+
+
+def test_arrow_engine_is_picked_and_rebatched():
+    table = pa.table({
+        "id": pa.array(range(1_000), pa.int64()),
+        "valor": pa.array([i / 4 for i in range(1_000)], pa.float64()).cast(pa.decimal128(12, 2)),
+    })
+    seen = []
+    batches = list(iter_query_batches(_ArrowConnection(table), "SELECT", batch_size=300, progress=seen.append))
+
+    assert seen[-1].engine == "arrow"
+    assert [len(b) for b in batches] == [300, 100, 300, 100, 200]
+    frame = pd.concat(batches, ignore_index=True)
+    assert frame["valor"].dtype == "float64"
+    assert frame["valor"].iloc[-1] == pytest.approx(999 / 4, abs=0.01)
+
+    with pytest.raises(ValueError):
+        list(iter_query_batches(sqlite3.connect(":memory:"), "SELECT 1", engine="arrow"))
+
+
+def test_arrow_text_matches_per_value_rule():
+    import datetime as dt
+    from decimal import Decimal
+
+    from src.utils.sql_fetch import _frame_from_arrow, _value_frame
+
+    table = pa.table({
+        "n": pa.array([1, None, -3, 10**15], pa.int64()),
+        "f": pa.array([1.0, float("nan"), float("inf"), 1e20], pa.float64()),
+        "g": pa.array([0.1, None, 1 / 3, 5e-05], pa.float64()),
+        "d": pa.array([Decimal("534.56"), None, Decimal("0.10"), Decimal("-2.00")], pa.decimal128(12, 2)),
+        "b": pa.array([True, False, None, True]),
+        "s": pa.array(["a", None, "", "NA"]),
+        "dia": pa.array([dt.date(2024, 1, 31), None, dt.date(1900, 2, 28), dt.date(9999, 12, 31)]),
+        "ts": pa.array(
+            [dt.datetime(2024, 1, 31), dt.datetime(2024, 1, 31, 10, 5, 3), dt.datetime(1960, 5, 1, 0, 0, 0, 120), None],
+            pa.timestamp("us"),
+        ),
+        "hora": pa.array([dt.time(1, 2), None, dt.time(0, 0), dt.time(23, 59, 59)]),
+    })
+
+    for data in (table, table.slice(0, 0)):
+        expected = _value_frame(data.to_pydict(), data.column_names, str)
+        pd.testing.assert_frame_equal(_frame_from_arrow(data, str), expected)
+    frame = _frame_from_arrow(table, str)
+    assert frame["d"].tolist()[0] == "534.56" and frame["f"].tolist()[3] == "1e+20"
+    assert frame["ts"].tolist()[:3] == ["2024-01-31", "2024-01-31 10:05:03", "1960-05-01 00:00:00.000120"]
+
+
+def test_sql_loader_on_sqlite_stand_in(database):
+    result = _loader(database, batch_size=256).load()
+
+    with sqlite3.connect(database) as conn:
+        expected = _read_sql_text(conn)
+    expected.columns = [c.upper() for c in expected.columns]
+    pd.testing.assert_frame_equal(result.data, expected)
+    assert result.metadata["rows"] == 1_000
+    assert result.metadata["batches"] == 4
+    assert result.metadata["rows_per_sec"] > 0
+
+
+def test_export_zip_streams_batches(database, tmp_path):
+    loader = _loader(database, batch_size=128)
+    result = loader.export_zip(tmp_path / "MaxSmart.zip", "MaxSmart.csv")
+
+    assert result.metadata["rows"] == 1_000
+    expected = _loader(database).load().data.to_csv(index=False, sep=";").encode("utf-8")
+    with zipfile.ZipFile(tmp_path / "MaxSmart.zip") as zf:
+        assert zf.read("MaxSmart.csv") == expected
+
+    empty = _loader(database, query=QUERY + " WHERE 1 = 0").export_zip(tmp_path / "vazio.zip", "vazio.csv")
+    assert empty.metadata["rows"] == 0 and not (tmp_path / "vazio.zip").exists()
+
+    missing = _loader(database, query="").export_zip(tmp_path / "erro.zip", "erro.csv")
+    assert missing.metadata["error"] == "No query or table specified"
+    assert not list(tmp_path.glob("erro.zip*"))
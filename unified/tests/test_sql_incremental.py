@@ -0,0 +1,111 @@
+"""
+Tests for incremental MAX extraction on the SQLite stand-in.
+After every delta the snapshot must equal a full run of the query.
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders.sql_loader import SQLLoader
+
+QUERY = """
+SELECT
+    MoContrato AS 'NUMERO_CONTRATO',
+    Movimentacoes_ID AS 'Movimentacoes_ID',
+    MoDataVencimento AS 'VENCIMENTO',
+    MoValorDocumento AS 'VALOR'
+FROM Movimentacoes
+WHERE (MoStatusMovimentacao = 0 OR MoStatusMovimentacao = 1)
+ORDER BY MoDataVencimento ASC, Movimentacoes_ID DESC
+"""
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "std.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE Movimentacoes (Movimentacoes_ID INTEGER, MoContrato TEXT, MoDataVencimento TEXT,"
+            " MoValorDocumento REAL, MoStatusMovimentacao INTEGER, MoDataAtualizacao TEXT, MoVersao BLOB)"
+        )
+        conn.executemany(
+            "INSERT INTO Movimentacoes VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (i, f"CT-{i % 40}", f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}", i / 4, i % 3,
+                 f"2024-06-01 {i % 24:02d}:00:00", (i * 256).to_bytes(8, "big"))
+                for i in range(1, 501)
+            ],
+        )
+    return path
+
+
+def _load(
+    database: Path, snapshot_dir: Path | None = None, watermark: str = "MoDataAtualizacao", **params
+) -> SQLLoader:
+    if snapshot_dir is not None:
+        params["incremental"] = {"snapshot_dir": str(snapshot_dir), "watermark_column": watermark}
+    config = LoaderConfig(
+        type=LoaderType.SQL,
+        params={"driver": "sqlite", "database": str(database), "query": QUERY, **params},
+    )
+    loader = SQLLoader(config, None)
+    result = loader.load()
+    assert "error" not in result.metadata, result.metadata
+    loader.data = result.data
+    return loader
+
+
+def test_delta_matches_full_query(database, tmp_path):
+    snapshots = tmp_path / "snapshot"
+    first = _load(database, snapshots, partitions=3)
+    assert first.delta.mode == "full"
+    pd.testing.assert_frame_equal(first.data, _load(database).data)
+
+    with sqlite3.connect(database) as conn:
+        # novo título, alteração de valor, baixa (sai do filtro) e reabertura sem carimbo novo
+        conn.execute("INSERT INTO Movimentacoes VALUES (900, 'CT-NOVO', '2024-03-03', 1.5, 0, '2024-06-02 08:00:00', NULL)")
+        conn.execute("UPDATE Movimentacoes SET MoValorDocumento = 99, MoDataAtualizacao = '2024-06-02 09:00:00' WHERE Movimentacoes_ID = 4")
+        conn.execute("UPDATE Movimentacoes SET MoStatusMovimentacao = 2 WHERE Movimentacoes_ID IN (3, 6)")
+        conn.execute("UPDATE Movimentacoes SET MoStatusMovimentacao = 0 WHERE Movimentacoes_ID = 2")
+
+    second = _load(database, snapshots)
+    assert second.delta.mode == "delta"
+    assert second.delta.removed == 2 and second.delta.reentered == 1
+    # o delta relê as linhas do watermark anterior (>=), não a base toda
+    assert second.delta.fetched < 30
+    pd.testing.assert_frame_equal(second.data, _load(database).data)
+
+    refreshed = _load(database, snapshots, full_refresh=True)
+    assert refreshed.delta.mode == "full"
+    pd.testing.assert_frame_equal(refreshed.data, second.data)
+
+
+def test_changed_query_forces_full_refresh(database, tmp_path):
+    snapshots = tmp_path / "snapshot"
+    _load(database, snapshots)
+    changed = _load(database, snapshots, query=QUERY.replace("MoStatusMovimentacao = 1", "MoStatusMovimentacao = 2"))
+    assert changed.delta.mode == "full"
+    assert changed.data["MOVIMENTACOES_ID"].astype(int).mod(3).isin([0, 2]).all()
+
+
+def test_rowversion_watermark(database, tmp_path):
+    snapshots = tmp_path / "snapshot"
+    first = _load(database, snapshots, watermark="MoVersao")
+    assert first.delta.mode == "full" and first.delta.watermark == "000000000001f300"
+
+    with sqlite3.connect(database) as conn:
+        conn.execute(
+            "UPDATE Movimentacoes SET MoValorDocumento = 99, MoVersao = ? WHERE Movimentacoes_ID = 4",
+            ((1_000 * 256).to_bytes(8, "big"),),
+        )
+
+    second = _load(database, snapshots, watermark="MoVersao")
+    assert second.delta.mode == "delta" and second.delta.fetched == 2
+    assert second.delta.watermark == "000000000003e800"
+    pd.testing.assert_frame_equal(second.data, _load(database).data)
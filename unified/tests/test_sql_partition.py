@@ -0,0 +1,118 @@
+"""
+Tests for partitioned MAX extraction on the SQLite stand-in.
+The merged partitions must equal the single query, in the same order.
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders.sql_loader import SQLLoader
+from src.utils.sql_partition import iter_partitioned, order_columns, partition_queries, split_query
+
+QUERY = """
+SELECT DISTINCT
+    upper(PeDocumento) AS 'CPFCNPJ_CLIENTE',
+    MoContrato AS 'NUMERO_CONTRATO',
+    Movimentacoes_ID AS 'Movimentacoes_ID',
+    MoDataVencimento AS 'VENCIMENTO',
+    MoValorDocumento AS 'VALOR'
+FROM Movimentacoes
+    INNER JOIN Pessoas ON MoInadimplentesID = Pessoas_ID
+WHERE
+    -- status 0 = aberto, 1 = acordo
+    (MoStatusMovimentacao = 0 OR MoStatusMovimentacao = 1)
+    AND MoClientesID IN (SELECT 232 FROM Pessoas WHERE Pessoas_ID = 1) -- subconsulta
+ORDER BY upper(PeDocumento), MoDataVencimento ASC, Movimentacoes_ID DESC
+"""
+
+
+@pytest.fixture
+def database(tmp_path):
+    rng = np.random.default_rng(7)
+    rows = 2_000
+    path = tmp_path / "std.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE Pessoas (Pessoas_ID INTEGER, PeDocumento TEXT)")
+        conn.executemany("INSERT INTO Pessoas VALUES (?, ?)", [(i, f"doc{i % 50:03d}") for i in range(1, 301)])
+        conn.execute(
+            "CREATE TABLE Movimentacoes (Movimentacoes_ID INTEGER, MoInadimplentesID INTEGER, MoContrato TEXT,"
+            " MoDataVencimento TEXT, MoValorDocumento REAL, MoStatusMovimentacao INTEGER, MoClientesID INTEGER)"
+        )
+        vencimentos = pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 700, rows), unit="D")
+        conn.executemany(
+            "INSERT INTO Movimentacoes VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    int(rng.integers(1, 10**6)),
+                    int(rng.integers(1, 301)),
+                    f"CT-{i % 300}",
+                    None if i % 250 == 0 else vencimentos[i].strftime("%Y-%m-%d %H:%M:%S"),
+                    float(i) / 3,
+                    int(rng.integers(0, 3)),
+                    232 if i % 10 else 99,
+                )
+                for i in range(rows)
+            ],
+        )
+    return path
+
+
+def _load(database: Path, **params) -> pd.DataFrame:
+    config = LoaderConfig(
+        type=LoaderType.SQL,
+        params={"driver": "sqlite", "database": str(database), "query": QUERY, **params},
+    )
+    result = SQLLoader(config, None).load()
+    assert "error" not in result.metadata, result.metadata
+    return result.data
+
+
+@pytest.mark.parametrize("column", ["Movimentacoes_ID", "MoDataVencimento"])
+def test_partitioned_matches_single_query(database, column):
+    expected = _load(database)
+    merged = _load(database, partitions=5, partition_column=column, batch_size=300)
+
+    assert len(expected) > 1_000
+    pd.testing.assert_frame_equal(merged, expected)
+
+
+def test_partitions_are_merged_while_streaming(database):
+    expected = _load(database)
+    connect = lambda: sqlite3.connect(database, check_same_thread=False)  # noqa: E731
+    stream = iter_partitioned(connect, QUERY, "Movimentacoes_ID", 4, batch_size=300, dtype=str, prefetch=1)
+    first = next(stream)
+    stream.close()  # as threads das faixas param sem consumir o resto
+    assert len(first) == 300
+
+    batches = list(iter_partitioned(connect, QUERY, "Movimentacoes_ID", 4, batch_size=300, dtype=str))
+    assert all(len(b) == 300 for b in batches[:-1]) and 0 < len(batches[-1]) <= 300
+    merged = pd.concat(batches, ignore_index=True)
+    merged.columns = [c.upper() for c in merged.columns]
+    pd.testing.assert_frame_equal(merged, expected)
+
+    empty = list(iter_partitioned(connect, QUERY.replace("IN (SELECT 232", "IN (SELECT -1"), "Movimentacoes_ID", 4))
+    assert len(empty) == 1 and empty[0].empty and "VALOR" in empty[0].columns
+
+
+def test_query_template_is_split_at_top_level():
+    parts = split_query(QUERY)
+    assert "SELECT 232" in parts.where and "Movimentacoes_ID DESC" in parts.order_by
+    assert order_columns(QUERY) == [
+        ("CPFCNPJ_CLIENTE", True),
+        ("VENCIMENTO", True),
+        ("Movimentacoes_ID", False),
+    ]
+
+    first, second = partition_queries(QUERY, "Movimentacoes_ID", [(1, 10), (10, 20)])
+    assert "-- subconsulta\n) AND (Movimentacoes_ID >= 1 AND Movimentacoes_ID < 10 OR Movimentacoes_ID IS NULL)" in first
+    assert "(Movimentacoes_ID >= 10 AND Movimentacoes_ID < 20)\nORDER BY" in second
+
+    with pytest.raises(ValueError):
+        split_query("EXEC dbo.RetornaTudo")
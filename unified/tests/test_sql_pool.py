@@ -0,0 +1,114 @@
+"""
+Tests for the process-wide SQL connection pool.
+A fake ODBC connector stands in for pyodbc; SQLite backs the connections.
+"""
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders.sql_loader import SQLLoader
+from src.utils.sql_pool import ODBC_DRIVERS, ConnectionPool, get_pool
+
+
+class FakeODBC:
+    """Connector that only accepts one driver name, like a machine with a single driver."""
+
+    def __init__(self, installed: str):
+        self.installed = installed
+        self.attempts = []
+
+    def __call__(self, driver, server, database, username, password, timeout):
+        self.attempts.append(driver)
+        if driver != self.installed:
+            raise RuntimeError(f"Data source name not found: {driver}")
+        return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def test_driver_probe_is_remembered_per_server():
+    odbc = FakeODBC(installed="SQL Server")
+    pool = ConnectionPool(max_idle=0, connector=odbc)
+
+    pool.acquire("std", "STD2016", "user", "pwd").close()
+    assert odbc.attempts == list(ODBC_DRIVERS)
+    assert pool.known_driver("std") == "SQL Server"
+
+    odbc.attempts.clear()
+    conn = pool.acquire("std", "OUTRO", "user", "pwd")
+    assert odbc.attempts == ["SQL Server"]
+    assert "DRIVER={SQL Server};SERVER=std;DATABASE=OUTRO;UID=user;PWD=pwd;" in conn.connection_string
+
+
+def test_released_connections_are_reused_and_checked():
+    odbc = FakeODBC(installed=ODBC_DRIVERS[0])
+    pool = ConnectionPool(connector=odbc)
+
+    first = pool.acquire("std", "STD2016", "user", "pwd")
+    raw = first.raw
+    first.close()
+    first.close()  # idempotente
+
+    second = pool.acquire("std", "STD2016", "user", "pwd")
+    assert second.raw is raw
+    assert pool.stats.opened == 1 and pool.stats.reused == 1
+
+    # Outro usuário não compartilha a conexão
+    other = pool.acquire("std", "STD2016", "outro", "pwd")
+    assert other.raw is not raw
+
+    # Conexão morta no pool é descartada antes de ser entregue
+    second.close()
+    raw.close()
+    third = pool.acquire("std", "STD2016", "user", "pwd")
+    assert third.raw is not raw
+    assert pool.stats.discarded == 1
+
+
+def test_failed_block_discards_connection():
+    pool = ConnectionPool(connector=FakeODBC(installed=ODBC_DRIVERS[0]))
+    with pytest.raises(ZeroDivisionError):
+        with pool.connection("std", "STD2016", "user", "pwd"):
+            1 / 0
+    assert pool.stats.discarded == 1
+    with pool.connection("std", "STD2016", "user", "pwd"):
+        pass
+    assert pool.stats.opened == 2
+
+    with pytest.raises(ConnectionError):
+        ConnectionPool(connector=FakeODBC(installed="nenhum")).acquire("std", "STD2016")
+
+
+def test_threads_never_share_a_connection():
+    pool = ConnectionPool(connector=FakeODBC(installed=ODBC_DRIVERS[0]))
+
+    def borrow(_):
+        with pool.connection("std", "STD2016", "user", "pwd") as conn:
+            return id(conn.raw), conn.execute("SELECT 1").fetchone()[0]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(borrow, range(40)))
+    assert all(value == 1 for _, value in results)
+    assert pool.stats.opened <= 4
+    assert pool.stats.opened + pool.stats.reused == 40
+
+
+def test_sql_loader_reuses_pooled_sqlite(tmp_path):
+    database = tmp_path / "max.sqlite"
+    with sqlite3.connect(database) as conn:
+        conn.execute("CREATE TABLE Movimentacoes (id INTEGER)")
+        conn.executemany("INSERT INTO Movimentacoes VALUES (?)", [(i,) for i in range(10)])
+
+    config = LoaderConfig(
+        type=LoaderType.SQL,
+        params={"driver": "sqlite", "database": str(database), "query": "SELECT id FROM Movimentacoes"},
+    )
+    pool = get_pool()
+    opened = pool.stats.opened
+    for _ in range(3):
+        assert len(SQLLoader(config, None).load().data) == 10
+    assert pool.stats.opened - opened <= 1
@@ -0,0 +1,69 @@
+"""
+Tests for the concurrent SQL runner used by the judicial extractions.
+"""
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.sql_runner import QueryJob, dedup_by_digits, pooled_backend, run_concurrently
+
+
+def _legacy_dedup(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.copy()
+    frame["_CPF_DIGITO"] = frame["CPF_CNPJ"].astype(str).str.replace(r"[^0-9]", "", regex=True)
+    return frame.drop_duplicates(subset=["_CPF_DIGITO"], keep="first").drop(columns=["_CPF_DIGITO"])
+
+
+def test_jobs_run_concurrently_and_report_latency():
+    def backend(job):
+        time.sleep(0.3)
+        if job.name == "quebrada":
+            raise RuntimeError("timeout")
+        return pd.DataFrame({"CPF_CNPJ": [job.name], "ORIGEM": [job.name]})
+
+    jobs = [QueryJob(name, "SELECT 1", "srv", "db") for name in ("AUTOJUR", "quebrada", "MAX_SMART")]
+    start = time.perf_counter()
+    outcomes = run_concurrently(jobs, backend=backend)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.6
+    assert [o.name for o in outcomes] == ["AUTOJUR", "quebrada", "MAX_SMART"]
+    assert [o.ok for o in outcomes] == [True, False, True]
+    assert outcomes[1].error == "timeout" and outcomes[1].data.empty
+    assert all(o.elapsed >= 0.3 for o in outcomes)
+
+
+def test_dedup_by_digits_matches_legacy():
+    rng = np.random.default_rng(0)
+    docs = rng.integers(10**10, 10**10 + 500, 3_000).astype(str)
+    formatted = [f"{d[:3]}.{d[3:6]}.{d[6:9]}-{d[9:]}" if i % 3 == 0 else d for i, d in enumerate(docs)]
+    frame = pd.DataFrame({"CPF_CNPJ": formatted, "ORIGEM": rng.choice(["AUTOJUR", "MAX_SMART"], 3_000)})
+    frame.loc[::97, "CPF_CNPJ"] = None
+
+    pd.testing.assert_frame_equal(dedup_by_digits(frame, "CPF_CNPJ"), _legacy_dedup(frame))
+
+
+def test_sqlite_stand_in_backend(tmp_path):
+    autojur, std = tmp_path / "autojur.sqlite", tmp_path / "std.sqlite"
+    for path, docs in ((autojur, ["123.456.789-01", "98765432100"]), (std, ["12345678901", "111"])):
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE Pastas (doc TEXT)")
+            conn.executemany("INSERT INTO Pastas VALUES (?)", [(d,) for d in docs])
+
+    query = "SELECT doc AS CPF_CNPJ, '{}' AS ORIGEM FROM Pastas"
+    jobs = [
+        QueryJob("AUTOJUR", query.format("AUTOJUR"), "", str(autojur), driver="sqlite"),
+        QueryJob("MAX_SMART", query.format("MAX_SMART"), "", str(std), driver="sqlite"),
+    ]
+    outcomes = run_concurrently(jobs, backend=pooled_backend)
+    combined = pd.concat([o.data for o in outcomes], ignore_index=True)
+
+    unique = dedup_by_digits(combined, "CPF_CNPJ")
+    assert unique["CPF_CNPJ"].tolist() == ["123.456.789-01", "98765432100", "111"]
+    assert unique["ORIGEM"].tolist() == ["AUTOJUR", "AUTOJUR", "MAX_SMART"]
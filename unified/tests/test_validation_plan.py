@@ -0,0 +1,100 @@
+"""
+Tests for the fused validation plan: one masking pass over the client frame
+must keep the same rows, in the same order, and report the same per-validator
+counts and errors as running each validator's ``validate`` in sequence.
+"""
+import sys
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import ValidatorConfig, ValidatorType
+from src.validators import ValidationPlan, create_validator
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "CPF_CNPJ": ["12345678901", "", "98765432100", "1234", "11122233344", "55566677788", None, "99988877766"],
+            "NOME": ["Ana", "Bia", "Caio\nSilva", "Duda", "Eva", "Fabio", "Gil", "Hugo"],
+            "STATUS_TITULO": ["ABERTO", "aberto", "ABERTO", "PAGO", "ABERTO ", "ABERTO", "ABERTO", "CANCELADO"],
+            "TIPO_PARCELA": ["PARCELA", "PARCELA", "ENTRADA", "PARCELA", "PARCELA", "PARCELA", "PARCELA", "PARCELA"],
+            "VENCIMENTO": ["01/02/2020", "15/03/2021", "12/12/2020", "10/10/2022", "", "31/12/1899", "07/07/2019", "08/08/2018"],
+        },
+        index=[10, 11, 12, 13, 14, 15, 16, 17],
+    )
+
+
+def _configs(linebreak_action: str = "exclude") -> list[ValidatorConfig]:
+    return [
+        ValidatorConfig(ValidatorType.REQUIRED, params={"columns": ["CPF_CNPJ", "NOME"]}),
+        ValidatorConfig(ValidatorType.LINEBREAK, params={"columns": ["NOME"], "action": linebreak_action}),
+        ValidatorConfig(ValidatorType.STATUS, params={"include": ["ABERTO"]}),
+        ValidatorConfig(ValidatorType.TYPE_FILTER, params={"exclude": ["RESIDUO"]}),
+        ValidatorConfig(ValidatorType.DATERANGE, params={"min_year": 1900, "null_action": "exclude"}),
+        ValidatorConfig(ValidatorType.REGEX, params={"column": "CPF_CNPJ", "pattern": r"\d{11}", "mode": "fullmatch"}),
+        ValidatorConfig(ValidatorType.STATUS, enabled=False, params={"include": ["NENHUM"]}),
+    ]
+
+
+def _sequential(configs, df):
+    steps, invalid = [], []
+    for config in configs:
+        if not config.enabled:
+            continue
+        validator = create_validator(config)
+        result = validator.validate(df)
+        steps.append((validator.name, result.total_valid, result.total_invalid, result.errors))
+        if result.total_invalid:
+            invalid.append(result.invalid)
+        df = result.valid
+    return df, steps, invalid
+
+
+def test_plan_matches_sequential_validators():
+    df = _frame()
+    expected, expected_steps, expected_invalid = _sequential(_configs(), df)
+
+    result = ValidationPlan.from_configs(_configs()).run(df)
+
+    pd.testing.assert_frame_equal(result.valid, expected)
+    assert [(s.name, s.valid, s.invalid, s.errors) for s in result.steps] == expected_steps
+    assert sorted(result.invalid.index) == sorted(pd.concat(expected_invalid).index)
+    assert result.total_invalid == len(df) - len(expected)
+    # o frame de entrada não é alterado
+    pd.testing.assert_frame_equal(df, _frame())
+
+
+def test_plan_falls_back_for_frame_rewriting_validator():
+    df = _frame()
+    expected, expected_steps, _ = _sequential(_configs("clean"), df)
+
+    result = ValidationPlan.from_configs(_configs("clean")).run(df)
+
+    pd.testing.assert_frame_equal(result.valid, expected)
+    assert [(s.name, s.valid, s.invalid, s.errors) for s in result.steps] == expected_steps
+    assert "Caio Silva" in result.valid["NOME"].tolist()
+
+
+def test_plan_records_empty_steps_once_every_row_is_rejected():
+    configs = [
+        ValidatorConfig(ValidatorType.STATUS, params={"include": ["NENHUM"]}),
+        ValidatorConfig(ValidatorType.REQUIRED, params={"columns": ["CPF_CNPJ"]}),
+    ]
+    result = ValidationPlan.from_configs(configs).run(_frame())
+    assert result.valid.empty and len(result.invalid) == len(_frame())
+    assert [(s.valid, s.invalid) for s in result.steps] == [(0, 8), (0, 0)]
+
+
+def test_valid_frame_can_be_modified_without_warnings():
+    df = _frame()
+    for configs in (_configs(), _configs("clean"), []):
+        result = ValidationPlan.from_configs(configs).run(df)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result.valid["CHAVE"] = "x"
+            result.valid.loc[:, "NOME"] = result.valid["NOME"].str.upper()
+    pd.testing.assert_frame_equal(df, _frame())
@@ -0,0 +1,108 @@
+"""
+Tests for the streaming CSV-in-ZIP writer.
+The member bytes must match the original in-memory rendering.
+"""
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.io.file_manager import FileManager
+from src.utils.io import write_csv_to_zip, zip_options
+
+
+def _legacy_bytes(df: pd.DataFrame, sep: str, encoding: str) -> bytes:
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, sep=sep, decimal=",")
+    return buffer.getvalue().encode(encoding)
+
+
+def test_streaming_writer_matches_legacy_bytes(tmp_path):
+    rows = 40_000  # vários blocos internos do to_csv (100 mil células cada)
+    rng = np.random.default_rng(0)
+    vencimento = pd.Series(pd.to_datetime("2024-01-01") + pd.to_timedelta(rng.integers(0, 900, rows), unit="D"))
+    vencimento.iloc[-5:] += pd.Timedelta(hours=3)  # só o último bloco tem horário
+    df = pd.DataFrame({
+        "CHAVE": [f"CT-{i}" for i in range(rows)],
+        "NOME": rng.choice(["JOÃO", "a;b", 'aspas "x"', "", None], rows),
+        "VALOR": rng.normal(100, 30, rows),
+        "VENCIMENTO": vencimento,
+        "QTD": rng.integers(0, 10, rows),
+    })
+    df.loc[::7, "VALOR"] = np.nan
+
+    path = write_csv_to_zip({"saida.csv": df, "vazio.csv": df.iloc[:0]}, tmp_path / "saida.zip", sep=";")
+
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+        assert zf.read("saida.csv") == _legacy_bytes(df, ";", "utf-8-sig")
+        assert zf.read("vazio.csv") == _legacy_bytes(df.iloc[:0], ";", "utf-8-sig")
+
+
+def _frames(rows: int = 5_000) -> dict:
+    rng = np.random.default_rng(1)
+    base = pd.DataFrame({
+        "CHAVE": [f"CT-{i}" for i in range(rows)],
+        "VALOR": rng.normal(100, 30, rows),
+        "STATUS": rng.choice(["EM ABERTO", "BAIXADO", ""], rows),
+    })
+    return {"a.csv": base, "b.csv": base.iloc[::2], "c.csv": base.iloc[:0]}
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("level", [None, 0, 9])
+def test_parallel_writer_matches_sequential(tmp_path, executor, level):
+    frames = _frames()
+    serial = write_csv_to_zip(frames, tmp_path / "serial.zip", sep=";", compresslevel=level)
+    parallel = write_csv_to_zip(
+        frames, tmp_path / "parallel.zip", sep=";", compresslevel=level, workers=3, executor=executor
+    )
+
+    with zipfile.ZipFile(serial) as zs, zipfile.ZipFile(parallel) as zp:
+        assert zp.testzip() is None
+        assert zp.namelist() == list(frames)
+        expected = zipfile.ZIP_STORED if level == 0 else zipfile.ZIP_DEFLATED
+        assert {info.compress_type for info in zp.infolist()} == {expected}
+        for name in frames:
+            assert zp.read(name) == zs.read(name) == _legacy_bytes(frames[name], ";", "utf-8-sig")
+
+
+def test_parallel_writer_zip64_records_and_utf8_names(tmp_path, monkeypatch):
+    frames = {"devolução.csv": _frames()["a.csv"], "b.csv": _frames()["b.csv"]}
+    monkeypatch.setattr(zipfile, "ZIP64_LIMIT", 1_000)  # força os registros ZIP64
+    path = write_csv_to_zip(frames, tmp_path / "zip64.zip", sep=";", workers=2)
+    monkeypatch.undo()
+
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == list(frames)
+        assert zf.read("devolução.csv") == _legacy_bytes(frames["devolução.csv"], ";", "utf-8-sig")
+
+
+def test_file_manager_uses_packaging_options(tmp_path):
+    config = {
+        "global": {"encoding": "utf-8", "csv_separator": ";"},
+        "paths": {"input": {}, "output": {"base": str(tmp_path)}},
+        "packaging": {"compresslevel": 0, "workers": 2},
+    }
+    frames = _frames()
+    path = FileManager(config).salvar_zip(dict(frames), tmp_path / "devolucao.zip")
+
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in zf.infolist())
+        # FileManager grava com o separador decimal padrão do pandas
+        assert zf.read("b.csv") == frames["b.csv"].to_csv(index=False, sep=";").encode("utf-8")
+
+
+def test_invalid_packaging_options():
+    with pytest.raises(ValueError):
+        zip_options({"packaging": {"compresslevel": 12}})
+    with pytest.raises(ValueError):
+        zip_options({"packaging": {"executor": "gpu"}})